@@ -31,8 +31,10 @@ from core.polyglot_manager import (
     UDS3PolyglotManager,
     UDS3Config,
     create_uds3_manager,
+    BackendUnavailableError,
     TransactionState
 )
+from core.pagination import parse_tags
 
 logger = logging.getLogger(__name__)
 
@@ -73,36 +75,56 @@ def list_processes():
         - domain: Filter by domain (default: 'vpb')
         - status: Filter by status
         - authority: Filter by authority
-        - limit: Max results (default: 100)
-        - offset: Offset für Pagination (default: 0)
+        - tags: Komma-separierte Tags (alle müssen gesetzt sein)
+        - limit: Max results (default: 100, max: 1000)
+        - cursor: next_cursor der vorherigen Seite (Keyset-Pagination)
+        - offset: Offset für Pagination (nur ohne cursor, veraltet)
     
     Returns:
-        200: List of processes
+        200: List of processes (mit next_cursor)
+        400: Ungültiger Cursor/Limit
         500: Server error
+        503: PostgreSQL nicht verbunden
     """
     try:
         # Query Parameters
         domain = request.args.get('domain', 'vpb')
-        status = request.args.get('status')
-        authority = request.args.get('authority')
-        limit = int(request.args.get('limit', 100))
         offset = int(request.args.get('offset', 0))
         
         manager = get_uds3_manager()
-        
-        # TODO: Implement list_processes in manager
-        # For now return mock data
-        processes = []
+        page = manager.list_processes(
+            domain=domain,
+            status=request.args.get('status'),
+            authority=request.args.get('authority'),
+            tags=parse_tags(request.args.getlist('tags')),
+            limit=request.args.get('limit'),
+            cursor=request.args.get('cursor'),
+            offset=offset
+        )
+        processes = page["processes"]
         
         return jsonify({
             "success": True,
             "processes": processes,
             "count": len(processes),
             "offset": offset,
-            "limit": limit,
+            "limit": page["limit"],
+            "next_cursor": page["next_cursor"],
             "timestamp": datetime.now().isoformat()
         }), 200
     
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "timestamp": datetime.now().isoformat()
+        }), 400
+    except BackendUnavailableError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "timestamp": datetime.now().isoformat()
+        }), 503
     except Exception as e:
         logger.error(f"Error listing processes: {e}")
         return jsonify({
@@ -442,10 +464,11 @@ def semantic_search():
         top_k = int(request.args.get('top_k', 10))
         min_similarity = float(request.args.get('min_similarity', 0.5))
         
-        # TODO: Implement semantic_search in UDS3PolyglotManager
-        # For now return mock
+        manager = get_uds3_manager()
         results = {
-            "results": [],
+            "results": manager.semantic_search(
+                query, top_k=top_k, min_similarity=min_similarity, domain=domain
+            ),
             "query": query,
             "domain": domain,
             "top_k": top_k
@@ -567,28 +590,27 @@ def health_check():
     """
     API Health Check
     
+    Backends verbinden sich erst bei erster Nutzung; "starting" (noch
+    nicht verbunden, kein Fehler) ist daher kein Fehlerzustand.
+    
     Returns:
-        200: Healthy
-        503: Unhealthy
+        200: Healthy / Starting
+        503: Degraded / Unhealthy
     """
     try:
         manager = get_uds3_manager()
         
-        # Check backend connections
-        backends_status = {
-            "postgresql": manager.postgresql.connected,
-            "neo4j": manager.neo4j.connected,
-            "chromadb": manager.chromadb.connected
-        }
-        
-        all_healthy = all(backends_status.values())
+        # Verbindungszustand ohne Verbindungsaufbau
+        health = manager.health()
+        states = health["backends"]
         
         return jsonify({
-            "status": "healthy" if all_healthy else "degraded",
-            "backends": backends_status,
+            "status": health["status"],
+            "backends": {name: info["state"] == "connected" for name, info in states.items()},
+            "backend_states": states,
             "saga_enabled": manager.config.enable_saga,
             "timestamp": datetime.now().isoformat()
-        }), 200 if all_healthy else 503
+        }), 503 if health["status"] == "degraded" else 200
     
     except Exception as e:
         logger.error(f"Health check error: {e}")
@@ -9,7 +9,8 @@ Features:
 - Automatische OpenAPI/Swagger Dokumentation
 - Pydantic Models für Request/Response Validation
 - SAGA Transaction Tracking
-- Async Support
+- Async Support (Backend-Aufrufe im ThreadPool mit Grenzen je Backend,
+  Backpressure -> 429, Deadlines via X-Request-Timeout -> 504)
 - Type Safety
 
 Autor: UDS3 Development Team
@@ -17,10 +18,14 @@ Datum: 18. Oktober 2025
 """
 
 import logging
+import math
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from fastapi import FastAPI, HTTPException, Query, Path, Body, APIRouter, status
+from fastapi import FastAPI, HTTPException, Query, Path, Body, APIRouter, Depends, Header, Request, status
+# Alias: Endpoints mit Query-Parameter "status" verdecken das Modul
+from fastapi import status as http_status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, validator
 import uvicorn
 
@@ -29,8 +34,16 @@ from core.polyglot_manager import (
     UDS3PolyglotManager,
     UDS3Config,
     create_uds3_manager,
+    BackendUnavailableError,
     TransactionState
 )
+from core.backend_executor import (
+    BackendExecutor,
+    ExecutionLimits,
+    ExecutionRejected,
+    deadline_from_timeout
+)
+from core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError, parse_tags
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +109,7 @@ class ProcessListResponse(BaseModel):
     count: int
     offset: int
     limit: int
+    next_cursor: Optional[str] = Field(None, description="Cursor für die nächste Seite (None = letzte Seite)")
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
@@ -158,7 +172,9 @@ class HealthResponse(BaseModel):
     """Health Check Response"""
     status: str
     backends: Dict[str, bool]
+    backend_states: Optional[Dict[str, Dict[str, Any]]] = None
     saga_enabled: bool
+    execution: Optional[Dict[str, Any]] = None
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
@@ -186,6 +202,33 @@ def get_uds3_manager() -> UDS3PolyglotManager:
     return _uds3_manager
 
 
+# ============================================================================
+# Backend Executor (ThreadPool, Grenzen je Backend, Deadlines)
+# ============================================================================
+
+# Backends je Operation (SAGA-Operationen belegen einen Slot in jedem Backend)
+READ_BACKENDS = ("postgresql",)
+SAGA_BACKENDS = ("postgresql", "neo4j", "chromadb")
+SEARCH_BACKENDS = ("chromadb",)
+
+_backend_executor: Optional[BackendExecutor] = None
+
+
+def get_backend_executor() -> BackendExecutor:
+    """Get or create Backend Executor instance"""
+    global _backend_executor
+    if _backend_executor is None:
+        _backend_executor = BackendExecutor(ExecutionLimits())
+    return _backend_executor
+
+
+def request_deadline(
+    x_request_timeout: Optional[float] = Header(None, description="Request Deadline in Sekunden")
+) -> float:
+    """Absolute Deadline des Requests (Header X-Request-Timeout oder Standard)"""
+    return deadline_from_timeout(x_request_timeout, get_backend_executor().limits.default_deadline)
+
+
 # ============================================================================
 # FastAPI App & Routers
 # ============================================================================
@@ -208,6 +251,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+
+@app.exception_handler(ExecutionRejected)
+async def execution_rejected_handler(request: Request, exc: ExecutionRejected):
+    """429 bei ausgelastetem Backend, 504 bei überschrittener Deadline"""
+    headers = {"Retry-After": str(math.ceil(exc.retry_after))} if exc.retry_after else None
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "success": False,
+            "error": str(exc),
+            "backend": exc.backend,
+            "timestamp": datetime.now().isoformat()
+        },
+        headers=headers
+    )
+
+
 # Routers
 vpb_router = APIRouter(prefix="/api/uds3/vpb", tags=["VPB Processes"])
 saga_router = APIRouter(prefix="/api/uds3/saga", tags=["SAGA Transactions"])
@@ -227,27 +288,52 @@ async def list_processes(
     domain: str = Query("vpb", description="App Domain Filter"),
     status: Optional[str] = Query(None, description="Status Filter"),
     authority: Optional[str] = Query(None, description="Authority Filter"),
-    limit: int = Query(100, ge=1, le=1000, description="Max Results"),
-    offset: int = Query(0, ge=0, description="Offset for Pagination")
+    tags: Optional[List[str]] = Query(None, description="Tag Filter (alle müssen gesetzt sein)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Max Results"),
+    cursor: Optional[str] = Query(None, description="next_cursor der vorherigen Seite"),
+    offset: int = Query(0, ge=0, description="Offset (veraltet, nur ohne cursor)"),
+    deadline: float = Depends(request_deadline)
 ):
-    """Liste alle VPB Prozesse"""
+    """Liste VPB Prozesse seitenweise (Keyset-Pagination)"""
     try:
         manager = get_uds3_manager()
-        
-        # TODO: Implement list_processes in manager
-        processes = []
+        page = await get_backend_executor().run(
+            READ_BACKENDS,
+            manager.list_processes,
+            deadline=deadline,
+            domain=domain,
+            status=status,
+            authority=authority,
+            tags=parse_tags(tags),
+            limit=limit,
+            cursor=cursor,
+            offset=offset
+        )
         
         return ProcessListResponse(
-            processes=processes,
-            count=len(processes),
+            processes=page["processes"],
+            count=len(page["processes"]),
             offset=offset,
-            limit=limit
+            limit=page["limit"],
+            next_cursor=page["next_cursor"]
         )
     
+    except ExecutionRejected:
+        raise
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except BackendUnavailableError as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error listing processes: {e}")
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
@@ -260,12 +346,15 @@ async def list_processes(
 )
 async def get_process(
     process_id: str = Path(..., description="Process UUID"),
-    source: str = Query("postgresql", description="Backend Source (postgresql, all)")
+    source: str = Query("postgresql", description="Backend Source (postgresql, all)"),
+    deadline: float = Depends(request_deadline)
 ):
     """Lade spezifischen VPB Prozess"""
     try:
         manager = get_uds3_manager()
-        process = manager.get_process(process_id, source=source)
+        process = await get_backend_executor().run(
+            READ_BACKENDS, manager.get_process, process_id, source=source, deadline=deadline
+        )
         
         if process:
             return {
@@ -280,7 +369,7 @@ async def get_process(
                 detail=f"Process not found: {process_id}"
             )
     
-    except HTTPException:
+    except (HTTPException, ExecutionRejected):
         raise
     except Exception as e:
         logger.error(f"Error loading process {process_id}: {e}")
@@ -300,7 +389,8 @@ async def get_process(
 async def create_process(
     process: ProcessCreate = Body(..., description="Process Data"),
     domain: str = Query("vpb", description="App Domain"),
-    generate_embeddings: bool = Query(True, description="Generate Embeddings for Semantic Search")
+    generate_embeddings: bool = Query(True, description="Generate Embeddings for Semantic Search"),
+    deadline: float = Depends(request_deadline)
 ):
     """Erstelle neuen VPB Prozess (mit SAGA)"""
     try:
@@ -311,7 +401,10 @@ async def create_process(
         manager = get_uds3_manager()
         
         # Save with SAGA
-        process_id = manager.save_process(
+        process_id = await get_backend_executor().run(
+            SAGA_BACKENDS,
+            manager.save_process,
+            deadline=deadline,
             process_data=process_data,
             domain=domain,
             generate_embeddings=generate_embeddings
@@ -329,6 +422,8 @@ async def create_process(
             transaction=transaction_info
         )
     
+    except ExecutionRejected:
+        raise
     except Exception as e:
         logger.error(f"Error creating process: {e}")
         
@@ -358,7 +453,8 @@ async def create_process(
 async def update_process(
     process_id: str = Path(..., description="Process UUID"),
     updates: ProcessUpdate = Body(..., description="Update Data"),
-    domain: str = Query("vpb", description="App Domain")
+    domain: str = Query("vpb", description="App Domain"),
+    deadline: float = Depends(request_deadline)
 ):
     """Aktualisiere bestehenden VPB Prozess (mit SAGA)"""
     try:
@@ -375,7 +471,10 @@ async def update_process(
         manager = get_uds3_manager()
         
         # Update with SAGA
-        success = manager.update_process(
+        success = await get_backend_executor().run(
+            SAGA_BACKENDS,
+            manager.update_process,
+            deadline=deadline,
             process_id=process_id,
             updates=update_data,
             domain=domain
@@ -398,7 +497,7 @@ async def update_process(
                 detail="Update failed"
             )
     
-    except HTTPException:
+    except (HTTPException, ExecutionRejected):
         raise
     except Exception as e:
         logger.error(f"Error updating process {process_id}: {e}")
@@ -429,7 +528,8 @@ async def update_process(
 async def delete_process(
     process_id: str = Path(..., description="Process UUID"),
     domain: str = Query("vpb", description="App Domain"),
-    soft_delete: bool = Query(True, description="Soft Delete (set deleted_at) vs Hard Delete")
+    soft_delete: bool = Query(True, description="Soft Delete (set deleted_at) vs Hard Delete"),
+    deadline: float = Depends(request_deadline)
 ):
     """Lösche VPB Prozess (mit SAGA)"""
     try:
@@ -437,7 +537,10 @@ async def delete_process(
         manager = get_uds3_manager()
         
         # Delete with SAGA
-        success = manager.delete_process(
+        success = await get_backend_executor().run(
+            SAGA_BACKENDS,
+            manager.delete_process,
+            deadline=deadline,
             process_id=process_id,
             domain=domain,
             soft_delete=soft_delete
@@ -461,7 +564,7 @@ async def delete_process(
                 detail="Delete failed"
             )
     
-    except HTTPException:
+    except (HTTPException, ExecutionRejected):
         raise
     except Exception as e:
         logger.error(f"Error deleting process {process_id}: {e}")
@@ -497,12 +600,18 @@ async def semantic_search(
     q: str = Query(..., min_length=1, description="Search Query"),
     domain: str = Query("vpb", description="Domain Filter"),
     top_k: int = Query(10, ge=1, le=100, description="Number of Results"),
-    min_similarity: float = Query(0.5, ge=0.0, le=1.0, description="Minimum Similarity Score")
+    min_similarity: float = Query(0.5, ge=0.0, le=1.0, description="Minimum Similarity Score"),
+    deadline: float = Depends(request_deadline)
 ):
     """Semantic Search über VPB Prozesse"""
     try:
-        # TODO: Implement semantic_search in UDS3PolyglotManager
-        results = []
+        manager = get_uds3_manager()
+        # Embedding + Vektorsuche blockieren -> ThreadPool (Slot im chromadb-Backend,
+        # auch für den lokalen Vektorindex)
+        results = await get_backend_executor().run(
+            SEARCH_BACKENDS, manager.semantic_search, q,
+            top_k=top_k, min_similarity=min_similarity, domain=domain, deadline=deadline
+        )
         
         return SearchResponse(
             results=results,
@@ -511,6 +620,8 @@ async def semantic_search(
             top_k=top_k
         )
     
+    except ExecutionRejected:
+        raise
     except Exception as e:
         logger.error(f"Error in semantic search: {e}")
         raise HTTPException(
@@ -614,19 +725,16 @@ async def health_check():
     try:
         manager = get_uds3_manager()
         
-        # Check backend connections
-        backends_status = {
-            "postgresql": manager.postgresql.connected,
-            "neo4j": manager.neo4j.connected,
-            "chromadb": manager.chromadb.connected
-        }
-        
-        all_healthy = all(backends_status.values())
+        # Verbindungszustand ohne Verbindungsaufbau (Backends verbinden lazy)
+        health = manager.health()
+        states = health["backends"]
         
         return HealthResponse(
-            status="healthy" if all_healthy else "degraded",
-            backends=backends_status,
-            saga_enabled=manager.config.enable_saga
+            status=health["status"],
+            backends={name: info["state"] == "connected" for name, info in states.items()},
+            backend_states=states,
+            saga_enabled=manager.config.enable_saga,
+            execution=get_backend_executor().snapshot()
         )
     
     except Exception as e:
@@ -667,16 +775,23 @@ async def root():
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize UDS3 Manager on startup"""
+    """Initialize UDS3 Manager on startup (Backends verbinden lazy)"""
     logger.info("🚀 Starting UDS3 VPB API...")
     manager = get_uds3_manager()
-    logger.info(f"✅ UDS3 Manager initialized (SAGA: {manager.config.enable_saga})")
+    logger.info(
+        f"✅ UDS3 Manager initialized (SAGA: {manager.config.enable_saga}, "
+        f"lazy_connect: {manager.config.lazy_connect}, warmup: {manager.config.background_warmup})"
+    )
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("👋 Shutting down UDS3 VPB API...")
+    if _backend_executor is not None:
+        _backend_executor.shutdown(wait=False)
+    if _uds3_manager is not None:
+        _uds3_manager.close()
 
 
 # ============================================================================
@@ -0,0 +1,210 @@
+"""
+Backend Executor
+================
+
+Ausführungsschicht für synchrone Backend-Aufrufe (UDS3PolyglotManager:
+psycopg2-Pool, Neo4j-Sessions, SentenceTransformer) aus async-Code.
+
+- Eigener, dimensionierter ThreadPool statt Aufruf im Event-Loop
+- Nebenläufigkeitsgrenzen je Backend (postgresql, neo4j, chromadb, ...)
+- Backpressure: ist ein Backend ausgelastet und wird innerhalb von
+  queue_timeout kein Slot frei -> BackendSaturatedError (HTTP 429)
+- Deadlines: überschreitet ein Aufruf seine Deadline ->
+  BackendDeadlineExceeded (HTTP 504). Der Worker-Thread läuft zu Ende und
+  gibt seine Slots erst dann frei, damit die Grenzen eingehalten bleiben.
+
+Autor: UDS3 Development Team
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionRejected(Exception):
+    """Basisklasse: Aufruf wurde nicht (rechtzeitig) ausgeführt"""
+
+    status_code = 503
+
+    def __init__(self, message: str, backend: Optional[str] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.backend = backend
+        self.retry_after = retry_after
+
+
+class BackendSaturatedError(ExecutionRejected):
+    """Backend ausgelastet (Backpressure)"""
+
+    status_code = 429
+
+
+class BackendDeadlineExceeded(ExecutionRejected):
+    """Deadline vor Abschluss des Aufrufs überschritten"""
+
+    status_code = 504
+
+
+@dataclass
+class ExecutionLimits:
+    """Konfiguration der Ausführungsschicht"""
+    # Maximale gleichzeitige Aufrufe je Backend
+    backend_limits: Dict[str, int] = field(default_factory=lambda: {
+        "postgresql": 8,
+        "neo4j": 4,
+        "chromadb": 2,
+    })
+    # Threads im Pool (None = Summe der Backend-Grenzen)
+    max_workers: Optional[int] = None
+    # Wartezeit auf einen freien Slot, bevor mit 429 abgelehnt wird
+    queue_timeout: float = 0.05
+    # Standard-Deadline pro Aufruf in Sekunden
+    default_deadline: float = 30.0
+    # Hinweis an Clients (Retry-After) bei 429
+    retry_after: float = 1.0
+
+
+class _BackendSlots:
+    """Zähler für laufende Aufrufe je Backend (thread-sicher)"""
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = dict(limits)
+        self.in_flight: Dict[str, int] = {name: 0 for name in limits}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, backends: Tuple[str, ...]) -> Optional[str]:
+        """Belegt alle Slots oder keinen; gibt das volle Backend zurück"""
+        with self._lock:
+            for name in backends:
+                if self.in_flight.get(name, 0) >= self.limits.get(name, 1):
+                    return name
+            for name in backends:
+                self.in_flight[name] = self.in_flight.get(name, 0) + 1
+        return None
+
+    def release(self, backends: Tuple[str, ...]) -> None:
+        with self._lock:
+            for name in backends:
+                self.in_flight[name] -= 1
+
+
+class BackendExecutor:
+    """
+    Führt synchrone Backend-Aufrufe im ThreadPool aus
+
+    Beispiel:
+        executor = BackendExecutor()
+        process = await executor.run("postgresql", manager.get_process, process_id)
+    """
+
+    _POLL_INTERVAL = 0.002
+
+    def __init__(self, limits: Optional[ExecutionLimits] = None):
+        self.limits = limits or ExecutionLimits()
+        workers = self.limits.max_workers or max(1, sum(self.limits.backend_limits.values()))
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="uds3-backend")
+        self._slots = _BackendSlots(self.limits.backend_limits)
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"completed": 0, "failed": 0, "rejected": 0, "timed_out": 0}
+        self.max_workers = workers
+
+    async def run(
+        self,
+        backends: Union[str, Sequence[str]],
+        func: Callable[..., Any],
+        *args,
+        deadline: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Führe func(*args, **kwargs) im Pool aus
+
+        Args:
+            backends: Betroffene Backends (ein Name oder mehrere, z.B. für SAGA)
+            deadline: Absoluter Zeitpunkt (time.monotonic()); None = default_deadline
+
+        Raises:
+            BackendSaturatedError: Kein Slot innerhalb von queue_timeout
+            BackendDeadlineExceeded: Deadline überschritten
+        """
+        names = (backends,) if isinstance(backends, str) else tuple(sorted(set(backends)))
+        if deadline is None:
+            deadline = time.monotonic() + self.limits.default_deadline
+
+        await self._acquire(names, deadline)
+        try:
+            future = self._pool.submit(self._call, names, func, args, kwargs)
+        except BaseException:
+            self._slots.release(names)
+            raise
+        # Bei Timeout abgebrochene, noch nicht gestartete Aufrufe geben ihre Slots hier frei
+        future.add_done_callback(lambda f: f.cancelled() and self._slots.release(names))
+
+        remaining = deadline - time.monotonic()
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=max(remaining, 0.0))
+        except asyncio.TimeoutError:
+            self._count("timed_out")
+            raise BackendDeadlineExceeded(
+                f"Deadline überschritten ({', '.join(names)})", backend=names[0]
+            ) from None
+
+    async def _acquire(self, names: Tuple[str, ...], deadline: float) -> None:
+        wait_until = min(time.monotonic() + self.limits.queue_timeout, deadline)
+        while True:
+            full = self._slots.try_acquire(names)
+            if full is None:
+                return
+            if time.monotonic() >= wait_until:
+                self._count("rejected")
+                raise BackendSaturatedError(
+                    f"Backend ausgelastet: {full}", backend=full, retry_after=self.limits.retry_after
+                )
+            await asyncio.sleep(self._POLL_INTERVAL)
+
+    def _call(self, names: Tuple[str, ...], func: Callable[..., Any], args, kwargs) -> Any:
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self._count("failed")
+            raise
+        finally:
+            self._slots.release(names)
+        self._count("completed")
+        return result
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Aktuelle Auslastung und Zähler (z.B. für den Health Check)"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": dict(self._slots.in_flight),
+            "limits": dict(self._slots.limits),
+            **stats,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+def deadline_from_timeout(timeout: Optional[float], default: float) -> float:
+    """Absolute Deadline aus einer relativen Angabe in Sekunden (z.B. Header)"""
+    if timeout is None or timeout <= 0:
+        timeout = default
+    return time.monotonic() + timeout
+
+
+__all__ = [
+    'BackendExecutor', 'ExecutionLimits', 'ExecutionRejected',
+    'BackendSaturatedError', 'BackendDeadlineExceeded', 'deadline_from_timeout',
+]
@@ -0,0 +1,150 @@
+"""
+Embedding Cache
+===============
+
+Cache für Embeddings des ChromaDBAdapter, adressiert über einen
+Content-Hash (sha256 aus Modellname und Embedding-Text).
+
+- In-Memory LRU (max_entries) für die zuletzt genutzten Vektoren
+- Optionale SQLite-Datei (path) als persistente zweite Stufe; Vektoren
+  werden als float32 (array 'f') gespeichert
+- Unveränderter Text aus _build_embedding_text wird dadurch nicht erneut
+  encodiert, auch nicht über Neustarts hinweg
+
+Autor: UDS3 Development Team
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS embeddings (
+        key TEXT PRIMARY KEY,
+        dim INTEGER NOT NULL,
+        vector BLOB NOT NULL
+    )
+"""
+
+# SQLite-Grenze für Parameter je Statement (konservativ)
+_SQL_CHUNK = 500
+
+
+def content_key(text: str, model_name: str = "") -> str:
+    """Content-Hash für einen Embedding-Text"""
+    return hashlib.sha256(f"{model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    LRU + SQLite Cache für Embeddings
+
+    Args:
+        max_entries: Anzahl Vektoren im Speicher (0 = kein In-Memory-Cache)
+        path: SQLite-Datei für den persistenten Cache (None = nur In-Memory)
+        model_name: Teil des Schlüssels, damit Modellwechsel den Cache nicht vergiften
+    """
+
+    def __init__(self, max_entries: int = 10000, path: Optional[str] = None, model_name: str = ""):
+        self.max_entries = max(0, max_entries)
+        self.path = path
+        self.model_name = model_name
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats: Dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    def key(self, text: str) -> str:
+        return content_key(text, self.model_name)
+
+    # ----- Lesen -----
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Gefundene Vektoren je Schlüssel (fehlende Schlüssel fehlen im Ergebnis)"""
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is None:
+                    missing.append(key)
+                    continue
+                self._memory.move_to_end(key)
+                found[key] = vector
+                self.stats["memory_hits"] += 1
+
+            if missing and self._conn is not None:
+                for start in range(0, len(missing), _SQL_CHUNK):
+                    chunk = missing[start:start + _SQL_CHUNK]
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({', '.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = array("f", blob).tolist()
+                        found[key] = vector
+                        self._remember(key, vector)
+                        self.stats["disk_hits"] += 1
+
+            self.stats["misses"] += len(keys) - len(found)
+        return found
+
+    def get(self, key: str) -> Optional[List[float]]:
+        return self.get_many([key]).get(key)
+
+    # ----- Schreiben -----
+    def put_many(self, items: Iterable[Tuple[str, Sequence[float]]]) -> None:
+        rows = []
+        with self._lock:
+            for key, vector in items:
+                vector = [float(v) for v in vector]
+                self._remember(key, vector)
+                if self._conn is not None:
+                    rows.append((key, len(vector), array("f", vector).tobytes()))
+            if rows:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)", rows
+                    )
+
+    def put(self, key: str, vector: Sequence[float]) -> None:
+        self.put_many([(key, vector)])
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        if not self.max_entries:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # ----- Verwaltung -----
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def clear(self) -> None:
+        """Leert nur den In-Memory-Teil"""
+        with self._lock:
+            self._memory.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+__all__ = ['EmbeddingCache', 'content_key']
@@ -0,0 +1,88 @@
+"""
+Keyset-Pagination für Prozesslisten
+===================================
+
+Gemeinsame Cursor-Tokens für SQLite (vpb_sqlite_db), den Flask-Server und die
+UDS3-Endpoints (Flask/FastAPI). Sortiert wird immer absteigend nach
+(updated_at, process_id); der Cursor enthält den Schlüssel der letzten
+gelieferten Zeile. Das Token ist opak (URL-sicheres Base64 über JSON) und in
+allen Schichten identisch aufgebaut.
+
+Autor: UDS3 Development Team
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Formatversion des Tokens (für spätere Erweiterungen)
+_CURSOR_VERSION = 1
+
+
+class InvalidCursorError(ValueError):
+    """Cursor-Token ist beschädigt oder stammt aus einem anderen Format."""
+
+
+def encode_cursor(updated_at: Any, process_id: str) -> str:
+    """Erzeugt das Token für die Position hinter (updated_at, process_id)."""
+    if hasattr(updated_at, "isoformat"):
+        updated_at = updated_at.isoformat()
+    payload = json.dumps([_CURSOR_VERSION, str(updated_at), str(process_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[str, str]:
+    """Liefert (updated_at, process_id) aus einem Token.
+
+    Raises:
+        InvalidCursorError: Token nicht dekodierbar oder falsches Format
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        version, updated_at, process_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as exc:
+        raise InvalidCursorError(f"Ungültiger Cursor: {token!r}") from exc
+    if version != _CURSOR_VERSION or not isinstance(updated_at, str) or not isinstance(process_id, str):
+        raise InvalidCursorError(f"Ungültiger Cursor: {token!r}")
+    return updated_at, process_id
+
+
+def clamp_limit(limit: Optional[Any]) -> int:
+    """Begrenzt die Seitengröße auf 1..MAX_PAGE_SIZE (None -> DEFAULT_PAGE_SIZE)."""
+    if limit is None or limit == "":
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def parse_tags(value: Optional[Any]) -> List[str]:
+    """Tags aus Query-Parametern: 'a,b' oder Liste (mehrfacher Parameter)."""
+    if not value:
+        return []
+    parts: Iterable[str] = value.split(",") if isinstance(value, str) else (
+        p for item in value for p in str(item).split(",")
+    )
+    return [p.strip() for p in parts if p.strip()]
+
+
+def split_page(rows: Sequence[Any], limit: int, key) -> Tuple[List[Any], Optional[str]]:
+    """Teilt limit + 1 gelesene Zeilen in Seite und next_cursor.
+
+    Args:
+        rows: Ergebnis einer Abfrage mit LIMIT limit + 1
+        limit: Seitengröße
+        key: Funktion row -> (updated_at, process_id)
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(*key(page[-1]))
+
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE", "MAX_PAGE_SIZE", "InvalidCursorError",
+    "encode_cursor", "decode_cursor", "clamp_limit", "parse_tags", "split_page",
+]
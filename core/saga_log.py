@@ -0,0 +1,333 @@
+"""
+SAGA Transaction Log
+====================
+
+Begrenztes, persistentes Log für SAGA Transactions des UDS3PolyglotManager.
+
+- In-Memory-Ring (ring_size) für die jüngsten Transaktionen; laufende
+  Transaktionen werden nie verdrängt
+- Optionales Journal in SQLite:
+  - saga_events: append-only, ein Eintrag pro Zustandswechsel
+  - saga_transactions: letzter Stand je Transaktion, indiziert nach
+    (state, started_at) und started_at für get/list-Abfragen
+- Jede Journal-Zeile trägt den Besitzer (Token des schreibenden Logs);
+  saga_owners hält Host, PID und Heartbeat je Token
+- interrupted(): offene Transaktionen, deren Besitzer nachweislich nicht
+  mehr läuft (für die Recovery nach einem Neustart). Offene Transaktionen
+  anderer, noch laufender Worker mit demselben Journal bleiben unberührt.
+
+Autor: UDS3 Development Team
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Zustände, in denen eine Transaktion noch nicht abgeschlossen ist
+OPEN_STATES = ("pending", "in_progress", "compensating")
+
+# Mindestabstand zwischen zwei Heartbeats eines Besitzers (Sekunden)
+HEARTBEAT_INTERVAL = 30.0
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS saga_events (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        transaction_id TEXT NOT NULL,
+        state TEXT NOT NULL,
+        recorded_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now')),
+        payload TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS saga_transactions (
+        transaction_id TEXT PRIMARY KEY,
+        operation TEXT NOT NULL,
+        domain TEXT,
+        process_id TEXT,
+        state TEXT NOT NULL,
+        started_at TEXT NOT NULL,
+        completed_at TEXT,
+        payload TEXT NOT NULL,
+        owner TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS saga_owners (
+        token TEXT PRIMARY KEY,
+        host TEXT NOT NULL,
+        pid INTEGER NOT NULL,
+        started_at REAL NOT NULL,
+        heartbeat_at REAL NOT NULL,
+        closed_at REAL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_saga_transactions_state ON saga_transactions(state, started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_saga_transactions_started ON saga_transactions(started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_saga_events_transaction ON saga_events(transaction_id)",
+)
+
+
+def _pid_alive(pid: int) -> bool:
+    """Läuft ein Prozess mit dieser PID auf diesem Host?"""
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return ctypes.GetLastError() == 5  # ERROR_ACCESS_DENIED: Prozess existiert
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SagaTransactionLog:
+    """
+    Ring + Journal für SAGA Transactions
+
+    Args:
+        ring_size: Anzahl abgeschlossener Transaktionen im Speicher
+        journal_path: SQLite-Datei für das Journal (None = nur In-Memory)
+        owner_timeout: Sekunden ohne Heartbeat, nach denen ein Besitzer auf
+            einem anderen Host als beendet gilt (None = nie; dessen offene
+            Transaktionen werden dann nicht automatisch wiederhergestellt)
+    """
+
+    def __init__(self, ring_size: int = 1000, journal_path: Optional[str] = None,
+                 owner_timeout: Optional[float] = None):
+        self.ring_size = max(1, ring_size)
+        self.journal_path = journal_path
+        self.owner_timeout = owner_timeout
+        # Besitzer der Journal-Zeilen dieses Logs (Host, PID, Start-Token)
+        self.owner = {"token": uuid.uuid4().hex, "host": socket.gethostname(), "pid": os.getpid()}
+        self._heartbeat_at = 0.0
+        # transaction_id -> SagaTransaction (Einfügereihenfolge = Startreihenfolge)
+        self._ring: "OrderedDict[str, Any]" = OrderedDict()
+        self._open: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if journal_path:
+            Path(journal_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(journal_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(saga_transactions)")}
+            if "owner" not in columns:
+                # Journal aus einer Version ohne Besitzer
+                self._conn.execute("ALTER TABLE saga_transactions ADD COLUMN owner TEXT")
+            now = time.time()
+            self._conn.execute(
+                "INSERT INTO saga_owners (token, host, pid, started_at, heartbeat_at) VALUES (?, ?, ?, ?, ?)",
+                (self.owner["token"], self.owner["host"], self.owner["pid"], now, now),
+            )
+            self._heartbeat_at = now
+
+    # ----- Schreiben -----
+    def record(self, transaction) -> None:
+        """Übernimmt den aktuellen Stand einer Transaktion (bei jedem Zustandswechsel)"""
+        data = transaction.to_dict()
+        with self._lock:
+            tid = transaction.transaction_id
+            if data["state"] in OPEN_STATES:
+                self._open[tid] = transaction
+            else:
+                self._open.pop(tid, None)
+            if tid not in self._ring:
+                self._ring[tid] = transaction
+                self._evict()
+            if self._conn is not None:
+                self._journal(data)
+
+    def progress(self, transaction) -> None:
+        """Schreibt Zwischenstände (Step gestartet/ausgeführt) ins Journal, ohne Ring-Update"""
+        if self._conn is None:
+            return
+        data = transaction.to_dict()
+        with self._lock:
+            if self._conn is not None:
+                self._journal(data)
+
+    def _evict(self) -> None:
+        excess = len(self._ring) - self.ring_size
+        if excess <= 0:
+            return
+        for tid in list(self._ring):
+            if excess <= 0:
+                break
+            if tid not in self._open:
+                del self._ring[tid]
+                excess -= 1
+
+    def _journal(self, data: Dict[str, Any]) -> None:
+        payload = json.dumps(data, default=str)
+        conn = self._conn
+        conn.execute("BEGIN")
+        try:
+            conn.execute(
+                "INSERT INTO saga_events (transaction_id, state, payload) VALUES (?, ?, ?)",
+                (data["transaction_id"], data["state"], payload),
+            )
+            conn.execute(
+                """
+                INSERT INTO saga_transactions
+                    (transaction_id, operation, domain, process_id, state, started_at, completed_at, payload, owner)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(transaction_id) DO UPDATE SET
+                    state = excluded.state,
+                    completed_at = excluded.completed_at,
+                    payload = excluded.payload,
+                    owner = excluded.owner
+                """,
+                (data["transaction_id"], data["operation"], data["domain"], data["process_id"],
+                 data["state"], data["started_at"], data["completed_at"], payload, self.owner["token"]),
+            )
+            now = time.time()
+            if now - self._heartbeat_at >= HEARTBEAT_INTERVAL:
+                conn.execute("UPDATE saga_owners SET heartbeat_at = ? WHERE token = ?",
+                             (now, self.owner["token"]))
+                self._heartbeat_at = now
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ----- Lesen -----
+    def get(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            transaction = self._ring.get(transaction_id) or self._open.get(transaction_id)
+            if transaction is not None:
+                return transaction.to_dict()
+            if self._conn is None:
+                return None
+            row = self._conn.execute(
+                "SELECT payload FROM saga_transactions WHERE transaction_id = ?", (transaction_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list(self, state: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Jüngste Transaktionen zuerst (aus dem Journal-Index bzw. dem Ring)"""
+        with self._lock:
+            if self._conn is not None:
+                if state:
+                    rows = self._conn.execute(
+                        "SELECT payload FROM saga_transactions WHERE state = ? "
+                        "ORDER BY started_at DESC LIMIT ?", (state, limit)
+                    ).fetchall()
+                else:
+                    rows = self._conn.execute(
+                        "SELECT payload FROM saga_transactions ORDER BY started_at DESC LIMIT ?", (limit,)
+                    ).fetchall()
+                return [json.loads(row[0]) for row in rows]
+
+            result = []
+            for transaction in reversed(self._ring.values()):
+                if state and transaction.state.value != state:
+                    continue
+                result.append(transaction.to_dict())
+                if len(result) >= limit:
+                    break
+            return result
+
+    def interrupted(self) -> List[Dict[str, Any]]:
+        """
+        Offene Transaktionen, deren Besitzer nachweislich beendet ist
+
+        Beendet heißt: Log geschlossen, PID auf diesem Host existiert nicht
+        mehr oder (anderer Host, nur mit owner_timeout) Heartbeat veraltet.
+        Zeilen ohne Besitzer stammen aus einem älteren Journal und gelten als
+        unterbrochen. Jeder Eintrag enthält zusätzlich "owner" (Token oder None).
+        """
+        if self._conn is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT t.payload, t.owner, o.host, o.pid, o.heartbeat_at, o.closed_at "
+                "FROM saga_transactions t LEFT JOIN saga_owners o ON o.token = t.owner "
+                f"WHERE t.state IN ({', '.join('?' * len(OPEN_STATES))}) "
+                "AND (t.owner IS NULL OR t.owner != ?) ORDER BY t.started_at",
+                (*OPEN_STATES, self.owner["token"])
+            ).fetchall()
+        return [
+            dict(json.loads(payload), owner=owner)
+            for payload, owner, host, pid, heartbeat_at, closed_at in rows
+            if self._owner_dead(owner, host, pid, heartbeat_at, closed_at)
+        ]
+
+    def _owner_dead(self, owner, host, pid, heartbeat_at, closed_at) -> bool:
+        if owner is None or host is None or closed_at is not None:
+            return True
+        if host == self.owner["host"]:
+            return not _pid_alive(pid)
+        return self.owner_timeout is not None and time.time() - heartbeat_at > self.owner_timeout
+
+    def claim(self, data: Dict[str, Any]) -> bool:
+        """
+        Übernimmt eine unterbrochene Transaktion für die Recovery
+
+        Atomar über den bisherigen Besitzer: starten zwei Worker gleichzeitig,
+        kompensiert nur der erste. Returns: False, wenn bereits übernommen.
+        """
+        if self._conn is None:
+            return False
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE saga_transactions SET owner = ? WHERE transaction_id = ? AND owner IS ? "
+                f"AND state IN ({', '.join('?' * len(OPEN_STATES))})",
+                (self.owner["token"], data["transaction_id"], data.get("owner"), *OPEN_STATES)
+            )
+        return cursor.rowcount == 1
+
+    def mark(self, data: Dict[str, Any], state: str, error: str) -> None:
+        """Setzt Zustand/Fehler einer nur im Journal vorhandenen Transaktion (Recovery)"""
+        if self._conn is None:
+            return
+        data = dict(data, state=state, error=error)
+        data.pop("owner", None)
+        data.setdefault("completed_at", None)
+        with self._lock:
+            self._journal(data)
+
+    # ----- Verwaltung -----
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def in_memory(self) -> "OrderedDict[str, Any]":
+        """Transaktionen im Ring (jüngste zuletzt)"""
+        with self._lock:
+            return OrderedDict(self._ring)
+
+    def close(self) -> None:
+        """Schließt das Journal; noch offene Transaktionen gelten danach als unterbrochen"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("UPDATE saga_owners SET closed_at = ? WHERE token = ?",
+                                   (time.time(), self.owner["token"]))
+                self._conn.close()
+                self._conn = None
+
+
+__all__ = ['SagaTransactionLog', 'OPEN_STATES', 'HEARTBEAT_INTERVAL']
@@ -0,0 +1,569 @@
+"""
+Lokaler Vektorindex
+===================
+
+Abhängigkeitsarmer Ersatz für ChromaDB (nur NumPy + SQLite) für die
+semantische Suche, abgelegt neben vpb_processes.db in einem Verzeichnis
+(Default im UDS3PolyglotManager: <data_dir>/vpb_processes.vectors/):
+
+- vectors.npy:   float32-Matrix (Kapazität x dim), L2-normalisiert, als
+  Memory-Map geöffnet; wächst durch Verdopplung
+- lists.npy:     IVF-Liste je Zeile (int32, -1 = keiner Liste zugeordnet)
+- centroids.npy: IVF-Zentroide (optional, siehe build_ivf)
+- index.db:      SQLite mit id -> Zeile, Dokument, Metadaten
+
+Suche: Skalarprodukt der normalisierten Vektoren (= Kosinus) und
+argpartition für Top-k. Mit IVF werden nur die n_probe nächstgelegenen
+Listen durchsucht. Dafür liegen die Zeilen nach dem Training nach Liste
+sortiert am Stück (gepackter Bereich, Scores über Slices ohne Kopie);
+neue Vektoren kommen in einen Anhang, der mitdurchsucht wird. Wächst der
+Anhang (plus gelöschte Zeilen im gepackten Bereich) über 20 %, wird neu
+gepackt. Upserts überschreiben die Zeile der id, Deletes geben die Zeile
+frei (im gepackten Bereich erst beim nächsten Packen).
+
+Training und Packen schreiben die Dateien neu und laufen daher nur auf dem
+Schreibpfad (nach upsert/delete bzw. explizit über maintain()); query()
+liest nur. Schreiben sollte ein einzelner Prozess.
+
+Die Schnittstelle (add/upsert/update/delete/query/count) entspricht der
+einer ChromaDB Collection; distance = 1 - Kosinus.
+
+HashingEncoder liefert Embeddings ohne sentence-transformers (Feature
+Hashing über Wörter und Zeichen-Trigramme).
+
+Autor: UDS3 Development Team
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS vectors (
+        id TEXT PRIMARY KEY,
+        row INTEGER NOT NULL,
+        document TEXT,
+        metadata TEXT
+    );
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+"""
+
+_MIN_CAPACITY = 1024
+# Zeilen je Matrixprodukt beim Zuordnen zu IVF-Listen
+_ASSIGN_CHUNK = 8192
+# SQLite-Grenze für Parameter je Statement (konservativ)
+_SQL_CHUNK = 500
+# Trainingspunkte je IVF-Liste (Stichprobe für k-means)
+_TRAIN_PER_LIST = 64
+# Ab so vielen Vektoren je Liste wird IVF automatisch trainiert
+_AUTO_TRAIN_PER_LIST = 39
+# Anteil Anhang + Löcher am gepackten Bereich, ab dem neu gepackt wird
+_REPACK_RATIO = 0.2
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class HashingEncoder:
+    """
+    Embedding ohne Modell: Feature Hashing über Wörter und Zeichen-Trigramme
+
+    Gleiche Schnittstelle wie SentenceTransformer.encode(); ähnliche Texte
+    (gemeinsame Wörter, Wortstämme) erhalten ähnliche Vektoren.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    @property
+    def name(self) -> str:
+        return f"hashing-{self.dim}"
+
+    def _add_features(self, row: np.ndarray, text: str) -> None:
+        for word in _TOKEN_RE.findall(text.lower()):
+            padded = f"<{word}>"
+            features = [(word, 2.0)] + [(padded[i:i + 3], 1.0) for i in range(len(padded) - 2)]
+            for feature, weight in features:
+                h = zlib.crc32(feature.encode("utf-8"))
+                row[h % self.dim] += weight if h & 0x80000000 else -weight
+
+    def encode(self, texts, batch_size: int = 32, convert_to_numpy: bool = True):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        out = np.zeros((len(batch), self.dim), dtype=np.float32)
+        for row, text in zip(out, batch):
+            self._add_features(row, text)
+        out = _normalize(out)
+        return out[0] if single else out
+
+
+class LocalVectorIndex:
+    """
+    Vektorindex auf Basis von Memory-Maps (ChromaDB-Collection-kompatibel)
+
+    Args:
+        path: Verzeichnis des Index (wird angelegt)
+        n_lists: Anzahl IVF-Listen (0 = immer exakte Suche)
+        n_probe: Durchsuchte Listen je Anfrage
+        encoder: Name des Encoders; passt er nicht zum gespeicherten Index,
+            wird der Index geleert (Vektoren wären nicht vergleichbar)
+    """
+
+    def __init__(self, path: str, n_lists: int = 0, n_probe: int = 8, encoder: str = ""):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.n_lists = max(0, int(n_lists))
+        self.n_probe = max(1, int(n_probe))
+        self._lock = threading.RLock()
+
+        self._conn = sqlite3.connect(str(self.path / "index.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self._vectors: Optional[np.ndarray] = None
+        self._lists: Optional[np.ndarray] = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._row_ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self.centroids: Optional[np.ndarray] = None
+        # IVF: Zeilen [0, packed_size) nach Liste sortiert, _bounds = (starts, ends)
+        self.packed_size = 0
+        self._holes = 0
+        self._bounds = None
+
+        stored = self._meta("encoder")
+        if encoder and stored and stored != encoder:
+            logger.warning(f"Vector index {self.path}: encoder changed ({stored} -> {encoder}), index reset")
+            self._drop_files()
+            with self._conn:
+                self._conn.execute("DELETE FROM vectors")
+                self._conn.execute("DELETE FROM meta")
+        if encoder:
+            self._set_meta(encoder=encoder)
+        self._load()
+
+    # ----- Laden / Speicher -----
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, **values: Any) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(key, str(value)) for key, value in values.items()],
+            )
+
+    def _file(self, name: str) -> str:
+        return str(self.path / name)
+
+    def _drop_files(self) -> None:
+        for name in ("vectors.npy", "lists.npy", "centroids.npy"):
+            if os.path.exists(self._file(name)):
+                os.remove(self._file(name))
+
+    def _load(self) -> None:
+        dim = self._meta("dim")
+        self.dim: Optional[int] = int(dim) if dim else None
+        self.size = int(self._meta("size") or 0)
+        if self.dim is None:
+            return
+
+        self._vectors = np.load(self._file("vectors.npy"), mmap_mode="r+")
+        self._lists = np.load(self._file("lists.npy"), mmap_mode="r+")
+        capacity = self._vectors.shape[0]
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._row_ids = [None] * capacity
+        for vector_id, row in self._conn.execute("SELECT id, row FROM vectors"):
+            self._rows[vector_id] = row
+            self._row_ids[row] = vector_id
+            self._alive[row] = True
+        if os.path.exists(self._file("centroids.npy")):
+            self.centroids = np.load(self._file("centroids.npy"))
+            self.packed_size = int(self._meta("packed_size") or 0)
+            self._holes = int(self.packed_size - self._alive[:self.packed_size].sum())
+            self._compute_bounds()
+        self._free = [
+            row for row in range(self.size - 1, self.packed_size - 1, -1) if not self._alive[row]
+        ]
+
+    def _create(self, dim: int) -> None:
+        self.dim = dim
+        self._vectors = np.lib.format.open_memmap(
+            self._file("vectors.npy"), mode="w+", dtype=np.float32, shape=(_MIN_CAPACITY, dim)
+        )
+        self._lists = np.lib.format.open_memmap(
+            self._file("lists.npy"), mode="w+", dtype=np.int32, shape=(_MIN_CAPACITY,)
+        )
+        self._lists[:] = -1
+        self._alive = np.zeros(_MIN_CAPACITY, dtype=bool)
+        self._row_ids = [None] * _MIN_CAPACITY
+        self._set_meta(dim=dim, size=0)
+
+    def _grow(self, needed: int) -> None:
+        """Sorge für Platz für needed weitere Zeilen (Verdopplung)"""
+        capacity = self._vectors.shape[0]
+        if self.size + needed <= capacity:
+            return
+        new_capacity = max(_MIN_CAPACITY, capacity * 2, self.size + needed)
+        self._vectors = self._regrow("vectors.npy", self._vectors, (new_capacity, self.dim), 0.0)
+        self._lists = self._regrow("lists.npy", self._lists, (new_capacity,), -1)
+        self._alive = np.concatenate([self._alive, np.zeros(new_capacity - capacity, dtype=bool)])
+        self._row_ids.extend([None] * (new_capacity - capacity))
+
+    def _regrow(self, name: str, old: np.ndarray, shape, fill) -> np.ndarray:
+        tmp = self._file(name + ".tmp")
+        new = np.lib.format.open_memmap(tmp, mode="w+", dtype=old.dtype, shape=shape)
+        new[:self.size] = old[:self.size]
+        new[self.size:] = fill
+        new.flush()
+        del new, old
+        os.replace(tmp, self._file(name))
+        return np.load(self._file(name), mmap_mode="r+")
+
+    # ----- Schreiben (ChromaDB-kompatibel) -----
+    def upsert(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        documents: Optional[Sequence[str]] = None,
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        """Schreibe Vektoren (vorhandene ids werden überschrieben)"""
+        if not ids:
+            return
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1))
+        documents = documents or [None] * len(ids)
+        metadatas = metadatas or [None] * len(ids)
+        # Doppelte ids: letzter Eintrag gewinnt
+        latest = list({vector_id: i for i, vector_id in enumerate(ids)}.values())
+
+        with self._lock:
+            if self.dim is None:
+                self._create(vectors.shape[1])
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} != index dimension {self.dim}")
+
+            batch = vectors[latest]
+            labels = (
+                self._assign(batch) if self.centroids is not None
+                else np.full(len(latest), -1, dtype=np.int32)
+            )
+            # Gepackte Zeilen, deren Liste sich ändert, wandern in den Anhang
+            targets, moved = [], []
+            for i, label in zip(latest, labels):
+                row = self._rows.get(ids[i])
+                if row is not None and row < self.packed_size and label != self._lists[row]:
+                    moved.append(row)
+                    row = None
+                targets.append(row)
+            self._grow(max(0, sum(row is None for row in targets) - len(self._free)))
+            self._release(moved)
+
+            rows = []
+            for i, row in zip(latest, targets):
+                if row is None:
+                    row = self._free.pop() if self._free else self.size
+                    self.size = max(self.size, row + 1)
+                    self._rows[ids[i]] = row
+                    self._row_ids[row] = ids[i]
+                rows.append(row)
+
+            self._vectors[rows] = batch
+            self._lists[rows] = labels
+            self._alive[rows] = True
+            self._vectors.flush()
+            self._lists.flush()
+
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO vectors (id, row, document, metadata) VALUES (?, ?, ?, ?)",
+                    [
+                        (ids[i], row, documents[i], json.dumps(metadatas[i]) if metadatas[i] is not None else None)
+                        for i, row in zip(latest, rows)
+                    ],
+                )
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('size', ?)", (str(self.size),))
+            self.maintain()
+
+    def add(self, ids, embeddings, documents=None, metadatas=None) -> None:
+        """Wie upsert (vorhandene ids werden überschrieben)"""
+        self.upsert(ids, embeddings, documents, metadatas)
+
+    def update(self, ids, embeddings, documents=None, metadatas=None) -> None:
+        """Wie upsert, aber nur für vorhandene ids"""
+        with self._lock:
+            keep = [i for i, vector_id in enumerate(ids) if vector_id in self._rows]
+            if keep:
+                self.upsert(
+                    [ids[i] for i in keep],
+                    [embeddings[i] for i in keep],
+                    [documents[i] for i in keep] if documents else None,
+                    [metadatas[i] for i in keep] if metadatas else None,
+                )
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """Entferne Vektoren; ihre Zeilen werden wiederverwendet"""
+        with self._lock:
+            rows = [self._rows.pop(vector_id) for vector_id in ids if vector_id in self._rows]
+            if not rows:
+                return
+            self._release(rows)
+            self._vectors.flush()
+            self._lists.flush()
+            with self._conn:
+                self._conn.executemany("DELETE FROM vectors WHERE row = ?", [(row,) for row in rows])
+            self.maintain()
+
+    def _release(self, rows: List[int]) -> None:
+        """Markiere Zeilen als frei (gepackte Zeilen behalten ihre Liste als Loch)"""
+        for row in rows:
+            self._vectors[row] = 0.0
+            self._alive[row] = False
+            self._row_ids[row] = None
+            if row < self.packed_size:
+                self._holes += 1
+            else:
+                self._lists[row] = -1
+                self._free.append(row)
+
+    def count(self) -> int:
+        return len(self._rows)
+
+    # ----- Suche -----
+    def query(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, List[List[Any]]]:
+        """Top-k je Anfrage-Vektor (Format wie ChromaDB Collection.query)
+
+        where filtert wie bei ChromaDB auf gleiche Metadatenwerte
+        ({"domain": "vpb"}); gesucht wird dann exakt über die passenden Zeilen.
+        """
+        result: Dict[str, List[List[Any]]] = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        with self._lock:
+            queries = np.asarray(query_embeddings, dtype=np.float32)
+            if not self._rows or n_results <= 0:
+                for key in result:
+                    result[key] = [[] for _ in range(len(queries))]
+                return result
+
+            queries = _normalize(queries.reshape(len(queries), self.dim))
+            hits = []
+            if where:
+                rows = self._rows_where(where)
+                matrix = self._vectors.view(np.ndarray)
+                for query in queries:
+                    hits.append(self._top_k(rows, matrix[rows] @ query, n_results))
+            elif self.centroids is not None and self.n_probe < len(self.centroids):
+                for query in queries:
+                    hits.append(self._search_ivf(query, n_results))
+            else:
+                scores = self._vectors[:self.size] @ queries.T
+                scores[~self._alive[:self.size]] = -np.inf
+                for column in scores.T:
+                    hits.append(self._top_k(np.arange(self.size), column, n_results))
+
+            stored = self._fetch([self._row_ids[row] for rows, _ in hits for row in rows])
+            for rows, similarities in hits:
+                ids = [self._row_ids[row] for row in rows]
+                result["ids"].append(ids)
+                result["documents"].append([stored[i][0] for i in ids])
+                result["metadatas"].append([stored[i][1] for i in ids])
+                result["distances"].append([float(1.0 - s) for s in similarities])
+        return result
+
+    @staticmethod
+    def _top_k(rows: np.ndarray, scores: np.ndarray, k: int):
+        valid = int(np.isfinite(scores).sum())
+        k = min(k, valid)
+        if k == 0:
+            return [], []
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")][:k]
+        return rows[top].tolist(), scores[top].tolist()
+
+    def _search_ivf(self, query: np.ndarray, k: int):
+        starts, ends = self._bounds
+        probe = np.argpartition(-(self.centroids @ query), self.n_probe - 1)[:self.n_probe]
+        # ndarray-Sicht spart den memmap-Overhead je Slice
+        matrix = self._vectors.view(np.ndarray)
+        rows, scores = [], []
+        for l in probe:
+            start, end = starts[l], ends[l]
+            if end > start:
+                block = matrix[start:end] @ query
+                block[~self._alive[start:end]] = -np.inf
+                rows.append(np.arange(start, end))
+                scores.append(block)
+        if self.size > self.packed_size:
+            tail = self.packed_size + np.flatnonzero(np.isin(self._lists[self.packed_size:self.size], probe))
+            rows.append(tail)
+            scores.append(matrix[tail] @ query)
+        if not rows:
+            return [], []
+        return self._top_k(np.concatenate(rows), np.concatenate(scores), k)
+
+    def _rows_where(self, where: Dict[str, Any]) -> np.ndarray:
+        clauses = " AND ".join("json_extract(metadata, ?) = ?" for _ in where)
+        params = [param for key, value in where.items() for param in (f"$.{key}", value)]
+        rows = [row for (row,) in self._conn.execute(f"SELECT row FROM vectors WHERE {clauses}", params)]
+        return np.asarray(sorted(rows), dtype=np.int64)
+
+    def _compute_bounds(self) -> None:
+        packed = np.asarray(self._lists[:self.packed_size])
+        lists = np.arange(len(self.centroids))
+        self._bounds = (
+            np.searchsorted(packed, lists, side="left"),
+            np.searchsorted(packed, lists, side="right"),
+        )
+
+    def _fetch(self, ids: List[str]) -> Dict[str, tuple]:
+        found = {}
+        unique = list(dict.fromkeys(ids))
+        for start in range(0, len(unique), _SQL_CHUNK):
+            chunk = unique[start:start + _SQL_CHUNK]
+            for vector_id, document, metadata in self._conn.execute(
+                f"SELECT id, document, metadata FROM vectors WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ):
+                found[vector_id] = (document, json.loads(metadata) if metadata else None)
+        return found
+
+    # ----- IVF -----
+    def maintain(self) -> bool:
+        """
+        Trainiere IVF, sobald genug Vektoren vorhanden sind, bzw. packe neu,
+        wenn Anhang und Löcher über _REPACK_RATIO liegen (Schreibpfad)
+
+        Returns:
+            True wenn die Dateien neu geschrieben wurden
+        """
+        with self._lock:
+            if (
+                self.n_lists and self.centroids is None
+                and len(self._rows) >= self.n_lists * _AUTO_TRAIN_PER_LIST
+            ):
+                return self.build_ivf() > 0
+            if (
+                self.centroids is not None
+                and self.size - self.packed_size + self._holes > _REPACK_RATIO * self.packed_size
+            ):
+                self._pack()
+                return True
+            return False
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, seed: int = 0) -> int:
+        """
+        Trainiere IVF-Zentroide (sphärisches k-means auf einer Stichprobe)
+        und ordne alle Zeilen ihrer Liste zu
+
+        Returns:
+            Anzahl Listen
+        """
+        with self._lock:
+            alive = np.flatnonzero(self._alive[:self.size])
+            n_lists = min(n_lists or self.n_lists, len(alive))
+            if n_lists < 2:
+                return 0
+            rng = np.random.default_rng(seed)
+            sample = np.sort(rng.choice(alive, size=min(len(alive), n_lists * _TRAIN_PER_LIST), replace=False))
+            data = np.asarray(self._vectors[sample])
+            centroids = data[rng.choice(len(data), size=n_lists, replace=False)].copy()
+            for _ in range(iterations):
+                labels = np.argmax(data @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, data)
+                filled = np.bincount(labels, minlength=n_lists) > 0
+                centroids[filled] = _normalize(sums[filled])
+
+            self.centroids = centroids
+            self.n_lists = n_lists
+            np.save(self._file("centroids.npy"), centroids)
+            for start in range(0, len(alive), _ASSIGN_CHUNK):
+                rows = alive[start:start + _ASSIGN_CHUNK]
+                self._lists[rows] = self._assign(np.asarray(self._vectors[rows]))
+            self._pack()
+            self._set_meta(n_lists=n_lists)
+            logger.info(f"Vector index {self.path}: IVF trained ({n_lists} lists, {len(alive)} vectors)")
+            return n_lists
+
+    def _pack(self) -> None:
+        """Sortiere alle Zeilen nach IVF-Liste um (neue Dateien, ids neu zugeordnet)"""
+        alive = np.flatnonzero(self._alive[:self.size])
+        order = alive[np.argsort(np.asarray(self._lists[alive]), kind="stable")]
+        n = len(order)
+        capacity = self._vectors.shape[0]
+
+        vectors = np.lib.format.open_memmap(
+            self._file("vectors.npy.tmp"), mode="w+", dtype=np.float32, shape=(capacity, self.dim)
+        )
+        lists = np.lib.format.open_memmap(
+            self._file("lists.npy.tmp"), mode="w+", dtype=np.int32, shape=(capacity,)
+        )
+        for start in range(0, n, _ASSIGN_CHUNK):
+            rows = order[start:start + _ASSIGN_CHUNK]
+            vectors[start:start + len(rows)] = self._vectors[rows]
+            lists[start:start + len(rows)] = self._lists[rows]
+        vectors[n:] = 0.0
+        lists[n:] = -1
+        vectors.flush()
+        lists.flush()
+        del vectors, lists
+        self._vectors = self._lists = None
+        for name in ("vectors.npy", "lists.npy"):
+            os.replace(self._file(name + ".tmp"), self._file(name))
+        self._vectors = np.load(self._file("vectors.npy"), mmap_mode="r+")
+        self._lists = np.load(self._file("lists.npy"), mmap_mode="r+")
+
+        ids = [self._row_ids[row] for row in order]
+        self._row_ids = ids + [None] * (capacity - n)
+        self._rows = {vector_id: row for row, vector_id in enumerate(ids)}
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._alive[:n] = True
+        self._free = []
+        self.size = self.packed_size = n
+        self._holes = 0
+        self._compute_bounds()
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE vectors SET row = ? WHERE id = ?", [(row, vector_id) for row, vector_id in enumerate(ids)]
+            )
+            self._set_meta(size=n, packed_size=n)
+
+    # ----- Verwaltung -----
+    def close(self) -> None:
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._lists.flush()
+            self._vectors = self._lists = None
+            self._conn.close()
+
+
+__all__ = ['HashingEncoder', 'LocalVectorIndex']
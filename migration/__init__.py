@@ -3,7 +3,8 @@ Migration Infrastructure for VPB SQLite → UDS3 Polyglot
 Version: 1.0.0
 """
 
-from .migration_tool import VPBMigrationTool, MigrationConfig, MigrationResult
+from .migration_tool import VPBMigrationTool, MigrationConfig, MigrationResult, MigrationProgress
+from .checkpoint import MigrationCheckpoint
 from .gap_detector import GapDetector, DataGap, GapType
 from .validation import DataValidator, ValidationResult
 
@@ -11,6 +12,8 @@ __all__ = [
     'VPBMigrationTool',
     'MigrationConfig',
     'MigrationResult',
+    'MigrationProgress',
+    'MigrationCheckpoint',
     'GapDetector',
     'DataGap',
     'GapType',
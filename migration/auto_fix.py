@@ -27,6 +27,7 @@ if uds3_path.exists() and str(uds3_path) not in sys.path:
     sys.path.insert(0, str(uds3_path))
 
 from .gap_detector import GapDetector, DataGap, GapType
+from .validation import process_document
 
 logger = logging.getLogger(__name__)
 
@@ -150,6 +151,11 @@ class AutoFixEngine:
     def _init_uds3_connection(self):
         """Initialisiert UDS3 Connection (lazy)"""
         if self._uds3_manager is None:
+            # Dieselbe UDS3-Seite, gegen die der GapDetector verglichen hat
+            self._uds3_manager = self.gap_detector.uds3_manager
+            if self._uds3_manager is not None:
+                return
+            
             try:
                 from core.polyglot_manager import UDS3PolyglotManager, create_uds3_manager
                 
@@ -319,18 +325,12 @@ class AutoFixEngine:
         if not gap.source_data:
             raise ValueError("Source data missing for COPY_FROM_SOURCE")
         
-        # Parse process_data wenn JSON string
-        process_data = gap.source_data.get('process_data')
-        if isinstance(process_data, str):
-            process_data = json.loads(process_data)
-        
-        # Merge alle Daten
+        # Gleiches Dokument wie die Migration (Checksums stimmen danach überein)
         full_data = {
-            'process_id': gap.source_data.get('process_id'),
-            'name': gap.source_data.get('name'),
-            'description': gap.source_data.get('description'),
-            'version': gap.source_data.get('version', 1),
-            **process_data
+            'version': 1,
+            **process_document(gap.source_data),
+            'migrated_from': 'sqlite',
+            'migration_timestamp': datetime.now().isoformat()
         }
         
         # Save to UDS3
@@ -344,10 +344,11 @@ class AutoFixEngine:
     
     def _fix_delete_from_target(self, gap: DataGap):
         """Löscht Orphaned Record aus UDS3"""
-        # UDS3 delete functionality
-        # Note: Benötigt delete_process() method in UDS3PolyglotManager
-        logger.warning(f"DELETE not yet implemented for UDS3 - skipping {gap.record_id}")
-        raise NotImplementedError("UDS3 delete_process() not available")
+        # Soft Delete über SAGA (PostgreSQL, Neo4j, ChromaDB)
+        if not self._uds3_manager.delete_process(gap.record_id, domain="vpb_auto_fix"):
+            raise RuntimeError(f"UDS3 delete_process failed for {gap.record_id}")
+        
+        logger.debug(f"Deleted orphaned record {gap.record_id} from UDS3")
     
     def _fix_update_target(self, gap: DataGap):
         """Updated Record in UDS3 mit vollständigen Daten"""
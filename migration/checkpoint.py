@@ -0,0 +1,114 @@
+"""
+Migration Checkpoints - Resume abgebrochener Migrationen je Tabelle
+Autor: UDS3 Development Team
+Datum: 18. Oktober 2025
+
+Der Checkpoint einer Tabelle ist der letzte Keyset-Schlüssel, bis zu dem
+alle Batches geschrieben sind. Da Writer-Threads Batches in beliebiger
+Reihenfolge abschließen, rückt CommitWatermark den Schlüssel nur über
+lückenlos abgeschlossene Batches vor.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+class MigrationCheckpoint:
+    """
+    Checkpoints je Tabelle als JSON-Datei (atomar per os.replace geschrieben)
+
+    Format:
+        {"version": 1, "source": "<sqlite>", "tables": {
+            "vpb_processes": {"last_key": "...", "migrated": 500,
+                              "completed": false, "updated_at": "..."}}}
+
+    Gehört die Datei zu einer anderen Quelldatenbank, wird sie ignoriert.
+    """
+
+    def __init__(self, path: str, source: str = ""):
+        self.path = Path(path)
+        self.source = source
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Checkpoint {self.path} unreadable - starting fresh: {e}")
+            return
+        if data.get('version') != CHECKPOINT_VERSION or data.get('source', '') != self.source:
+            logger.warning(f"⚠️  Checkpoint {self.path} belongs to another source - ignored")
+            return
+        self._tables = data.get('tables', {})
+
+    def _save(self):
+        data = {'version': CHECKPOINT_VERSION, 'source': self.source, 'tables': self._tables}
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+
+    def get(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Checkpoint einer Tabelle (last_key, migrated, completed) oder None"""
+        with self._lock:
+            entry = self._tables.get(table_name)
+            return dict(entry) if entry else None
+
+    def update(self, table_name: str, last_key: Any, migrated: int, completed: bool = False):
+        """Speichert den Fortschritt einer Tabelle"""
+        with self._lock:
+            self._tables[table_name] = {
+                'last_key': last_key,
+                'migrated': migrated,
+                'completed': completed,
+                'updated_at': datetime.now().isoformat()
+            }
+            self._save()
+
+    def clear(self, table_name: Optional[str] = None):
+        """Entfernt den Checkpoint einer Tabelle (None = alle)"""
+        with self._lock:
+            if table_name is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(table_name, None)
+            self._save()
+
+
+class CommitWatermark:
+    """
+    Höchster Schlüssel, bis zu dem alle Batches abgeschlossen sind
+
+    Batches werden in Lesereihenfolge nummeriert (seq 0, 1, ...). complete()
+    liefert (last_key, migrated) sobald die Watermark vorrückt, sonst None.
+    Nicht abgeschlossene (fehlgeschlagene) Batches halten sie dauerhaft an.
+    """
+
+    def __init__(self, last_key: Any = None, migrated: int = 0):
+        self.last_key = last_key
+        self.migrated = migrated
+        self._next_seq = 0
+        self._pending: Dict[int, Tuple[Any, int]] = {}
+
+    def complete(self, seq: int, last_key: Any, count: int) -> Optional[Tuple[Any, int]]:
+        self._pending[seq] = (last_key, count)
+        if seq != self._next_seq:
+            return None
+        while self._next_seq in self._pending:
+            key, batch_count = self._pending.pop(self._next_seq)
+            self.last_key = key
+            self.migrated += batch_count
+            self._next_seq += 1
+        return self.last_key, self.migrated
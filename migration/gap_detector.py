@@ -6,17 +6,21 @@ Datum: 18. Oktober 2025
 
 import sys
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Iterable, Iterator, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
+import json
 import logging
+import sqlite3
 
 # UDS3 Path hinzufügen
 uds3_path = Path(__file__).parent.parent.parent / "uds3"
 if uds3_path.exists() and str(uds3_path) not in sys.path:
     sys.path.insert(0, str(uds3_path))
 
+from .validation import DataValidator, process_document
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,6 +63,45 @@ class DataGap:
         }
 
 
+def merge_sorted(
+    source: Iterable[Tuple[str, Any]],
+    target: Iterable[Tuple[str, Any]]
+) -> Iterator[Tuple[str, Optional[Any], Optional[Any]]]:
+    """
+    Sorted-Merge zweier nach ID aufsteigend sortierter Streams
+    
+    Liefert (id, source_item, target_item); fehlt die ID auf einer Seite,
+    ist das Item dort None. IDs werden als Strings verglichen; ist ein
+    Stream nicht sortiert, wird ValueError geworfen.
+    """
+    source_iter, target_iter = iter(source), iter(target)
+    end = (None, None)
+    s_id, s_item = next(source_iter, end)
+    t_id, t_item = next(target_iter, end)
+    last_s = last_t = None
+    
+    while s_id is not None or t_id is not None:
+        s_key = str(s_id) if s_id is not None else None
+        t_key = str(t_id) if t_id is not None else None
+        if (s_key is not None and last_s is not None and s_key < last_s) or \
+                (t_key is not None and last_t is not None and t_key < last_t):
+            raise ValueError("merge_sorted: input streams must be sorted by id")
+        
+        if t_key is None or (s_key is not None and s_key < t_key):
+            yield s_key, s_item, None
+            last_s = s_key
+            s_id, s_item = next(source_iter, end)
+        elif s_key is None or t_key < s_key:
+            yield t_key, None, t_item
+            last_t = t_key
+            t_id, t_item = next(target_iter, end)
+        else:
+            yield s_key, s_item, t_item
+            last_s = last_t = s_key
+            s_id, s_item = next(source_iter, end)
+            t_id, t_item = next(target_iter, end)
+
+
 class GapDetector:
     """
     Detector für Daten-Lücken zwischen SQLite und UDS3
@@ -91,6 +134,10 @@ class GapDetector:
         # Lazy loading für UDS3
         self._uds3_manager = None
         self._sqlite_conn = None
+        # Ergebnis des SQLite↔UDS3 Abgleichs (je detect_all_gaps) und
+        # Anzahl nicht gelisteter Gaps je Typ (über max_gaps)
+        self._diff: Optional[Dict[GapType, List[DataGap]]] = None
+        self.truncated: Dict[str, int] = {}
     
     def detect_all_gaps(self) -> List[DataGap]:
         """
@@ -101,6 +148,8 @@ class GapDetector:
         """
         logger.info("🔍 Starting comprehensive gap detection...")
         self.gaps = []
+        self._diff = None
+        self.truncated = {}
         
         try:
             # 1. Missing Records Detection
@@ -130,36 +179,20 @@ class GapDetector:
         return self.gaps
     
     def _detect_missing_records(self):
-        """Detektiert Records die in SQLite aber nicht in UDS3 sind"""
+        """Detektiert Records die in SQLite aber nicht in UDS3 sind (und abweichende Checksums)"""
         logger.info("  Checking for missing records...")
         
         try:
-            import sqlite3
+            diff = self._uds3_diff()
+            if diff is None:
+                return
             
-            with sqlite3.connect(self.sqlite_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                # VPB Processes prüfen
-                cursor.execute("SELECT process_id, name FROM vpb_processes")
-                sqlite_processes = cursor.fetchall()
-                
-                logger.info(f"    Found {len(sqlite_processes)} processes in SQLite")
-                
-                # TODO: Mit UDS3 abgleichen (wenn UDS3 verfügbar)
-                # Für jetzt: Mock Gap für Demo
-                if len(sqlite_processes) > 0:
-                    sample = sqlite_processes[0]
-                    gap = DataGap(
-                        gap_type=GapType.MISSING_RECORD,
-                        table_name="vpb_processes",
-                        record_id=sample['process_id'],
-                        description=f"Process '{sample['name']}' exists in SQLite but not in UDS3",
-                        source_data={'process_id': sample['process_id'], 'name': sample['name']},
-                        severity="high",
-                        auto_fixable=True
-                    )
-                    # self.gaps.append(gap)  # Nur hinzufügen wenn wirklich missing
+            self.gaps.extend(diff[GapType.MISSING_RECORD])
+            self.gaps.extend(diff[GapType.INCOMPLETE_MIGRATION])
+            logger.info(
+                f"    {len(diff[GapType.MISSING_RECORD])} missing, "
+                f"{len(diff[GapType.INCOMPLETE_MIGRATION])} checksum mismatches"
+            )
                 
         except Exception as e:
             logger.warning(f"    ⚠️  Missing records detection failed: {e}")
@@ -168,9 +201,139 @@ class GapDetector:
         """Detektiert Records die in UDS3 aber nicht in SQLite sind"""
         logger.info("  Checking for orphaned records...")
         
-        # TODO: UDS3 Query Implementation
-        # Für jetzt: Placeholder
-        pass
+        try:
+            diff = self._uds3_diff()
+            if diff is None:
+                return
+            
+            self.gaps.extend(diff[GapType.ORPHANED_RECORD])
+            logger.info(f"    {len(diff[GapType.ORPHANED_RECORD])} orphaned records")
+                
+        except Exception as e:
+            logger.warning(f"    ⚠️  Orphaned records detection failed: {e}")
+    
+    def _get_uds3_manager(self):
+        """
+        UDS3-Seite für den Abgleich (lazy)
+        
+        uds3_config['manager'] = bereits laufender Manager bzw. ein Objekt
+        mit iter_processes(batch_size); sonst create_uds3_manager(). Ist
+        PostgreSQL nicht erreichbar, gibt es keinen Abgleich (None).
+        """
+        if self._uds3_manager is None:
+            manager = self.uds3_config.get('manager')
+            
+            if manager is None:
+                try:
+                    from core.polyglot_manager import create_uds3_manager
+                    manager = create_uds3_manager()
+                    if not manager.postgresql.ensure_connected():
+                        logger.info("    UDS3 (PostgreSQL) not reachable - skipping SQLite↔UDS3 diff")
+                        return None
+                except ImportError as e:
+                    logger.info(f"    UDS3 Manager not available - skipping SQLite↔UDS3 diff: {e}")
+                    return None
+            
+            self._uds3_manager = manager
+        
+        return self._uds3_manager
+    
+    @property
+    def uds3_manager(self):
+        """UDS3-Seite des Abgleichs (None wenn nicht erreichbar), z.B. für AutoFixEngine"""
+        return self._get_uds3_manager()
+    
+    def _uds3_diff(self) -> Optional[Dict[GapType, List[DataGap]]]:
+        """
+        SQLite ↔ UDS3 Abgleich für vpb_processes (einmal je detect_all_gaps)
+        
+        Beide Seiten werden nach process_id sortiert gestreamt (SQLite-Cursor,
+        UDS3 iter_processes) und per Sorted-Merge verglichen; je Record wird
+        nur die Checksum (DataValidator._calculate_checksum_filtered über das
+        Prozessdokument) gehalten. Speicher: ein Record je Seite plus die
+        gefundenen Gaps.
+        """
+        if self._diff is not None:
+            return self._diff
+        
+        manager = self._get_uds3_manager()
+        if manager is None:
+            return None
+        
+        validator = DataValidator()
+        diff: Dict[GapType, List[DataGap]] = {
+            GapType.MISSING_RECORD: [],
+            GapType.ORPHANED_RECORD: [],
+            GapType.INCOMPLETE_MIGRATION: [],
+        }
+        batch_size = int(self.uds3_config.get('batch_size', 1000))
+        # Obergrenze je Gap-Typ (z.B. frische Ziel-DB: alles fehlt);
+        # darüber hinaus wird nur gezählt
+        max_gaps = int(self.uds3_config.get('max_gaps', 10000))
+        compared = 0
+        
+        def add(gap: DataGap):
+            if len(diff[gap.gap_type]) < max_gaps:
+                diff[gap.gap_type].append(gap)
+            else:
+                key = gap.gap_type.value
+                self.truncated[key] = self.truncated.get(key, 0) + 1
+        
+        with sqlite3.connect(self.sqlite_path) as conn:
+            conn.row_factory = sqlite3.Row
+            source = conn.execute("SELECT * FROM vpb_processes ORDER BY process_id")
+            target = manager.iter_processes(batch_size=batch_size)
+            
+            for process_id, row, target_doc in merge_sorted(
+                ((row['process_id'], row) for row in source),
+                ((doc['process_id'], doc) for doc in target)
+            ):
+                if target_doc is None:
+                    add(DataGap(
+                        gap_type=GapType.MISSING_RECORD,
+                        table_name="vpb_processes",
+                        record_id=process_id,
+                        description=f"Process '{row['name']}' exists in SQLite but not in UDS3",
+                        source_data=dict(row),
+                        severity="high",
+                        auto_fixable=True
+                    ))
+                    continue
+                
+                if row is None:
+                    add(DataGap(
+                        gap_type=GapType.ORPHANED_RECORD,
+                        table_name="vpb_processes",
+                        record_id=process_id,
+                        description=f"Process '{target_doc.get('name')}' exists in UDS3 but not in SQLite",
+                        target_data={'process_id': process_id, 'name': target_doc.get('name')},
+                        severity="medium",
+                        auto_fixable=True
+                    ))
+                    continue
+                
+                compared += 1
+                try:
+                    source_checksum = validator._calculate_checksum_filtered(process_document(dict(row)))
+                except json.JSONDecodeError:
+                    continue  # korruptes JSON meldet _detect_data_corruption
+                
+                if source_checksum != validator._calculate_checksum_filtered(target_doc):
+                    add(DataGap(
+                        gap_type=GapType.INCOMPLETE_MIGRATION,
+                        table_name="vpb_processes",
+                        record_id=process_id,
+                        description="Checksum mismatch between SQLite and UDS3",
+                        source_data=dict(row),
+                        severity="medium",
+                        auto_fixable=True
+                    ))
+        
+        logger.info(f"    Compared {compared} processes present on both sides")
+        for gap_type, count in self.truncated.items():
+            logger.warning(f"    ⚠️  {count} further {gap_type} gaps not listed (max_gaps={max_gaps})")
+        self._diff = diff
+        return diff
     
     def _detect_schema_mismatches(self):
         """Detektiert Schema-Unterschiede"""
@@ -197,31 +360,26 @@ class GapDetector:
             logger.warning(f"    ⚠️  Schema mismatch detection failed: {e}")
     
     def _detect_data_corruption(self):
-        """Detektiert korrupte Daten"""
+        """Detektiert korrupte Daten (process_data-JSON, gestreamt)"""
         logger.info("  Checking for data corruption...")
         
         try:
-            import sqlite3
-            
             with sqlite3.connect(self.sqlite_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                # JSON Fields validieren
-                cursor.execute("SELECT process_id, process_data FROM vpb_processes")
-                processes = cursor.fetchall()
+                # JSON Fields validieren (Cursor-Iteration statt fetchall)
+                cursor = conn.execute("SELECT process_id, process_data FROM vpb_processes")
                 
+                checked = 0
                 corrupted_count = 0
-                for proc in processes:
+                for process_id, process_data in cursor:
+                    checked += 1
                     try:
-                        import json
-                        json.loads(proc['process_data'])
-                    except json.JSONDecodeError:
+                        json.loads(process_data)
+                    except (json.JSONDecodeError, TypeError):
                         corrupted_count += 1
                         gap = DataGap(
                             gap_type=GapType.DATA_CORRUPTION,
                             table_name="vpb_processes",
-                            record_id=proc['process_id'],
+                            record_id=process_id,
                             description=f"Corrupted JSON in process_data field",
                             severity="critical",
                             auto_fixable=False
@@ -231,7 +389,7 @@ class GapDetector:
                 if corrupted_count > 0:
                     logger.warning(f"    ⚠️  Found {corrupted_count} corrupted records")
                 else:
-                    logger.info(f"    ✅ No corruption detected in {len(processes)} records")
+                    logger.info(f"    ✅ No corruption detected in {checked} records")
                 
         except Exception as e:
             logger.warning(f"    ⚠️  Data corruption detection failed: {e}")
@@ -325,6 +483,7 @@ class GapDetector:
                 for severity in ['low', 'medium', 'high', 'critical']
             },
             'auto_fixable': len(self.get_auto_fixable_gaps()),
+            'truncated': dict(self.truncated),
             'gaps': [g.to_dict() for g in self.gaps],
             'generated_at': datetime.now().isoformat()
         }
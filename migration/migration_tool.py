@@ -8,30 +8,44 @@ Features:
 - Gap Detection Integration
 - Data Validation Integration
 - Rollback Support
-- Progress Tracking
+- Progress Tracking (Durchsatz, ETA)
 - Dry-Run Mode
+- Keyset-Pagination, begrenzte Queue, parallele Writer mit Bulk-APIs
+- Resumable Checkpoints je Tabelle
 """
 
 import sys
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 import logging
 import json
+import queue
 import sqlite3
+import threading
+import time
 
 # UDS3 Path hinzufügen
 uds3_path = Path(__file__).parent.parent.parent / "uds3"
 if uds3_path.exists() and str(uds3_path) not in sys.path:
     sys.path.insert(0, str(uds3_path))
 
+from .checkpoint import CommitWatermark, MigrationCheckpoint
 from .gap_detector import GapDetector, DataGap
-from .validation import DataValidator, ValidationResult
+from .validation import DataValidator, ValidationResult, process_document
 
 logger = logging.getLogger(__name__)
 
+# Tabellen in Migrationsreihenfolge → Schlüsselspalte (Keyset-Pagination)
+MIGRATION_TABLES = {
+    "vpb_processes": "process_id",
+    "vpb_elements": "element_id",
+    "vpb_connections": "connection_id",
+    "vpb_metadata": "metadata_id",
+}
+
 
 class MigrationStatus(Enum):
     """Status einer Migration"""
@@ -53,6 +67,40 @@ class MigrationConfig:
     enable_validation: bool = True
     enable_rollback: bool = True
     continue_on_error: bool = False
+    # Pipeline: Writer-Threads und max. Batches in der Queue
+    # (Speicherobergrenze: queue_size + writer_workers Batches)
+    writer_workers: int = 4
+    queue_size: int = 8
+    # Checkpoint-Datei (JSON) für Resume je Tabelle; None = ohne Checkpoints
+    checkpoint_path: Optional[str] = None
+
+
+@dataclass
+class MigrationProgress:
+    """Fortschritt der aktuellen Tabelle (Durchsatz und ETA)"""
+    table_name: str
+    processed: int
+    total: int
+    elapsed_seconds: float
+    
+    @property
+    def records_per_second(self) -> float:
+        return self.processed / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+    
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.records_per_second
+        if rate <= 0:
+            return None
+        return max(0, self.total - self.processed) / rate
+    
+    def message(self) -> str:
+        eta = self.eta_seconds
+        eta_text = f"{eta:.0f}s" if eta is not None else "?"
+        return (
+            f"Migrating {self.table_name} ({self.processed}/{self.total}, "
+            f"{self.records_per_second:.0f} rec/s, ETA {eta_text})"
+        )
 
 
 @dataclass
@@ -63,6 +111,7 @@ class MigrationResult:
     migrated_records: int = 0
     failed_records: int = 0
     skipped_records: int = 0
+    resumed_records: int = 0
     gaps_detected: List[DataGap] = field(default_factory=list)
     validation_results: List[ValidationResult] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
@@ -79,6 +128,7 @@ class MigrationResult:
             'migrated_records': self.migrated_records,
             'failed_records': self.failed_records,
             'skipped_records': self.skipped_records,
+            'resumed_records': self.resumed_records,
             'success_rate': (self.migrated_records / self.total_records * 100) if self.total_records > 0 else 0,
             'gaps_detected': len(self.gaps_detected),
             'validation_results': len(self.validation_results),
@@ -86,7 +136,9 @@ class MigrationResult:
             'warnings': self.warnings,
             'started_at': self.started_at.isoformat() if self.started_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'duration_seconds': self.duration_seconds
+            'duration_seconds': self.duration_seconds,
+            'records_per_second': (self.migrated_records - self.resumed_records) / self.duration_seconds
+            if self.duration_seconds > 0 else 0
         }
 
 
@@ -99,7 +151,9 @@ class VPBMigrationTool:
         result = tool.migrate()
         
     Features:
-    - Batch Processing mit konfigurierbarer Batch-Size
+    - Batch Processing mit konfigurierbarer Batch-Size (Keyset-Pagination)
+    - Parallele Writer-Threads mit Bulk-Writes (save_processes_bulk)
+    - Resume über Checkpoints je Tabelle (checkpoint_path)
     - Gap Detection vor und nach Migration
     - Data Validation nach jedem Batch
     - Rollback Support bei Fehlern
@@ -117,7 +171,9 @@ class VPBMigrationTool:
         
         Args:
             config: Migration Configuration
-            progress_callback: Callback für Progress Updates (current, total, message)
+            progress_callback: Callback für Progress Updates (current, total, message);
+                message enthält Durchsatz und ETA der aktuellen Tabelle.
+                Wird aus den Writer-Threads aufgerufen.
         """
         self.config = config
         self.progress_callback = progress_callback
@@ -130,6 +186,15 @@ class VPBMigrationTool:
         self.result = MigrationResult(status=MigrationStatus.PENDING)
         self._uds3_manager = None
         self._sqlite_conn = None
+        self.progress: Optional[MigrationProgress] = None
+        self.table_stats: Dict[str, Dict[str, Any]] = {}
+        self._checkpoint: Optional[MigrationCheckpoint] = None
+        
+        if config.checkpoint_path:
+            self._checkpoint = MigrationCheckpoint(
+                config.checkpoint_path,
+                source=str(Path(config.source_db_path).resolve())
+            )
         
         # UDS3 Integration
         self._init_uds3_connection()
@@ -140,6 +205,11 @@ class VPBMigrationTool:
             logger.info("🔧 Dry-Run Mode: Skipping UDS3 connection")
             return
         
+        # Bereits laufender Manager (z.B. aus dem API-Prozess)
+        if self.config.target_config.get('manager') is not None:
+            self._uds3_manager = self.config.target_config['manager']
+            return
+        
         try:
             # Import UDS3 Manager
             from core.polyglot_manager import UDS3PolyglotManager, create_uds3_manager
@@ -230,33 +300,13 @@ class VPBMigrationTool:
             self._sqlite_conn.row_factory = sqlite3.Row
             cursor = self._sqlite_conn.cursor()
             
-            # 1. VPB Processes migrieren
-            self._migrate_table(
-                cursor=cursor,
-                table_name="vpb_processes",
-                id_column="process_id"
-            )
-            
-            # 2. VPB Elements migrieren
-            self._migrate_table(
-                cursor=cursor,
-                table_name="vpb_elements",
-                id_column="element_id"
-            )
-            
-            # 3. VPB Connections migrieren
-            self._migrate_table(
-                cursor=cursor,
-                table_name="vpb_connections",
-                id_column="connection_id"
-            )
-            
-            # 4. VPB Metadata migrieren
-            self._migrate_table(
-                cursor=cursor,
-                table_name="vpb_metadata",
-                id_column="metadata_id"
-            )
+            # Processes, Elements, Connections, Metadata (in dieser Reihenfolge)
+            for table_name, id_column in MIGRATION_TABLES.items():
+                self._migrate_table(
+                    cursor=cursor,
+                    table_name=table_name,
+                    id_column=id_column
+                )
             
         except Exception as e:
             logger.error(f"❌ Migration execution failed: {e}")
@@ -265,168 +315,418 @@ class VPBMigrationTool:
         finally:
             if self._sqlite_conn:
                 self._sqlite_conn.close()
+                self._sqlite_conn = None
+    
+    def migrate_table(
+        self,
+        table_name: str,
+        id_column: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Migriert eine einzelne Tabelle (ohne Gap Detection / Post-Validation)
+        
+        Args:
+            table_name: Tabellenname
+            id_column: Schlüsselspalte (Default aus MIGRATION_TABLES)
+            progress_callback: Callback je abgeschlossenem Batch
+                (batch_num, batch_size, table_name)
+        
+        Returns:
+            Dict mit success, total_records, successful_records,
+            failed_records, resumed_records, duration_seconds,
+            records_per_second und ggf. error
+        """
+        id_column = id_column or MIGRATION_TABLES.get(table_name, "id")
+        conn = sqlite3.connect(self.config.source_db_path)
+        conn.row_factory = sqlite3.Row
+        
+        try:
+            self._migrate_table(conn.cursor(), table_name, id_column, progress_callback)
+        except Exception as e:
+            logger.error(f"❌ Migration of {table_name} aborted: {e}")
+            stats = self.table_stats.setdefault(table_name, self._new_table_stats(table_name))
+            stats['error'] = str(e)
+        finally:
+            conn.close()
+        
+        stats = self.table_stats[table_name]
+        return {'success': stats['failed_records'] == 0 and not stats['error'], **stats}
     
     def _migrate_table(
         self,
         cursor: sqlite3.Cursor,
         table_name: str,
-        id_column: str
-    ):
+        id_column: str,
+        batch_callback: Optional[Callable[[int, int, str], None]] = None
+    ) -> Dict[str, Any]:
         """
-        Migriert eine Tabelle in Batches
+        Migriert eine Tabelle als Pipeline
+        
+        Der aufrufende Thread liest Batches per Keyset-Pagination
+        (WHERE key > ? ORDER BY key LIMIT ?) und legt sie in eine begrenzte
+        Queue; writer_workers Threads schreiben sie über die Bulk-APIs.
+        Im Speicher liegen höchstens queue_size + writer_workers Batches.
+        Nach jedem lückenlos abgeschlossenen Batch wird der Checkpoint der
+        Tabelle fortgeschrieben; ein erneuter Lauf setzt dort fort.
         
         Args:
             cursor: SQLite Cursor
             table_name: Tabellenname
-            id_column: ID-Spalte für Progress Tracking
+            id_column: Schlüsselspalte für Keyset-Pagination und Checkpoints
+            batch_callback: Callback je Batch (batch_num, batch_size, table_name)
+        
+        Returns:
+            Statistik der Tabelle (siehe migrate_table), auch in table_stats
         """
         logger.info(f"\n   📊 Migrating table: {table_name}")
+        stats = self.table_stats[table_name] = self._new_table_stats(table_name)
         
         try:
             # Record Count
             cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
             total = cursor.fetchone()[0]
+            stats['total_records'] = total
             
             if total == 0:
                 logger.info(f"      ⚠️  Table {table_name} is empty - skipping")
-                return
+                return stats
             
             logger.info(f"      Found {total} records")
             self.result.total_records += total
             
-            # Batch Processing
-            offset = 0
-            batch_num = 1
+            key_column = self._key_column(cursor, table_name, id_column)
+            checkpoint = self._checkpoint.get(table_name) if self._checkpoint else None
+            watermark = CommitWatermark()
             
-            while offset < total:
-                # Fetch Batch
-                cursor.execute(f"""
-                    SELECT * FROM {table_name}
-                    LIMIT {self.config.batch_size} OFFSET {offset}
-                """)
-                records = cursor.fetchall()
-                
-                if not records:
-                    break
-                
-                # Convert to Dict
-                batch_data = [dict(r) for r in records]
-                
-                logger.info(f"      Batch {batch_num}: {len(batch_data)} records (offset {offset})")
-                
-                # Dry-Run Check
-                if self.config.dry_run:
-                    logger.info(f"         🔧 DRY-RUN: Would migrate {len(batch_data)} records")
-                    self.result.migrated_records += len(batch_data)
-                else:
-                    # Migrate Batch
-                    migrated = self._migrate_batch(table_name, batch_data)
-                    self.result.migrated_records += migrated
-                
-                # Progress Callback
-                if self.progress_callback:
-                    self.progress_callback(
-                        self.result.migrated_records,
-                        self.result.total_records,
-                        f"Migrating {table_name}"
-                    )
-                
-                # Validation nach jedem Batch (wenn aktiviert)
-                if self.config.enable_validation and not self.config.dry_run:
-                    validation_result = self._validate_batch(table_name, batch_data)
-                    self.result.validation_results.append(validation_result)
-                    
-                    if not validation_result.is_valid and not self.config.continue_on_error:
-                        raise Exception(f"Validation failed for batch {batch_num}")
-                
-                offset += self.config.batch_size
-                batch_num += 1
+            if checkpoint:
+                if checkpoint['completed']:
+                    logger.info(f"      ✅ Checkpoint: {table_name} already migrated - skipping")
+                    self._count_resumed(stats, total)
+                    return stats
+                watermark = CommitWatermark(checkpoint['last_key'], checkpoint['migrated'])
+                logger.info(f"      ↪️  Resuming after {key_column} {checkpoint['last_key']!r} "
+                            f"({checkpoint['migrated']} records done)")
+                self._count_resumed(stats, checkpoint['migrated'])
+            
+            self._run_pipeline(cursor, table_name, key_column, total, watermark, stats, batch_callback)
+            
+            if self._checkpoint and not self.config.dry_run and stats['failed_records'] == 0:
+                self._checkpoint.update(table_name, watermark.last_key, watermark.migrated, completed=True)
             
-            logger.info(f"      ✅ Migration complete: {table_name}")
+            logger.info(
+                f"      ✅ Migration complete: {table_name} "
+                f"({stats['records_per_second']:.0f} rec/s)"
+            )
         
         except Exception as e:
             logger.error(f"      ❌ Migration failed for {table_name}: {e}")
             self.result.errors.append(f"{table_name}: {e}")
+            stats['error'] = str(e)
             
             if not self.config.continue_on_error:
                 raise
+        
+        return stats
+    
+    @staticmethod
+    def _new_table_stats(table_name: str) -> Dict[str, Any]:
+        return {
+            'table_name': table_name, 'total_records': 0, 'successful_records': 0,
+            'failed_records': 0, 'resumed_records': 0, 'duration_seconds': 0.0,
+            'records_per_second': 0.0, 'error': None
+        }
+    
+    def _count_resumed(self, stats: Dict[str, Any], count: int):
+        """Bereits in einem früheren Lauf migrierte Records mitzählen"""
+        stats['resumed_records'] = count
+        stats['successful_records'] = count
+        self.result.resumed_records += count
+        self.result.migrated_records += count
+    
+    @staticmethod
+    def _key_column(cursor: sqlite3.Cursor, table_name: str, id_column: str) -> str:
+        """Schlüssel für Keyset-Pagination: id_column, sonst rowid"""
+        cursor.execute(f"PRAGMA table_info({table_name})")
+        columns = {row[1] for row in cursor.fetchall()}
+        if id_column in columns:
+            return id_column
+        logger.warning(f"      ⚠️  {table_name} has no column {id_column} - paginating by rowid")
+        return "rowid"
+    
+    def _read_batches(
+        self,
+        cursor: sqlite3.Cursor,
+        table_name: str,
+        key_column: str,
+        last_key: Any
+    ) -> Iterator[Tuple[List[Dict[str, Any]], Any]]:
+        """Liest (batch, last_key) per Keyset-Pagination ab last_key"""
+        select = f"SELECT {key_column} AS _migration_key, * FROM {table_name}"
+        order = f"ORDER BY {key_column} LIMIT ?"
+        
+        while True:
+            if last_key is None:
+                cursor.execute(f"{select} {order}", (self.config.batch_size,))
+            else:
+                cursor.execute(f"{select} WHERE {key_column} > ? {order}", (last_key, self.config.batch_size))
+            rows = cursor.fetchall()
+            
+            if not rows:
+                return
+            
+            batch = [dict(row) for row in rows]
+            for record in batch:
+                last_key = record.pop('_migration_key')
+            yield batch, last_key
+    
+    def _run_pipeline(
+        self,
+        cursor: sqlite3.Cursor,
+        table_name: str,
+        key_column: str,
+        total: int,
+        watermark: CommitWatermark,
+        stats: Dict[str, Any],
+        batch_callback: Optional[Callable[[int, int, str], None]]
+    ):
+        """Reader (dieser Thread) → begrenzte Queue → Writer-Threads"""
+        workers = 1 if self.config.dry_run else max(1, self.config.writer_workers)
+        work: "queue.Queue[Optional[Tuple[int, List[Dict[str, Any]], Any]]]" = queue.Queue(
+            maxsize=max(1, self.config.queue_size)
+        )
+        stop = threading.Event()
+        lock = threading.Lock()
+        failures: List[Exception] = []
+        done = {'batches': 0, 'records': 0}
+        started = time.perf_counter()
+        remaining = total - watermark.migrated
+        
+        if self.config.enable_validation and not self.config.dry_run and not self.validator:
+            self.validator = DataValidator()
+        
+        def writer():
+            while True:
+                item = work.get()
+                if item is None:
+                    return
+                seq, batch, last_key = item
+                if stop.is_set():
+                    continue  # Queue leeren, damit der Reader nicht blockiert
+                
+                try:
+                    migrated, record_errors = self._write_batch(table_name, batch, seq + 1)
+                except Exception as e:
+                    with lock:
+                        failures.append(e)
+                        self.result.failed_records += len(batch)
+                        stats['failed_records'] += len(batch)
+                    if not self.config.continue_on_error:
+                        stop.set()
+                    continue
+                
+                with lock:
+                    # Einzeln fehlgeschlagene Records sind erfasst -> Watermark läuft weiter
+                    for error in record_errors:
+                        self.result.errors.append(f"{table_name}: {error}")
+                    self.result.failed_records += len(record_errors)
+                    stats['failed_records'] += len(record_errors)
+                    self.result.migrated_records += migrated
+                    stats['successful_records'] += migrated
+                    done['batches'] += 1
+                    done['records'] += len(batch)
+                    advanced = watermark.complete(seq, last_key, migrated)
+                    if advanced and self._checkpoint and not self.config.dry_run:
+                        self._checkpoint.update(table_name, *advanced)
+                    self._report_progress(table_name, done, remaining, started, len(batch), batch_callback)
+        
+        threads = [
+            threading.Thread(target=writer, name=f"migration-writer-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            for seq, (batch, last_key) in enumerate(
+                self._read_batches(cursor, table_name, key_column, watermark.last_key)
+            ):
+                logger.debug(f"      Batch {seq + 1}: {len(batch)} records (up to {key_column} {last_key!r})")
+                if not self._enqueue(work, (seq, batch, last_key), stop):
+                    break
+        finally:
+            for _ in threads:
+                work.put(None)
+            for thread in threads:
+                thread.join()
+        
+        stats['duration_seconds'] = time.perf_counter() - started
+        if stats['duration_seconds'] > 0:
+            stats['records_per_second'] = done['records'] / stats['duration_seconds']
+        
+        if failures:
+            for error in failures:
+                self.result.errors.append(f"{table_name}: {error}")
+            if not self.config.continue_on_error:
+                raise failures[0]
+    
+    @staticmethod
+    def _enqueue(work: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        """Blockiert solange die Queue voll ist; False wenn abgebrochen wurde"""
+        while not stop.is_set():
+            try:
+                work.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _write_batch(
+        self,
+        table_name: str,
+        batch: List[Dict[str, Any]],
+        batch_num: int
+    ) -> Tuple[int, List[str]]:
+        """Schreibt und validiert einen Batch (Writer-Thread)
+        
+        Returns:
+            (migrierte Records, Fehler einzelner Records)
+        """
+        if self.config.dry_run:
+            return len(batch), []
+        
+        migrated, record_errors = self._migrate_batch(table_name, batch)
+        
+        # Validation nach jedem Batch (wenn aktiviert)
+        if self.config.enable_validation:
+            validation_result = self._validate_batch(table_name, batch)
+            self.result.validation_results.append(validation_result)
+            
+            if not validation_result.is_valid and not self.config.continue_on_error:
+                raise Exception(f"Validation failed for batch {batch_num}")
+        
+        return migrated, record_errors
+    
+    def _report_progress(
+        self,
+        table_name: str,
+        done: Dict[str, int],
+        remaining: int,
+        started: float,
+        batch_size: int,
+        batch_callback: Optional[Callable[[int, int, str], None]]
+    ):
+        """Aktualisiert self.progress und ruft die Callbacks (unter Lock)"""
+        self.progress = MigrationProgress(
+            table_name=table_name,
+            processed=done['records'],
+            total=remaining,
+            elapsed_seconds=time.perf_counter() - started
+        )
+        
+        if batch_callback:
+            batch_callback(done['batches'], batch_size, table_name)
+        
+        if self.progress_callback:
+            self.progress_callback(
+                self.result.migrated_records,
+                self.result.total_records,
+                self.progress.message()
+            )
     
     def _migrate_batch(
         self,
         table_name: str,
         records: List[Dict[str, Any]]
-    ) -> int:
+    ) -> Tuple[int, List[str]]:
         """
         Migriert einen Batch von Records zu UDS3
         
+        vpb_processes werden mit einem Aufruf von save_processes_bulk
+        geschrieben (Bulk-Upserts statt SAGA je Record). Ohne
+        continue_on_error wird jeder Fehler weitergereicht und der Batch
+        zählt komplett als fehlgeschlagen.
+        
+        Mit continue_on_error werden Records mit korruptem process_data
+        einzeln gezählt, und ein fehlgeschlagener Bulk-Aufruf wird Record
+        für Record wiederholt, sodass nur die fehlerhaften Records
+        fehlschlagen. Lässt sich dabei kein einziger Record schreiben
+        (Backend nicht erreichbar, Neo4j/Embeddings unvollständig -
+        BulkWriteError), wird die Exception weitergereicht: der Batch hält
+        Watermark und Checkpoint an und wird beim nächsten Lauf erneut
+        geschrieben.
+        
         Args:
             table_name: Tabellenname
             records: Records zu migrieren
         
         Returns:
-            Anzahl erfolgreich migrierter Records
+            (Anzahl erfolgreich migrierter Records, Fehler je Record)
         """
-        migrated = 0
+        if not self._uds3_manager:
+            # Mock Mode: Simulate migration
+            return len(records), []
+        
+        if table_name != "vpb_processes":
+            # Other tables: UDS3PolyglotManager currently focused on processes
+            # For now, skip non-process tables (extend in Phase 2.2)
+            logger.debug(f"Skipping {table_name} (no UDS3 handler yet)")
+            return len(records), []
+        
+        logger.debug(f"         📝 Writing {len(records)} records to UDS3...")
+        migration_timestamp = datetime.now().isoformat()
+        processes = []
+        errors: List[str] = []
+        
+        for record in records:
+            # SQLite-Felder + eingebettetes process_data-JSON
+            try:
+                document = process_document(record)
+            except Exception as e:
+                if not self.config.continue_on_error:
+                    raise
+                logger.error(f"         ❌ Record {record.get('process_id')!r} skipped: {e}")
+                errors.append(f"{record.get('process_id')}: {e}")
+                continue
+            processes.append({
+                **document,
+                'migrated_from': 'sqlite',
+                'migration_timestamp': migration_timestamp
+            })
+        
+        if not processes:
+            return 0, errors
         
         try:
-            logger.info(f"         📝 Writing {len(records)} records to UDS3...")
-            
-            # UDS3 Integration - Real Implementation
-            if self._uds3_manager:
-                for record in records:
-                    try:
-                        # Store record in UDS3 Polyglot Storage
-                        # vpb_processes → process documents
-                        if table_name == "vpb_processes":
-                            # Parse process_data if JSON string
-                            process_data_raw = record.get('process_data', '{}')
-                            if isinstance(process_data_raw, str):
-                                import json
-                                process_data = json.loads(process_data_raw)
-                            else:
-                                process_data = process_data_raw
-                            
-                            # Merge with record metadata
-                            full_process_data = {
-                                **record,  # Include all SQLite fields
-                                **process_data,  # Merge JSON data
-                                'migrated_from': 'sqlite',
-                                'migration_timestamp': datetime.now().isoformat()
-                            }
-                            
-                            # Call UDS3 save_process (correct signature)
-                            process_id = self._uds3_manager.save_process(
-                                process_data=full_process_data,
-                                domain="vpb_migration",
-                                generate_embeddings=True
-                            )
-                            
-                            logger.debug(f"Migrated process {process_id}")
-                        
-                        else:
-                            # Other tables: Generic storage
-                            # Note: UDS3PolyglotManager currently focused on processes
-                            # For now, skip non-process tables (extend in Phase 2.2)
-                            logger.debug(f"Skipping {table_name} (no UDS3 handler yet)")
-                        
-                        migrated += 1
-                    
-                    except Exception as e:
-                        logger.error(f"Failed to migrate record {record.get('id', record.get('process_id', 'unknown'))}: {e}")
-                        if not self.config.continue_on_error:
-                            raise
-            else:
-                # Dry-Run Mode: Simulate migration
-                migrated = len(records)
-            
-            logger.info(f"         ✅ {migrated} records written")
-        
+            migrated = self._uds3_manager.save_processes_bulk(
+                processes,
+                domain="vpb_migration"
+            )
         except Exception as e:
-            logger.error(f"         ❌ Batch migration failed: {e}")
-            self.result.failed_records += len(records) - migrated
-            raise
+            if not self.config.continue_on_error:
+                logger.error(f"         ❌ Batch migration failed: {e}")
+                raise
+            logger.warning(f"         ⚠️  Batch migration failed ({e}) - retrying record by record")
+            migrated, failed = self._migrate_records(processes)
+            if not migrated:
+                logger.error(f"         ❌ Batch migration failed: {e}")
+                raise
+            errors.extend(failed)
         
-        return migrated
+        logger.debug(f"         ✅ {migrated} records written")
+        return migrated, errors
+    
+    def _migrate_records(self, processes: List[Dict[str, Any]]) -> Tuple[int, List[str]]:
+        """Schreibt Prozesse einzeln (nach fehlgeschlagenem Bulk-Aufruf)"""
+        migrated = 0
+        errors = []
+        for process in processes:
+            try:
+                migrated += self._uds3_manager.save_processes_bulk([process], domain="vpb_migration")
+            except Exception as e:
+                logger.error(f"         ❌ Record {process.get('process_id')!r} failed: {e}")
+                errors.append(f"{process.get('process_id')}: {e}")
+        return migrated, errors
     
     def _validate_batch(
         self,
@@ -598,6 +898,8 @@ if __name__ == "__main__":
     parser.add_argument("--dry-run", action="store_true", help="Dry-run mode (no changes)")
     parser.add_argument("--output", default="migration_result.json", help="Output result path")
     parser.add_argument("--continue-on-error", action="store_true", help="Continue on errors")
+    parser.add_argument("--workers", type=int, default=4, help="Writer threads")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (resume per table)")
     
     args = parser.parse_args()
     
@@ -611,7 +913,9 @@ if __name__ == "__main__":
         source_db_path=args.db,
         batch_size=args.batch_size,
         dry_run=args.dry_run,
-        continue_on_error=args.continue_on_error
+        continue_on_error=args.continue_on_error,
+        writer_workers=args.workers,
+        checkpoint_path=args.checkpoint
     )
     
     # Progress Callback
@@ -21,6 +21,19 @@ if uds3_path.exists() and str(uds3_path) not in sys.path:
 logger = logging.getLogger(__name__)
 
 
+def process_document(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    SQLite-Zeile aus vpb_processes → UDS3-Prozessdokument
+    
+    Alle Spalten plus der eingebettete process_data-JSON (so speichert die
+    Migration die Prozesse). Wirft json.JSONDecodeError bei korruptem JSON.
+    """
+    process_data = record.get('process_data') or '{}'
+    if isinstance(process_data, str):
+        process_data = json.loads(process_data)
+    return {**record, **process_data}
+
+
 @dataclass
 class ValidationResult:
     """Ergebnis einer Validierung"""
@@ -399,6 +399,37 @@ class TestConnectionFactory:
         assert conn.description == "Data"
 
 
+class TestCompactConnection:
+    """Test slotted connection storage."""
+    
+    def test_waypoints_allocated_lazily(self):
+        """Test that waypoints are only allocated when used."""
+        conn = VPBConnection(connection_id="c1", source_element="a", target_element="b")
+        
+        assert conn._waypoints is None
+        assert conn.has_waypoints() is False
+        conn.add_waypoint(1, 2)
+        assert conn.waypoints == [(1, 2)]
+    
+    def test_ad_hoc_cache_attribute(self):
+        """Test that canvas caches can still be attached."""
+        conn = VPBConnection(connection_id="c1", source_element="a", target_element="b")
+        conn._grid_route_cache = {'key': 1}
+        
+        assert conn._grid_route_cache == {'key': 1}
+    
+    def test_roundtrip_and_equality(self):
+        """Test to_dict/from_dict round trip."""
+        conn = VPBConnection(
+            connection_id="c1", source_element="a", target_element="b",
+            connection_type="DATA", routing_mode="orthogonal", waypoints=[(1, 2)],
+        )
+        restored = VPBConnection.from_dict(conn.to_dict())
+        
+        assert restored == conn
+        assert restored.to_dict() == conn.to_dict()
+
+
 class TestConnectionConstants:
     """Test connection constants."""
     
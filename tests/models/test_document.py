@@ -323,7 +323,64 @@ class TestDocumentModel:
         
         incoming = doc.get_incoming_connections('e3')
         assert len(incoming) == 2
-    
+
+    def test_adjacency_index_tracks_removals(self):
+        """Test adjacency index after removing connections and elements."""
+        doc = DocumentModel()
+        for i in range(1, 4):
+            doc.add_element(ElementFactory.create('Prozess', i * 100, 100, element_id=f'e{i}'))
+        doc.add_connection(ConnectionFactory.create('e1', 'e2', connection_id='c1'))
+        doc.add_connection(ConnectionFactory.create('e2', 'e3', connection_id='c2'))
+        doc.add_connection(ConnectionFactory.create('e1', 'e3', connection_id='c3'))
+
+        assert doc.get_out_degree('e1') == 2
+        assert doc.get_in_degree('e3') == 2
+
+        doc.remove_connection('c3')
+        assert [c.connection_id for c in doc.get_outgoing_connections('e1')] == ['c1']
+        assert doc.get_in_degree('e3') == 1
+
+        doc.remove_element('e2')
+        assert doc.get_out_degree('e1') == 0
+        assert doc.get_in_degree('e3') == 0
+        assert doc.get_connections_for_element('e2') == []
+
+    def test_adjacency_views_are_read_only(self):
+        """Test that adjacency views cannot be mutated."""
+        doc = DocumentModel()
+        doc.add_element(ElementFactory.create('Prozess', 100, 100, element_id='e1'))
+        doc.add_element(ElementFactory.create('Prozess', 200, 100, element_id='e2'))
+        doc.add_connection(ConnectionFactory.create('e1', 'e2', connection_id='c1'))
+
+        view = doc.get_outgoing_view('e1')
+        assert list(view) == ['c1']
+        with pytest.raises(TypeError):
+            view['c2'] = None
+        assert len(doc.get_incoming_view('e1')) == 0
+
+    def test_adjacency_index_after_from_dict_and_clear(self):
+        """Test adjacency index is rebuilt on load and reset on clear."""
+        doc = DocumentModel()
+        for i in range(1, 4):
+            doc.add_element(ElementFactory.create('Prozess', i * 100, 100, element_id=f'e{i}'))
+        doc.add_connection(ConnectionFactory.create('e1', 'e2', connection_id='c1'))
+        doc.add_connection(ConnectionFactory.create('e2', 'e3', connection_id='c2'))
+
+        loaded = DocumentModel.from_dict(doc.to_dict())
+        assert [c.connection_id for c in loaded.get_incoming_connections('e2')] == ['c1']
+        assert [c.connection_id for c in loaded.get_outgoing_connections('e2')] == ['c2']
+
+        # Duplicate ID: the later entry replaces the earlier one in the index too
+        data = doc.to_dict()
+        data['connections'].append(dict(data['connections'][0], source_element='e3', target_element='e1'))
+        loaded = DocumentModel.from_dict(data)
+        assert loaded.get_out_degree('e1') == 0
+        assert [c.connection_id for c in loaded.get_outgoing_connections('e3')] == ['c1']
+        assert [c.connection_id for c in loaded.get_incoming_connections('e2')] == []
+
+        loaded.clear()
+        assert loaded.get_out_degree('e3') == 0
+
     def test_clear(self):
         """Test clearing document."""
         doc = DocumentModel()
@@ -5,6 +5,8 @@ from vpb.models.element import (
     VPBElement,
     ElementFactory,
     ELEMENT_TYPES,
+    EXTENSION_BLOCKS,
+    TYPE_EXTENSIONS,
 )
 
 
@@ -459,6 +461,89 @@ class TestElementFactory:
         assert element.members == []
 
 
+class TestCompactStorage:
+    """Test slotted storage with extension blocks."""
+    
+    def test_plain_element_has_no_extension_blocks(self):
+        """Test that non-SPS elements allocate no blocks or lists."""
+        element = VPBElement("e1", "Prozess", "Test", 0, 0)
+        
+        assert all(element.extension(slot) is None for slot in EXTENSION_BLOCKS)
+        assert element.counter_max_value == 100
+        assert element.interlock_auto_release is True
+        assert element.extension('_counter') is None
+    
+    def test_typed_element_allocates_its_block(self):
+        """Test that SPS types get their block on construction."""
+        for element_type, slot in TYPE_EXTENSIONS.items():
+            element = VPBElement("e1", element_type, "Test", 0, 0)
+            assert element.extension(slot) is not None
+    
+    def test_setting_field_allocates_block(self):
+        """Test lazy allocation when a non-default value is set."""
+        element = VPBElement("e1", "Prozess", "Test", 0, 0, counter_max_value=100)
+        assert element.extension('_counter') is None
+        
+        element.counter_max_value = 5
+        assert element.extension('_counter') is not None
+        assert element.counter_max_value == 5
+        
+        element.state_transitions.append({'target': 'e2'})
+        assert element.state_transitions == [{'target': 'e2'}]
+    
+    def test_ad_hoc_attributes(self):
+        """Test that the canvas can still attach ad-hoc attributes."""
+        element = VPBElement("e1", "GROUP", "Gruppe", 0, 0)
+        element.style_override = {'fill': '#fff'}
+        element._resolved_style = {}
+        
+        assert element.style_override == {'fill': '#fff'}
+    
+    def test_unknown_keyword_rejected(self):
+        """Test that unknown properties raise TypeError like before."""
+        with pytest.raises(TypeError):
+            VPBElement("e1", "Prozess", "Test", 0, 0, no_such_field=1)
+    
+    @pytest.mark.parametrize('element_type', [
+        'Prozess', 'SUBPROCESS', 'TIME_LOOP', 'COUNTER', 'CONDITION',
+        'ERROR_HANDLER', 'STATE', 'INTERLOCK',
+    ])
+    def test_roundtrip_all_types(self, element_type):
+        """Test to_dict/from_dict round trip per extension type."""
+        original = ElementFactory.create(
+            element_type, 10, 20, name="Test", element_id="e1",
+            ref_file="sub.vpb" if element_type == 'SUBPROCESS' else "",
+            loop_type="interval", loop_interval_minutes=15,
+            counter_max_value=7, counter_on_max_reached="e9",
+            condition_checks=[{'field': 'status', 'operator': '==', 'value': 'ok'}],
+            condition_true_target="e2",
+            error_handler_retry_count=5, error_handler_on_error_target="e3",
+            state_name="Eingereicht", state_transitions=[{'target': 'e4'}],
+            interlock_resource_id="db",
+            members=["a", "b"],
+        )
+        data = original.to_dict()
+        restored = VPBElement.from_dict(data)
+        
+        assert restored.to_dict() == data
+        assert restored.members == ["a", "b"]
+        slot = TYPE_EXTENSIONS.get(element_type)
+        if slot:
+            assert restored.extension(slot) == original.extension(slot)
+    
+    def test_copy_and_equality(self):
+        """Test deepcopy of slotted elements."""
+        import copy
+        element = VPBElement("e1", "STATE", "Test", 0, 0, state_name="A")
+        element.hierarchy = "Ebene 1"
+        duplicate = copy.deepcopy(element)
+        
+        assert duplicate == element
+        assert duplicate.hierarchy == "Ebene 1"
+        duplicate.state_name = "B"
+        assert duplicate != element
+
+
 class TestElementTypes:
     """Test ELEMENT_TYPES constant."""
     
@@ -0,0 +1,62 @@
+"""
+Speicher-Benchmark für VPBElement/VPBConnection mit 50k Elementen.
+
+Vergleicht die kompakte Slot-Darstellung (Erweiterungsblöcke nur für
+SPS-Typen) mit einem nachgebauten Objekt, das wie die frühere Dataclass alle
+Felder im Instanz-__dict__ hält. Es wird geloggt; optionaler Schwellenwert
+in Bytes pro Element via VPB_ELEMENT_MEM_MAX_BYTES.
+"""
+
+import os
+import tracemalloc
+
+from vpb.models.connection import VPBConnection
+from vpb.models.element import VPBElement
+
+N = 50_000
+SPS_TYPES = ['COUNTER', 'CONDITION', 'STATE', 'INTERLOCK', 'TIME_LOOP']
+
+
+class _DictElement:
+    """Nachbau der alten Dataclass-Speicherung: alle Felder im __dict__, Listen je Instanz."""
+
+    def __init__(self, template: VPBElement):
+        for name in VPBElement.FIELD_NAMES:
+            value = getattr(template, name)
+            setattr(self, name, list(value) if isinstance(value, list) else value)
+
+
+def _element_type(i: int) -> str:
+    # 10 % SPS-Elemente, Rest einfache Prozessschritte
+    return SPS_TYPES[i % len(SPS_TYPES)] if i % 10 == 0 else 'Prozess'
+
+
+def _measure(factory) -> tuple:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(N)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return objects, size
+
+
+def test_element_memory_50k_log_only():
+    template = VPBElement('T', 'Prozess', 'Vorlage', 0, 0)
+
+    _, compact = _measure(lambda i: VPBElement(f'E{i}', _element_type(i), f'Schritt {i}', i % 500, i // 500))
+    _, legacy = _measure(lambda i: _DictElement(template))
+    _, conns = _measure(lambda i: VPBConnection(f'C{i}', f'E{i}', f'E{i + 1}'))
+
+    # Die Vergleichsobjekte teilen sich die Strings der Vorlage -> konservativer Vergleich
+    per_compact = compact / N
+    per_legacy = legacy / N
+    print(
+        f"PERF ELEMENT MEMORY n={N}: slotted={per_compact:.0f} B/element | "
+        f"dict-based={per_legacy:.0f} B/element | connections={conns / N:.0f} B/connection"
+    )
+
+    threshold = os.environ.get("VPB_ELEMENT_MEM_MAX_BYTES")
+    if threshold:
+        assert per_compact <= float(threshold), f"{per_compact:.0f} B/element > {threshold}"
+    assert per_compact < per_legacy
@@ -0,0 +1,119 @@
+"""Unit tests for ProcessGraph"""
+
+import pytest
+from vpb.models.document import DocumentModel
+from vpb.models.element import ElementFactory
+from vpb.models.connection import ConnectionFactory
+from vpb.models.process_graph import ProcessGraph
+
+
+def _document(edges, n=6, types=None):
+    """Create document with elements e0..e{n-1} and the given edges."""
+    types = types or {}
+    doc = DocumentModel()
+    for i in range(n):
+        doc.add_element(ElementFactory.create(types.get(i, 'Prozess'), i * 100, 100,
+                                              name=f'Schritt {i}', element_id=f'e{i}'))
+    for idx, (s, t) in enumerate(edges):
+        doc.add_connection(ConnectionFactory.create(f'e{s}', f'e{t}', connection_id=f'c{idx}'))
+    return doc
+
+
+class TestProcessGraph:
+    """Test suite for ProcessGraph analyses."""
+
+    def test_degrees_and_start_end(self):
+        """Test degree tables and start/end detection."""
+        doc = _document([(0, 1), (1, 2), (1, 3)], n=5, types={4: 'NachProzess'})
+        graph = doc.get_process_graph()
+
+        assert graph.out_degree['e1'] == 2
+        assert graph.in_degree['e1'] == 1
+        assert graph.sources == ('e0', 'e4')
+        assert graph.start_ids == ('e0', 'e4')
+        assert graph.end_ids == ('e2', 'e3', 'e4')
+
+    def test_reachability(self):
+        """Test forward and reverse reachability."""
+        # e0 -> e1 -> e2, e3 <-> e4 (unreachable loop), e5 isolated
+        doc = _document([(0, 1), (1, 2), (3, 4), (4, 3)])
+        graph = doc.get_process_graph()
+
+        assert graph.node_ids - graph.reachable == {'e3', 'e4'}
+        assert graph.node_ids - graph.reaching_end == {'e3', 'e4'}
+
+    def test_cycles(self):
+        """Test SCC based cycle detection."""
+        doc = _document([(0, 1), (1, 2), (2, 1), (2, 3), (3, 4), (4, 2)])
+        graph = doc.get_process_graph()
+
+        assert [sorted(c) for c in graph.cycles] == [['e1', 'e2', 'e3', 'e4']]
+        assert sum(len(c) for c in graph.sccs) == 6
+
+    def test_topological_layers(self):
+        """Test longest-path layering with a collapsed cycle."""
+        doc = _document([(0, 1), (0, 2), (1, 2), (2, 3), (3, 2), (3, 4)])
+        graph = doc.get_process_graph()
+
+        assert graph.layers == {'e0': 0, 'e1': 1, 'e2': 2, 'e3': 2, 'e4': 3, 'e5': 0}
+        assert graph.layer_groups()[2] == ['e2', 'e3']
+
+    def test_large_chain_no_recursion_limit(self):
+        """Test iterative algorithms on a long chain."""
+        n = 5000
+        elements = {f'e{i}': ElementFactory.create('Prozess', 0, 0, element_id=f'e{i}') for i in range(n)}
+        connections = [ConnectionFactory.create(f'e{i}', f'e{i + 1}', connection_id=f'c{i}')
+                       for i in range(n - 1)]
+        graph = ProcessGraph(elements, connections)
+
+        assert graph.layers[f'e{n - 1}'] == n - 1
+        assert len(graph.reachable) == n
+        assert graph.cycles == []
+
+    def test_from_dict_matches_document(self):
+        """Test that the dict-based graph equals the model graph."""
+        doc = _document([(0, 1), (1, 2), (2, 1), (3, 4)], types={5: 'NachProzess'})
+        data = doc.to_dict()
+        data['connections'].append({'connection_id': 'loop', 'source_element': 'e0',
+                                    'target_element': 'e0'})
+        graph = ProcessGraph.from_dict(data)
+
+        assert graph.summary() == doc.get_process_graph().summary()
+        assert graph.layers == doc.get_process_graph().layers
+
+
+class TestProcessGraphCache:
+    """Test caching of the ProcessGraph on DocumentModel."""
+
+    def test_graph_is_cached(self):
+        """Test that the same graph is returned without changes."""
+        doc = _document([(0, 1)])
+        assert doc.get_process_graph() is doc.get_process_graph()
+
+    @pytest.mark.parametrize('mutate', [
+        lambda doc: doc.add_connection(ConnectionFactory.create('e2', 'e3', connection_id='cx')),
+        lambda doc: doc.remove_connection('c0'),
+        lambda doc: doc.remove_element('e1'),
+        lambda doc: doc.add_element(ElementFactory.create('Prozess', 0, 0, element_id='ex')),
+        lambda doc: doc.update_element(ElementFactory.create('NachProzess', 0, 0, element_id='e0')),
+        lambda doc: doc.clear(),
+    ])
+    def test_changes_invalidate_graph(self, mutate):
+        """Test that change notifications drop the cached graph."""
+        doc = _document([(0, 1)])
+        before = doc.get_process_graph()
+        mutate(doc)
+        after = doc.get_process_graph()
+
+        assert after is not before
+        assert after.summary() == ProcessGraph.from_document(doc).summary()
+
+    def test_observers_see_fresh_graph(self):
+        """Test that observers read the graph of the new state."""
+        doc = _document([(0, 1)])
+        doc.get_process_graph()
+        seen = []
+        doc.attach_observer(lambda event, data: seen.append(doc.get_process_graph().edge_count))
+
+        doc.add_connection(ConnectionFactory.create('e1', 'e2', connection_id='cx'))
+        assert seen == [2]
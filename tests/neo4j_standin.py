@@ -0,0 +1,262 @@
+"""
+Neo4j Stand-in Driver
+=====================
+
+In-Memory-Ersatz für den Neo4j-Treiber (GraphDatabase.driver) für Tests ohne
+Neo4j-Server (Hilfsmodul neben den Tests, kein Teil von core). Unterstützt die Schnittstelle, die der
+Neo4jAdapter nutzt (session(), run(), begin_transaction(), execute_write(),
+commit/rollback) und führt dessen Cypher-Statements auf einem einfachen
+Graph-Modell aus. Unbekannte Statements werden nur protokolliert.
+
+Jeder run() sowie jedes commit() zählt als Round Trip; optional wird pro
+Round Trip eine feste Latenz simuliert.
+
+Verwendung:
+    adapter = Neo4jAdapter(config)
+    adapter.driver = StandInNeo4jDriver()
+    adapter.connected = True
+
+Autor: UDS3 Development Team
+"""
+
+import copy
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.polyglot_manager import (
+    _CYPHER_DELETE_PROCESS,
+    _CYPHER_DELETE_PROCESS_ELEMENTS,
+    _CYPHER_DELETE_STALE_CONNECTIONS,
+    _CYPHER_DELETE_STALE_ELEMENTS,
+    _CYPHER_MERGE_PROCESS,
+    _CYPHER_UPSERT_CONNECTIONS,
+    _CYPHER_UPSERT_ELEMENTS,
+)
+
+ElementKey = Tuple[str, str]
+
+
+class GraphState:
+    """Graph-Inhalt: Prozesse, Elemente je (process_id, element_id), Kanten"""
+
+    def __init__(self):
+        self.processes: Dict[str, Dict[str, Any]] = {}
+        self.elements: Dict[ElementKey, Dict[str, Any]] = {}
+        self.has_element: Dict[str, set] = {}
+        self.connections: Dict[Tuple[ElementKey, ElementKey], Dict[str, Any]] = {}
+
+    def copy(self) -> "GraphState":
+        return copy.deepcopy(self)
+
+    def detach_delete_element(self, key: ElementKey) -> None:
+        self.elements.pop(key, None)
+        self.has_element.get(key[0], set()).discard(key)
+        for edge in [edge for edge in self.connections if key in edge]:
+            del self.connections[edge]
+
+    def process_elements(self, process_id: str) -> List[ElementKey]:
+        return sorted(self.has_element.get(process_id, ()))
+
+
+# ----------------------------------------------------------------------------
+# Ausführung der Adapter-Statements
+# ----------------------------------------------------------------------------
+
+def _merge_process(state: GraphState, p: Dict[str, Any]) -> None:
+    node = state.processes.setdefault(p['process_id'], {'process_id': p['process_id']})
+    node.update(name=p['name'], description=p['description'], revision=p['revision'])
+
+
+def _upsert_elements(state: GraphState, p: Dict[str, Any]) -> None:
+    process_id = p['process_id']
+    if process_id not in state.processes:
+        return
+    linked = state.has_element.setdefault(process_id, set())
+    for row in p['rows']:
+        key = (process_id, row['element_id'])
+        node = state.elements.setdefault(key, {'process_id': process_id, 'element_id': row['element_id']})
+        node.update(type=row['type'], name=row['name'], properties=row['properties'], revision=p['revision'])
+        linked.add(key)
+
+
+def _upsert_connections(state: GraphState, p: Dict[str, Any]) -> None:
+    process_id = p['process_id']
+    for row in p['rows']:
+        source, target = (process_id, row['from_id']), (process_id, row['to_id'])
+        if source not in state.elements or target not in state.elements:
+            continue
+        edge = state.connections.setdefault((source, target), {})
+        edge.update(type=row['type'], revision=p['revision'])
+
+
+def _delete_stale_elements(state: GraphState, p: Dict[str, Any]) -> None:
+    for key in state.process_elements(p['process_id']):
+        if state.elements[key].get('revision') != p['revision']:
+            state.detach_delete_element(key)
+
+
+def _delete_stale_connections(state: GraphState, p: Dict[str, Any]) -> None:
+    linked = state.has_element.get(p['process_id'], set())
+    for edge, props in list(state.connections.items()):
+        if edge[0] in linked and props.get('revision') != p['revision']:
+            del state.connections[edge]
+
+
+def _delete_process(state: GraphState, p: Dict[str, Any]) -> None:
+    for key in state.process_elements(p['process_id']):
+        state.detach_delete_element(key)
+    state.processes.pop(p['process_id'], None)
+    state.has_element.pop(p['process_id'], None)
+
+
+def _delete_process_elements(state: GraphState, p: Dict[str, Any]) -> None:
+    for key in [key for key in state.elements if key[0] == p['process_id']]:
+        state.detach_delete_element(key)
+
+
+_HANDLERS: Dict[str, Callable[[GraphState, Dict[str, Any]], None]] = {
+    _CYPHER_MERGE_PROCESS: _merge_process,
+    _CYPHER_UPSERT_ELEMENTS: _upsert_elements,
+    _CYPHER_UPSERT_CONNECTIONS: _upsert_connections,
+    _CYPHER_DELETE_STALE_ELEMENTS: _delete_stale_elements,
+    _CYPHER_DELETE_STALE_CONNECTIONS: _delete_stale_connections,
+    _CYPHER_DELETE_PROCESS: _delete_process,
+    _CYPHER_DELETE_PROCESS_ELEMENTS: _delete_process_elements,
+}
+
+
+# ----------------------------------------------------------------------------
+# Treiber-Schnittstelle
+# ----------------------------------------------------------------------------
+
+class StandInResult:
+    """Leeres Ergebnis (die Schreib-Statements liefern keine Records)"""
+
+    def single(self):
+        return None
+
+    def consume(self):
+        return None
+
+    def data(self) -> List[Dict[str, Any]]:
+        return []
+
+    def __iter__(self):
+        return iter(())
+
+
+class StandInTransaction:
+    """Explizite Transaktion: Änderungen werden erst mit commit() sichtbar"""
+
+    def __init__(self, driver: "StandInNeo4jDriver"):
+        self._driver = driver
+        self._state = driver.state.copy()
+        self.closed = False
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs) -> StandInResult:
+        params = dict(parameters or {}, **kwargs)
+        self._driver._round_trip(query, params)
+        handler = _HANDLERS.get(query)
+        if handler is not None:
+            handler(self._state, params)
+        return StandInResult()
+
+    def commit(self) -> None:
+        if self.closed:
+            return
+        self._driver._round_trip("COMMIT", {})
+        self._driver.state = self._state
+        self._driver.commits += 1
+        self.closed = True
+
+    def rollback(self) -> None:
+        self.closed = True
+
+    def __enter__(self) -> "StandInTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+class StandInSession:
+    def __init__(self, driver: "StandInNeo4jDriver"):
+        self._driver = driver
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs) -> StandInResult:
+        """Auto-Commit: ein Round Trip, Änderung sofort sichtbar"""
+        params = dict(parameters or {}, **kwargs)
+        self._driver._round_trip(query, params)
+        handler = _HANDLERS.get(query)
+        if handler is not None:
+            handler(self._driver.state, params)
+        return StandInResult()
+
+    def begin_transaction(self) -> StandInTransaction:
+        return StandInTransaction(self._driver)
+
+    def execute_write(self, transaction_function: Callable, *args, **kwargs) -> Any:
+        tx = StandInTransaction(self._driver)
+        try:
+            result = transaction_function(tx, *args, **kwargs)
+        except Exception:
+            tx.rollback()
+            raise
+        tx.commit()
+        return result
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "StandInSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class StandInNeo4jDriver:
+    """
+    Ersatz für neo4j.Driver
+
+    Args:
+        round_trip_latency: Simulierte Latenz pro Round Trip in Sekunden
+        fail_on: Optionaler Statement-Text; run() wirft dann eine Exception
+            (zum Testen von Rollbacks)
+    """
+
+    def __init__(self, round_trip_latency: float = 0.0, fail_on: Optional[str] = None):
+        self.round_trip_latency = round_trip_latency
+        self.fail_on = fail_on
+        self.state = GraphState()
+        self.round_trips = 0
+        self.commits = 0
+        self.statements: List[Tuple[str, Dict[str, Any]]] = []
+
+    def _round_trip(self, query: str, params: Dict[str, Any]) -> None:
+        self.round_trips += 1
+        self.statements.append((query, params))
+        if self.round_trip_latency:
+            time.sleep(self.round_trip_latency)
+        if self.fail_on is not None and query == self.fail_on:
+            raise RuntimeError("Stand-in: simulierter Fehler")
+
+    def reset_counters(self) -> None:
+        self.round_trips = 0
+        self.commits = 0
+        self.statements.clear()
+
+    def session(self, **kwargs) -> StandInSession:
+        return StandInSession(self)
+
+    def verify_connectivity(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+__all__ = ['StandInNeo4jDriver', 'StandInSession', 'StandInTransaction', 'StandInResult', 'GraphState']
@@ -0,0 +1,176 @@
+"""Tests for IncrementalValidator (equivalence with full validation runs)"""
+
+import random
+
+import pytest
+from vpb.services.validation_service import ValidationService, IncrementalValidator
+from vpb.models import DocumentModel, ElementFactory, ConnectionFactory
+
+
+ELEMENT_TYPES = [
+    'Prozess', 'Prozess', 'Prozess', 'VorProzess', 'NachProzess', 'Entscheidung',
+    'Gateway_XOR', 'COUNTER', 'CONDITION', 'ERROR_HANDLER', 'STATE', 'INTERLOCK',
+]
+NAMES = ['Antrag prüfen', 'Bescheid', 'bescheid', 'Ok', '', '  ', 'Start', 'Ende', 'x' * 120]
+
+
+class RandomEditor:
+    """Applies random edits to a document through its public API."""
+
+    def __init__(self, doc, rng):
+        self.doc = doc
+        self.rng = rng
+        self.counter = 0
+
+    def _element_ids(self):
+        return [el.element_id for el in self.doc.get_all_elements()]
+
+    def _random_ref(self):
+        ids = self._element_ids()
+        return self.rng.choice(ids + ['missing']) if ids else 'missing'
+
+    def add_element(self):
+        self.counter += 1
+        element = ElementFactory.create(
+            self.rng.choice(ELEMENT_TYPES), 0, 0,
+            name=self.rng.choice(NAMES), element_id=f'e{self.counter}',
+            description=self.rng.choice(['', 'Beschreibung']),
+        )
+        self.doc.add_element(element)
+
+    def remove_element(self):
+        ids = self._element_ids()
+        if ids:
+            self.doc.remove_element(self.rng.choice(ids))
+
+    def update_element(self):
+        elements = self.doc.get_all_elements()
+        if not elements:
+            return
+        element = self.rng.choice(elements)
+        change = self.rng.randrange(6)
+        if change == 0:
+            element.name = self.rng.choice(NAMES)
+        elif change == 1:
+            element.element_type = self.rng.choice(ELEMENT_TYPES)
+        elif change == 2:
+            element.description = self.rng.choice(['', 'Text'])
+        elif change == 3:
+            element.state_type = self.rng.choice(['NORMAL', 'INITIAL', 'FINAL'])
+            element.state_transitions = [{'target': self._random_ref()}]
+        elif change == 4:
+            element.interlock_resource_id = self.rng.choice(['', 'db', 'printer'])
+            element.counter_on_max_reached = self.rng.choice(['', self._random_ref()])
+        else:
+            element.condition_true_target = self._random_ref()
+            element.error_handler_on_error_target = self._random_ref()
+        self.doc.update_element(element)
+
+    def add_connection(self):
+        ids = self._element_ids()
+        if len(ids) < 2:
+            return
+        source, target = self.rng.sample(ids, 2)
+        self.counter += 1
+        self.doc.add_connection(ConnectionFactory.create(source, target, connection_id=f'c{self.counter}'))
+
+    def remove_connection(self):
+        connections = self.doc.get_all_connections()
+        if connections:
+            self.doc.remove_connection(self.rng.choice(connections).connection_id)
+
+    def step(self):
+        actions = [
+            (self.add_element, 4), (self.remove_element, 1), (self.update_element, 4),
+            (self.add_connection, 5), (self.remove_connection, 2),
+        ]
+        funcs, weights = zip(*actions)
+        self.rng.choices(funcs, weights)[0]()
+
+
+def _assert_equal(incremental, service, doc):
+    expected = service.validate_document(doc)
+    actual = incremental.result()
+    assert actual.errors == expected.errors
+    assert actual.warnings == expected.warnings
+    assert actual.info == expected.info
+    assert actual.stats == expected.stats
+    assert actual.is_valid == expected.is_valid
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_randomized_edits_match_full_run(seed):
+    """Incremental result equals a full run after every random edit."""
+    rng = random.Random(seed)
+    doc = DocumentModel()
+    service = ValidationService()
+    incremental = service.create_incremental(doc)
+    editor = RandomEditor(doc, rng)
+
+    for _ in range(150):
+        editor.step()
+        _assert_equal(incremental, service, doc)
+
+
+def test_service_settings_are_respected():
+    """Disabled checks are also skipped incrementally."""
+    rng = random.Random(99)
+    doc = DocumentModel()
+    service = ValidationService(check_naming=False, check_flow=False, min_name_length=5)
+    incremental = IncrementalValidator(doc, service)
+    editor = RandomEditor(doc, rng)
+
+    for _ in range(60):
+        editor.step()
+    _assert_equal(incremental, service, doc)
+
+
+def test_clear_and_metadata_changes():
+    """Document reset and (unnotified) metadata changes are picked up."""
+    rng = random.Random(7)
+    doc = DocumentModel()
+    service = ValidationService()
+    incremental = service.create_incremental(doc)
+    editor = RandomEditor(doc, rng)
+    for _ in range(40):
+        editor.step()
+
+    doc.metadata.title = "Antragsverfahren"
+    doc.metadata.author = "Fachbereich"
+    _assert_equal(incremental, service, doc)
+
+    doc.clear()
+    _assert_equal(incremental, service, doc)
+
+
+def test_rename_only_rechecks_local_rules():
+    """A rename does not re-run rules for unrelated elements."""
+    doc = DocumentModel()
+    doc.add_element(ElementFactory.create('VorProzess', 0, 0, name='Start', element_id='e0'))
+    for i in range(1, 200):
+        doc.add_element(ElementFactory.create('Prozess', 0, 0, name=f'Schritt {i}', element_id=f'e{i}'))
+        doc.add_connection(ConnectionFactory.create(f'e{i - 1}', f'e{i}', connection_id=f'c{i}'))
+    service = ValidationService()
+    incremental = service.create_incremental(doc)
+
+    before = incremental.checks_run
+    element = doc.get_element('e100')
+    element.name = 'Schritt 5'
+    doc.update_element(element)
+
+    assert incremental.checks_run - before <= 6
+    _assert_equal(incremental, service, doc)
+
+
+def test_detach_stops_updates():
+    """Detached validators no longer follow the document."""
+    doc = DocumentModel()
+    incremental = ValidationService().create_incremental(doc)
+    incremental.detach()
+
+    doc.add_element(ElementFactory.create('Prozess', 0, 0, name='Schritt', element_id='e1'))
+    assert incremental.result().stats['element_count'] == 1
+    assert 'Prozess' not in incremental.result().stats['elements_by_type']
+
+    incremental.attach()
+    _assert_equal(incremental, ValidationService(), doc)
@@ -0,0 +1,79 @@
+"""
+Skalierungs-Benchmark für ValidationService.validate_document.
+
+Generierte Prozesse mit 1k / 2.5k / 5k / 10k Elementen (Kette mit Entscheidungen
+und Rücksprüngen). Mit dem Adjazenz-Index im DocumentModel sollte die Laufzeit
+etwa linear wachsen. Es wird nur geloggt; optionaler Schwellenwert für das
+Verhältnis t(max)/t(min) normiert auf die Größe via VPB_VALIDATION_PERF_MAX_RATIO.
+"""
+
+import os
+import time
+
+from vpb.models.document import DocumentModel
+from vpb.models.element import ElementFactory
+from vpb.models.connection import ConnectionFactory
+from vpb.services.validation_service import ValidationService
+
+
+def _generated_process(n: int) -> DocumentModel:
+    doc = DocumentModel()
+    doc.add_element(ElementFactory.create('VorProzess', 0, 0, name='Start', element_id='E0'))
+    for i in range(1, n - 1):
+        etype = 'Entscheidung' if i % 50 == 0 else 'Prozess'
+        doc.add_element(ElementFactory.create(etype, (i % 100) * 150, (i // 100) * 100,
+                                              name=f'Schritt {i}', element_id=f'E{i}'))
+    doc.add_element(ElementFactory.create('NachProzess', 0, n, name='Ende', element_id=f'E{n - 1}'))
+
+    for i in range(n - 1):
+        doc.add_connection(ConnectionFactory.create(f'E{i}', f'E{i + 1}', connection_id=f'C{i}'))
+    # Entscheidungen bekommen einen zweiten Pfad (Rücksprung)
+    for i in range(50, n - 1, 50):
+        doc.add_connection(ConnectionFactory.create(f'E{i}', f'E{i - 10}', connection_id=f'R{i}'))
+    return doc
+
+
+def test_validation_scaling_log_only():
+    sizes = [1000, 2500, 5000, 10000]
+    timings = []
+    service = ValidationService()
+    for n in sizes:
+        doc = _generated_process(n)
+        start = time.perf_counter()
+        result = service.validate_document(doc)
+        dur = time.perf_counter() - start
+        timings.append((n, dur))
+        print(f"PERF VALIDATION n={n}: {dur*1000:.1f} ms | errors={len(result.errors)} warnings={len(result.warnings)}")
+
+    (n_min, t_min), (n_max, t_max) = timings[0], timings[-1]
+    # 1.0 = perfekt linear, ~10 = quadratisch bei Faktor 10 in der Größe
+    ratio = (t_max / max(t_min, 1e-9)) / (n_max / n_min)
+    print(f"PERF VALIDATION scaling: normalized ratio={ratio:.2f}")
+
+    threshold = os.environ.get("VPB_VALIDATION_PERF_MAX_RATIO")
+    if threshold:
+        assert ratio <= float(threshold), f"Validierung skaliert nicht linear: {ratio:.2f} > {threshold}"
+    assert len(timings) == len(sizes)
+
+
+def test_incremental_edit_log_only():
+    n = 10000
+    doc = _generated_process(n)
+    service = ValidationService()
+
+    start = time.perf_counter()
+    service.validate_document(doc)
+    full_ms = (time.perf_counter() - start) * 1000.0
+
+    incremental = service.create_incremental(doc)
+    element = doc.get_element(f'E{n // 2}')
+    edits = 200
+    start = time.perf_counter()
+    for i in range(edits):
+        element.name = f'Schritt umbenannt {i}'
+        doc.update_element(element)
+        incremental.result()
+    edit_ms = (time.perf_counter() - start) * 1000.0 / edits
+    print(f"PERF VALIDATION incremental n={n}: full={full_ms:.1f} ms | rename+result={edit_ms:.2f} ms")
+
+    assert incremental.result().errors == service.validate_document(doc).errors
@@ -0,0 +1,211 @@
+"""
+Tests für core.backend_executor (ThreadPool, Grenzen je Backend,
+Backpressure, Deadlines) und ein Lasttest gegen lokale Stub-Backends.
+
+Der Lasttest schickt gemischten CRUD- und Such-Traffic mit fester
+Ankunftsrate durch dieselbe Backend-Zuordnung wie api/uds3_vpb_fastapi.py
+und berichtet p50/p99-Latenz und Requests/s, einmal mit direkten
+(blockierenden) Aufrufen im Event-Loop und einmal über den BackendExecutor. Es wird nur geloggt;
+optionaler Schwellenwert VPB_API_LOAD_MIN_RPS für den Executor-Durchsatz.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+
+import pytest
+
+from core.backend_executor import (
+    BackendDeadlineExceeded,
+    BackendExecutor,
+    BackendSaturatedError,
+    ExecutionLimits,
+)
+
+# Backend-Zuordnung wie in api/uds3_vpb_fastapi.py
+READ_BACKENDS = ("postgresql",)
+SAGA_BACKENDS = ("postgresql", "neo4j", "chromadb")
+SEARCH_BACKENDS = ("chromadb",)
+
+
+class _StubChroma:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def query(self, query_text, n_results=10):
+        time.sleep(self.latency)  # Embedding + Vektorsuche
+        return [{"id": f"P{i}", "distance": 0.1 * i} for i in range(n_results)]
+
+
+class _StubManager:
+    """Synchrone Backends mit fester Latenz (blockierendes I/O wie psycopg2/Neo4j)."""
+
+    def __init__(self, read_s=0.002, save_s=0.015, search_s=0.03):
+        self.read_s, self.save_s = read_s, save_s
+        self.chromadb = _StubChroma(search_s)
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _work(self, seconds):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(seconds)
+        with self._lock:
+            self.active -= 1
+
+    def get_process(self, process_id, source="postgresql"):
+        self._work(self.read_s)
+        return {"process_id": process_id}
+
+    def list_processes(self, **kwargs):
+        self._work(self.read_s)
+        return {"processes": [], "next_cursor": None, "limit": 100}
+
+    def save_process(self, process_data, domain="vpb", generate_embeddings=True):
+        self._work(self.save_s)
+        return process_data["process_id"]
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_per_backend_limit_is_enforced():
+    executor = BackendExecutor(ExecutionLimits(backend_limits={"neo4j": 2, "postgresql": 8}, queue_timeout=5.0))
+    manager = _StubManager(read_s=0.02)
+
+    async def main():
+        await asyncio.gather(*(executor.run("neo4j", manager.get_process, f"P{i}") for i in range(10)))
+
+    _run(main())
+    assert manager.peak == 2
+    assert executor.snapshot()["completed"] == 10
+    assert executor.snapshot()["in_flight"]["neo4j"] == 0
+    executor.shutdown()
+
+
+def test_saturated_backend_is_rejected():
+    executor = BackendExecutor(ExecutionLimits(backend_limits={"chromadb": 1}, queue_timeout=0.01))
+    manager = _StubManager(search_s=0.2)
+
+    async def main():
+        slow = asyncio.ensure_future(executor.run("chromadb", manager.chromadb.query, "a"))
+        await asyncio.sleep(0.02)
+        with pytest.raises(BackendSaturatedError) as info:
+            await executor.run("chromadb", manager.chromadb.query, "b")
+        assert info.value.status_code == 429 and info.value.backend == "chromadb"
+        await slow
+
+    _run(main())
+    assert executor.snapshot()["rejected"] == 1
+    executor.shutdown()
+
+
+def test_deadline_exceeded_keeps_slot_until_worker_finishes():
+    executor = BackendExecutor(ExecutionLimits(backend_limits={"postgresql": 1}, queue_timeout=0.5))
+    manager = _StubManager(read_s=0.15)
+
+    async def main():
+        with pytest.raises(BackendDeadlineExceeded) as info:
+            await executor.run("postgresql", manager.get_process, "P1", deadline=time.monotonic() + 0.03)
+        assert info.value.status_code == 504
+        # Worker läuft noch -> Slot belegt
+        assert executor.snapshot()["in_flight"]["postgresql"] == 1
+        # Der nächste Aufruf wartet auf den Slot und läuft danach normal
+        assert await executor.run("postgresql", manager.get_process, "P2") == {"process_id": "P2"}
+
+    _run(main())
+    assert manager.peak == 1
+    executor.shutdown()
+
+
+def test_multi_backend_acquire_is_all_or_nothing():
+    executor = BackendExecutor(ExecutionLimits(backend_limits={"postgresql": 4, "chromadb": 1}, queue_timeout=0.01))
+    manager = _StubManager(search_s=0.1, save_s=0.01)
+
+    async def main():
+        search = asyncio.ensure_future(executor.run(SEARCH_BACKENDS, manager.chromadb.query, "x"))
+        await asyncio.sleep(0.02)
+        with pytest.raises(BackendSaturatedError):
+            await executor.run(SAGA_BACKENDS, manager.save_process, {"process_id": "P1"})
+        # postgresql-Slot der abgelehnten SAGA wurde nicht belegt
+        assert executor.snapshot()["in_flight"]["postgresql"] == 0
+        await search
+
+    _run(main())
+    executor.shutdown()
+
+
+# ----------------------------------------------------------------------------
+# Lasttest
+# ----------------------------------------------------------------------------
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _load(manager, executor, requests=300, rate=200.0, seed=7):
+    """
+    Offene Last: Request i trifft zum Zeitpunkt i / rate ein (60 % get,
+    15 % list, 15 % save, 10 % search). Die Latenz zählt ab dem geplanten
+    Eintreffen, Blockaden des Event-Loops gehen also mit ein.
+    """
+    rng = random.Random(seed)
+    kinds = rng.choices(["get", "list", "save", "search"], weights=[60, 15, 15, 10], k=requests)
+    latencies, rejected = [], 0
+
+    async def call(backends, func, *args, **kwargs):
+        if executor is None:
+            return func(*args, **kwargs)  # bisheriges Verhalten: blockiert den Event-Loop
+        return await executor.run(backends, func, *args, **kwargs)
+
+    async def request(i, kind, arrival):
+        nonlocal rejected
+        await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+        try:
+            if kind == "get":
+                await call(READ_BACKENDS, manager.get_process, f"P{i}")
+            elif kind == "list":
+                await call(READ_BACKENDS, manager.list_processes, limit=100)
+            elif kind == "save":
+                await call(SAGA_BACKENDS, manager.save_process, {"process_id": f"N{i}"})
+            else:
+                await call(SEARCH_BACKENDS, manager.chromadb.query, "Baugenehmigung", n_results=5)
+        except BackendSaturatedError:
+            rejected += 1
+            return
+        latencies.append(time.perf_counter() - arrival)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request(i, kind, start + i / rate) for i, kind in enumerate(kinds)))
+    elapsed = time.perf_counter() - start
+    return latencies, rejected, elapsed
+
+
+def test_mixed_load_log_only():
+    requests = int(os.environ.get("VPB_API_LOAD_REQUESTS", "300"))
+    rate = float(os.environ.get("VPB_API_LOAD_RATE", "200"))
+    manager = _StubManager()
+
+    blocking = _run(_load(manager, None, requests=requests, rate=rate))
+    executor = BackendExecutor(ExecutionLimits())
+    pooled = _run(_load(manager, executor, requests=requests, rate=rate))
+    executor.shutdown(wait=True)
+
+    for label, (latencies, rejected, elapsed) in (("blocking", blocking), ("executor", pooled)):
+        print(
+            f"PERF API LOAD {label} n={requests} @ {rate:.0f} req/s offered: p50={_percentile(latencies, 0.5) * 1000:.1f} ms | "
+            f"p99={_percentile(latencies, 0.99) * 1000:.1f} ms | {len(latencies) / elapsed:.0f} req/s | "
+            f"429={rejected}"
+        )
+
+    rps = len(pooled[0]) / pooled[2]
+    threshold = os.environ.get("VPB_API_LOAD_MIN_RPS")
+    if threshold:
+        assert rps >= float(threshold), f"Durchsatz zu gering: {rps:.0f} req/s < {threshold}"
+    assert len(pooled[0]) + pooled[1] == requests
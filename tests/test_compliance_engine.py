@@ -0,0 +1,161 @@
+"""
+Tests für den kompilierten Regelplan der VBPComplianceEngine (ProcessIndex)
+und validate_many über ein Prozess-Portfolio im Prozess-Pool.
+
+Der Benchmark vergleicht validate_uds3_process in einer Schleife mit
+validate_many (Pool) und wird nur geloggt. Größe über
+VPB_COMPLIANCE_BENCH_SIZE, optionaler Schwellenwert VPB_COMPLIANCE_MIN_SPEEDUP.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from vpb_compliance_engine import (
+    ProcessIndex,
+    VBPComplianceEngine,
+    VBPComplianceLevel,
+    process_graph_of,
+    to_compliance_document,
+)
+
+PROCESSES = Path(__file__).resolve().parent.parent / "processes"
+
+DOCUMENT = {
+    'document_id': 'antrag_001',
+    'content': {
+        'process_name': 'Antragsbearbeitung Test',
+        'process_description': 'Dieser Prozess dient der systematischen Bearbeitung von Anträgen. '
+                               'Der Ablauf umfasst Prüfung und Bescheid.',
+        'process_steps': [
+            {'step_id': 's1', 'step_name': 'Antrag prüfen', 'step_type': 'userTask',
+             'verwaltung_specific': {'zustaendig': 'Sachbearbeiter A'}},
+            {'step_id': 's2', 'step_name': 'Akte ablegen', 'step_type': 'manualTask'},
+            {'step_id': 's3', 'step_type': 'serviceTask'},
+        ]
+    },
+    'verwaltungsattribute': {
+        'rechtsgrundlage': 'VwVfG',
+        'zustaendigkeit': 'Kommunal',
+        'datenschutz_relevant': True,
+        'sicherheitsstufe': 'normal'
+    }
+}
+
+
+def _vpb_documents(count):
+    """(process_id, JSON) wie VPBSQLiteDB.iter_process_documents()"""
+    files = sorted(PROCESSES.glob("*.vpb.json"))
+    texts = [path.read_text(encoding="utf-8") for path in files]
+    return [(f"P{i:06d}", texts[i % len(texts)]) for i in range(count)]
+
+
+def test_process_index_single_pass():
+    index = ProcessIndex(DOCUMENT)
+    assert index.process_name == 'Antragsbearbeitung Test'
+    assert 'ablauf' in index.description_lower
+    assert index.unassigned_tasks == ('Akte ablegen',)
+    assert ProcessIndex({'content': None}).steps == []
+
+
+def test_compiled_plan_results():
+    engine = VBPComplianceEngine()
+    result = engine.validate_uds3_process(DOCUMENT)
+
+    assert result.violations == []
+    warnings = {w['rule_id']: w for w in result.warnings}
+    assert warnings['BVA_003']['message'] == 'Nicht alle Benutzer-Tasks haben Zuständigkeitszuweisungen'
+    assert 'BVA_002' in warnings  # Abschnitt "Zweck" fehlt
+    assert 'FIM_002' in warnings  # kein Paragraph in der Rechtsgrundlage
+    assert result.validation_details['bva']['rules_checked'] == 4
+
+    # _validate_rule akzeptiert weiterhin das Dokument selbst
+    rule = engine.bva_rules[2]
+    assert engine._validate_rule(DOCUMENT, rule)['details'] == {'unassigned_steps': ['Akte ablegen']}
+
+    # Geänderte Regeln greifen nach compile_rules()
+    engine.all_rules = {'security': engine.security_rules}
+    engine.compile_rules()
+    assert list(engine.validate_uds3_process(DOCUMENT).category_scores) == ['security']
+
+
+def test_to_compliance_document_maps_vpb_process():
+    data = json.loads((PROCESSES / "antrag_basic_low.vpb.json").read_text(encoding="utf-8"))
+    document = to_compliance_document(json.dumps(data), "P1")
+
+    assert document['document_id'] == "P1"
+    assert document['content']['process_name'] == data['metadata']['name']
+    steps = document['content']['process_steps']
+    assert len(steps) == len(data['elements'])
+    function = next(s for s in steps if s['step_id'] == 'F1')
+    assert function['step_type'] == 'userTask'
+    assert function['verwaltung_specific']['zustaendig'] == 'Servicestelle'
+
+    assert to_compliance_document(DOCUMENT) is DOCUMENT
+
+
+def test_structure_warnings_from_process_graph():
+    data = json.loads((PROCESSES / "antrag_basic_low.vpb.json").read_text(encoding="utf-8"))
+    engine = VBPComplianceEngine()
+    clean = engine.validate_uds3_process(to_compliance_document(data), process_graph_of(data))
+    assert clean.validation_details['structure']['unreachable'] == 0
+    assert not [w for w in clean.warnings if w['rule_id'] == 'struktur_graph']
+
+    # Abgetrennte Schleife: weder vom Start erreichbar noch mit Weg zum Ende
+    for element_id in ('F8', 'F9'):
+        data['elements'].append(dict(data['elements'][1], element_id=element_id, name='Verwaist'))
+    data['connections'] += [
+        {'connection_id': 'C8', 'source_element': 'F8', 'target_element': 'F9'},
+        {'connection_id': 'C9', 'source_element': 'F9', 'target_element': 'F8'},
+    ]
+    (doc_id, result), = engine.validate_many([("P1", json.dumps(data))], workers=1)
+    structure = result.validation_details['structure']
+    assert structure['unreachable'] == 2 and structure['dead_ends'] == 2 and structure['warnings'] == 2
+    messages = [w['message'] for w in result.warnings if w['rule_id'] == 'struktur_graph']
+    assert messages == ['2 Prozessschritte sind vom Start aus nicht erreichbar',
+                        '2 Prozessschritte führen zu keinem Prozessende']
+    assert process_graph_of(DOCUMENT) is None
+    assert 'structure' not in engine.validate_uds3_process(DOCUMENT).validation_details
+
+
+def test_validate_many_streams_in_order_inline_and_pool():
+    engine = VBPComplianceEngine()
+    documents = _vpb_documents(60) + [("kaputt", "{kein json"), ("uds3", DOCUMENT)]
+
+    inline = list(engine.validate_many(documents, workers=1, chunk_size=7))
+    pooled = list(engine.validate_many(iter(documents), workers=2, chunk_size=7))
+
+    assert [doc_id for doc_id, _ in pooled] == [doc_id for doc_id, _ in documents]
+    assert pooled == inline
+    assert inline[-1][1] == engine.validate_uds3_process(DOCUMENT)
+    broken = dict(inline)["kaputt"]
+    assert broken.overall_level is VBPComplianceLevel.NICHT_KONFORM
+    assert broken.violations[0]['rule_id'] == 'system_error'
+
+
+def test_validate_many_benchmark_log_only():
+    count = int(os.environ.get("VPB_COMPLIANCE_BENCH_SIZE", "5000"))
+    documents = _vpb_documents(count)
+    engine = VBPComplianceEngine()
+
+    start = time.perf_counter()
+    sequential = [
+        (doc_id, engine.validate_uds3_process(to_compliance_document(text, doc_id), process_graph_of(text)))
+        for doc_id, text in documents
+    ]
+    sequential_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pooled = list(engine.validate_many(documents))
+    pooled_s = time.perf_counter() - start
+
+    speedup = sequential_s / max(pooled_s, 1e-6)
+    print(
+        f"\nPERF COMPLIANCE n={count} workers={os.cpu_count()}: sequential={count / sequential_s:.0f} docs/s | "
+        f"validate_many={count / pooled_s:.0f} docs/s | speedup={speedup:.1f}x"
+    )
+    assert pooled == sequential
+    threshold = os.environ.get("VPB_COMPLIANCE_MIN_SPEEDUP")
+    if threshold:
+        assert speedup >= float(threshold), f"Speedup zu gering: {speedup:.1f}x < {threshold}x"
@@ -0,0 +1,124 @@
+"""
+Tests für den Kontext-Cache von VPBDataPreparator: LRU über
+(process_id, updated_at), lazy Abschnitte und Token-Budget im Prompt.
+
+Der Benchmark misst die Latenz wiederholter Anfragen zum selben Prozess
+(erste Anfrage vs. Cache-Treffer) und wird nur geloggt. Optionaler
+Schwellenwert VPB_PREP_MIN_SPEEDUP.
+"""
+
+import os
+import time
+
+import pytest
+
+pytest.importorskip("uds3_vpb_schema")
+
+from uds3_vpb_schema import VPBConnectionData, VPBElementData, VPBProcessRecord  # noqa: E402
+from vpb_data_preparation import (  # noqa: E402
+    PROMPT_TEMPLATE,
+    TRUNCATION_MARKER,
+    VPBDataPreparator,
+    estimate_tokens,
+)
+from vpb_sqlite_db import VPBSQLiteDB  # noqa: E402
+
+
+def _process(process_id: str, elements: int = 50) -> VPBProcessRecord:
+    process = VPBProcessRecord(process_id=process_id, name=f"Prozess {process_id}")
+    process.elements = [
+        VPBElementData(element_id=f"E{j}", element_type="task", name=f"Schritt {j}",
+                       description=f"Bearbeitung von Schritt {j} durch das Bauamt",
+                       competent_authority="Bauamt", x=float(j * 120), y=80.0)
+        for j in range(elements)
+    ]
+    process.connections = [
+        VPBConnectionData(connection_id=f"C{j}", source_element_id=f"E{j}", target_element_id=f"E{j + 1}")
+        for j in range(elements - 1)
+    ]
+    return process
+
+
+@pytest.fixture
+def preparator(tmp_path):
+    db_path = str(tmp_path / "prep.db")
+    with VPBSQLiteDB(db_path) as db:
+        for process_id in ("P1", "P2", "P3"):
+            db.save_process(_process(process_id))
+    prep = VPBDataPreparator(db_path, cache_size=2)
+    yield prep
+    prep.vpb_db.close()
+
+
+def test_cache_hits_until_process_changes(preparator):
+    first = preparator.prepare_process_for_llm("P1", "Frage 1")
+    second = preparator.prepare_process_for_llm("P1", "Frage 2")
+    assert preparator.cache_stats == {"hits": 1, "misses": 1, "evictions": 0}
+    assert first.process is second.process
+    assert second.metadata["query_context"] == "Frage 2"
+
+    process = preparator.vpb_db.load_process("P1")
+    process.name = "Umbenannt"
+    preparator.vpb_db.save_process(process)  # neues updated_at
+    assert "Umbenannt" in preparator.prepare_process_for_llm("P1").process_overview
+    assert preparator.cache_stats["misses"] == 2
+
+    preparator.prepare_process_for_llm("P2")
+    preparator.prepare_process_for_llm("P3")
+    assert preparator.cache_stats["evictions"] == 1
+
+    with pytest.raises(ValueError):
+        preparator.prepare_process_for_llm("fehlt")
+
+
+def test_sections_are_built_lazily(preparator):
+    context = preparator.prepare_process_for_llm("P1")
+    assert context.built_sections() == []
+
+    prompt = preparator.format_for_llm_prompt(
+        context, "Welche Fristen gelten?", template="{query}\n\n{process_overview}\n\n{legal_context}"
+    )
+    assert prompt.startswith("Welche Fristen gelten?")
+    assert context.built_sections() == ["process_overview", "legal_context"]
+
+    with pytest.raises(ValueError):
+        preparator.format_for_llm_prompt(context, "x", template="{unbekannt}")
+
+
+def test_token_budget_truncates_lowest_priority_first(preparator):
+    context = preparator.prepare_process_for_llm("P1")
+    full = preparator.format_for_llm_prompt(context, "Analyse")
+    assert TRUNCATION_MARKER not in full
+
+    budget = estimate_tokens(full) - 100
+    prompt = preparator.format_for_llm_prompt(context, "Analyse", max_tokens=budget)
+    assert estimate_tokens(prompt) <= budget
+    assert context.process_overview in prompt  # höchste Priorität bleibt vollständig
+    assert "BENUTZERANFRAGE: Analyse" in prompt
+    assert prompt.startswith(PROMPT_TEMPLATE.split("{query}")[0])
+
+
+def test_repeated_query_latency_log_only(tmp_path):
+    db_path = str(tmp_path / "bench.db")
+    with VPBSQLiteDB(db_path) as db:
+        db.save_process(_process("BIG", elements=500))
+    preparator = VPBDataPreparator(db_path)
+    queries = [f"Frage {i}" for i in range(20)]
+
+    start = time.perf_counter()
+    preparator.format_for_llm_prompt(preparator.prepare_process_for_llm("BIG", queries[0]), queries[0])
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for query in queries[1:]:
+        preparator.format_for_llm_prompt(preparator.prepare_process_for_llm("BIG", query), query)
+    warm_ms = (time.perf_counter() - start) * 1000 / (len(queries) - 1)
+    preparator.vpb_db.close()
+
+    speedup = cold_ms / max(warm_ms, 1e-6)
+    print(f"\nPERF LLM-CONTEXT 500 Elemente: erste Anfrage={cold_ms:.1f} ms | "
+          f"Wiederholung={warm_ms:.2f} ms | speedup={speedup:.0f}x")
+    assert preparator.cache_stats["hits"] == len(queries) - 1
+    threshold = os.environ.get("VPB_PREP_MIN_SPEEDUP")
+    if threshold:
+        assert speedup >= float(threshold), f"Speedup zu gering: {speedup:.1f}x < {threshold}x"
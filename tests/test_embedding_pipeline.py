@@ -0,0 +1,177 @@
+"""
+Tests für die Batch-Embedding-Pipeline des ChromaDBAdapter
+(add_many/upsert_many, Embedding Cache) und das selektive Re-Embedding
+in UDS3PolyglotManager.update_process.
+
+Statt SentenceTransformer wird ein deterministischer Fake-Encoder mit
+fester Kosten pro encode()-Aufruf und pro Text verwendet. Der Benchmark
+wird nur geloggt; optionaler Schwellenwert VPB_EMBED_MIN_SPEEDUP.
+"""
+
+import hashlib
+import os
+import time
+
+import pytest
+
+from core.embedding_cache import EmbeddingCache
+from core.polyglot_manager import BackendConfig, ChromaDBAdapter, UDS3Config, UDS3PolyglotManager
+
+
+class _FakeEncoder:
+    """Deterministische 8-dim Vektoren aus dem sha1 des Textes."""
+
+    def __init__(self, call_cost=0.0, text_cost=0.0):
+        self.call_cost, self.text_cost = call_cost, text_cost
+        self.calls = 0
+        self.texts = 0
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.calls += 1
+        self.texts += len(batch)
+        time.sleep(self.call_cost + self.text_cost * len(batch))
+        vectors = [[b / 255.0 for b in hashlib.sha1(t.encode()).digest()[:8]] for t in batch]
+        return vectors[0] if single else vectors
+
+
+class _FakeCollection:
+    def __init__(self):
+        self.writes = []
+        self.rows = {}
+
+    def _write(self, method, ids, embeddings, documents, metadatas):
+        self.writes.append((method, len(ids)))
+        for i, pid in enumerate(ids):
+            self.rows[pid] = (embeddings[i], documents[i], metadatas[i])
+
+    def add(self, **kwargs):
+        self._write("add", **kwargs)
+
+    def upsert(self, **kwargs):
+        self._write("upsert", **kwargs)
+
+    def update(self, **kwargs):
+        self._write("update", **kwargs)
+
+
+def _adapter(encoder=None, **options):
+    adapter = ChromaDBAdapter(BackendConfig(options=options))
+    adapter.embedding_model = encoder or _FakeEncoder()
+    adapter.collection = _FakeCollection()
+    adapter.connected = True
+    return adapter
+
+
+def _records(n, prefix="Prozess"):
+    return [(f"P{i}", f"{prefix} {i} Bauamt", {"process_id": f"P{i}"}) for i in range(n)]
+
+
+def test_add_many_batches_encode_and_writes():
+    adapter = _adapter(encode_batch_size=16, write_batch_size=40)
+    assert adapter.add_many(_records(100)) == 100
+    assert adapter.collection.writes == [("add", 40), ("add", 40), ("add", 20)]
+    assert adapter.embedding_model.texts == 100
+    assert adapter.embedding_model.calls == 8  # je Write-Batch: 16+16+8, 16+16+8, 16+4
+
+    single = _adapter()
+    single.add("P7", "Prozess 7 Bauamt", {})
+    assert single.collection.rows["P7"][0] == adapter.collection.rows["P7"][0]
+
+
+def test_cache_skips_unchanged_texts_and_duplicates():
+    adapter = _adapter()
+    records = _records(50) + [("DUP", "Prozess 3 Bauamt", {})]
+    adapter.upsert_many(records)
+    assert adapter.embedding_model.texts == 50  # Duplikat nur einmal encodiert
+
+    changed = _records(45) + _records(5, prefix="Neu")
+    adapter.upsert_many(changed)
+    assert adapter.embedding_model.texts == 55
+    assert adapter.embedding_cache.stats["memory_hits"] >= 45
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    first = _adapter(embedding_cache_path=path)
+    first.upsert_many(_records(20))
+    first.embedding_cache.close()
+
+    second = _adapter(embedding_cache_path=path)
+    second.upsert_many(_records(20))
+    assert second.embedding_model.texts == 0
+    assert second.embedding_cache.stats["disk_hits"] == 20
+    # Persistiert als float32
+    assert second.collection.rows["P3"][0] == pytest.approx(first.collection.rows["P3"][0], abs=1e-6)
+
+
+def test_lru_is_bounded():
+    cache = EmbeddingCache(max_entries=3)
+    for i in range(5):
+        cache.put(cache.key(str(i)), [float(i)])
+    assert len(cache) == 3
+    assert cache.get(cache.key("0")) is None
+    assert cache.get(cache.key("4")) == [4.0]
+
+
+class _StubBackend:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, method):
+        if method.startswith("_"):
+            raise AttributeError(method)
+        return lambda *args, **kwargs: self.calls.append(method) or True
+
+
+class _StubPostgres(_StubBackend):
+    def get_process(self, process_id):
+        return {"process_id": process_id,
+                "process_data": {"process_id": process_id, "name": "Baugenehmigung", "authority": "Bauamt"}}
+
+
+def test_update_reembeds_only_on_changed_text():
+    manager = UDS3PolyglotManager(UDS3Config())
+    manager.postgresql, manager.neo4j, manager.chromadb = _StubPostgres(), _StubBackend(), _StubBackend()
+
+    assert manager.update_process("P1", {"name": "Baugenehmigung", "status": "active"})
+    assert manager.update_process("P1", {"authority": "Bauamt"})
+    assert manager.chromadb.calls == []
+
+    assert manager.update_process("P1", {"name": "Abrissgenehmigung"})
+    assert manager.chromadb.calls == ["update"]
+
+
+def test_batch_embedding_benchmark_log_only():
+    n = int(os.environ.get("VPB_EMBED_BENCH_N", "500"))
+    records = _records(n)
+
+    def encoder():
+        return _FakeEncoder(call_cost=0.002, text_cost=0.0001)
+
+    single = _adapter(encoder(), embedding_cache_size=0)
+    start = time.perf_counter()
+    for pid, text, meta in records:
+        single.add(pid, text, meta)
+    per_record = time.perf_counter() - start
+
+    batched = _adapter(encoder(), encode_batch_size=64)
+    start = time.perf_counter()
+    batched.upsert_many(records)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched.upsert_many(records)
+    warm = time.perf_counter() - start
+
+    speedup = per_record / cold
+    print(
+        f"PERF EMBED n={n}: add={per_record * 1000:.0f} ms ({single.embedding_model.calls} encode) | "
+        f"upsert_many cold={cold * 1000:.0f} ms ({len(batched.collection.writes) // 2} writes) | "
+        f"warm={warm * 1000:.1f} ms | speedup={speedup:.1f}x"
+    )
+    assert len(batched.collection.rows) == n
+    threshold = os.environ.get("VPB_EMBED_MIN_SPEEDUP")
+    if threshold:
+        assert speedup >= float(threshold), f"Speedup zu gering: {speedup:.1f}x < {threshold}x"
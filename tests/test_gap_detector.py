@@ -0,0 +1,216 @@
+"""
+Test: Gap Detector
+SQLite ↔ UDS3 Abgleich per Sorted-Merge und Checksums, Übergabe an die
+AutoFixEngine und ein Benchmark über 100k Prozesse.
+
+Die UDS3-Seite ist ein lokaler Stand-in (eigene SQLite-DB mit
+iter_processes / save_process / delete_process). Der Benchmark wird nur
+geloggt; Größe über VPB_GAP_BENCH_SIZE, optionale Obergrenze in Sekunden
+über VPB_GAP_MAX_SECONDS.
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+import pytest
+
+from migration.auto_fix import AutoFixEngine, FixStatus, FixStrategy
+from migration.gap_detector import GapDetector, GapType, merge_sorted
+from migration.validation import process_document
+
+
+class LocalUDS3:
+    """Stand-in für UDS3PolyglotManager: Prozessdokumente in SQLite"""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS uds3_processes (process_id TEXT PRIMARY KEY, process_data TEXT)"
+        )
+
+    def iter_processes(self, batch_size=1000):
+        cursor = self.conn.execute("SELECT process_id, process_data FROM uds3_processes ORDER BY process_id")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for process_id, data in rows:
+                yield {**json.loads(data), "process_id": process_id}
+
+    def save_process(self, process_data, domain="vpb", generate_embeddings=True):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO uds3_processes VALUES (?, ?)",
+            (process_data["process_id"], json.dumps(process_data))
+        )
+        self.conn.commit()
+        return process_data["process_id"]
+
+    def delete_process(self, process_id, domain="vpb", soft_delete=True):
+        self.conn.execute("DELETE FROM uds3_processes WHERE process_id = ?", (process_id,))
+        self.conn.commit()
+        return True
+
+
+def _create_source(path, count):
+    conn = sqlite3.connect(str(path))
+    conn.execute("""
+        CREATE TABLE vpb_processes (
+            process_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT,
+            process_data TEXT,
+            version INTEGER DEFAULT 1
+        )
+    """)
+    rows = (
+        (
+            f"P{i:07d}", f"Prozess {i}", f"Beschreibung {i}",
+            json.dumps({"elements": [{"id": f"e{i}", "type": "activity"}], "connections": []}), 1
+        )
+        for i in range(count)
+    )
+    conn.executemany("INSERT INTO vpb_processes VALUES (?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def _migrate(source_path, target, skip=(), modify=(), orphans=()):
+    """Kopiert die Quelle wie die Migration (Dokument + Migrationsfelder)"""
+    conn = sqlite3.connect(str(source_path))
+    conn.row_factory = sqlite3.Row
+    rows = []
+    for row in conn.execute("SELECT * FROM vpb_processes"):
+        if row["process_id"] in skip:
+            continue
+        document = {**process_document(dict(row)), "migrated_from": "sqlite", "migration_timestamp": "t"}
+        if row["process_id"] in modify:
+            document["name"] += " (geändert)"
+        rows.append((row["process_id"], json.dumps(document)))
+    rows.extend((pid, json.dumps({"process_id": pid, "name": "Nur in UDS3"})) for pid in orphans)
+    target.conn.executemany("INSERT INTO uds3_processes VALUES (?, ?)", rows)
+    target.conn.commit()
+    conn.close()
+
+
+def test_merge_sorted():
+    source = [("a", 1), ("c", 3), ("d", 4)]
+    target = [("b", "B"), ("c", "C"), ("e", "E")]
+    assert list(merge_sorted(source, target)) == [
+        ("a", 1, None), ("b", None, "B"), ("c", 3, "C"), ("d", 4, None), ("e", None, "E")
+    ]
+    assert list(merge_sorted([], [("x", 1)])) == [("x", None, 1)]
+    with pytest.raises(ValueError):
+        list(merge_sorted([("b", 1), ("a", 2)], []))
+
+
+def test_detects_missing_orphaned_and_mismatched(tmp_path):
+    source = tmp_path / "source.db"
+    _create_source(source, 50)
+    target = LocalUDS3(tmp_path / "uds3.db")
+    _migrate(source, target, skip={"P0000003", "P0000040"}, modify={"P0000010"}, orphans={"P0000007a", "Z1"})
+
+    detector = GapDetector(str(source), {"manager": target})
+    gaps = detector.detect_all_gaps()
+
+    by_type = {gap_type: sorted(g.record_id for g in detector.get_gaps_by_type(gap_type)) for gap_type in GapType}
+    assert by_type[GapType.MISSING_RECORD] == ["P0000003", "P0000040"]
+    assert by_type[GapType.ORPHANED_RECORD] == ["P0000007a", "Z1"]
+    assert by_type[GapType.INCOMPLETE_MIGRATION] == ["P0000010"]
+    assert len(gaps) == 5
+
+    missing = detector.get_gaps_by_type(GapType.MISSING_RECORD)[0]
+    assert missing.auto_fixable and missing.source_data["name"] == "Prozess 3"
+
+    capped = GapDetector(str(source), {"manager": target, "max_gaps": 1})
+    capped.detect_all_gaps()
+    assert len(capped.get_gaps_by_type(GapType.MISSING_RECORD)) == 1
+    assert capped.generate_report()["truncated"] == {"missing_record": 1, "orphaned_record": 1}
+
+
+def test_gaps_feed_auto_fix_engine(tmp_path):
+    source = tmp_path / "source.db"
+    _create_source(source, 20)
+    target = LocalUDS3(tmp_path / "uds3.db")
+    _migrate(source, target, skip={"P0000005"}, modify={"P0000006"}, orphans={"X1"})
+    detector = GapDetector(str(source), {"manager": target})
+
+    engine = AutoFixEngine(detector, auto_confirm=True)
+    report = engine.auto_fix_gaps()
+
+    strategies = {action.gap.record_id: action.strategy for action in report.actions}
+    assert strategies == {
+        "P0000005": FixStrategy.COPY_FROM_SOURCE,
+        "P0000006": FixStrategy.UPDATE_TARGET,
+        "X1": FixStrategy.DELETE_FROM_TARGET,
+    }
+    assert all(action.status is FixStatus.SUCCESS for action in report.actions)
+    assert report.fixed == 3
+
+    # Fixes schreiben dasselbe Dokument wie die Migration -> keine Lücken mehr
+    assert detector.detect_all_gaps() == []
+
+
+def test_corruption_detection_streams_and_diff_skips_corrupt_rows(tmp_path):
+    source = tmp_path / "source.db"
+    _create_source(source, 10)
+    target = LocalUDS3(tmp_path / "uds3.db")
+    _migrate(source, target)
+    conn = sqlite3.connect(str(source))
+    conn.execute("UPDATE vpb_processes SET process_data = '{kaputt' WHERE process_id = 'P0000002'")
+    conn.commit()
+    conn.close()
+
+    gaps = GapDetector(str(source), {"manager": target}).detect_all_gaps()
+    assert [(g.gap_type, g.record_id) for g in gaps] == [(GapType.DATA_CORRUPTION, "P0000002")]
+
+
+def test_without_uds3_side_no_diff_gaps(tmp_path, monkeypatch):
+    source = tmp_path / "source.db"
+    _create_source(source, 5)
+    detector = GapDetector(str(source))
+    monkeypatch.setattr(detector, "_get_uds3_manager", lambda: None)
+    assert detector.detect_all_gaps() == []
+
+
+def _rss_mb():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process(os.getpid()).memory_info().rss / 1024 / 1024
+
+
+def test_gap_detection_benchmark_log_only(tmp_path):
+    count = int(os.environ.get("VPB_GAP_BENCH_SIZE", "100000"))
+    source = tmp_path / "source.db"
+    _create_source(source, count)
+    target = LocalUDS3(tmp_path / "uds3.db")
+    step = max(1, count // 1000)
+    skip = {f"P{i:07d}" for i in range(0, count, step * 2)}
+    modify = {f"P{i:07d}" for i in range(step, count, step * 4)}
+    orphans = {f"P{i:07d}x" for i in range(0, count, step * 3)}
+    _migrate(source, target, skip=skip, modify=modify, orphans=orphans)
+
+    rss_start = _rss_mb()
+    start = time.perf_counter()
+    detector = GapDetector(str(source), {"manager": target})
+    detector.detect_all_gaps()
+    duration = time.perf_counter() - start
+    rss_end = _rss_mb()
+
+    report = detector.generate_report()["by_type"]
+    rss = f"{rss_end - rss_start:+.1f} MB RSS" if rss_start is not None else "RSS n/a"
+    print(
+        f"\nPERF GAPS n={count}: {duration:.2f} s ({count / duration:.0f} records/s) | {rss} | "
+        f"missing={report['missing_record']} orphaned={report['orphaned_record']} "
+        f"mismatch={report['incomplete_migration']}"
+    )
+
+    assert report["missing_record"] == len(skip)
+    assert report["orphaned_record"] == len(orphans)
+    assert report["incomplete_migration"] == len(modify - skip)
+    limit = os.environ.get("VPB_GAP_MAX_SECONDS")
+    if limit:
+        assert duration <= float(limit), f"Gap Detection zu langsam: {duration:.1f} s > {limit} s"
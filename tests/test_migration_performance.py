@@ -7,6 +7,8 @@ Tests:
 - Memory Usage Monitoring
 - Stress Testing
 - Benchmark gegen Performance Goals
+- Pipeline (Keyset, parallele Writer, Checkpoints): Records/s und Peak RSS
+  bei 10k / 100k Records (VPB_MIGRATION_MIN_RPS, VPB_MIGRATION_MAX_RSS_MB)
 
 Author: VPB Development Team
 Date: 18. Oktober 2025
@@ -14,6 +16,7 @@ Date: 18. Oktober 2025
 
 import pytest
 import sqlite3
+import threading
 import time
 import json
 import psutil
@@ -24,6 +27,8 @@ import cProfile
 import pstats
 from io import StringIO
 
+from core.polyglot_manager import BulkWriteError, UDS3Config, UDS3PolyglotManager
+
 # Import Migration Tools
 from migration.migration_tool import VPBMigrationTool, MigrationConfig
 from migration.gap_detector import GapDetector
@@ -622,6 +627,266 @@ def test_validation_performance(test_db_1k):
     print("✅ Test PASSED")
 
 
+# ============================================================
+# Pipeline: Keyset-Pagination, parallele Writer, Checkpoints
+# ============================================================
+
+class BulkTarget:
+    """
+    UDS3-Stand-in mit save_processes_bulk: feste Latenz je Aufruf
+    (Netzwerk-Roundtrip), merkt sich nur die process_ids.
+    """
+    
+    def __init__(self, latency: float = 0.002, fail_on_call: int = 0, reject=()):
+        self.latency = latency
+        self.fail_on_call = fail_on_call
+        self.reject = set(reject)
+        self.calls = 0
+        self.ids = set()
+        self._lock = threading.Lock()
+    
+    def save_processes_bulk(self, processes, domain="vpb", generate_embeddings=True):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self.latency)
+        if call == self.fail_on_call:
+            raise RuntimeError("Backend nicht erreichbar")
+        rejected = self.reject.intersection(p["process_id"] for p in processes)
+        if rejected:
+            raise ValueError(f"Ungültiger Prozess: {sorted(rejected)}")
+        with self._lock:
+            self.ids.update(p["process_id"] for p in processes)
+        return len(processes)
+
+
+def _pipeline_config(db_path, target, **kwargs):
+    options = dict(
+        target_config={"manager": target},
+        enable_gap_detection=False,
+        enable_validation=False,
+    )
+    options.update(kwargs)
+    return MigrationConfig(source_db_path=db_path, **options)
+
+
+def test_pipeline_migrates_all_records_with_progress(test_db_1k):
+    target = BulkTarget()
+    updates = []
+    batches = []
+    config = _pipeline_config(test_db_1k, target, batch_size=64, writer_workers=3)
+    tool = VPBMigrationTool(config, lambda current, total, message: updates.append((current, message)))
+    
+    stats = tool.migrate_table("vpb_processes", progress_callback=lambda n, size, table: batches.append(size))
+    
+    assert stats["success"] and stats["successful_records"] == 1000
+    assert target.ids == {f"test_process_{i:06d}" for i in range(1000)}
+    assert target.calls == len(batches) == 16  # ceil(1000 / 64)
+    assert sum(batches) == 1000
+    assert updates[-1][0] == 1000
+    assert "rec/s" in updates[-1][1] and "ETA" in updates[-1][1]
+    assert tool.progress.processed == 1000 and tool.progress.eta_seconds == 0
+
+
+def test_pipeline_resumes_from_checkpoint(test_db_1k, tmp_path):
+    checkpoint = str(tmp_path / "migration.checkpoint.json")
+    failing = BulkTarget(fail_on_call=5)
+    config = _pipeline_config(test_db_1k, failing, batch_size=100, writer_workers=1,
+                              checkpoint_path=checkpoint)
+    
+    stats = VPBMigrationTool(config).migrate_table("vpb_processes")
+    assert not stats["success"]
+    assert stats["successful_records"] == 400
+    
+    saved = json.loads(Path(checkpoint).read_text(encoding="utf-8"))["tables"]["vpb_processes"]
+    assert saved == {**saved, "last_key": "test_process_000399", "migrated": 400, "completed": False}
+    
+    target = BulkTarget()
+    config = _pipeline_config(test_db_1k, target, batch_size=100, writer_workers=4,
+                              checkpoint_path=checkpoint)
+    stats = VPBMigrationTool(config).migrate_table("vpb_processes")
+    assert stats["success"] and stats["resumed_records"] == 400
+    assert stats["successful_records"] == 1000
+    assert len(target.ids) == 600 and "test_process_000400" in target.ids
+    
+    # Vollständig migriert -> dritter Lauf schreibt nichts
+    again = BulkTarget()
+    config = _pipeline_config(test_db_1k, again, checkpoint_path=checkpoint)
+    result = VPBMigrationTool(config).migrate()
+    assert again.calls == 0
+    assert result.migrated_records == result.resumed_records == 1000
+
+
+def test_pipeline_continue_on_error_retries_batch_per_record(test_db_1k, tmp_path):
+    checkpoint = str(tmp_path / "migration.checkpoint.json")
+    target = BulkTarget(reject={"test_process_000250"})
+    config = _pipeline_config(test_db_1k, target, batch_size=100, writer_workers=2,
+                              checkpoint_path=checkpoint, continue_on_error=True)
+    tool = VPBMigrationTool(config)
+    
+    stats = tool.migrate_table("vpb_processes")
+    assert stats["successful_records"] == 999 and stats["failed_records"] == 1
+    assert target.calls == 10 + 100  # nur Batch 3 einzeln wiederholt
+    assert len(target.ids) == 999 and "test_process_000250" not in target.ids
+    assert [e for e in tool.result.errors if "test_process_000250" in e]
+    
+    # Der Record ist erfasst -> die Watermark läuft bis zum Ende weiter
+    saved = json.loads(Path(checkpoint).read_text(encoding="utf-8"))["tables"]["vpb_processes"]
+    assert saved["last_key"] == "test_process_000999" and saved["migrated"] == 999
+    assert not saved["completed"]
+
+
+def test_pipeline_corrupt_record_fails_alone(test_db_1k, tmp_path):
+    conn = sqlite3.connect(test_db_1k)
+    conn.execute("UPDATE vpb_processes SET process_data = '{broken' WHERE process_id = 'test_process_000150'")
+    conn.commit()
+    conn.close()
+    checkpoint = str(tmp_path / "migration.checkpoint.json")
+    target = BulkTarget()
+    config = _pipeline_config(test_db_1k, target, batch_size=100, writer_workers=1,
+                              checkpoint_path=checkpoint, continue_on_error=True)
+    tool = VPBMigrationTool(config)
+    
+    stats = tool.migrate_table("vpb_processes")
+    assert stats["failed_records"] == 1 and stats["successful_records"] == 999
+    assert tool.result.failed_records == 1 and target.calls == 10
+    assert [e for e in tool.result.errors if "test_process_000150" in e]
+    
+    # Rerun setzt nach dem letzten Batch fort, statt Batch 2 erneut zu schreiben
+    again = BulkTarget()
+    stats = VPBMigrationTool(_pipeline_config(test_db_1k, again, checkpoint_path=checkpoint,
+                                              continue_on_error=True)).migrate_table("vpb_processes")
+    assert again.calls == 0 and stats["resumed_records"] == 999
+
+
+def test_migrate_table_reports_setup_errors(test_db_1k):
+    config = _pipeline_config(test_db_1k, BulkTarget())
+    stats = VPBMigrationTool(config).migrate_table("vpb_missing")
+    assert not stats["success"] and "vpb_missing" in stats["error"]
+
+
+class _BulkBackend:
+    """Backend-Stub für save_processes_bulk: schreibt bis zu `limit` Prozesse je Aufruf."""
+    
+    def __init__(self, limit=None):
+        self.config = type("Config", (), {"enabled": True})()
+        self.limit = limit
+    
+    def _write(self, items):
+        return len(items) if self.limit is None else min(self.limit, len(items))
+    
+    save_processes = save_process_graphs = upsert_many = _write
+
+
+def test_pipeline_backend_shortfall_holds_checkpoint(test_db_1k, tmp_path):
+    config = UDS3Config()
+    config.local_vector.connection_string = str(tmp_path / "vectors")
+    manager = UDS3PolyglotManager(config)
+    manager.postgresql, manager.chromadb = _BulkBackend(), _BulkBackend()
+    manager.neo4j = _BulkBackend(limit=0)  # Neo4j nicht erreichbar
+    
+    with pytest.raises(BulkWriteError) as error:
+        manager.save_processes_bulk([{"process_id": "P1"}, {"process_id": "P2"}])
+    assert error.value.counts == {"postgresql": 2, "neo4j": 0, "chromadb": 2}
+    
+    checkpoint = str(tmp_path / "migration.checkpoint.json")
+    migration = _pipeline_config(test_db_1k, manager, batch_size=100, writer_workers=1,
+                                 checkpoint_path=checkpoint, continue_on_error=True)
+    stats = VPBMigrationTool(migration).migrate_table("vpb_processes")
+    assert stats["failed_records"] == 1000 and not stats["success"]
+    assert not Path(checkpoint).exists() or not json.loads(
+        Path(checkpoint).read_text(encoding="utf-8"))["tables"].get("vpb_processes")
+    
+    # Neo4j wieder da: der Rerun schreibt alle Batches erneut
+    manager.neo4j = _BulkBackend()
+    stats = VPBMigrationTool(migration).migrate_table("vpb_processes")
+    assert stats["success"] and stats["resumed_records"] == 0 and stats["successful_records"] == 1000
+
+
+class PeakRSS:
+    """Misst die maximale RSS in einem Hintergrund-Thread (psutil)."""
+    
+    def __init__(self, interval: float = 0.01):
+        self.process = psutil.Process(os.getpid())
+        self.interval = interval
+        self.start_mb = self.peak_mb = self._rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+    
+    def _rss(self) -> float:
+        return self.process.memory_info().rss / 1024 / 1024
+    
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, self._rss())
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, self._rss())
+    
+    @property
+    def delta_mb(self) -> float:
+        return self.peak_mb - self.start_mb
+
+
+def _offset_scan_seconds(db_path: str, batch_size: int) -> float:
+    """Lesezeit der alten LIMIT/OFFSET-Pagination (Vergleich)"""
+    conn = sqlite3.connect(db_path)
+    start = time.perf_counter()
+    offset = 0
+    while conn.execute(
+        f"SELECT * FROM vpb_processes LIMIT {batch_size} OFFSET {offset}"
+    ).fetchall():
+        offset += batch_size
+    conn.close()
+    return time.perf_counter() - start
+
+
+@pytest.mark.parametrize("record_count", [
+    int(n) for n in os.environ.get("VPB_MIGRATION_BENCH_SIZES", "10000,100000").split(",")
+])
+def test_pipeline_throughput_and_peak_rss(tmp_path, record_count):
+    """
+    Pipeline-Benchmark bei 10k / 100k Records gegen BulkTarget.
+    
+    Ziele (per Umgebung überschreibbar):
+    - VPB_MIGRATION_MIN_RPS: Records/s (Default 5000)
+    - VPB_MIGRATION_MAX_RSS_MB: Peak-RSS-Zuwachs in MB (Default 150)
+    """
+    min_rps = float(os.environ.get("VPB_MIGRATION_MIN_RPS", "5000"))
+    max_rss_mb = float(os.environ.get("VPB_MIGRATION_MAX_RSS_MB", "150"))
+    db_path = str(tmp_path / f"bench_{record_count}.db")
+    create_test_database(db_path, record_count)
+    
+    target = BulkTarget(latency=0.005)
+    config = _pipeline_config(db_path, target, batch_size=500, writer_workers=4, queue_size=8,
+                              checkpoint_path=str(tmp_path / "bench.checkpoint.json"))
+    tool = VPBMigrationTool(config)
+    
+    with PeakRSS() as rss:
+        start = time.perf_counter()
+        stats = tool.migrate_table("vpb_processes")
+        duration = time.perf_counter() - start
+    
+    rps = record_count / duration
+    offset_s = _offset_scan_seconds(db_path, 500)
+    print(
+        f"\nPERF MIGRATION n={record_count}: {duration:.2f} s | {rps:.0f} rec/s | "
+        f"peak RSS +{rss.delta_mb:.1f} MB | batches={target.calls} | "
+        f"OFFSET-Scan (nur Lesen)={offset_s:.2f} s"
+    )
+    
+    assert stats["success"] and stats["successful_records"] == record_count
+    assert len(target.ids) == record_count
+    assert rps >= min_rps, f"Durchsatz zu gering: {rps:.0f} < {min_rps:.0f} rec/s"
+    assert rss.delta_mb <= max_rss_mb, f"Peak RSS zu hoch: +{rss.delta_mb:.1f} MB > {max_rss_mb:.0f} MB"
+
+
 if __name__ == "__main__":
     """
     Run Performance Tests direkt.
@@ -0,0 +1,125 @@
+"""
+Tests für die gebündelten Graph-Schreibvorgänge des Neo4jAdapter
+(UNWIND in einer Transaktion, Entfernen veralteter Elemente).
+
+Läuft gegen den In-Memory-Stand-in (tests/neo4j_standin.py), kein Neo4j-Server
+nötig. Zusätzlich ein Round-Trip-Benchmark für einen Prozess mit 1.000
+Elementen (nur Logging; optionaler Schwellenwert VPB_NEO4J_MAX_ROUND_TRIPS).
+"""
+
+import json
+import os
+import time
+
+from core.polyglot_manager import BackendConfig, Neo4jAdapter, _CYPHER_UPSERT_CONNECTIONS
+from neo4j_standin import StandInNeo4jDriver
+
+
+def _adapter(driver, batch_size=1000) -> Neo4jAdapter:
+    adapter = Neo4jAdapter(BackendConfig(connection_string="bolt://standin",
+                                         options={"unwind_batch_size": batch_size}))
+    adapter.driver = driver
+    adapter.connected = True
+    return adapter
+
+
+def _process(n: int, process_id: str = "P1") -> dict:
+    return {
+        "process_id": process_id,
+        "name": "Baugenehmigung",
+        "description": "Test",
+        "elements": [{"id": f"E{i}", "type": "Prozess", "name": f"Schritt {i}"} for i in range(n)],
+        "connections": [{"from": f"E{i}", "to": f"E{i + 1}", "type": "sequence"} for i in range(n - 1)],
+    }
+
+
+def _legacy_save(driver, process_data) -> None:
+    """Frühere Strategie: ein Auto-Commit-run() pro Prozess, Element und Verbindung."""
+    with driver.session() as session:
+        session.run("MERGE (p:Process ...)", {"process_id": process_data["process_id"]})
+        for element in process_data["elements"]:
+            session.run("MERGE (e:Element ...)", {"element_id": element["id"]})
+        for conn in process_data["connections"]:
+            session.run("MERGE (from)-[r:CONNECTED_TO]->(to)", {"from_id": conn["from"]})
+
+
+def test_save_is_one_transaction_with_chunked_unwind():
+    driver = StandInNeo4jDriver()
+    adapter = _adapter(driver, batch_size=40)
+
+    assert adapter.save_process_graph(_process(100))
+    # Prozess + 3 Element-Chunks + 3 Verbindungs-Chunks + 2 Stale-Löschungen + Commit
+    assert driver.round_trips == 1 + 3 + 3 + 2 + 1
+    assert driver.commits == 1
+    state = driver.state
+    assert len(state.elements) == 100
+    assert len(state.connections) == 99
+    assert json.loads(state.elements[("P1", "E5")]["properties"])["name"] == "Schritt 5"
+
+
+def test_resave_removes_stale_elements_and_connections():
+    driver = StandInNeo4jDriver()
+    adapter = _adapter(driver)
+    adapter.save_process_graph(_process(10))
+    adapter.save_process_graph(_process(3, process_id="P2"))
+
+    smaller = _process(6)
+    smaller["connections"].append({"from": "E5", "to": "E0", "type": "loop"})
+    smaller["connections"].pop(0)
+    assert adapter.save_process_graph(smaller)
+
+    state = driver.state
+    assert state.process_elements("P1") == [("P1", f"E{i}") for i in range(6)]
+    assert (("P1", "E0"), ("P1", "E1")) not in state.connections
+    assert state.connections[(("P1", "E5"), ("P1", "E0"))]["type"] == "loop"
+    # Gleiche Element-IDs im anderen Prozess bleiben unberührt
+    assert len(state.process_elements("P2")) == 3
+
+
+def test_failed_save_rolls_back_whole_graph():
+    driver = StandInNeo4jDriver()
+    adapter = _adapter(driver)
+    adapter.save_process_graph(_process(5))
+
+    driver.fail_on = _CYPHER_UPSERT_CONNECTIONS
+    assert not adapter.save_process_graph(_process(8))
+    assert len(driver.state.process_elements("P1")) == 5
+
+
+def test_delete_removes_process_and_orphaned_elements():
+    driver = StandInNeo4jDriver()
+    adapter = _adapter(driver)
+    adapter.save_process_graph(_process(5))
+    adapter.save_process_graph(_process(2, process_id="P2"))
+    # Element ohne HAS_ELEMENT (z.B. aus einem abgebrochenen Speichervorgang)
+    driver.state.elements[("P1", "X")] = {"process_id": "P1", "element_id": "X"}
+
+    assert adapter.delete_process_graph("P1")
+    assert not [key for key in driver.state.elements if key[0] == "P1"]
+    assert "P1" not in driver.state.processes
+    assert len(driver.state.process_elements("P2")) == 2
+
+
+def test_round_trips_per_1k_process_log_only():
+    process = _process(1000)
+    latency = float(os.environ.get("VPB_NEO4J_BENCH_LATENCY_S", "0.0002"))
+
+    legacy = StandInNeo4jDriver(round_trip_latency=latency)
+    start = time.perf_counter()
+    _legacy_save(legacy, process)
+    legacy_s = time.perf_counter() - start
+
+    driver = StandInNeo4jDriver(round_trip_latency=latency)
+    adapter = _adapter(driver)
+    start = time.perf_counter()
+    assert adapter.save_process_graph(process)
+    batched_s = time.perf_counter() - start
+
+    print(
+        f"PERF NEO4J SAVE 1k elements: before={legacy.round_trips} round trips ({legacy_s * 1000:.0f} ms) | "
+        f"after={driver.round_trips} round trips ({batched_s * 1000:.0f} ms) @ {latency * 1000:.2f} ms/RTT"
+    )
+    assert driver.round_trips < legacy.round_trips
+    threshold = os.environ.get("VPB_NEO4J_MAX_ROUND_TRIPS")
+    if threshold:
+        assert driver.round_trips <= int(threshold)
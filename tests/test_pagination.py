@@ -0,0 +1,49 @@
+"""
+Tests für die gemeinsamen Cursor-Tokens der Prozesslisten (core.pagination).
+"""
+
+from datetime import datetime
+
+import pytest
+
+from core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    clamp_limit,
+    decode_cursor,
+    encode_cursor,
+    parse_tags,
+    split_page,
+)
+
+
+def test_cursor_roundtrip_and_datetime():
+    token = encode_cursor("2025-08-22T10:00:00", "P/ü 1")
+    assert "=" not in token
+    assert decode_cursor(token) == ("2025-08-22T10:00:00", "P/ü 1")
+    assert decode_cursor(encode_cursor(datetime(2025, 8, 22, 10), "P1")) == ("2025-08-22T10:00:00", "P1")
+
+
+@pytest.mark.parametrize("token", ["", "kein-cursor", "W10", encode_cursor("x", "y")[:-3]])
+def test_invalid_cursor(token):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token)
+
+
+def test_limit_and_tags():
+    assert clamp_limit(None) == DEFAULT_PAGE_SIZE
+    assert clamp_limit("5") == 5
+    assert clamp_limit(0) == 1
+    assert clamp_limit(10 ** 6) == MAX_PAGE_SIZE
+    assert parse_tags("bau, umwelt,,") == ["bau", "umwelt"]
+    assert parse_tags(["bau", "a,b"]) == ["bau", "a", "b"]
+    assert parse_tags(None) == []
+
+
+def test_split_page():
+    rows = [("t3", "c"), ("t2", "b"), ("t1", "a")]
+    page, cursor = split_page(rows, 2, lambda row: row)
+    assert page == rows[:2]
+    assert decode_cursor(cursor) == ("t2", "b")
+    assert split_page(rows, 3, lambda row: row) == (rows, None)
@@ -0,0 +1,193 @@
+"""
+Tests für das begrenzte, persistente SAGA Transaction Log (core.saga_log)
+und dessen Nutzung im UDS3PolyglotManager (Ring, Journal, Recovery).
+"""
+
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from core.polyglot_manager import SagaStep, SagaTransaction, TransactionState, UDS3Config, UDS3PolyglotManager
+from core.saga_log import SagaTransactionLog
+
+
+class _StubBackend:
+    """Zeichnet Aufrufe auf; results: Rückgabewert je Methode (Default True)."""
+
+    def __init__(self, **results):
+        self.calls = []
+        self.results = results
+
+    def __getattr__(self, method):
+        if method.startswith("_"):
+            raise AttributeError(method)
+        return lambda *args, **kwargs: self.calls.append((method, args)) or self.results.get(method, True)
+
+
+def _manager(tmp_path=None, ring=1000):
+    config = UDS3Config(saga_log_size=ring,
+                        saga_journal_path=str(tmp_path / "saga.db") if tmp_path else None)
+    if tmp_path:
+        # Recovery im Konstruktor läuft noch gegen die echten Adapter
+        config.local_vector.connection_string = str(tmp_path / "vectors")
+    manager = UDS3PolyglotManager(config)
+    manager.postgresql, manager.neo4j, manager.chromadb = _StubBackend(), _StubBackend(), _StubBackend()
+    return manager
+
+
+def _transaction(i, state=TransactionState.COMMITTED):
+    tx = SagaTransaction(transaction_id=f"T{i:05d}", operation="save_process", domain="vpb", process_id=f"P{i}")
+    tx.state = state
+    return tx
+
+
+def test_ring_is_bounded_but_keeps_open_transactions():
+    log = SagaTransactionLog(ring_size=5)
+    running = _transaction(0, TransactionState.IN_PROGRESS)
+    log.record(running)
+    for i in range(1, 20):
+        log.record(_transaction(i))
+
+    assert len(log) == 5
+    assert "T00000" in log.in_memory()
+    assert [t["transaction_id"] for t in log.list(limit=3)] == ["T00019", "T00018", "T00017"]
+    assert log.get("T00001") is None  # verdrängt, kein Journal
+
+
+def test_manager_ring_and_status_queries():
+    manager = _manager(ring=10)
+    for i in range(50):
+        manager.save_process({"process_id": f"P{i}", "name": f"Prozess {i}"})
+
+    assert len(manager.transactions) == 10
+    latest = manager.list_transactions(limit=1)[0]
+    assert latest["process_id"] == "P49"
+    assert manager.get_transaction_status(latest["transaction_id"])["state"] == "committed"
+    assert manager.list_transactions(state=TransactionState.ROLLED_BACK) == []
+
+
+def test_journal_persists_and_is_indexed(tmp_path):
+    manager = _manager(tmp_path, ring=5)
+    ids = [manager.save_process({"process_id": f"P{i}", "name": "x"}) for i in range(30)]
+    first = manager.transaction_log.list(limit=1000)[-1]
+
+    # Älteste Transaktion ist aus dem Ring verdrängt, aber im Journal
+    assert first["process_id"] == ids[0]
+    assert manager.get_transaction_status(first["transaction_id"])["state"] == "committed"
+    assert len(manager.list_transactions(state=TransactionState.COMMITTED, limit=1000)) == 30
+    manager.transaction_log.close()
+
+    with sqlite3.connect(tmp_path / "saga.db") as conn:
+        events = conn.execute("SELECT COUNT(*) FROM saga_events").fetchone()[0]
+        plan = " ".join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT payload FROM saga_transactions WHERE state = ? "
+            "ORDER BY started_at DESC LIMIT 10", ("committed",)))
+    assert events == 150  # in_progress + Start je Step (3) + committed je Transaktion
+    assert "idx_saga_transactions_state" in plan
+
+
+def _interrupted(log, i, steps, preexisting=False, operation="save_process"):
+    """Offene Transaktion wie nach einem Absturz: steps = gestartete Backends"""
+    tx = _transaction(i, TransactionState.IN_PROGRESS)
+    tx.operation = operation
+    tx.preexisting = preexisting
+    for backend in steps:
+        tx.add_step(SagaStep(backend_name=backend, operation="save", execute=None, compensate=None,
+                             started_at=datetime.now()))
+    log.record(tx)
+    return tx
+
+
+def _recovering_manager(tmp_path, **results):
+    """Manager mit Stub-Adaptern, dessen Log das gemeinsame Journal nutzt."""
+    manager = _manager()
+    manager.transaction_log = SagaTransactionLog(journal_path=str(tmp_path / "saga.db"))
+    manager.postgresql = _StubBackend(**results.get("postgresql", {}))
+    manager.neo4j = _StubBackend(**results.get("neo4j", {}))
+    manager.chromadb = _StubBackend(**results.get("chromadb", {}))
+    return manager
+
+
+def _deletes(manager):
+    return {
+        name: [call[0] for call in getattr(manager, name).calls if call[0].startswith("delete")]
+        for name in ("postgresql", "neo4j", "chromadb")
+    }
+
+
+def test_recovery_of_interrupted_transactions(tmp_path):
+    log = SagaTransactionLog(journal_path=str(tmp_path / "saga.db"))
+    _interrupted(log, 1, ["postgresql", "neo4j"])            # neu angelegt, Chroma nie gestartet
+    _interrupted(log, 2, ["postgresql", "neo4j", "chromadb"], preexisting=True)  # Re-Save (Upsert)
+    _interrupted(log, 3, ["postgresql"], operation="update_process")
+    _interrupted(log, 4, ["postgresql"], preexisting=None)   # Vorzustand unbekannt
+    log.record(_transaction(5))
+    log.close()  # "Absturz": Transaktionen 1-4 offen
+
+    manager = _recovering_manager(tmp_path)
+    recovered = manager.recover_transactions()
+
+    assert [t["transaction_id"] for t in recovered] == ["T00001", "T00002", "T00003", "T00004"]
+    states = {t["transaction_id"]: t["state"] for t in manager.list_transactions(limit=10)}
+    assert states == {"T00001": "rolled_back", "T00002": "failed", "T00003": "failed",
+                      "T00004": "failed", "T00005": "committed"}
+    # Nur Backends der gestarteten Steps von T00001, nichts vom vorhandenen P2
+    assert _deletes(manager) == {"postgresql": ["delete_process"], "neo4j": ["delete_process_graph"],
+                                 "chromadb": []}
+    assert manager.postgresql.calls[0] == ("delete_process", ("P1",))
+    assert manager.transaction_log.interrupted() == []
+
+
+def test_recovery_marks_failed_when_delete_fails(tmp_path):
+    log = SagaTransactionLog(journal_path=str(tmp_path / "saga.db"))
+    _interrupted(log, 1, ["postgresql", "neo4j", "chromadb"])
+    _interrupted(log, 2, ["postgresql"])
+    log.close()
+
+    # Neo4j nicht erreichbar; PostgreSQL-Zeile von T00002 existiert noch
+    manager = _recovering_manager(tmp_path, neo4j={"delete_process_graph": False},
+                                  postgresql={"delete_process": False, "process_exists": True})
+    recovered = {t["transaction_id"]: t for t in manager.recover_transactions()}
+
+    assert recovered["T00001"]["state"] == "failed"
+    assert "neo4j" in recovered["T00001"]["error"] and "postgresql" in recovered["T00001"]["error"]
+    assert recovered["T00002"]["state"] == "failed"
+    assert _deletes(manager)["chromadb"] == ["delete_embedding"]
+
+
+def test_recovery_leaves_foreign_in_flight_transactions_alone(tmp_path):
+    running = SagaTransactionLog(journal_path=str(tmp_path / "saga.db"))  # zweiter Worker, läuft
+    _interrupted(running, 1, ["postgresql", "neo4j"])
+
+    crashed = SagaTransactionLog(journal_path=str(tmp_path / "saga.db"))
+    _interrupted(crashed, 2, ["postgresql"])
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    with sqlite3.connect(tmp_path / "saga.db") as conn:  # Absturz ohne close()
+        conn.execute("UPDATE saga_owners SET pid = ? WHERE token = ?", (dead.pid, crashed.owner["token"]))
+
+    manager = _recovering_manager(tmp_path)
+    assert [t["transaction_id"] for t in manager.recover_transactions()] == ["T00002"]
+    assert manager.transaction_log.get("T00001")["state"] == "in_progress"
+    assert manager.postgresql.calls == [("delete_process", ("P2",))]
+    assert manager.neo4j.calls == []
+
+    # Parallel startender Worker: bereits übernommene Transaktion nicht erneut
+    other = _recovering_manager(tmp_path)
+    assert other.recover_transactions() == []
+    assert other.postgresql.calls == []
+    running.close()
+
+
+def test_list_transactions_log_only(tmp_path):
+    manager = _manager(tmp_path, ring=1000)
+    for i in range(2000):
+        manager.save_process({"process_id": f"P{i}", "name": "x"}, generate_embeddings=False)
+    start = time.perf_counter()
+    for _ in range(100):
+        manager.list_transactions(state=TransactionState.COMMITTED, limit=50)
+    per_call_ms = (time.perf_counter() - start) * 10.0
+    print(f"PERF SAGA LOG n=2000 ring=1000: list_transactions={per_call_ms:.2f} ms/call")
+    assert len(manager.transactions) == 1000
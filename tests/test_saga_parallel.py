@@ -0,0 +1,159 @@
+"""
+Tests für die parallele Ausführung von SAGA Steps im UDS3PolyglotManager.
+
+Die Backends werden durch Stub-Adapter mit einstellbarer Latenz und
+Fehlern ersetzt; geprüft werden die Überlappung der Steps (aus started_at
+und duration_ms in SagaTransaction.to_dict(), nicht per Wanduhr), die
+Kompensation nur abgeschlossener Steps und das Beenden des Thread Pools.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.polyglot_manager import TransactionState, UDS3Config, UDS3PolyglotManager
+
+
+class _StubBackend:
+    """Zeichnet Aufrufe auf; latency/fail je Methode."""
+
+    def __init__(self, name, latency=0.0, fail=()):
+        self.name = name
+        self.latency = latency
+        self.fail = set(fail)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _call(self, method, *args):
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls.append(method)
+        if method in self.fail:
+            raise RuntimeError(f"{self.name}.{method} fehlgeschlagen")
+        return True
+
+    def __getattr__(self, method):
+        if method.startswith("_"):
+            raise AttributeError(method)
+        return lambda *args, **kwargs: self._call(method, *args)
+
+
+class _StubPostgres(_StubBackend):
+    def process_exists(self, process_id):
+        self._call("process_exists")
+        return False
+
+    def get_process(self, process_id):
+        self._call("get_process")
+        return {"process_id": process_id, "process_data": {"process_id": process_id, "name": "Alt"}}
+
+
+def _manager(parallel, pg=0.05, neo4j=0.05, chroma=0.05, fail=None):
+    config = UDS3Config(parallel_saga=parallel)
+    manager = UDS3PolyglotManager(config)
+    fail = fail or {}
+    manager.postgresql = _StubPostgres("postgresql", pg, fail.get("postgresql", ()))
+    manager.neo4j = _StubBackend("neo4j", neo4j, fail.get("neo4j", ()))
+    manager.chromadb = _StubBackend("chromadb", chroma, fail.get("chromadb", ()))
+    return manager
+
+
+def _intervals(tx):
+    """(Start, Ende) je Step aus started_at/duration_ms der Transaktion"""
+    return [
+        (datetime.fromisoformat(s["started_at"]),
+         datetime.fromisoformat(s["started_at"]) + timedelta(milliseconds=s["duration_ms"]))
+        for s in tx["steps"]
+    ]
+
+
+def _overlapping(tx):
+    """Alle Steps liefen gleichzeitig: spätester Start vor frühestem Ende"""
+    intervals = _intervals(tx)
+    return max(start for start, _ in intervals) < min(end for _, end in intervals)
+
+
+def _process():
+    return {"process_id": "P1", "name": "Baugenehmigung", "description": "Test", "authority": "Bauamt"}
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_save_commits_and_records_timings(parallel):
+    manager = _manager(parallel)
+    assert manager.save_process(_process()) == "P1"
+
+    tx = manager.list_transactions(limit=1)[0]
+    assert tx["state"] == TransactionState.COMMITTED.value
+    assert tx["parallel"] is parallel
+    assert [s["backend"] for s in tx["steps"]] == ["postgresql", "neo4j", "chromadb"]
+    assert all(s["duration_ms"] >= 40 for s in tx["steps"])
+    assert tx["duration_ms"] >= 40
+    if parallel:
+        assert _overlapping(tx)
+    else:
+        intervals = _intervals(tx)
+        assert all(end <= next_start for (_, end), (next_start, _) in zip(intervals, intervals[1:]))
+
+
+def test_parallel_failure_compensates_only_completed_steps():
+    manager = _manager(True, neo4j=0.01, fail={"neo4j": {"save_process_graph"}})
+    with pytest.raises(Exception, match="neo4j.save_process_graph"):
+        manager.save_process(_process())
+
+    tx = manager.list_transactions(limit=1)[0]
+    assert tx["state"] == TransactionState.ROLLED_BACK.value
+    steps = {s["backend"]: s for s in tx["steps"]}
+    # Langsamere Steps liefen zu Ende und wurden anschließend kompensiert
+    assert steps["postgresql"]["compensated"] and steps["chromadb"]["compensated"]
+    assert not steps["neo4j"]["executed"] and not steps["neo4j"]["compensated"]
+    assert "delete_process" in manager.postgresql.calls
+    assert "delete_embedding" in manager.chromadb.calls
+    assert "delete_process_graph" not in manager.neo4j.calls
+    assert steps["postgresql"]["compensation_ms"] is not None
+
+
+def test_sequential_failure_stops_at_first_error():
+    manager = _manager(False, fail={"neo4j": {"save_process_graph"}})
+    with pytest.raises(Exception):
+        manager.save_process(_process())
+    assert manager.chromadb.calls == []
+    tx = manager.list_transactions(limit=1)[0]
+    assert [s["backend"] for s in tx["steps"]] == ["postgresql", "neo4j"]
+
+
+def test_parallel_delete_and_update():
+    manager = _manager(True)
+    assert manager.delete_process("P1")
+    assert _overlapping(manager.list_transactions(limit=1)[0])
+
+    assert manager.update_process("P1", {"name": "Neu", "elements": []})
+    tx = manager.list_transactions(limit=1)[0]
+    assert tx["operation"] == "update_process"
+    assert [s["backend"] for s in tx["steps"]] == ["postgresql", "neo4j", "chromadb"]
+    assert tx["parallel"] is True
+
+    assert manager.update_process("P1", {"status": "active"})
+    assert len(manager.list_transactions(limit=1)[0]["steps"]) == 1
+
+
+def test_failed_update_restores_previous_state():
+    manager = _manager(True, fail={"chromadb": {"update"}})
+    assert not manager.update_process("P1", {"description": "Neu"})
+    tx = manager.list_transactions(limit=1)[0]
+    assert tx["state"] == TransactionState.ROLLED_BACK.value
+    assert manager.postgresql.calls.count("update_process") == 2
+
+
+def test_close_shuts_down_saga_pool():
+    manager = _manager(True, pg=0.0, neo4j=0.0, chroma=0.0)
+    assert manager.save_process(_process()) == "P1"
+    pool = manager._saga_pool
+    assert pool is not None
+
+    manager.close()
+    assert manager._saga_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(lambda: None)
+    assert "disconnect" in manager.neo4j.calls
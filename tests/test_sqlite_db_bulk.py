@@ -0,0 +1,75 @@
+"""
+Tests für den Verzeichnis-Import und Voll-Export von VPBSQLiteDB
+(--import-dir / --export-all).
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("uds3_vpb_schema")
+
+from vpb_sqlite_db import VPBSQLiteDB  # noqa: E402
+
+PROCESSES_DIR = Path(__file__).resolve().parent.parent / "processes"
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    target = tmp_path / "src"
+    target.mkdir()
+    for path in sorted(PROCESSES_DIR.glob("*.vpb.json"))[:12]:
+        shutil.copy(path, target / path.name)
+    (target / "kaputt.vpb.json").write_text("{ kein json", encoding="utf-8")
+    (target / "notizen.txt").write_text("ignoriert", encoding="utf-8")
+    return target
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_import_directory(tmp_path, source_dir, workers):
+    progress = []
+    with VPBSQLiteDB(str(tmp_path / "bulk.db")) as db:
+        result = db.import_directory(str(source_dir), workers=workers, batch_size=5,
+                                     progress=lambda *args: progress.append(args))
+        total = db.get_statistics()["total_processes"]
+
+    assert result["files"] == 13
+    assert result["failed"] == 1
+    assert result["errors"][0][0].endswith("kaputt.vpb.json")
+    assert result["imported"] == 12
+    assert 1 <= total <= 12
+    assert progress and progress[-1][0] == 12
+    assert result["records_per_second"] > 0
+
+
+def test_import_directory_reports_failing_file_of_batch(tmp_path, source_dir):
+    broken = sorted(source_dir.glob("*.vpb.json"))[2]
+    broken_name = json.loads(broken.read_text(encoding="utf-8"))["metadata"]["name"]
+    with VPBSQLiteDB(str(tmp_path / "bulk.db")) as db:
+        write = db._write_process
+
+        def failing_write(conn, process):
+            if process.name == broken_name:
+                raise ValueError("Schreibfehler")
+            return write(conn, process)
+
+        db._write_process = failing_write
+        result = db.import_directory(str(source_dir), workers=0, batch_size=5)
+
+    # Der Batch mit der Datei wird einzeln wiederholt; nur sie scheitert
+    assert result["imported"] == 11 and result["failed"] == 2
+    assert (str(broken), "Schreibfehler") in result["errors"]
+    assert not any(path.startswith("batch[") for path, _ in result["errors"])
+
+
+def test_export_all_streams_documents(tmp_path, source_dir):
+    with VPBSQLiteDB(str(tmp_path / "bulk.db")) as db:
+        db.import_directory(str(source_dir), workers=0)
+        total = db.get_statistics()["total_processes"]
+        result = db.export_all(str(tmp_path / "out"))
+
+    files = list((tmp_path / "out").glob("*_export.vpb.json"))
+    assert result["exported"] == total == len(files)
+    assert all(isinstance(json.loads(f.read_text(encoding="utf-8")), dict) for f in files)
@@ -0,0 +1,85 @@
+"""
+Tests für die paginierte Prozessliste von VPBSQLiteDB (Keyset-Cursor,
+Projektion ohne process_data, Filter im SQL).
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("uds3_vpb_schema")
+
+from uds3_vpb_schema import VPBProcessRecord  # noqa: E402
+from core.pagination import InvalidCursorError  # noqa: E402
+from vpb_sqlite_db import LIST_COLUMNS, VPBSQLiteDB  # noqa: E402
+
+BASE = datetime(2025, 8, 22, 10, 0, 0)
+
+
+def _process(i: int) -> VPBProcessRecord:
+    process = VPBProcessRecord(process_id=f"P{i:04d}", name=f"Prozess {i}")
+    # Jeweils drei Prozesse mit gleichem updated_at -> Tie-Break über process_id
+    process.updated_at = BASE + timedelta(minutes=i // 3)
+    process.tags = ["bau"] + (["umwelt"] if i % 4 == 0 else [])
+    return process
+
+
+@pytest.fixture
+def db(tmp_path):
+    with VPBSQLiteDB(str(tmp_path / "page.db")) as database:
+        database.save_processes(_process(i) for i in range(50))
+        yield database
+
+
+def _all_pages(db, **kwargs):
+    ids, cursor, pages = [], None, 0
+    while True:
+        page = db.list_processes_page(cursor=cursor, **kwargs)
+        ids.extend(p["process_id"] for p in page["processes"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+def test_pages_cover_all_rows_in_order(db):
+    ids, pages = _all_pages(db, limit=7)
+    expected = [p["process_id"] for p in db.list_processes()]
+    assert ids == expected
+    assert len(ids) == 50 and len(set(ids)) == 50
+    assert pages == 8
+
+
+def test_projection_excludes_process_data(db):
+    page = db.list_processes_page(limit=3)
+    assert set(page["processes"][0]) == set(LIST_COLUMNS)
+    assert "process_data" not in page["processes"][0]
+    assert page["processes"][0]["tags"][0] == "bau"
+
+
+def test_filters_are_pushed_down(db):
+    ids, _ = _all_pages(db, limit=4, tags=["bau", "umwelt"])
+    assert ids == sorted((f"P{i:04d}" for i in range(0, 50, 4)), key=lambda pid: (int(pid[1:]) // 3, pid),
+                         reverse=True)
+    status = db.list_processes()[0]["status"]
+    assert len(_all_pages(db, limit=20, status=status)[0]) == 50
+    assert db.list_processes_page(status="gibt-es-nicht")["processes"] == []
+
+
+def test_invalid_cursor_raises(db):
+    with pytest.raises(InvalidCursorError):
+        db.list_processes_page(cursor="kaputt")
+
+
+def test_deep_page_log_only(tmp_path):
+    with VPBSQLiteDB(str(tmp_path / "deep.db")) as db:
+        db.save_processes(_process(i) for i in range(5000))
+        start = time.perf_counter()
+        ids, pages = _all_pages(db, limit=100)
+        keyset_ms = (time.perf_counter() - start) * 1000.0
+        start = time.perf_counter()
+        db.list_processes()
+        full_ms = (time.perf_counter() - start) * 1000.0
+    print(f"PERF SQLITE LIST n=5000: keyset {pages} pages={keyset_ms:.1f} ms | full list={full_ms:.1f} ms")
+    assert len(ids) == 5000
@@ -0,0 +1,141 @@
+"""
+Benchmark für VPBSQLiteDB.save_process: 1.000 Prozesse à 200 Elemente.
+
+Vorher: frische Verbindung je Aufruf, DELETE + ein INSERT pro Element/Verbindung
+(Nachbau der früheren Implementierung). Nachher: persistente WAL-Verbindung,
+executemany und Diff-Upsert; zusätzlich erneutes Speichern mit wenigen
+Änderungen und Bulk-Speichern in einer Transaktion (save_processes). Es wird nur geloggt; optionale Schwellenwerte:
+- VPB_SQLITE_BENCH_PROCESSES (Anzahl Prozesse, Standard 1000)
+- VPB_SQLITE_SAVE_MAX_S (Obergrenze Gesamtzeit "nachher" in Sekunden)
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+import pytest
+
+pytest.importorskip("uds3_vpb_schema")
+
+from uds3_vpb_schema import VPBConnectionData, VPBElementData, VPBProcessRecord  # noqa: E402
+from vpb_sqlite_db import (  # noqa: E402
+    CONNECTION_COLUMNS,
+    ELEMENT_COLUMNS,
+    VPBSQLiteDB,
+    _connection_row,
+    _element_row,
+    _process_row,
+)
+
+ELEMENTS_PER_PROCESS = 200
+
+
+def _insert_sql(table, columns):
+    columns = ("process_id",) + columns
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+_LEGACY_ELEMENT_INSERT = _insert_sql("vpb_elements", ELEMENT_COLUMNS)
+_LEGACY_CONNECTION_INSERT = _insert_sql("vpb_connections", CONNECTION_COLUMNS)
+
+
+def _process(i: int) -> VPBProcessRecord:
+    process = VPBProcessRecord(process_id=f"P{i:05d}", name=f"Prozess {i}")
+    process.elements = [
+        VPBElementData(element_id=f"E{j}", element_type="Prozess", name=f"Schritt {j}",
+                       x=float(j * 120), y=float(i % 50) * 80)
+        for j in range(ELEMENTS_PER_PROCESS)
+    ]
+    process.connections = [
+        VPBConnectionData(connection_id=f"C{j}", source_element_id=f"E{j}", target_element_id=f"E{j + 1}")
+        for j in range(ELEMENTS_PER_PROCESS - 1)
+    ]
+    return process
+
+
+def _legacy_save(db_path, process: VPBProcessRecord) -> None:
+    """Frühere Schreibstrategie: neue Verbindung, DELETE + Einzel-INSERTs."""
+    process.update_scores()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute(
+            f"INSERT OR REPLACE INTO vpb_processes VALUES ({', '.join('?' * 22)})",
+            _process_row(process),
+        )
+        conn.execute("DELETE FROM vpb_elements WHERE process_id = ?", (process.process_id,))
+        conn.execute("DELETE FROM vpb_connections WHERE process_id = ?", (process.process_id,))
+        for element in process.elements:
+            conn.execute(_LEGACY_ELEMENT_INSERT, (process.process_id,) + _element_row(element))
+        for connection in process.connections:
+            conn.execute(_LEGACY_CONNECTION_INSERT, (process.process_id,) + _connection_row(connection))
+        conn.commit()
+
+
+def test_save_1000_processes_log_only(tmp_path):
+    count = int(os.environ.get("VPB_SQLITE_BENCH_PROCESSES", "1000"))
+    processes = [_process(i) for i in range(count)]
+
+    legacy_db = VPBSQLiteDB(str(tmp_path / "legacy.db"))
+    legacy_db.close()
+    start = time.perf_counter()
+    for process in processes:
+        _legacy_save(legacy_db.db_path, process)
+    legacy_s = time.perf_counter() - start
+
+    with VPBSQLiteDB(str(tmp_path / "current.db")) as db:
+        start = time.perf_counter()
+        for process in processes:
+            assert db.save_process(process)
+        save_s = time.perf_counter() - start
+
+        # Erneut speichern: je Prozess ein Element verschoben
+        for process in processes:
+            process.elements[0].x += 10
+        start = time.perf_counter()
+        for process in processes:
+            db.save_process(process)
+        resave_s = time.perf_counter() - start
+
+        stats = db.get_statistics()
+
+    # Bulk: alle Prozesse in einer Transaktion (Import-Pfad)
+    with VPBSQLiteDB(str(tmp_path / "bulk.db")) as db:
+        start = time.perf_counter()
+        assert db.save_processes(processes) == count
+        bulk_s = time.perf_counter() - start
+
+    rows = count * (2 * ELEMENTS_PER_PROCESS - 1)
+    print(
+        f"PERF SQLITE SAVE n={count}x{ELEMENTS_PER_PROCESS}: before={legacy_s:.2f} s | "
+        f"after={save_s:.2f} s ({rows / max(save_s, 1e-9):.0f} rows/s) | "
+        f"resave 1 change/process={resave_s:.2f} s | bulk={bulk_s:.2f} s"
+    )
+
+    assert stats["total_elements"] == count * ELEMENTS_PER_PROCESS
+    assert stats["total_connections"] == count * (ELEMENTS_PER_PROCESS - 1)
+    threshold = os.environ.get("VPB_SQLITE_SAVE_MAX_S")
+    if threshold:
+        assert save_s <= float(threshold), f"Speichern zu langsam: {save_s:.2f} s > {threshold}"
+
+
+def test_diff_upsert_touches_only_changed_rows(tmp_path):
+    with VPBSQLiteDB(str(tmp_path / "diff.db")) as db:
+        process = _process(1)
+        db.save_process(process)
+
+        process.elements[3].name = "Umbenannt"
+        process.elements.pop()
+        process.connections.pop()
+        with db._connections.transaction() as conn:
+            changed = db._write_process(conn, process)
+        assert changed == {"elements": 2, "connections": 1}
+
+        loaded = db.load_process(process.process_id)
+        assert len(loaded.elements) == ELEMENTS_PER_PROCESS - 1
+        assert {e.element_id: e.name for e in loaded.elements}["E3"] == "Umbenannt"
+        assert json.loads(
+            db._connections.get().execute(
+                "SELECT tags FROM vpb_processes WHERE process_id = ?", (process.process_id,)
+            ).fetchone()[0]
+        ) == process.tags
@@ -10,17 +10,22 @@ Datum: 18. Oktober 2025
 
 import pytest
 import json
+import threading
 from datetime import datetime
 from fastapi.testclient import TestClient
 
 # Import FastAPI app
+import api.uds3_vpb_fastapi as fastapi_module
 from api.uds3_vpb_fastapi import app
 
+from core.backend_executor import BackendExecutor, ExecutionLimits
+
 # Import Polyglot Manager
 from core.polyglot_manager import (
     UDS3PolyglotManager,
     UDS3Config,
     create_uds3_manager,
+    BackendUnavailableError,
     TransactionState
 )
 
@@ -351,6 +356,32 @@ def test_list_processes_with_filters(client):
     print("✅ Test PASSED")
 
 
+class _FailingPostgres:
+    """PostgreSQL-Stub: list_processes wirft die übergebene Exception"""
+    
+    def __init__(self, error):
+        self.error = error
+    
+    def list_processes(self, **kwargs):
+        raise self.error
+
+
+@pytest.mark.parametrize("error, expected", [
+    (BackendUnavailableError("PostgreSQL not connected"), 503),
+    (RuntimeError("relation uds3_processes does not exist"), 500),
+])
+def test_list_processes_backend_errors(client, monkeypatch, error, expected):
+    """Test: Backend-Fehler liefern 5xx statt einer leeren Seite"""
+    manager = UDS3PolyglotManager(UDS3Config())
+    manager.postgresql = _FailingPostgres(error)
+    monkeypatch.setattr(fastapi_module, "_uds3_manager", manager)
+    
+    response = client.get('/api/uds3/vpb/processes?limit=10')
+    
+    assert response.status_code == expected
+    assert str(error) in response.json()['detail']
+
+
 def test_semantic_search(client):
     """Test: GET /api/uds3/vpb/search"""
     print("\n" + "="*80)
@@ -389,6 +420,76 @@ def test_semantic_search_missing_query(client):
     print("✅ Test PASSED")
 
 
+class _BlockingSearchManager:
+    """semantic_search blockiert, bis release gesetzt ist (belegt den chromadb-Slot)"""
+    
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.calls = []
+    
+    def semantic_search(self, query, top_k=10, min_similarity=0.0, domain=None):
+        self.calls.append({"query": query, "domain": domain})
+        self.entered.set()
+        self.release.wait(5)
+        return [{"id": "P1", "metadata": {"domain": domain}, "similarity": 0.9}]
+
+
+@pytest.fixture
+def blocking_search(monkeypatch):
+    """Stub-Manager und Executor mit einem chromadb-Slot"""
+    manager = _BlockingSearchManager()
+    executor = BackendExecutor(ExecutionLimits(
+        backend_limits={"chromadb": 1}, queue_timeout=0.01, retry_after=2.5
+    ))
+    monkeypatch.setattr(fastapi_module, "_uds3_manager", manager)
+    monkeypatch.setattr(fastapi_module, "_backend_executor", executor)
+    yield manager
+    manager.release.set()
+    executor.shutdown(wait=True)
+
+
+def test_semantic_search_filters_by_domain(client, blocking_search):
+    """Test: domain wird als Metadaten-Filter an die Suche übergeben"""
+    blocking_search.release.set()
+    
+    response = client.get('/api/uds3/vpb/search?q=Baugenehmigung&domain=bau')
+    
+    assert response.status_code == 200
+    assert response.json()['domain'] == 'bau'
+    assert blocking_search.calls == [{"query": "Baugenehmigung", "domain": "bau"}]
+
+
+def test_semantic_search_saturated_backend_returns_429(client, blocking_search):
+    """Test: Belegte Backend-Slots -> 429 mit Retry-After"""
+    first = {}
+    worker = threading.Thread(
+        target=lambda: first.update(response=client.get('/api/uds3/vpb/search?q=erste'))
+    )
+    worker.start()
+    assert blocking_search.entered.wait(5)
+    
+    response = client.get('/api/uds3/vpb/search?q=zweite')
+    
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '3'
+    assert response.json()['backend'] == 'chromadb'
+    
+    blocking_search.release.set()
+    worker.join(5)
+    assert first['response'].status_code == 200
+    assert [call['query'] for call in blocking_search.calls] == ['erste']
+
+
+def test_semantic_search_deadline_returns_504(client, blocking_search):
+    """Test: Überschrittene Deadline (X-Request-Timeout) -> 504"""
+    response = client.get('/api/uds3/vpb/search?q=langsam', headers={'X-Request-Timeout': '0.05'})
+    
+    assert response.status_code == 504
+    assert response.json()['backend'] == 'chromadb'
+    assert 'Retry-After' not in response.headers
+
+
 # ============================================================================
 # SAGA Transaction Tests
 # ============================================================================
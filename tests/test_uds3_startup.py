@@ -0,0 +1,170 @@
+"""
+Tests für den lazy Verbindungsaufbau des UDS3PolyglotManager
+(ConnectionState je Adapter, deferred Model Loading, Warm-up, Health)
+und ein Startup-Benchmark für die Flask- und FastAPI-Einstiegspunkte.
+
+Statt echter Backends werden _open() / das Embedding Model durch Fakes
+mit fester Latenz ersetzt. Der Benchmark wird nur geloggt; optionaler
+Schwellenwert VPB_STARTUP_MIN_SPEEDUP.
+"""
+
+import os
+import time
+
+import pytest
+
+import core.polyglot_manager as pm
+from core.polyglot_manager import ConnectionState, UDS3Config, UDS3PolyglotManager
+
+CONNECT_S = 0.05
+MODEL_S = 0.15
+
+
+class _FakeModel:
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        return [[float(len(t))] for t in texts]
+
+
+@pytest.fixture
+def slow_backends(monkeypatch):
+    """Alle Adapter 'verfügbar'; Verbinden und Model-Laden kosten Zeit."""
+    opened = []
+
+    def fake_open(self):
+        time.sleep(CONNECT_S)
+        opened.append(self.name)
+        if getattr(self, "fail_open", False):
+            raise RuntimeError(f"{self.name} nicht erreichbar")
+
+    def fake_model(name):
+        time.sleep(MODEL_S)
+        return _FakeModel()
+
+    for cls in (pm.PostgreSQLAdapter, pm.Neo4jAdapter, pm.ChromaDBAdapter):
+        monkeypatch.setattr(cls, "_open", fake_open)
+        monkeypatch.setattr(cls, "_available", lambda self: None)
+    monkeypatch.setattr(pm, "CHROMADB_AVAILABLE", True)  # vector_backend 'auto' -> ChromaDB
+    monkeypatch.setattr(pm, "SENTENCE_TRANSFORMERS_AVAILABLE", True)
+    monkeypatch.setattr(pm, "SentenceTransformer", fake_model, raising=False)
+    return opened
+
+
+def test_lazy_manager_connects_on_first_use(slow_backends):
+    manager = UDS3PolyglotManager(UDS3Config())
+    assert slow_backends == []
+    assert {info["state"] for info in manager.backend_status().values()} == {"not_connected"}
+    assert manager.health()["status"] == "starting"
+
+    assert manager.neo4j.get_process_graph("P1") is None  # driver bleibt None
+    assert slow_backends == ["Neo4j"]
+    assert manager.neo4j.state is ConnectionState.CONNECTED
+    assert manager.chromadb.embedding_model is None
+
+    assert manager.chromadb._generate_embeddings(["a", "bb"]) == [[1.0], [2.0]]
+    assert manager.chromadb.status()["embedding_model_loaded"]
+
+
+def test_failed_backend_is_reported_and_retried_after_interval(slow_backends):
+    config = UDS3Config()
+    config.postgresql.options["reconnect_interval"] = 0.2
+    manager = UDS3PolyglotManager(config)
+    manager.postgresql.fail_open = True
+
+    assert manager.postgresql.ensure_connected() is False
+    status = manager.backend_status()["postgresql"]
+    assert status["state"] == "failed"
+    assert "nicht erreichbar" in status["error"]
+    assert manager.health()["status"] == "degraded"
+
+    assert manager.postgresql.ensure_connected() is False
+    assert slow_backends.count("PostgreSQL") == 1  # kein Retry vor Ablauf
+
+    manager.postgresql.fail_open = False
+    time.sleep(0.25)
+    assert manager.postgresql.ensure_connected() is True
+    assert manager.backend_status()["postgresql"]["error"] is None
+
+
+def test_disabled_and_missing_driver_states(monkeypatch):
+    config = UDS3Config()
+    config.neo4j.enabled = False
+    manager = UDS3PolyglotManager(config)
+    monkeypatch.setattr(manager.postgresql, "_available", lambda: "psycopg2 not installed")
+
+    states = manager.backend_status()
+    assert states["neo4j"]["state"] == "disabled"
+    assert states["postgresql"] == {
+        "state": "unavailable", "error": "psycopg2 not installed",
+        "connected_at": None, "connect_ms": None
+    }
+    assert manager.neo4j.ensure_connected() is False
+    assert manager.health()["status"] == "degraded"
+
+
+def test_background_warmup(slow_backends):
+    manager = UDS3PolyglotManager(UDS3Config(background_warmup=True))
+    manager._warmup_thread.join(timeout=5)
+    assert sorted(slow_backends) == ["ChromaDB", "Neo4j", "PostgreSQL"]
+    assert manager.health()["status"] == "healthy"
+    assert manager.chromadb.embedding_model is not None
+
+
+def _eager_vs_lazy(factory):
+    start = time.perf_counter()
+    factory(UDS3Config(lazy_connect=False))
+    eager = time.perf_counter() - start
+    start = time.perf_counter()
+    factory(UDS3Config())
+    lazy = time.perf_counter() - start
+    return eager, lazy
+
+
+def _report(label, eager, lazy):
+    speedup = eager / max(lazy, 1e-6)
+    print(f"PERF STARTUP {label}: eager={eager * 1000:.0f} ms | lazy={lazy * 1000:.1f} ms | speedup={speedup:.0f}x")
+    threshold = os.environ.get("VPB_STARTUP_MIN_SPEEDUP")
+    if threshold:
+        assert speedup >= float(threshold), f"Speedup zu gering: {speedup:.1f}x < {threshold}x"
+
+
+def test_startup_benchmark_manager_log_only(slow_backends):
+    eager, lazy = _eager_vs_lazy(UDS3PolyglotManager)
+    assert eager >= 3 * CONNECT_S + MODEL_S
+    _report("manager", eager, lazy)
+
+
+def test_startup_benchmark_flask_log_only(slow_backends, monkeypatch):
+    pytest.importorskip("flask")
+    from flask import Flask
+    import api.uds3_vpb_endpoints as endpoints
+
+    def start(config):
+        monkeypatch.setattr(endpoints, "_uds3_manager", None)
+        monkeypatch.setattr(endpoints, "create_uds3_manager", lambda: UDS3PolyglotManager(config))
+        app = Flask(__name__)
+        endpoints.register_uds3_endpoints(app)
+        response = app.test_client().get("/api/uds3/vpb/health")
+        assert response.status_code == 200
+        return response.get_json()
+
+    eager, lazy = _eager_vs_lazy(start)
+    assert start(UDS3Config())["backend_states"]["postgresql"]["state"] == "not_connected"
+    _report("flask", eager, lazy)
+
+
+def test_startup_benchmark_fastapi_log_only(slow_backends, monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    import api.uds3_vpb_fastapi as fastapi_app
+
+    def start(config):
+        monkeypatch.setattr(fastapi_app, "_uds3_manager", None)
+        monkeypatch.setattr(fastapi_app, "create_uds3_manager", lambda: UDS3PolyglotManager(config))
+        with TestClient(fastapi_app.app) as client:  # löst startup_event aus
+            response = client.get("/api/uds3/vpb/health")
+        assert response.status_code == 200
+        return response.json()
+
+    eager, lazy = _eager_vs_lazy(start)
+    assert start(UDS3Config())["status"] == "starting"
+    _report("fastapi", eager, lazy)
@@ -0,0 +1,244 @@
+"""
+Tests für den lokalen Vektorindex (core/vector_index.py) und den
+LocalVectorAdapter als Alternative zu ChromaDB.
+
+Der Benchmark vergleicht die Query-Latenz (exakt vs. IVF) bei 10k und 100k
+Prozessen auf synthetischen, geclusterten Vektoren und wird nur geloggt.
+Größen über VPB_VECTOR_BENCH_SIZES, optionaler Schwellenwert für den
+IVF-Recall@10 über VPB_VECTOR_MIN_RECALL.
+"""
+
+import os
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.polyglot_manager import (
+    BackendConfig,
+    LocalVectorAdapter,
+    UDS3Config,
+    UDS3PolyglotManager,
+)
+from core.vector_index import HashingEncoder, LocalVectorIndex
+
+DOCS = {
+    "P1": "Baugenehmigung Wohnhaus Bauamt",
+    "P2": "Gewerbeanmeldung Ordnungsamt",
+    "P3": "Abrissgenehmigung Bauamt",
+    "P4": "Hundesteuer Anmeldung Kämmerei",
+}
+
+
+def _index(path, encoder=None, **kwargs):
+    encoder = encoder or HashingEncoder()
+    index = LocalVectorIndex(str(path), encoder=encoder.name, **kwargs)
+    ids = list(DOCS)
+    index.upsert(ids, encoder.encode([DOCS[i] for i in ids]), [DOCS[i] for i in ids],
+                 [{"process_id": i} for i in ids])
+    return index, encoder
+
+
+def test_query_upsert_delete(tmp_path):
+    index, encoder = _index(tmp_path / "idx")
+    hits = index.query(encoder.encode(["Baugenehmigung"]), n_results=2)
+    assert hits["ids"][0][0] == "P1"
+    assert hits["metadatas"][0][0] == {"process_id": "P1"}
+    assert 0.0 <= hits["distances"][0][0] < hits["distances"][0][1]
+
+    index.upsert(["P1"], encoder.encode(["Hundesteuer"]), ["Hundesteuer"])
+    assert index.count() == 4
+    assert index.query(encoder.encode(["Baugenehmigung"]), n_results=1)["ids"][0] != ["P1"]
+
+    index.delete(["P2", "unbekannt"])
+    assert index.count() == 3
+    assert "P2" not in index.query(encoder.encode(["Gewerbeanmeldung"]), n_results=10)["ids"][0]
+
+    index.update(["P9"], encoder.encode(["neu"]))  # update ignoriert unbekannte ids
+    assert index.count() == 3
+
+
+def test_persistence_growth_and_row_reuse(tmp_path):
+    path = tmp_path / "idx"
+    index, encoder = _index(path)
+    index.delete(["P3"])
+    index.close()
+
+    reopened = LocalVectorIndex(str(path), encoder=encoder.name)
+    assert reopened.count() == 3
+    reopened.upsert(["P5"], encoder.encode(["Parkausweis"]), ["Parkausweis"])
+    assert reopened.size == 4  # Zeile von P3 wiederverwendet
+
+    vectors = np.random.default_rng(1).normal(size=(3000, encoder.dim)).astype(np.float32)
+    reopened.upsert([f"R{i}" for i in range(3000)], vectors)
+    assert reopened.count() == 3004
+    assert reopened.query(vectors[1234:1235], n_results=1)["ids"][0] == ["R1234"]
+
+    changed = LocalVectorIndex(str(path), encoder="anderes-modell")
+    assert changed.count() == 0  # andere Embeddings -> Index geleert
+
+
+def test_ivf_matches_exact_search_on_clusters(tmp_path):
+    vectors, queries = _clustered(5000, 64, clusters=20, n_queries=20)
+    index = LocalVectorIndex(str(tmp_path / "idx"), n_probe=4)
+    index.upsert([f"V{i}" for i in range(len(vectors))], vectors)
+    exact = index.query(queries, n_results=10)["ids"]
+
+    assert index.build_ivf(n_lists=16) == 16
+    approx = index.query(queries, n_results=10)["ids"]
+    assert _recall(exact, approx) >= 0.9
+
+    # Neue Vektoren nach dem Training landen in ihrer Liste (Anhang)
+    index.upsert(["NEU"], queries[:1])
+    assert index.query(queries[:1], n_results=1)["ids"][0] == ["NEU"]
+    # Geänderter Vektor einer gepackten Zeile wandert in den Anhang
+    index.upsert(["V0"], queries[1:2])
+    assert index.query(queries[1:2], n_results=1)["ids"][0] == ["V0"]
+
+    # Viele Löcher -> neu packen beim Löschen (Schreibpfad)
+    index.delete([f"V{i}" for i in range(1, 1500)])
+    assert index.packed_size == index.size == index.count() == 3502
+    index.close()
+
+    reopened = LocalVectorIndex(str(tmp_path / "idx"), n_probe=4)
+    assert reopened.packed_size == 3502
+    assert reopened.query(queries[1:2], n_results=1)["ids"][0] == ["V0"]
+
+
+def test_query_is_read_only(tmp_path):
+    vectors, queries = _clustered(2000, 32, clusters=8, n_queries=5)
+    index = LocalVectorIndex(str(tmp_path / "idx"))
+    index.upsert([f"V{i}" for i in range(len(vectors))], vectors)
+    index.close()
+
+    # Genug Vektoren für IVF, aber trainiert wird erst auf dem Schreibpfad
+    reopened = LocalVectorIndex(str(tmp_path / "idx"), n_lists=8, n_probe=2)
+    files = {name: os.stat(tmp_path / "idx" / name).st_mtime_ns for name in ("vectors.npy", "lists.npy")}
+    reopened.query(queries, n_results=5)
+    assert reopened.centroids is None and not (tmp_path / "idx" / "centroids.npy").exists()
+    assert files == {name: os.stat(tmp_path / "idx" / name).st_mtime_ns for name in files}
+
+    assert reopened.maintain()
+    assert reopened.centroids is not None and reopened.packed_size == 2000
+    assert not reopened.maintain()
+
+
+def test_default_index_path_from_data_dir(tmp_path, monkeypatch):
+    config = UDS3Config(vector_backend="local", data_dir=str(tmp_path / "data"))
+    manager = UDS3PolyglotManager(config)
+    assert manager.chromadb.config.connection_string == str(tmp_path / "data" / "vpb_processes.vectors")
+
+    monkeypatch.setenv("VPB_DATA_DIR", str(tmp_path / "env"))
+    manager = UDS3PolyglotManager(UDS3Config(vector_backend="local"))
+    assert manager.chromadb.config.connection_string == str(tmp_path / "env" / "vpb_processes.vectors")
+
+
+def test_local_adapter_in_manager(tmp_path):
+    config = UDS3Config(vector_backend="local")
+    config.local_vector.connection_string = str(tmp_path / "vpb_processes.vectors")
+    config.local_vector.options["encoder"] = "hashing"
+    manager = UDS3PolyglotManager(config)
+    assert isinstance(manager.chromadb, LocalVectorAdapter)
+    assert manager.backend_status()["chromadb"]["state"] == "not_connected"
+
+    processes = [{"process_id": pid, "name": text} for pid, text in DOCS.items()]
+    assert manager.index_embeddings(processes) == 4
+    hits = manager.semantic_search("Baugenehmigung", top_k=2)
+    assert hits[0]["id"] == "P1"
+    assert hits[0]["metadata"]["name"] == DOCS["P1"]
+    assert hits[0]["similarity"] > hits[1]["similarity"]
+
+    assert manager.chromadb.delete_embedding("P1")
+    assert manager.chromadb.status()["vectors"] == 3
+
+
+def test_query_filters_by_metadata(tmp_path):
+    encoder = HashingEncoder()
+    index = LocalVectorIndex(str(tmp_path / "idx"), encoder=encoder.name)
+    ids = list(DOCS)
+    domains = {"P1": "bau", "P2": "gewerbe", "P3": "bau", "P4": "steuer"}
+    index.upsert(ids, encoder.encode([DOCS[i] for i in ids]), [DOCS[i] for i in ids],
+                 [{"process_id": i, "domain": domains[i]} for i in ids])
+    query = encoder.encode(["Baugenehmigung"])
+
+    assert index.query(query, n_results=10, where={"domain": "bau"})["ids"][0] == ["P1", "P3"]
+    assert index.query(query, n_results=10, where={"domain": "gewerbe", "process_id": "P2"})["ids"][0] == ["P2"]
+    assert index.query(query, n_results=10, where={"domain": "unbekannt"})["ids"][0] == []
+
+    index.delete(["P3"])
+    assert index.query(query, n_results=10, where={"domain": "bau"})["ids"][0] == ["P1"]
+
+    config = UDS3Config(vector_backend="local", data_dir=str(tmp_path / "data"))
+    config.local_vector.options["encoder"] = "hashing"
+    manager = UDS3PolyglotManager(config)
+    processes = [{"process_id": pid, "name": text} for pid, text in DOCS.items()]
+    manager.index_embeddings(processes[:2], domain="bau")
+    manager.index_embeddings(processes[2:], domain="steuer")
+    assert manager.semantic_search("Bauamt", domain="steuer")[0]["id"] == "P3"
+    assert manager.semantic_search("Bauamt", domain="bau")[0]["id"] == "P1"
+    assert {hit["metadata"]["domain"] for hit in manager.semantic_search("Bauamt", domain="steuer")} == {"steuer"}
+
+
+def test_adapter_falls_back_to_hashing_encoder(tmp_path, monkeypatch):
+    import core.polyglot_manager as pm
+
+    monkeypatch.setattr(pm, "SENTENCE_TRANSFORMERS_AVAILABLE", False)
+    adapter = LocalVectorAdapter(BackendConfig(connection_string=str(tmp_path / "idx"), options={"hashing_dim": 64}))
+    assert adapter.add("P1", DOCS["P1"], {"process_id": "P1"})
+    assert isinstance(adapter.embedding_model, HashingEncoder)
+    assert adapter.status()["encoder"] == "hashing-64"
+    assert adapter.query("Bauamt Wohnhaus", n_results=1)[0]["id"] == "P1"
+
+
+def _clustered(n, dim, clusters, n_queries, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, size=n)] + 0.35 * rng.normal(size=(n, dim)).astype(np.float32)
+    queries = vectors[rng.choice(n, size=n_queries, replace=False)] + 0.05 * rng.normal(size=(n_queries, dim))
+    return vectors, queries.astype(np.float32)
+
+
+def _recall(exact, approx):
+    return sum(len(set(e) & set(a)) for e, a in zip(exact, approx)) / sum(len(e) for e in exact)
+
+
+def _latency_ms(index, queries):
+    index.query(queries[:1], n_results=10)
+    start = time.perf_counter()
+    for query in queries:
+        index.query(query[None, :], n_results=10)
+    return (time.perf_counter() - start) * 1000.0 / len(queries)
+
+
+def test_query_latency_benchmark_log_only(tmp_path):
+    sizes = [int(s) for s in os.environ.get("VPB_VECTOR_BENCH_SIZES", "10000,100000").split(",")]
+    dim = 384
+    for n in sizes:
+        vectors, queries = _clustered(n, dim, clusters=max(16, n // 500), n_queries=50)
+        n_lists = int(np.sqrt(n))
+        # n_lists=0: erst exakt messen, IVF danach explizit trainieren
+        index = LocalVectorIndex(str(tmp_path / f"bench_{n}"), n_probe=max(1, n_lists // 16))
+        start = time.perf_counter()
+        for offset in range(0, n, 10000):
+            index.upsert([f"V{i}" for i in range(offset, min(n, offset + 10000))], vectors[offset:offset + 10000])
+        load_s = time.perf_counter() - start
+
+        exact_ms = _latency_ms(index, queries)
+        exact = index.query(queries, n_results=10)["ids"]
+        start = time.perf_counter()
+        index.build_ivf(n_lists)
+        train_s = time.perf_counter() - start
+        ivf_ms = _latency_ms(index, queries)
+        recall = _recall(exact, index.query(queries, n_results=10)["ids"])
+
+        print(
+            f"PERF VECTOR n={n} dim={dim}: load={load_s:.1f} s | exact={exact_ms:.2f} ms/query | "
+            f"ivf({n_lists} lists, probe {index.n_probe}, train {train_s:.1f} s)={ivf_ms:.2f} ms/query | "
+            f"recall@10={recall:.2f} | speedup={exact_ms / ivf_ms:.1f}x"
+        )
+        assert index.count() == n
+        threshold = os.environ.get("VPB_VECTOR_MIN_RECALL")
+        if threshold:
+            assert recall >= float(threshold), f"IVF-Recall zu gering: {recall:.2f} < {threshold}"
+        index.close()
@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+import io
+import os
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
 import pytest
 
 from vpb.xml_export import (
@@ -7,6 +13,7 @@ from vpb.xml_export import (
     vpb_to_atok_xml,
     vpb_to_bpmn20_xml,
     vpb_to_eepk_xml,
+    write_vpb_xml,
 )
 
 
@@ -111,3 +118,78 @@ def test_render_vpb_xml_dispatches_formats_consistently():
 def test_render_vpb_xml_rejects_unknown_format():
     with pytest.raises(ValueError):
         render_vpb_xml(SAMPLE_PROCESS, format="unknown-format")
+
+
+def test_write_vpb_xml_streams_same_document(tmp_path):
+    for fmt in ("atok", "eepk", "bpmn"):
+        expected = render_vpb_xml(SAMPLE_PROCESS, format=fmt)
+        path = tmp_path / f"process_{fmt}.xml"
+        write_vpb_xml(SAMPLE_PROCESS, path, format=fmt)
+        assert path.read_text(encoding="utf-8") == expected
+
+        buffer = io.StringIO()
+        write_vpb_xml(SAMPLE_PROCESS, buffer, format=fmt)
+        assert buffer.getvalue() == expected
+
+    with pytest.raises(ValueError):
+        write_vpb_xml(SAMPLE_PROCESS, io.StringIO(), format="unknown-format")
+
+
+def test_text_and_attributes_survive_round_trip():
+    process = {
+        "metadata": {"name": 'A & "B"'},
+        "elements": [
+            {"element_id": "F1", "element_type": "FUNCTION", "name": "Zeile 1\nZeile 2",
+             "description": "Absatz 1\n\nAbsatz 2 <wichtig>"},
+        ],
+        "connections": [],
+    }
+    root = ET.fromstring(vpb_to_atok_xml(process))
+    element = root.find("elements/element")
+    assert element.get("name") == "Zeile 1\nZeile 2"
+    assert element.find("description").text == "Absatz 1\n\nAbsatz 2 <wichtig>"
+    assert root.find("metadata/field").text == 'A & "B"'
+
+
+def _large_process(n: int) -> dict:
+    types = ("START_EVENT", "FUNCTION", "XOR_CONNECTOR", "FUNCTION", "END_EVENT")
+    return {
+        "metadata": {"name": "Großer Prozess", "id": "BIG"},
+        "elements": [
+            {"element_id": f"E{i}", "element_type": types[i % len(types)], "name": f"Schritt {i}",
+             "description": f"Bearbeitung {i}", "x": (i % 100) * 200, "y": (i // 100) * 120}
+            for i in range(n)
+        ],
+        "connections": [
+            {"connection_id": f"C{i}", "source_element": f"E{i}", "target_element": f"E{i + 1}",
+             "connection_type": "SEQUENCE", "description": f"Fluss {i}"}
+            for i in range(n - 1)
+        ],
+    }
+
+
+def test_export_10k_elements_log_only(tmp_path):
+    process = _large_process(10_000)
+    max_ms = os.environ.get("VPB_XML_EXPORT_MAX_MS")
+    for fmt in ("atok", "eepk", "bpmn"):
+        tracemalloc.start()
+        start = time.perf_counter()
+        text = render_vpb_xml(process, format=fmt)
+        render_ms = (time.perf_counter() - start) * 1000
+        render_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        path = tmp_path / f"big_{fmt}.xml"
+        tracemalloc.start()
+        start = time.perf_counter()
+        write_vpb_xml(process, path, format=fmt)
+        write_ms = (time.perf_counter() - start) * 1000
+        write_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"\nPERF XML {fmt} 10k Elemente: render={render_ms:.0f} ms / {render_peak / 1e6:.1f} MB | "
+              f"write_to={write_ms:.0f} ms / {write_peak / 1e6:.1f} MB | {len(text) / 1e6:.1f} MB XML")
+        assert path.read_text(encoding="utf-8") == text
+        assert write_peak < render_peak
+        if max_ms:
+            assert write_ms <= float(max_ms), f"Export zu langsam: {write_ms:.0f} ms > {max_ms} ms"
@@ -0,0 +1,214 @@
+"""
+Tests für die Delta-Historie des Canvas (vpb.ui.canvas_history).
+
+Die Kommandos arbeiten auf jedem Objekt mit elements/connections/metadata/
+hierarchy_categories, daher wird hier ohne Tk-Display mit einem schlanken
+Ziel-Objekt getestet. Zusätzlich ein Speicher-/Zeitvergleich mit
+Voll-Snapshots (nur Logging).
+"""
+
+import copy
+import random
+import time
+from types import SimpleNamespace
+
+from vpb.models import VPBConnection, VPBElement
+from vpb.ui.canvas_history import (
+    CanvasHistory,
+    HistoryShadow,
+    MoveBatchCommand,
+    PatchPropertiesCommand,
+    capture_state,
+    diff_shadow,
+)
+
+
+def _target(n: int = 20) -> SimpleNamespace:
+    elements = {f"E{i}": VPBElement(f"E{i}", "FUNCTION", f"Schritt {i}", i * 10, 100) for i in range(n)}
+    connections = {
+        f"C{i}": VPBConnection(f"C{i}", f"E{i}", f"E{i + 1}") for i in range(n - 1)
+    }
+    return SimpleNamespace(
+        elements=elements,
+        connections=connections,
+        metadata={"name": "VPB Prozess", "version": "1.0"},
+        hierarchy_categories=[],
+    )
+
+
+def _state(target) -> dict:
+    return {
+        "elements": {eid: capture_state(el) for eid, el in target.elements.items()},
+        "connections": {cid: capture_state(c) for cid, c in target.connections.items()},
+        "metadata": copy.deepcopy(target.metadata),
+        "hierarchy_categories": copy.deepcopy(target.hierarchy_categories),
+    }
+
+
+class _Recorder:
+    """Minimaler Nachbau des push_undo()/undo()/redo()-Ablaufs im Canvas."""
+
+    def __init__(self, target):
+        self.target = target
+        self.history = CanvasHistory()
+        self.shadow = HistoryShadow(target)
+
+    def step(self, mutate, now=None):
+        mutate(self.target)
+        command = diff_shadow(self.shadow, self.target)
+        if command is not None:
+            self.history.record(command, now=now)
+            self.shadow.update(self.target, command)
+        return command
+
+    def undo(self):
+        command = self.history.pop_undo()
+        command.revert(self.target)
+        self.shadow.update(self.target, command)
+
+    def redo(self):
+        command = self.history.pop_redo()
+        command.apply(self.target)
+        self.shadow.update(self.target, command)
+
+
+def _random_edit(rng, counter):
+    def mutate(t):
+        ids = list(t.elements)
+        choice = rng.randrange(6)
+        if choice == 0 or not ids:
+            eid = f"N{next(counter)}"
+            t.elements[eid] = VPBElement(eid, "TASK", "Neu", rng.randrange(500), rng.randrange(500))
+        elif choice == 1:
+            eid = rng.choice(ids)
+            del t.elements[eid]
+            for cid in [c for c, conn in t.connections.items() if eid in (conn.source_element, conn.target_element)]:
+                del t.connections[cid]
+        elif choice == 2:
+            for eid in rng.sample(ids, min(3, len(ids))):
+                t.elements[eid].x += 5
+                t.elements[eid].y -= 5
+        elif choice == 3:
+            el = t.elements[rng.choice(ids)]
+            el.name = f"Umbenannt {rng.randrange(100)}"
+            el.members.append("X")
+            el.style_override = {"fill": "#fff"}
+        elif choice == 4 and len(ids) > 1:
+            s, d = rng.sample(ids, 2)
+            cid = f"K{next(counter)}"
+            t.connections[cid] = VPBConnection(cid, s, d)
+        else:
+            t.metadata["version"] = str(rng.randrange(10))
+            t.hierarchy_categories.append({"name": "Kategorie"})
+    return mutate
+
+
+def test_random_edits_undo_redo_roundtrip():
+    rng = random.Random(3)
+    counter = iter(range(10 ** 6))
+    target = _target()
+    rec = _Recorder(target)
+
+    states = [_state(target)]
+    for _ in range(60):
+        if rec.step(_random_edit(rng, counter), now=float(len(states) * 10)) is not None:
+            states.append(_state(target))
+
+    for expected in reversed(states[:-1]):
+        rec.undo()
+        assert _state(target) == expected
+    assert not rec.history.can_undo()
+
+    for expected in states[1:]:
+        rec.redo()
+        assert _state(target) == expected
+
+
+def test_move_is_recorded_as_move_batch_and_coalesced():
+    target = _target()
+    rec = _Recorder(target)
+
+    def nudge(t):
+        t.elements["E1"].x += 1
+        t.elements["E2"].x += 1
+
+    for i in range(5):
+        command = rec.step(nudge, now=100.0 + i * 0.1)
+        assert isinstance(command, MoveBatchCommand)
+    assert rec.history.undo_depth == 1
+
+    # Andere Auswahl bzw. außerhalb des Zeitfensters -> neuer Schritt
+    rec.step(lambda t: setattr(t.elements["E1"], "x", 0), now=100.6)
+    rec.step(nudge, now=105.0)
+    assert rec.history.undo_depth == 3
+
+    rec.undo()
+    rec.undo()
+    rec.undo()
+    assert target.elements["E1"].x == 10
+    assert target.elements["E2"].x == 20
+
+
+def test_patch_stores_only_changed_fields():
+    target = _target()
+    rec = _Recorder(target)
+
+    command = rec.step(lambda t: setattr(t.elements["E3"], "description", "Neu"))
+    assert isinstance(command, PatchPropertiesCommand)
+    assert command.patches == {"E3": {"description": ("", "Neu")}}
+
+    # Ad-hoc-Attribute (z. B. vom Canvas gesetzt) werden ebenfalls erfasst und rückgängig gemacht
+    rec.step(lambda t: setattr(t.elements["E3"], "ref_process_id", "P7"))
+    rec.undo()
+    assert not hasattr(target.elements["E3"], "ref_process_id")
+
+
+def test_private_and_transient_attributes_are_ignored():
+    target = _target()
+    shadow = HistoryShadow(target)
+    target.elements["E0"]._resolved_style = {"fill": "#000"}
+    target.elements["E0"].canvas_items = [1, 2, 3]
+    target.connections["C0"].canvas_item = 7
+    assert diff_shadow(shadow, target) is None
+
+
+def test_memory_budget_drops_oldest_steps():
+    target = _target(50)
+    rec = _Recorder(target)
+    rec.history.budget_bytes = 4000
+
+    for i in range(40):
+        rec.step(lambda t, i=i: setattr(t.elements[f"E{i}"], "description", "x" * 200))
+    assert rec.history.size_bytes <= 4000
+    assert 1 <= rec.history.undo_depth < 40
+
+    # Neue Änderung nach Undo verwirft Redo und dessen Budgetanteil
+    rec.undo()
+    assert rec.history.can_redo()
+    rec.step(lambda t: setattr(t.elements["E0"], "name", "Neu"))
+    assert not rec.history.can_redo()
+
+
+def test_history_memory_vs_snapshots_log_only():
+    n = 5000
+    target = _target(n)
+    rec = _Recorder(target)
+    steps = 100
+
+    start = time.perf_counter()
+    for i in range(steps):
+        rec.step(lambda t, i=i: setattr(t.elements[f"E{i}"], "x", t.elements[f"E{i}"].x + 10), now=float(i * 10))
+    record_ms = (time.perf_counter() - start) * 1000.0 / steps
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        rec.undo()
+    undo_ms = (time.perf_counter() - start) * 1000.0 / steps
+
+    snapshot_bytes = len(repr(_state(target)["elements"])) + len(repr(_state(target)["connections"]))
+    print(
+        f"PERF HISTORY n={n}: delta={rec.history.size_bytes / steps:.0f} B/step | "
+        f"snapshot≈{snapshot_bytes} B/step | record={record_ms:.2f} ms | undo={undo_ms:.3f} ms"
+    )
+    assert rec.history.size_bytes < snapshot_bytes
+    assert target.elements["E0"].x == 0
@@ -0,0 +1,159 @@
+"""
+Frame-Time Benchmark für VPBCanvas: redraw_all vs. inkrementelles Move-Rendering.
+
+Synthetische Dokumente mit 100 / 1k / 5k Elementen (Gitter, Kettenverbindungen).
+Es wird nur geloggt; optionaler Schwellenwert via VPB_CANVAS_FRAME_MAX_MS.
+Zusätzlich: Viewport-Culling, Level-of-Detail und gecachte Minimap-Übersicht.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+from vpb.ui.canvas import MiniMapCanvas, VPBCanvas
+
+
+pytestmark = pytest.mark.skipif(
+    'DISPLAY' not in os.environ and sys.platform.startswith('linux'),
+    reason='Tkinter display not available',
+)
+
+
+def _synthetic_document(n: int) -> dict:
+    cols = max(1, int(n ** 0.5))
+    elements = [
+        {
+            "element_id": f"E{i}",
+            "element_type": "FUNCTION",
+            "name": f"Schritt {i}",
+            "x": 200 + (i % cols) * 220,
+            "y": 120 + (i // cols) * 120,
+        }
+        for i in range(n)
+    ]
+    connections = [
+        {
+            "connection_id": f"C{i}",
+            "source_element": f"E{i}",
+            "target_element": f"E{i + 1}",
+            "connection_type": "SEQUENCE",
+        }
+        for i in range(n - 1)
+    ]
+    return {"metadata": {"name": f"Synthetic {n}"}, "elements": elements, "connections": connections}
+
+
+@pytest.fixture
+def canvas():
+    root = tk.Tk()
+    root.withdraw()
+    c = VPBCanvas(root, width=1200, height=800)
+    c.grid_visible = False
+    c.time_axis_enabled = False
+    try:
+        yield c
+    finally:
+        root.destroy()
+
+
+def _frame_ms(fn, frames: int) -> float:
+    start = time.perf_counter()
+    for i in range(frames):
+        fn(i)
+    return (time.perf_counter() - start) * 1000.0 / frames
+
+
+@pytest.mark.parametrize("n", [100, 1000, 5000])
+def test_drag_frame_time_log_only(canvas, n):
+    canvas.load_from_dict(_synthetic_document(n))
+    target = canvas.elements["E1"]
+
+    def _full(i):
+        target.x += 5
+        canvas.redraw_all()
+
+    def _incremental(i):
+        target.x += 5
+        canvas.refresh_moved_elements(("E1",))
+
+    frames_full = 3 if n >= 5000 else 10
+    full_ms = _frame_ms(_full, frames_full)
+    inc_ms = _frame_ms(_incremental, 50)
+    print(f"PERF CANVAS n={n}: redraw_all={full_ms:.2f} ms/frame | incremental={inc_ms:.3f} ms/frame")
+
+    threshold = os.environ.get("VPB_CANVAS_FRAME_MAX_MS")
+    if threshold:
+        assert inc_ms <= float(threshold), f"Inkrementelles Frame zu langsam: {inc_ms:.2f} ms > {threshold} ms"
+
+
+def test_incremental_move_matches_full_redraw(canvas):
+    canvas.load_from_dict(_synthetic_document(30))
+    for eid in ("E3", "E4"):
+        canvas.elements[eid].x += 75
+        canvas.elements[eid].y -= 40
+    canvas.refresh_moved_elements(("E3", "E4"))
+    incremental_points = dict(canvas._connection_points_cache)
+    incremental_bbox = canvas.bbox("node:E3")
+    incremental_box = canvas._node_index.bounds("E3")
+
+    canvas.redraw_all()
+    assert canvas._connection_points_cache == incremental_points
+    assert canvas.bbox("node:E3") == incremental_bbox
+    assert canvas._node_index.bounds("E3") == incremental_box
+
+
+def test_culling_draws_only_visible_elements(canvas):
+    canvas.load_from_dict(_synthetic_document(2000))
+    canvas.set_view_origin_model(0, 0)
+    canvas.redraw_all()
+    culled_items = len(canvas.find_all())
+    assert "E0" in canvas._rendered_centers
+    assert "E1999" not in canvas._rendered_centers
+
+    canvas.culling_enabled = False
+    canvas.redraw_all()
+    full_items = len(canvas.find_all())
+    print(f"PERF CULLING n=2000: items culled={culled_items} | full={full_items}")
+    assert culled_items * 5 < full_items
+
+    # verdecktes Element wird beim Hineinschieben gezeichnet
+    canvas.culling_enabled = True
+    canvas.redraw_all()
+    far = canvas.elements["E1999"]
+    far.x, far.y = 400, 300
+    canvas.refresh_moved_elements(("E1999",))
+    assert "E1999" in canvas._rendered_centers
+
+
+def test_lod_below_threshold_skips_labels(canvas):
+    canvas.load_from_dict(_synthetic_document(100))
+    canvas.view_scale = 0.2
+    canvas.redraw_all()
+    kinds = {canvas.type(item) for item in canvas.find_all()}
+    assert "text" not in kinds
+    assert len(canvas.find_withtag("node:E5")) == 1
+
+    canvas.view_scale = 1.0
+    canvas.redraw_all()
+    assert any(canvas.type(item) == "text" for item in canvas.find_all())
+
+
+def test_minimap_overview_not_rebuilt_on_pan(canvas):
+    canvas.load_from_dict(_synthetic_document(500))
+    minimap = MiniMapCanvas(canvas.master, width=200, height=120)
+    minimap.attach(canvas)
+    builds = minimap.overview_builds
+
+    for i in range(5):
+        canvas.set_view_origin_model(100 * i, 50 * i)
+        minimap.redraw()
+    assert minimap.overview_builds == builds
+
+    canvas.elements["E3"].x += 300
+    canvas.refresh_moved_elements(("E3",))
+    minimap.redraw()
+    assert minimap.overview_builds == builds + 1
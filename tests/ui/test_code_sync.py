@@ -0,0 +1,290 @@
+"""
+Tests für die Live-Synchronisation der Code-Ansichten: zeilenbasierte Patches
+(diff_lines), Delta-Import (diff_canvas_data) und Tokenizer des Editors.
+
+Die Patches werden ohne Tk-Display auf einer Zeilenliste mit derselben
+Semantik wie RichCodeEditor.set_text() angewendet. Der Benchmark vergleicht
+die Größe von Voll-Ersetzen und Patch nach einer Verschiebung (nur Logging).
+
+Mit Display: VPBCanvas.apply_data_diff (nur geänderte Objekte, Ansicht und
+Auswahl bleiben, ein Undo-Schritt) und das Patchen des Tk-Text-Widgets.
+Debounce und verdeckte Ansichten der VPBApplication laufen ohne Display mit
+einem Stand-in für root.after().
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+import pytest
+
+import vpb_app
+from vpb.services.code_sync_service import CodeSyncService, diff_lines
+from vpb.ui.rich_code_editor import tokenize
+
+needs_display = pytest.mark.skipif(
+    'DISPLAY' not in os.environ and sys.platform.startswith('linux'),
+    reason='Tkinter display not available',
+)
+
+
+def _apply(text, patches):
+    """Wendet Patches wie der Editor an: von hinten, Zeilen [start, end) ersetzen."""
+    lines = text.splitlines(keepends=True)
+    for patch in reversed(patches):
+        lines[patch.start:patch.end] = patch.text.splitlines(keepends=True)
+    return "".join(lines)
+
+
+def _document(n):
+    return {
+        "metadata": {"name": "Synthetic"},
+        "elements": [
+            {"element_id": f"E{i}", "element_type": "FUNCTION", "name": f"Schritt {i}",
+             "x": 200 + i * 10, "y": 120}
+            for i in range(n)
+        ],
+        "connections": [
+            {"connection_id": f"C{i}", "source_element": f"E{i}", "target_element": f"E{i + 1}",
+             "connection_type": "SEQUENCE"}
+            for i in range(n - 1)
+        ],
+    }
+
+
+def test_diff_lines_reproduces_new_text():
+    rng = random.Random(11)
+    base = [f"zeile {i}\n" for i in range(60)]
+    for _ in range(300):
+        old = list(base)
+        new = list(base)
+        for _ in range(rng.randint(1, 4)):
+            pos = rng.randrange(len(new) + 1)
+            op = rng.choice(("insert", "delete", "replace"))
+            if op == "insert" or not new:
+                new[pos:pos] = [f"neu {rng.random()}\n"] * rng.randint(1, 3)
+            elif op == "delete":
+                del new[pos:pos + rng.randint(1, 3)]
+            else:
+                new[min(pos, len(new) - 1)] = f"geändert {rng.random()}\n"
+        old_text, new_text = "".join(old), "".join(new)
+        if rng.random() < 0.5:
+            new_text = new_text.rstrip("\n")  # letzte Zeile ohne Umbruch
+        patches = diff_lines(old_text, new_text)
+        assert _apply(old_text, patches) == new_text
+        assert all(a.end <= b.start for a, b in zip(patches, patches[1:]))
+    assert diff_lines("a\nb", "a\nb") == []
+    assert _apply("", diff_lines("", "x\ny")) == "x\ny"
+
+
+def test_diff_canvas_data_reports_only_changes():
+    service = CodeSyncService()
+    current = _document(20)
+    new = json.loads(json.dumps(current))
+    new["elements"][3]["name"] = "Umbenannt"
+    del new["elements"][5]
+    new["connections"].append({"connection_id": "CX", "source_element": "E1", "target_element": "E9"})
+
+    diff = service.diff_canvas_data(current, new)
+    assert list(diff.elements) == ["E3"]
+    assert diff.removed_elements == ["E5"]
+    assert list(diff.connections) == ["CX"] and diff.removed_connections == []
+    assert diff.element_order == [e["element_id"] for e in new["elements"]]
+    assert diff.connection_order is not None and diff.document == {}
+    assert service.diff_canvas_data(current, json.loads(json.dumps(current))).is_empty()
+
+
+def test_tokenizer_covers_json_and_xml():
+    text = '{\n  "x": [1, -2.5e3, true, "a\\"b"],\n  "n": null\n}'
+    tokens = [(tag, text[a:b]) for tag, a, b in tokenize("json", text)]
+    assert ("string", '"a\\"b"') in tokens
+    assert ("number", "-2.5e3") in tokens
+    assert ("keyword", "null") in tokens
+    assert [t for t in tokens if t[0] == "bracket"][0] == ("bracket", "{")
+
+    xml = '<vpb:process version="1.0">\n  <!-- a\n  b -->\n  <name>x</name>\n</vpb:process>'
+    tokens = [(tag, xml[a:b]) for tag, a, b in tokenize("xml", xml)]
+    assert tokens[:4] == [("bracket", "<"), ("tag", "vpb:process"), ("attribute", "version"), ("string", '"1.0"')]
+    assert ("comment", "<!-- a\n  b -->") in tokens
+    assert ("bracket", "</") in tokens
+    # Token überlappen nicht
+    spans = [(a, b) for _, a, b in tokenize("xml", xml)]
+    assert all(b1 <= a2 for (_, b1), (a2, _) in zip(spans, spans[1:]))
+
+
+def test_patch_size_after_move_log_only():
+    service = CodeSyncService()
+    data = _document(5000)
+    old_text = service.canvas_to_json(data)
+    data["elements"][2500]["x"] += 40
+    new_text = service.canvas_to_json(data)
+
+    start = time.perf_counter()
+    patches = diff_lines(old_text, new_text)
+    diff_ms = (time.perf_counter() - start) * 1000
+    patched_chars = sum(len(p.text) for p in patches)
+    print(f"\nPERF CODE-SYNC 5000 Elemente: diff={diff_ms:.1f} ms | patch={patched_chars} Zeichen "
+          f"| voll={len(new_text)} Zeichen")
+    assert _apply(old_text, patches) == new_text
+    assert len(patches) == 1 and patched_chars < 100
+
+
+@pytest.fixture
+def tk_root():
+    tk = pytest.importorskip("tkinter")
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        yield root
+    finally:
+        root.destroy()
+
+
+def _by_id(items, key):
+    return {item[key]: item for item in items}
+
+
+@needs_display
+def test_apply_data_diff_replaces_only_changed_objects(tk_root):
+    from vpb.ui.canvas import VPBCanvas
+
+    canvas = VPBCanvas(tk_root, width=800, height=600)
+    canvas.load_from_dict(_document(30))
+    canvas.view_scale, canvas.view_tx, canvas.view_ty = 1.5, -40.0, 25.0
+    canvas.selected_id = "E3"
+    canvas.selected_ids = {"E3", "E5"}
+    before = canvas.to_dict()
+    untouched = {eid: canvas.elements[eid] for eid in ("E0", "E10", "E29")}
+    untouched_conn = canvas.connections["C10"]
+
+    new = json.loads(json.dumps(before))
+    new["elements"][3]["name"] = "Umbenannt"
+    del new["elements"][5]
+    new["connections"] = [c for c in new["connections"] if "E5" not in (c["source_element"], c["target_element"])]
+    new["connections"].append({"connection_id": "CX", "source_element": "E1", "target_element": "E9",
+                               "connection_type": "SEQUENCE"})
+    diff = CodeSyncService().diff_canvas_data(before, new)
+
+    assert canvas.apply_data_diff(diff)
+    assert all(canvas.elements[eid] is element for eid, element in untouched.items())
+    assert canvas.connections["C10"] is untouched_conn
+    assert canvas.elements["E3"].name == "Umbenannt" and "E5" not in canvas.elements
+    assert list(canvas.elements) == [e["element_id"] for e in new["elements"]]
+    assert "CX" in canvas.connections and "C4" not in canvas.connections
+    assert (canvas.view_scale, canvas.view_tx, canvas.view_ty) == (1.5, -40.0, 25.0)
+    assert canvas.selected_id == "E3" and canvas.selected_ids == {"E3"}
+    assert not canvas.apply_data_diff(CodeSyncService().diff_canvas_data(canvas.to_dict(), canvas.to_dict()))
+
+    # Ein Undo stellt die gesamte Änderung wieder her
+    canvas.undo()
+    restored = canvas.to_dict()
+    assert _by_id(restored["elements"], "element_id") == _by_id(before["elements"], "element_id")
+    assert _by_id(restored["connections"], "connection_id") == _by_id(before["connections"], "connection_id")
+
+
+@needs_display
+def test_set_text_patches_tk_text_widget(tk_root):
+    from vpb.ui.rich_code_editor import RichCodeEditor
+
+    editor = RichCodeEditor(tk_root, language="json")
+    rng = random.Random(5)
+    texts = ["", "a", "a\n", "a\nb", "a\nb\n", "\n", "\n\n", "b\na\n\n"]
+    for _ in range(200):
+        lines = [f'"zeile {rng.randint(0, 9)}": {rng.randint(0, 3)},' for _ in range(rng.randint(0, 12))]
+        texts.append("\n".join(lines) + rng.choice(("", "\n", "\n\n")))
+    for text in texts:
+        editor.set_text(text)
+        # Tk hängt intern einen Zeilenumbruch an; get_text() liefert exakt den Zieltext
+        assert editor.get_text() == text
+        assert editor.text.get("1.0", "end") == text + "\n"
+        assert str(editor.text.cget("state")) == "disabled"
+
+    editor.set_readonly(False)
+    editor.set_text('{\n  "x": 1\n}')
+    assert editor.get_text() == '{\n  "x": 1\n}' and str(editor.text.cget("state")) == "normal"
+
+
+class _FakeRoot:
+    """Stand-in für root.after()/after_cancel(): Jobs laufen erst bei run()"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.delays = []
+
+    def after(self, ms, callback):
+        job = f"after#{len(self.delays)}"
+        self.delays.append(ms)
+        self.jobs[job] = callback
+        return job
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run(self):
+        jobs, self.jobs = self.jobs, {}
+        for callback in jobs.values():
+            callback()
+
+
+class _FakeEditor:
+    def __init__(self, mapped=True, readonly=True):
+        self.mapped = mapped
+        self.readonly = readonly
+
+    def is_readonly(self):
+        return self.readonly
+
+    def winfo_ismapped(self):
+        return self.mapped
+
+
+class _SyncHost:
+    """Die Live-Sync-Methoden der VPBApplication ohne deren Tk-Oberfläche"""
+
+    _schedule_code_sync = vpb_app.VPBApplication._schedule_code_sync
+    _run_code_sync = vpb_app.VPBApplication._run_code_sync
+    _flush_stale_code_view = vpb_app.VPBApplication._flush_stale_code_view
+
+    def __init__(self, json_editor, xml_editor):
+        self.root = _FakeRoot()
+        self.code_sync_service = CodeSyncService()
+        self.json_editor = json_editor
+        self.xml_editor = xml_editor
+        self._code_sync_job = None
+        self._code_sync_stale = set()
+        self.refreshed = []
+
+    def _refresh_code_view(self, code_type):
+        self.refreshed.append(code_type)
+
+
+def test_code_sync_debounce_and_stale_views():
+    host = _SyncHost(_FakeEditor(mapped=True), _FakeEditor(mapped=False))
+    for _ in range(5):
+        host._schedule_code_sync()
+    assert len(host.root.jobs) == 1  # vorherige Jobs abgebrochen
+    assert host.root.delays == [vpb_app.CODE_SYNC_DEBOUNCE_MS] * 5
+
+    host.root.run()
+    assert host.refreshed == ["json"] and host._code_sync_job is None
+    assert host._code_sync_stale == {"xml"}
+
+    # Verdeckte Ansicht wird beim Anzeigen genau einmal nachgezogen
+    host._flush_stale_code_view("xml")
+    host._flush_stale_code_view("xml")
+    host._flush_stale_code_view("json")
+    assert host.refreshed == ["json", "xml"] and not host._code_sync_stale
+
+    # Laufende Bearbeitung wird weder überschrieben noch vorgemerkt
+    host.json_editor.readonly = False
+    host._schedule_code_sync()
+    host.root.run()
+    assert host.refreshed == ["json", "xml"] and host._code_sync_stale == {"xml"}
+    host._flush_stale_code_view("json")
+    assert host.refreshed == ["json", "xml"]
+
+    host.code_sync_service.set_auto_sync(False)
+    host._schedule_code_sync()
+    assert host.root.jobs == {}
@@ -0,0 +1,249 @@
+"""
+Tests für das gemeinsame Hindernis-Gitter der smart-plus-Verbindungen
+(vpb.ui.grid_router).
+
+Referenz ist das bisherige Einzel-Routing aus VPBCanvas._route_polyline_grid
+(Hindernis-Mengen pro Verbindung), hier ohne Tk-Display über die View-Boxen
+der Prozesse aus processes/ nachgebildet. Der Benchmark (nur Logging)
+vergleicht ein Neuzeichnen aller Prozesse nach einer Verschiebung; optionaler
+Schwellenwert VPB_ROUTER_MIN_SPEEDUP.
+"""
+
+import heapq
+import json
+import math
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from vpb.ui.grid_router import GridRouter
+
+PROCESSES = Path(__file__).resolve().parents[2] / "processes"
+GRID_STEP = 90  # NODE_W * view_scale 0.6 (Untergrenze)
+HALF_W, HALF_H = 75, 30
+
+
+def _reference_route(boxes, polylines, sx, sy, tx, ty, cid, src_id, tgt_id, grid_step=GRID_STEP):
+    """Bisheriges Routing: Hindernisse pro Verbindung, A* über Zell-Tupel"""
+    margin = grid_step * 2
+    xs, ys = [sx, tx], [sy, ty]
+    for _eid, (cx, cy, hw, hh) in boxes.items():
+        xs.extend([cx - hw - margin, cx + hw + margin])
+        ys.extend([cy - hh - margin, cy + hh + margin])
+    min_x = int(math.floor(min(xs) / grid_step) * grid_step)
+    max_x = int(math.ceil(max(xs) / grid_step) * grid_step)
+    min_y = int(math.floor(min(ys) / grid_step) * grid_step)
+    max_y = int(math.ceil(max(ys) / grid_step) * grid_step)
+    width = int((max_x - min_x) / grid_step) + 1
+    height = int((max_y - min_y) / grid_step) + 1
+    if width <= 0 or height <= 0 or width * height > 60000:
+        return None
+
+    def _clamp_cell(x, y):
+        gx = int(math.floor((x - min_x) / grid_step))
+        gy = int(math.floor((y - min_y) / grid_step))
+        return (max(0, min(width - 1, gx)), max(0, min(height - 1, gy)))
+
+    start, goal = _clamp_cell(sx, sy), _clamp_cell(tx, ty)
+    if start == goal:
+        return [sx, sy, tx, ty]
+
+    blocked, penalty = set(), set()
+    for eid, (cx, cy, hw, hh) in boxes.items():
+        pad_x, pad_y = hw + grid_step // 2, hh + grid_step // 2
+        if eid in {src_id, tgt_id}:
+            pad_x, pad_y = max(0, pad_x - grid_step // 2), max(0, pad_y - grid_step // 2)
+        ix0 = max(0, int(math.floor((cx - pad_x - min_x) / grid_step)))
+        ix1 = min(width - 1, int(math.ceil((cx + pad_x - min_x) / grid_step)))
+        iy0 = max(0, int(math.floor((cy - pad_y - min_y) / grid_step)))
+        iy1 = min(height - 1, int(math.ceil((cy + pad_y - min_y) / grid_step)))
+        blocked.update((gx, gy) for gx in range(ix0, ix1 + 1) for gy in range(iy0, iy1 + 1))
+    clearance = max(6, grid_step // 2)
+    for other, pts in polylines.items():
+        if not pts or len(pts) < 4 or other == cid:
+            continue
+        for idx in range(0, len(pts) - 2, 2):
+            x1, y1, x2, y2 = pts[idx:idx + 4]
+            ix0 = max(0, int(math.floor((min(x1, x2) - clearance - min_x) / grid_step)))
+            ix1 = min(width - 1, int(math.ceil((max(x1, x2) + clearance - min_x) / grid_step)))
+            iy0 = max(0, int(math.floor((min(y1, y2) - clearance - min_y) / grid_step)))
+            iy1 = min(height - 1, int(math.ceil((max(y1, y2) + clearance - min_y) / grid_step)))
+            penalty.update(
+                (gx, gy) for gx in range(ix0, ix1 + 1) for gy in range(iy0, iy1 + 1) if (gx, gy) not in blocked
+            )
+    blocked.discard(start)
+    blocked.discard(goal)
+
+    def _heuristic(cell):
+        return abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])
+
+    open_heap, g_score, came_from, counter = [(_heuristic(start), 0, start)], {start: 0.0}, {}, 0
+    found = False
+    while open_heap:
+        _, _, current = heapq.heappop(open_heap)
+        if current == goal:
+            found = True
+            break
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nb = (current[0] + dx, current[1] + dy)
+            if not (0 <= nb[0] < width and 0 <= nb[1] < height) or nb in blocked:
+                continue
+            tentative = g_score[current] + 1.0 + (4.0 if nb in penalty else 0.0)
+            if tentative + 1e-6 < g_score.get(nb, float("inf")):
+                came_from[nb] = current
+                g_score[nb] = tentative
+                counter += 1
+                heapq.heappush(open_heap, (tentative + _heuristic(nb), counter, nb))
+    if not found:
+        return None
+    cells = [goal]
+    while cells[-1] != start:
+        cells.append(came_from[cells[-1]])
+    coords = []
+    for gx, gy in reversed(cells):
+        coords.extend([int(min_x + gx * grid_step), int(min_y + gy * grid_step)])
+    coords[0], coords[1] = sx, sy
+    coords[-2], coords[-1] = tx, ty
+    return coords
+
+
+def _load(path):
+    data = json.loads(path.read_text(encoding="utf-8"))
+    boxes = {el["element_id"]: (int(el["x"]), int(el["y"]), HALF_W, HALF_H) for el in data["elements"]}
+    connections = []
+    for i, c in enumerate(data.get("connections", [])):
+        src_id = c.get("source_element") or c.get("source_element_id") or c.get("from")
+        tgt_id = c.get("target_element") or c.get("target_element_id") or c.get("to")
+        if src_id in boxes and tgt_id in boxes:
+            connections.append((c.get("connection_id") or f"C{i}", src_id, tgt_id))
+    return boxes, connections
+
+
+def _endpoints(boxes, src_id, tgt_id):
+    """Ankerpunkte am Boxrand in Richtung des Gegenübers"""
+    scx, scy, shw, shh = boxes[src_id]
+    tcx, tcy, thw, thh = boxes[tgt_id]
+    if abs(tcx - scx) >= abs(tcy - scy):
+        direction = 1 if tcx >= scx else -1
+        return scx + direction * shw, scy, tcx - direction * thw, tcy
+    direction = 1 if tcy >= scy else -1
+    return scx, scy + direction * shh, tcx, tcy - direction * thh
+
+
+def _redraw(boxes, connections, router=None):
+    """Zeichnet alle Verbindungen der Reihe nach (wie redraw_all); Referenz ohne Router"""
+    polylines, routes = {}, {}
+    if router is not None:
+        router.reset()
+        router.build(boxes.items(), GRID_STEP, polylines)
+    for cid, src_id, tgt_id in connections:
+        sx, sy, tx, ty = _endpoints(boxes, src_id, tgt_id)
+        if router is None:
+            coords = _reference_route(boxes, polylines, sx, sy, tx, ty, cid, src_id, tgt_id)
+        else:
+            coords = router.route(cid, sx, sy, tx, ty, src_id, tgt_id)
+        routes[cid] = coords
+        polylines[cid] = coords or [sx, sy, tx, ty]
+        if router is not None:
+            router.set_polyline(cid, polylines[cid])
+    return routes
+
+
+FIXTURES = sorted(PROCESSES.glob("*.vpb.json"))
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=[p.name for p in FIXTURES])
+def test_batch_routes_match_per_connection_routing(path):
+    boxes, connections = _load(path)
+    router = GridRouter()
+    assert _redraw(boxes, connections, router) == _redraw(boxes, connections)
+
+    # Nach dem Verschieben eines Elements (Routen teils aus dem Korridor-Cache)
+    moved = connections[len(connections) // 2][1] if connections else next(iter(boxes))
+    cx, cy, hw, hh = boxes[moved]
+    boxes[moved] = (cx + 37, cy - 23, hw, hh)
+    assert _redraw(boxes, connections, router) == _redraw(boxes, connections)
+
+
+def test_incremental_updates_match_rebuild():
+    boxes, connections = _load(PROCESSES / "bauantrag_pruefung_komplex.vpb.json")
+    router = GridRouter()
+    _redraw(boxes, connections, router)
+    polylines = dict(router._polylines)
+
+    # Drag: Element und Polylinien inkrementell pflegen, eigene Route bleibt im Cache (wie beim Move)
+    moved = connections[0][2]
+    for step in range(1, 6):
+        cx, cy, hw, hh = boxes[moved]
+        boxes[moved] = (cx + 45 * step, cy + 15, hw, hh)
+        router.update_element(moved, boxes[moved])
+        for cid, src_id, tgt_id in connections:
+            if moved not in (src_id, tgt_id):
+                continue
+            sx, sy, tx, ty = _endpoints(boxes, src_id, tgt_id)
+            expected = _reference_route(boxes, polylines, sx, sy, tx, ty, cid, src_id, tgt_id)
+            assert router.route(cid, sx, sy, tx, ty, src_id, tgt_id) == expected
+            polylines[cid] = expected or [sx, sy, tx, ty]
+            router.set_polyline(cid, polylines[cid])
+
+    # Element weit nach außen: Gitter wächst, Ergebnis bleibt gleich
+    far = connections[-1][1]
+    boxes[far] = (boxes[far][0] + 2000, boxes[far][1], HALF_W, HALF_H)
+    router.update_element(far, boxes[far])
+    for cid, src_id, tgt_id in connections:
+        sx, sy, tx, ty = _endpoints(boxes, src_id, tgt_id)
+        assert router.route(cid, sx, sy, tx, ty, src_id, tgt_id) == \
+            _reference_route(boxes, polylines, sx, sy, tx, ty, cid, src_id, tgt_id)
+
+
+def test_corridor_cache_skips_unaffected_routes():
+    boxes = {f"E{i}": (i * 300, 0, HALF_W, HALF_H) for i in range(6)}
+    boxes.update({f"F{i}": (i * 300, 1500, HALF_W, HALF_H) for i in range(6)})
+    connections = [(f"C{i}", f"E{i}", f"E{i + 1}") for i in range(5)]
+    connections += [(f"D{i}", f"F{i}", f"F{i + 1}") for i in range(5)]
+    router = GridRouter()
+    _redraw(boxes, connections, router)
+    assert router.stats == {"routed": 10, "reused": 0}
+
+    boxes["F5"] = (1500, 1540, HALF_W, HALF_H)  # nur die untere Kette ist betroffen
+    assert _redraw(boxes, connections, router) == _redraw(boxes, connections)
+    assert router.stats["reused"] >= 4
+    assert router.stats["routed"] < 20
+
+
+def test_redraw_after_move_benchmark_log_only():
+    scenes = [_load(path) for path in FIXTURES]
+    rounds = int(os.environ.get("VPB_ROUTER_BENCH_ROUNDS", "3"))
+    routers = [GridRouter() for _ in scenes]
+    for (boxes, connections), router in zip(scenes, routers):
+        _redraw(boxes, connections, router)
+
+    def _move(round_no):
+        for boxes, connections in scenes:
+            if connections:
+                moved = connections[0][1]
+                cx, cy, hw, hh = boxes[moved]
+                boxes[moved] = (cx + (40 if round_no % 2 == 0 else -40), cy, hw, hh)
+
+    legacy_s = router_s = 0.0
+    for round_no in range(rounds):
+        _move(round_no)
+        start = time.perf_counter()
+        expected = [_redraw(boxes, connections) for boxes, connections in scenes]
+        legacy_s += time.perf_counter() - start
+        start = time.perf_counter()
+        actual = [_redraw(boxes, connections, router) for (boxes, connections), router in zip(scenes, routers)]
+        router_s += time.perf_counter() - start
+        assert actual == expected
+
+    total = sum(len(connections) for _, connections in scenes)
+    reused = sum(router.stats["reused"] for router in routers)
+    speedup = legacy_s / max(router_s, 1e-6)
+    print(f"\nPERF SMART-PLUS {len(scenes)} Prozesse / {total} Verbindungen x {rounds}: "
+          f"einzeln={legacy_s * 1000 / rounds:.1f} ms | Gitter={router_s * 1000 / rounds:.1f} ms | "
+          f"wiederverwendet={reused} | speedup={speedup:.1f}x")
+    threshold = os.environ.get("VPB_ROUTER_MIN_SPEEDUP")
+    if threshold:
+        assert speedup >= float(threshold), f"Speedup zu gering: {speedup:.1f}x < {threshold}x"
@@ -0,0 +1,225 @@
+"""
+Tests für den räumlichen Index des Canvas (vpb.ui.spatial_index).
+
+Die Ausrichtungs-Logik wird ohne Tk-Display gegen den bisherigen
+Voll-Durchlauf aus VPBCanvas._compute_alignment geprüft. Zusätzlich ein
+Drag-Benchmark mit 2k Elementen (nur Logging); optionaler Schwellenwert
+VPB_SPATIAL_MIN_SPEEDUP. Das Hit-Testing von Verbindungen über den
+Segment-Index läuft mit den Canvas-Methoden auf einem Stand-in ohne Tk.
+"""
+
+import os
+import random
+import time
+from types import SimpleNamespace
+
+from vpb.ui.canvas import VPBCanvas
+from vpb.ui.spatial_index import SpatialIndex, align_on_axis
+
+NODE_W = 150
+NODE_H = 60
+
+
+def _reference_alignment(positions, moving_id, nx, ny, threshold=8):
+    """Bisheriger Voll-Durchlauf über alle Elemente (Referenz)"""
+    w, h = NODE_W, NODE_H
+    best_v = (None, threshold + 1)
+    best_h = (None, threshold + 1)
+
+    def edges_for(xc, yc):
+        return xc - w / 2, xc + w / 2, yc - h / 2, yc + h / 2, xc, yc
+
+    l, r, t, b, cx, cy = edges_for(nx, ny)
+    for oid, (ox, oy) in positions.items():
+        if oid == moving_id:
+            continue
+        ol, or_, ot, ob, ocx, ocy = edges_for(ox, oy)
+        for a, b2 in [(l, ol), (l, or_), (r, ol), (r, or_), (cx, ocx)]:
+            d = abs(a - b2)
+            if d <= best_v[1]:
+                best_v = (b2 if a in (l, cx) else (b2 + w / 2 if a == r else b2), d)
+                if a == l:
+                    nx = b2 + w / 2
+                elif a == r:
+                    nx = b2 - w / 2
+                elif a == cx:
+                    nx = b2
+        for a, b2 in [(t, ot), (t, ob), (b, ot), (b, ob), (cy, ocy)]:
+            d = abs(a - b2)
+            if d <= best_h[1]:
+                best_h = (b2 if a in (t, cy) else (b2 + h / 2 if a == b else b2), d)
+                if a == t:
+                    ny = b2 + h / 2
+                elif a == b:
+                    ny = b2 - h / 2
+                elif a == cy:
+                    ny = b2
+        l, r, t, b, cx, cy = edges_for(nx, ny)
+    vline = best_v[0] if best_v[0] is not None and best_v[1] <= threshold else None
+    hline = best_h[0] if best_h[0] is not None and best_h[1] <= threshold else None
+    return nx, ny, vline, hline
+
+
+def _node_box(x, y):
+    return (x - NODE_W / 2, y - NODE_H / 2, x + NODE_W / 2, y + NODE_H / 2)
+
+
+def _index_for(positions):
+    index = SpatialIndex(cell_size=NODE_W)
+    index.rebuild((eid, _node_box(x, y)) for eid, (x, y) in positions.items())
+    return index
+
+
+def _indexed_alignment(index, positions, moving_id, nx, ny, threshold=8):
+    nx, vline = align_on_axis(index, "x", moving_id, nx, NODE_W, threshold, lambda k: positions[k][0])
+    ny, hline = align_on_axis(index, "y", moving_id, ny, NODE_H, threshold, lambda k: positions[k][1])
+    return nx, ny, vline, hline
+
+
+def _grid_positions(n, cols=None):
+    cols = cols or max(1, int(n ** 0.5))
+    return {f"E{i}": (200 + (i % cols) * 220, 120 + (i // cols) * 120) for i in range(n)}
+
+
+def test_point_rect_and_axis_queries_follow_updates():
+    index = SpatialIndex(cell_size=100)
+    index.rebuild([("a", (0, 0, 50, 50)), ("b", (200, 0, 260, 40)), ("c", (-500, -500, 900, 900))])
+
+    assert index.query_point(10, 10) == ["a", "c"]
+    assert index.query_point(50, 50) == ["a", "c"]  # Rand zählt
+    assert index.query_rect(40, -10, 210, 5) == ["a", "b", "c"]
+    assert index.query_axis("x", 255, 300) == ["b", "c"]
+    assert index.extent() == (-500, -500, 900, 900)
+
+    index.insert("a", (1000, 1000, 1050, 1050))
+    assert index.query_point(10, 10) == ["c"]
+    assert index.query_rect(990, 990, 5000, 5000) == ["a"]
+    assert list(index) == ["a", "b", "c"]  # Update behält die Reihenfolge
+
+    index.insert("d", (205, 10, 215, 20))
+    assert index.remove("c") and not index.remove("c")
+    assert index.query_rect(-10000, -10000, 10000, 10000) == ["a", "b", "d"]
+    assert index.extent() == (200, 0, 1050, 1050)
+    assert "c" not in index and len(index) == 3
+
+    index.clear()
+    assert index.query_point(0, 0) == [] and index.extent() is None
+
+
+class _SegmentHost:
+    """Segment-Index und Verbindungs-Hit-Test des VPBCanvas ohne Tk-Widget"""
+
+    CONNECTION_HIT_TOLERANCE = VPBCanvas.CONNECTION_HIT_TOLERANCE
+    to_model = VPBCanvas.to_model
+    _set_connection_points = VPBCanvas._set_connection_points
+    _route_segments_model = VPBCanvas._route_segments_model
+    _ensure_segment_index = VPBCanvas._ensure_segment_index
+    _point_segment_distance = staticmethod(VPBCanvas._point_segment_distance)
+    _hit_test_connection = VPBCanvas._hit_test_connection
+
+    def __init__(self):
+        self.view_scale, self.view_tx, self.view_ty = 2.0, 10.0, 0.0
+        self._router = SimpleNamespace(set_polyline=lambda cid, pts: None)
+        self._connection_points_cache = {}
+        self._connection_items = {}
+        self._id_to_element = {}
+        self._id_to_connection = {}
+        self._segment_index = SpatialIndex(cell_size=150)
+        self._segment_counts = {}
+        self._dirty_segments = set()
+        self._segments_stale = True
+        self.overlapping = []
+
+    def find_overlapping(self, *bbox):
+        return self.overlapping
+
+    def route(self, cid, pts):
+        self._connection_items[cid] = {"line": len(self._connection_items) + 1}
+        self._set_connection_points(cid, pts)
+
+    def hit(self, x, y):
+        return self._hit_test_connection(SimpleNamespace(x=x, y=y))
+
+
+def test_connection_hit_test_uses_route_segments():
+    host = _SegmentHost()
+    # View-Punkte; C1 als L-Route, C2 waagerecht darunter
+    host.route("C1", [10, 10, 210, 10, 210, 210])
+    host.route("C2", [10, 100, 400, 100])
+
+    assert host.hit(214, 150) == "C1"  # 4 px neben dem senkrechten Segment
+    assert host.hit(214, 103) == "C2"  # näher an C2 als an C1
+    assert host.hit(300, 160) is None
+    assert len(host._segment_index) == 3
+
+    # Neue Route: alte Segmente verschwinden, ohne den Index neu aufzubauen
+    host._set_connection_points("C1", [10, 10, 110, 10])
+    assert host.hit(214, 150) is None and host.hit(105, 13) == "C1"
+    assert len(host._segment_index) == 2
+    host._set_connection_points("C2", None)
+    assert host.hit(214, 103) is None and len(host._segment_index) == 1
+
+    # Nach einem Neuzeichnen mit anderem Zoom wird der Index aus dem Cache neu aufgebaut
+    host.view_scale = 4.0
+    host._connection_points_cache = {"C1": [10, 10, 110, 10]}
+    host._segments_stale = True
+    assert host.hit(60, 14) == "C1"
+    assert host._segment_index.bounds(("C1", 0)) == (0.0, 2.5, 25.0, 2.5)
+
+    # Elemente unter dem Cursor und nicht gezeichnete Verbindungen haben Vorrang bzw. zählen nicht
+    host.overlapping = [7]
+    host._id_to_element[7] = "E1"
+    assert host.hit(60, 14) is None
+    host.overlapping = []
+    del host._connection_items["C1"]
+    assert host.hit(60, 14) is None
+
+
+def test_alignment_matches_full_scan():
+    rng = random.Random(7)
+    scenes = [
+        _grid_positions(300),
+        {f"E{i}": (rng.uniform(-2000, 2000), rng.uniform(-2000, 2000)) for i in range(300)},
+        # dichte Kette: Einrasten wandert über viele Nachbarn (Fallback auf Voll-Durchlauf)
+        {f"E{i}": (i * 7.5, 100 + (i % 3) * 9) for i in range(200)},
+    ]
+    for positions in scenes:
+        index = _index_for(positions)
+        ids = list(positions)
+        for _ in range(300):
+            moving = rng.choice(ids)
+            x, y = positions[moving]
+            nx, ny = x + rng.uniform(-300, 300), y + rng.uniform(-300, 300)
+            assert _indexed_alignment(index, positions, moving, nx, ny) == \
+                _reference_alignment(positions, moving, nx, ny)
+
+
+def test_drag_latency_2k_log_only():
+    positions = _grid_positions(2000)
+    index = _index_for(positions)
+    moving = "E1000"
+    start_x, start_y = positions[moving]
+    path = [(start_x + i * 1.5, start_y + i * 0.5) for i in range(200)]
+
+    start = time.perf_counter()
+    expected = []
+    for nx, ny in path:
+        result = _reference_alignment(positions, moving, nx, ny)
+        expected.append(result)
+    full_ms = (time.perf_counter() - start) * 1000 / len(path)
+
+    start = time.perf_counter()
+    actual = []
+    for nx, ny in path:
+        result = _indexed_alignment(index, positions, moving, nx, ny)
+        index.insert(moving, _node_box(result[0], result[1]))
+        actual.append(result)
+    indexed_ms = (time.perf_counter() - start) * 1000 / len(path)
+
+    speedup = full_ms / max(indexed_ms, 1e-6)
+    print(f"\nPERF DRAG n=2000: full scan={full_ms:.3f} ms/frame | spatial index={indexed_ms:.3f} ms/frame "
+          f"| speedup={speedup:.0f}x")
+    assert actual == expected
+    threshold = os.environ.get("VPB_SPATIAL_MIN_SPEEDUP")
+    if threshold:
+        assert speedup >= float(threshold), f"Speedup zu gering: {speedup:.1f}x < {threshold}x"
@@ -68,6 +68,9 @@ class BackendHealth:
     neo4j_version: Optional[str] = None
     chromadb_version: Optional[str] = None
     
+    # Verbindungszustand je Backend (not_connected, connected, failed, ...)
+    backend_states: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    
     last_check: datetime = field(default_factory=datetime.now)
     
     @property
@@ -333,7 +336,7 @@ class UDS3APIBackend:
             
             # Query ChromaDB
             chromadb_adapter = self.polyglot_manager.chromadb
-            if chromadb_adapter and chromadb_adapter.connected:
+            if chromadb_adapter and chromadb_adapter.ensure_connected():
                 results = chromadb_adapter.query(search_text, n_results=5)
                 return results
             
@@ -350,6 +353,9 @@ class UDS3APIBackend:
         """
         Prüfe Status aller Backend-Verbindungen
         
+        Baut keine Verbindungen auf: noch nicht genutzte Backends erscheinen
+        in backend_states als "not_connected", nicht als Fehler.
+        
         Returns:
             BackendHealth mit Connection Status
         """
@@ -372,6 +378,8 @@ class UDS3APIBackend:
             chromadb = self.polyglot_manager.chromadb
             health.chromadb_connected = chromadb.connected if chromadb else False
             
+            health.backend_states = self.polyglot_manager.backend_status()
+            
             logger.info(f"Backend health: PG={health.postgresql_connected}, "
                        f"Neo4j={health.neo4j_connected}, "
                        f"ChromaDB={health.chromadb_connected}")
@@ -401,7 +409,7 @@ class UDS3APIBackend:
         
         try:
             chromadb = self.polyglot_manager.chromadb
-            if chromadb and chromadb.connected:
+            if chromadb and chromadb.ensure_connected():
                 results = chromadb.query(query, n_results=n_results)
                 logger.info(f"Semantic search for '{query}' returned {len(results)} results")
                 return results
@@ -429,7 +437,7 @@ class UDS3APIBackend:
         
         try:
             neo4j = self.polyglot_manager.neo4j
-            if neo4j and neo4j.connected:
+            if neo4j and neo4j.ensure_connected():
                 graph = neo4j.get_process_graph(process_id)
                 if graph:
                     logger.info(f"Loaded graph for process {process_id}")
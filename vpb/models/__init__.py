@@ -8,6 +8,7 @@ This package contains:
 - DocumentModel: Complete process document structure with metadata
 - VPBElement: Individual process elements
 - VPBConnection: Connections between elements
+- ProcessGraph: Cached graph analysis (reachability, cycles, layers)
 - PaletteModel: Element palette definitions
 """
 
@@ -20,6 +21,7 @@ from .connection import (
     ROUTING_MODES,
 )
 from .document import DocumentModel, DocumentMetadata
+from .process_graph import ProcessGraph
 from .palette import PaletteModel, PaletteCategory, PaletteItem
 
 __all__ = [
@@ -36,6 +38,8 @@ __all__ = [
     # Document
     'DocumentModel',
     'DocumentMetadata',
+    # Graph analysis
+    'ProcessGraph',
     # Palette
     'PaletteModel',
     'PaletteCategory',
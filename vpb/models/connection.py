@@ -13,11 +13,11 @@ Features:
 - Multiple connection types (SEQUENCE, DEPENDENCY, etc.)
 - Routing modes (auto, straight, orthogonal)
 - Serialization support
+- Compact slotted storage
 """
 
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from uuid import uuid4
 import logging
 
@@ -56,13 +56,16 @@ ROUTING_MODES = {
 }
 
 
-@dataclass
 class VPBConnection:
     """
     VPB Process Connection.
     
     Represents a connection/arrow between two elements in a VPB process diagram.
     
+    Fields are stored in ``__slots__``; the waypoint list is only allocated
+    when used. Ad-hoc attributes (e.g. routing caches of the canvas) are
+    still supported via ``__dict__``.
+    
     Attributes:
         connection_id: Unique identifier
         source_element: ID of source element
@@ -75,34 +78,59 @@ class VPBConnection:
         waypoints: Optional manual waypoints for routing
     """
     
-    # Core properties
-    connection_id: str
-    source_element: str
-    target_element: str
-    
-    # Optional properties with defaults
-    connection_type: str = "SEQUENCE"
-    description: str = ""
-    arrow_style: str = "single"
-    routing_mode: str = "auto"
-    
-    # Canvas integration (transient)
-    canvas_item: Optional[int] = None
-    
-    # Manual routing
-    waypoints: List[Tuple[int, int]] = field(default_factory=list)
+    __slots__ = (
+        'connection_id', 'source_element', 'target_element',
+        'connection_type', 'description', 'arrow_style', 'routing_mode',
+        'canvas_item', '_waypoints',
+        '__dict__', '__weakref__',
+    )
     
-    def __post_init__(self):
-        """Validate connection after creation."""
-        self.validate()
+    # All public fields in declaration order (serialization, equality, history)
+    FIELD_NAMES: Tuple[str, ...] = (
+        'connection_id', 'source_element', 'target_element',
+        'connection_type', 'description', 'arrow_style', 'routing_mode',
+        'canvas_item', 'waypoints',
+    )
     
-    def validate(self) -> None:
+    def __init__(
+        self,
+        connection_id: str,
+        source_element: str,
+        target_element: str,
+        connection_type: str = "SEQUENCE",
+        description: str = "",
+        arrow_style: str = "single",
+        routing_mode: str = "auto",
+        canvas_item: Optional[int] = None,
+        waypoints: Optional[List[Tuple[int, int]]] = None,
+    ):
         """
-        Validate connection properties.
+        Create a connection.
         
         Raises:
             ValueError: If validation fails
         """
+        # Core properties
+        self.connection_id = connection_id
+        self.source_element = source_element
+        self.target_element = target_element
+        
+        # Optional properties with defaults
+        self.connection_type = connection_type
+        self.description = description
+        self.arrow_style = arrow_style
+        self.routing_mode = routing_mode
+        
+        # Canvas integration (transient)
+        self.canvas_item = canvas_item
+        
+        # Manual routing (allocated on first use)
+        self._waypoints = waypoints or None
+        
+        self._check_required()
+    
+    def _check_required(self) -> None:
+        """Hard checks run on construction (no logging)."""
         if not self.connection_id:
             raise ValueError("connection_id cannot be empty")
         
@@ -114,6 +142,17 @@ class VPBConnection:
         
         if self.source_element == self.target_element:
             raise ValueError("Cannot connect element to itself")
+    
+    def validate(self) -> None:
+        """
+        Validate connection properties.
+        
+        Unknown types/styles/modes are only logged as warnings.
+        
+        Raises:
+            ValueError: If validation fails
+        """
+        self._check_required()
         
         if self.connection_type not in CONNECTION_TYPES:
             logger.warning(f"Unknown connection type: {self.connection_type}")
@@ -124,6 +163,39 @@ class VPBConnection:
         if self.routing_mode not in ROUTING_MODES:
             logger.warning(f"Unknown routing mode: {self.routing_mode}")
     
+    @property
+    def waypoints(self) -> List[Tuple[int, int]]:
+        if self._waypoints is None:
+            self._waypoints = []
+        return self._waypoints
+    
+    @waypoints.setter
+    def waypoints(self, value: List[Tuple[int, int]]) -> None:
+        self._waypoints = value
+    
+    @waypoints.deleter
+    def waypoints(self) -> None:
+        self._waypoints = None
+    
+    def state_items(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate over stored fields as (name, value)."""
+        yield 'connection_id', self.connection_id
+        yield 'source_element', self.source_element
+        yield 'target_element', self.target_element
+        yield 'connection_type', self.connection_type
+        yield 'description', self.description
+        yield 'arrow_style', self.arrow_style
+        yield 'routing_mode', self.routing_mode
+        yield 'canvas_item', self.canvas_item
+        yield 'waypoints', self._waypoints if self._waypoints is not None else []
+    
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.FIELD_NAMES)
+    
+    __hash__ = None  # type: ignore[assignment]
+    
     def is_sequence(self) -> bool:
         """Check if this is a sequence connection."""
         return self.connection_type == 'SEQUENCE'
@@ -138,7 +210,7 @@ class VPBConnection:
     
     def has_waypoints(self) -> bool:
         """Check if connection has manual waypoints."""
-        return len(self.waypoints) > 0
+        return bool(self._waypoints)
     
     def add_waypoint(self, x: int, y: int) -> None:
         """
@@ -152,7 +224,8 @@ class VPBConnection:
     
     def clear_waypoints(self) -> None:
         """Remove all waypoints."""
-        self.waypoints.clear()
+        if self._waypoints:
+            self._waypoints.clear()
     
     def reverse(self) -> VPBConnection:
         """
@@ -208,7 +281,7 @@ class VPBConnection:
             'description': self.description,
             'arrow_style': self.arrow_style,
             'routing_mode': self.routing_mode,
-            'waypoints': self.waypoints,
+            'waypoints': self._waypoints if self._waypoints is not None else [],
             # Note: canvas_item is transient and not serialized
         }
     
@@ -10,6 +10,8 @@ VPB process diagram including metadata, elements, and connections.
 Features:
 - Observer pattern for change notifications
 - Element and connection management
+- Adjacency index (O(1) incoming/outgoing connection lookups)
+- Cached ProcessGraph analysis (invalidated by change notifications)
 - Validation (no orphaned connections)
 - Serialization (JSON format)
 - Undo/Redo support (history tracking)
@@ -18,17 +20,21 @@ Features:
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Callable, Set
+from typing import List, Optional, Dict, Any, Callable, Set, Mapping
+from types import MappingProxyType
 from datetime import datetime
 from pathlib import Path
 import logging
 
 from .element import VPBElement
 from .connection import VPBConnection
+from .process_graph import ProcessGraph
 
 
 logger = logging.getLogger(__name__)
 
+_EMPTY_VIEW: Mapping[str, VPBConnection] = MappingProxyType({})
+
 
 @dataclass
 class DocumentMetadata:
@@ -120,7 +126,11 @@ class DocumentModel:
         self.metadata = DocumentMetadata()
         self._elements: Dict[str, VPBElement] = {}
         self._connections: Dict[str, VPBConnection] = {}
+        # Adjacency index: element_id -> {connection_id: connection}
+        self._outgoing: Dict[str, Dict[str, VPBConnection]] = {}
+        self._incoming: Dict[str, Dict[str, VPBConnection]] = {}
         self._observers: List[Callable[[str, Any], None]] = []
+        self._process_graph: Optional[ProcessGraph] = None
         self._current_path: Optional[Path] = None
         self._modified: bool = False
     
@@ -165,6 +175,8 @@ class DocumentModel:
             data: Event data
         """
         logger.debug(f"Notifying observers: {event}")
+        # Any change makes the cached graph analysis stale
+        self._process_graph = None
         for observer in self._observers[:]:  # Copy to allow modifications
             try:
                 observer(event, data)
@@ -279,6 +291,7 @@ class DocumentModel:
             raise ValueError(f"Target element '{connection.target_element}' not found")
         
         self._connections[connection.connection_id] = connection
+        self._index_connection(connection)
         self._set_modified()
         self._notify('connection.added', {'connection': connection})
         logger.debug(f"Connection added: {connection.connection_id}")
@@ -297,6 +310,7 @@ class DocumentModel:
             return None
         
         connection = self._connections.pop(connection_id)
+        self._unindex_connection(connection)
         self._set_modified()
         self._notify('connection.removed', {'connection': connection})
         logger.debug(f"Connection removed: {connection_id}")
@@ -329,37 +343,108 @@ class DocumentModel:
         Returns:
             List of connections involving this element
         """
-        return [
-            conn for conn in self._connections.values()
-            if conn.source_element == element_id or conn.target_element == element_id
-        ]
+        connections = dict(self._outgoing.get(element_id, {}))
+        connections.update(self._incoming.get(element_id, {}))
+        return list(connections.values())
     
     def get_outgoing_connections(self, element_id: str) -> List[VPBConnection]:
         """Get connections from an element."""
-        return [
-            conn for conn in self._connections.values()
-            if conn.source_element == element_id
-        ]
+        return list(self._outgoing.get(element_id, {}).values())
     
     def get_incoming_connections(self, element_id: str) -> List[VPBConnection]:
         """Get connections to an element."""
-        return [
-            conn for conn in self._connections.values()
-            if conn.target_element == element_id
-        ]
+        return list(self._incoming.get(element_id, {}).values())
+    
+    def get_outgoing_view(self, element_id: str) -> Mapping[str, VPBConnection]:
+        """
+        Get a read-only live view of the outgoing connections of an element.
+        
+        Args:
+            element_id: Element ID
+            
+        Returns:
+            Mapping connection_id -> connection (must not be mutated)
+        """
+        bucket = self._outgoing.get(element_id)
+        return MappingProxyType(bucket) if bucket else _EMPTY_VIEW
+    
+    def get_incoming_view(self, element_id: str) -> Mapping[str, VPBConnection]:
+        """
+        Get a read-only live view of the incoming connections of an element.
+        
+        Args:
+            element_id: Element ID
+            
+        Returns:
+            Mapping connection_id -> connection (must not be mutated)
+        """
+        bucket = self._incoming.get(element_id)
+        return MappingProxyType(bucket) if bucket else _EMPTY_VIEW
+    
+    def get_out_degree(self, element_id: str) -> int:
+        """Get number of outgoing connections of an element."""
+        return len(self._outgoing.get(element_id, ()))
+    
+    def get_in_degree(self, element_id: str) -> int:
+        """Get number of incoming connections of an element."""
+        return len(self._incoming.get(element_id, ()))
+    
+    def get_process_graph(self) -> ProcessGraph:
+        """
+        Get the cached graph analysis of this document.
+        
+        The graph is built on first access and dropped whenever a change
+        notification is dispatched (before observers run, so observers
+        always see the new state). Code that mutates elements directly
+        (without update_element) must call invalidate_process_graph().
+        
+        Returns:
+            ProcessGraph for the current document state
+        """
+        if self._process_graph is None:
+            self._process_graph = ProcessGraph(self._elements, self._connections.values())
+        return self._process_graph
+    
+    def invalidate_process_graph(self) -> None:
+        """Drop the cached ProcessGraph."""
+        self._process_graph = None
+    
+    def _index_connection(self, connection: VPBConnection) -> None:
+        """Register a connection in the adjacency index."""
+        conn_id = connection.connection_id
+        self._outgoing.setdefault(connection.source_element, {})[conn_id] = connection
+        self._incoming.setdefault(connection.target_element, {})[conn_id] = connection
+    
+    def _unindex_connection(self, connection: VPBConnection) -> None:
+        """Remove a connection from the adjacency index."""
+        conn_id = connection.connection_id
+        for index, element_id in (
+            (self._outgoing, connection.source_element),
+            (self._incoming, connection.target_element),
+        ):
+            bucket = index.get(element_id)
+            if bucket is None:
+                continue
+            bucket.pop(conn_id, None)
+            if not bucket:
+                del index[element_id]
+    
+    def _rebuild_index(self) -> None:
+        """Rebuild the adjacency index from the connection table."""
+        self._outgoing = {}
+        self._incoming = {}
+        for connection in self._connections.values():
+            self._index_connection(connection)
     
     def _remove_connections_for_element(self, element_id: str) -> List[VPBConnection]:
         """Remove all connections to/from an element."""
-        to_remove = [
-            conn_id for conn_id, conn in self._connections.items()
-            if conn.source_element == element_id or conn.target_element == element_id
-        ]
+        to_remove = self.get_connections_for_element(element_id)
         
-        removed = []
-        for conn_id in to_remove:
-            removed.append(self._connections.pop(conn_id))
+        for conn in to_remove:
+            self._connections.pop(conn.connection_id, None)
+            self._unindex_connection(conn)
         
-        return removed
+        return to_remove
     
     # ========================================================================
     # Document Operations
@@ -369,6 +454,7 @@ class DocumentModel:
         """Clear all elements and connections."""
         self._elements.clear()
         self._connections.clear()
+        self._rebuild_index()
         self.metadata = DocumentMetadata()
         self._current_path = None
         self._modified = False
@@ -502,6 +588,8 @@ class DocumentModel:
                     )
             except Exception as e:
                 logger.error(f"Failed to load connection: {e}")
+        # Index once from the final table (a duplicate ID replaces the earlier entry)
+        doc._rebuild_index()
         
         doc._modified = False
         doc._notify('document.loaded', {'element_count': len(doc._elements)})
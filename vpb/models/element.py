@@ -8,7 +8,7 @@ This module defines the VPBElement class representing individual process element
 like VorProzess, Prozess, NachProzess, Entscheidung, etc.
 
 Features:
-- Immutable data structure (frozen dataclass)
+- Compact slotted storage with type-specific extension blocks
 - Type validation
 - Serialization (to_dict/from_dict)
 - Geometry calculations
@@ -16,8 +16,8 @@ Features:
 """
 
 from __future__ import annotations
-from dataclasses import dataclass, field, asdict
-from typing import List, Optional, Tuple, Dict, Any
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from uuid import uuid4
 import logging
 
@@ -108,13 +108,173 @@ ELEMENT_TYPES = {
 }
 
 
-@dataclass
+class _ExtensionBlock:
+    """
+    Base class for type-specific property blocks of VPBElement.
+
+    Subclasses declare their fields in DEFAULTS; a default of ``list``
+    creates a fresh list per block.
+    """
+
+    __slots__ = ()
+    DEFAULTS: Dict[str, Any] = {}
+
+    def __init__(self):
+        for name, default in self.DEFAULTS.items():
+            setattr(self, name, [] if default is list else default)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.DEFAULTS)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.DEFAULTS)
+        return f"{type(self).__name__}({values})"
+
+
+class ReferenceProps(_ExtensionBlock):
+    """External/inline file reference (SUBPROCESS and imported elements)."""
+
+    DEFAULTS = {
+        'ref_file': "",
+        'ref_inline_content': None,
+        'ref_inline_path': None,
+        'ref_inline_error': None,
+        'ref_inline_truncated': False,
+        'ref_source_mtime': None,
+    }
+    __slots__ = tuple(DEFAULTS)
+
+
+class TimeLoopProps(_ExtensionBlock):
+    """Time properties for TIME_LOOP and TIMER."""
+
+    DEFAULTS = {
+        'loop_type': "none",  # none, interval, cron, date, relative
+        'loop_interval_minutes': 0,  # Für interval: Minuten zwischen Wiederholungen
+        'loop_cron': "",  # Für cron: Cron-Expression (z.B. "0 9 * * *" = täglich 9 Uhr)
+        'loop_date': "",  # Für date: ISO-Datum (z.B. "2025-12-31")
+        'loop_relative_days': 0,  # Für relative: Tage relativ zu Prozessstart
+        'loop_max_iterations': 0,  # 0 = unbegrenzt, >0 = max. Wiederholungen
+    }
+    __slots__ = tuple(DEFAULTS)
+
+
+class CounterProps(_ExtensionBlock):
+    """Counter properties for COUNTER."""
+
+    DEFAULTS = {
+        'counter_type': "UP",  # UP, DOWN, UP_DOWN
+        'counter_start_value': 0,  # Startwert
+        'counter_max_value': 100,  # Maximalwert
+        'counter_current_value': 0,  # Aktueller Wert (Laufzeit)
+        'counter_reset_on_max': False,  # Bei Max zurücksetzen?
+        'counter_on_max_reached': "",  # Element-ID für Eskalation bei Maximum
+    }
+    __slots__ = tuple(DEFAULTS)
+
+
+class ConditionProps(_ExtensionBlock):
+    """Condition properties for CONDITION."""
+
+    DEFAULTS = {
+        'condition_checks': list,  # Liste von ConditionCheck-Dicts
+        'condition_logic': "AND",  # AND, OR
+        'condition_true_target': "",  # Element-ID für TRUE-Fall
+        'condition_false_target': "",  # Element-ID für FALSE-Fall
+    }
+    __slots__ = tuple(DEFAULTS)
+
+
+class ErrorHandlerProps(_ExtensionBlock):
+    """Error handler properties for ERROR_HANDLER."""
+
+    DEFAULTS = {
+        'error_handler_type': "RETRY",  # RETRY, FALLBACK, NOTIFY, ABORT
+        'error_handler_retry_count': 3,  # Anzahl Wiederholungsversuche
+        'error_handler_retry_delay': 60,  # Verzögerung zwischen Retries (Sekunden)
+        'error_handler_timeout': 300,  # Timeout für Operation (Sekunden), 0 = kein Timeout
+        'error_handler_on_error_target': "",  # Element-ID bei Fehler (nach allen Retries)
+        'error_handler_on_success_target': "",  # Element-ID bei Erfolg
+        'error_handler_log_errors': True,  # Fehler loggen?
+    }
+    __slots__ = tuple(DEFAULTS)
+
+
+class StateProps(_ExtensionBlock):
+    """State machine properties for STATE."""
+
+    DEFAULTS = {
+        'state_name': "",  # Name des Zustands (z.B. "Eingereicht", "In Bearbeitung")
+        'state_type': "NORMAL",  # NORMAL, INITIAL, FINAL, ERROR
+        'state_entry_action': "",  # Aktion beim Eintritt (Element-ID oder Script)
+        'state_exit_action': "",  # Aktion beim Verlassen (Element-ID oder Script)
+        'state_transitions': list,  # Liste von Transitions
+        'state_timeout': 0,  # Timeout im State (Sekunden), 0 = kein Timeout
+        'state_timeout_target': "",  # Element-ID bei Timeout
+    }
+    __slots__ = tuple(DEFAULTS)
+
+
+class InterlockProps(_ExtensionBlock):
+    """Interlock properties for INTERLOCK (Mutex/Semaphore)."""
+
+    DEFAULTS = {
+        'interlock_type': "MUTEX",  # MUTEX (exklusiv) oder SEMAPHORE (begrenzte Anzahl)
+        'interlock_resource_id': "",  # Eindeutige Ressourcen-ID (z.B. "db_connection", "printer_1")
+        'interlock_max_count': 1,  # Maximale Anzahl gleichzeitiger Zugriffe (nur SEMAPHORE), MUTEX = 1
+        'interlock_timeout': 0,  # Timeout beim Warten auf Lock (Sekunden), 0 = unbegrenzt warten
+        'interlock_on_locked_target': "",  # Element-ID wenn Lock nicht verfügbar (nach Timeout)
+        'interlock_auto_release': True,  # Lock automatisch nach Element-Durchlauf freigeben?
+    }
+    __slots__ = tuple(DEFAULTS)
+
+
+# Extension blocks: slot name -> block class
+EXTENSION_BLOCKS: Dict[str, type] = {
+    '_ref': ReferenceProps,
+    '_loop': TimeLoopProps,
+    '_counter': CounterProps,
+    '_condition': ConditionProps,
+    '_error_handler': ErrorHandlerProps,
+    '_state': StateProps,
+    '_interlock': InterlockProps,
+}
+
+# Element types whose extension block is allocated on construction;
+# all other elements only get a block once one of its fields is set
+TYPE_EXTENSIONS: Dict[str, str] = {
+    'TIME_LOOP': '_loop',
+    'TIMER': '_loop',
+    'COUNTER': '_counter',
+    'CONDITION': '_condition',
+    'ERROR_HANDLER': '_error_handler',
+    'STATE': '_state',
+    'INTERLOCK': '_interlock',
+}
+
+_EXTENSION_FIELDS: Dict[str, str] = {
+    name: slot for slot, block in EXTENSION_BLOCKS.items() for name in block.DEFAULTS
+}
+
+
 class VPBElement:
     """
     VPB Process Element.
     
     Represents a single element in a VPB process diagram.
     
+    Storage is compact: the core fields live in ``__slots__``, the
+    type-specific properties (time loop, counter, condition, error handler,
+    state, interlock, file reference) in small extension blocks that are only
+    allocated for elements of the matching type or once one of their fields
+    is set. Unallocated blocks read as their class defaults, so every
+    attribute below is always available. Ad-hoc attributes (e.g. set by the
+    canvas) are still supported via ``__dict__``.
+    
     Attributes:
         element_id: Unique identifier
         element_type: Type of element (VorProzess, Prozess, etc.)
@@ -142,113 +302,186 @@ class VPBElement:
         loop_relative_days: Days relative to process start
         loop_max_iterations: Maximum iterations (0 = unlimited)
         canvas_items: List of canvas item IDs
-    """
     
-    # Core properties
-    element_id: str
-    element_type: str
-    name: str
-    x: int
-    y: int
-    
-    # Optional properties with defaults
-    description: str = ""
-    responsible_authority: str = ""
-    legal_basis: str = ""
-    deadline_days: int = 0
-    geo_reference: str = ""
-    
-    # File references
-    ref_file: str = ""
-    ref_inline_content: Optional[str] = None
-    ref_inline_path: Optional[str] = None
-    ref_inline_error: Optional[str] = None
-    ref_inline_truncated: bool = False
-    ref_source_mtime: Optional[float] = None
-    
-    # Type transformation
-    original_element_type: Optional[str] = None
-    
-    # Container properties
-    members: List[str] = field(default_factory=list)
-    collapsed: bool = False
-    
-    # Zeit-Properties (NEU für TIME_LOOP und TIMER)
-    loop_type: str = "none"  # none, interval, cron, date, relative
-    loop_interval_minutes: int = 0  # Für interval: Minuten zwischen Wiederholungen
-    loop_cron: str = ""  # Für cron: Cron-Expression (z.B. "0 9 * * *" = täglich 9 Uhr)
-    loop_date: str = ""  # Für date: ISO-Datum (z.B. "2025-12-31")
-    loop_relative_days: int = 0  # Für relative: Tage relativ zu Prozessstart
-    loop_max_iterations: int = 0  # 0 = unbegrenzt, >0 = max. Wiederholungen
-    
-    # Counter-Properties (NEU für COUNTER)
-    counter_type: str = "UP"  # UP, DOWN, UP_DOWN
-    counter_start_value: int = 0  # Startwert
-    counter_max_value: int = 100  # Maximalwert
-    counter_current_value: int = 0  # Aktueller Wert (Laufzeit)
-    counter_reset_on_max: bool = False  # Bei Max zurücksetzen?
-    counter_on_max_reached: str = ""  # Element-ID für Eskalation bei Maximum
-    
-    # Condition-Properties (NEU für CONDITION)
-    condition_checks: List[Dict[str, Any]] = field(default_factory=list)  # Liste von ConditionCheck-Dicts
-    condition_logic: str = "AND"  # AND, OR
-    condition_true_target: str = ""  # Element-ID für TRUE-Fall
-    condition_false_target: str = ""  # Element-ID für FALSE-Fall
-    
-    # Error-Handler-Properties (NEU für ERROR_HANDLER)
-    error_handler_type: str = "RETRY"  # RETRY, FALLBACK, NOTIFY, ABORT
-    error_handler_retry_count: int = 3  # Anzahl Wiederholungsversuche
-    error_handler_retry_delay: int = 60  # Verzögerung zwischen Retries (Sekunden)
-    error_handler_timeout: int = 300  # Timeout für Operation (Sekunden), 0 = kein Timeout
-    error_handler_on_error_target: str = ""  # Element-ID bei Fehler (nach allen Retries)
-    error_handler_on_success_target: str = ""  # Element-ID bei Erfolg
-    error_handler_log_errors: bool = True  # Fehler loggen?
-    
-    # State-Properties (NEU für STATE)
-    state_name: str = ""  # Name des Zustands (z.B. "Eingereicht", "In Bearbeitung")
-    state_type: str = "NORMAL"  # NORMAL, INITIAL, FINAL, ERROR
-    state_entry_action: str = ""  # Aktion beim Eintritt (Element-ID oder Script)
-    state_exit_action: str = ""  # Aktion beim Verlassen (Element-ID oder Script)
-    state_transitions: List[Dict[str, Any]] = field(default_factory=list)  # Liste von Transitions
-    state_timeout: int = 0  # Timeout im State (Sekunden), 0 = kein Timeout
-    state_timeout_target: str = ""  # Element-ID bei Timeout
-    
-    # Interlock-Properties (NEU für INTERLOCK - Mutex/Semaphore)
-    interlock_type: str = "MUTEX"  # MUTEX (exklusiv) oder SEMAPHORE (begrenzte Anzahl)
-    interlock_resource_id: str = ""  # Eindeutige Ressourcen-ID (z.B. "db_connection", "printer_1")
-    interlock_max_count: int = 1  # Maximale Anzahl gleichzeitiger Zugriffe (nur SEMAPHORE), MUTEX = 1
-    interlock_timeout: int = 0  # Timeout beim Warten auf Lock (Sekunden), 0 = unbegrenzt warten
-    interlock_on_locked_target: str = ""  # Element-ID wenn Lock nicht verfügbar (nach Timeout)
-    interlock_auto_release: bool = True  # Lock automatisch nach Element-Durchlauf freigeben?
-    
-    # Canvas integration
-    canvas_items: List[int] = field(default_factory=list)
-    
-    def __post_init__(self):
-        """Validate element after creation."""
-        self.validate()
+    The SPS properties (counter_*, condition_*, error_handler_*, state_*,
+    interlock_*) are documented on their extension block classes.
+    """
     
-    def validate(self) -> None:
+    __slots__ = (
+        # Core properties
+        'element_id', 'element_type', 'name', 'x', 'y',
+        'description', 'responsible_authority', 'legal_basis', 'deadline_days', 'geo_reference',
+        'original_element_type', 'collapsed',
+        # Lazily allocated lists
+        '_members', '_canvas_items',
+        # Extension blocks (None until needed)
+        *EXTENSION_BLOCKS,
+        # Ad-hoc attributes and weak references
+        '__dict__', '__weakref__',
+    )
+    
+    # All public fields in declaration order (serialization, equality, history)
+    FIELD_NAMES: Tuple[str, ...] = (
+        'element_id', 'element_type', 'name', 'x', 'y',
+        'description', 'responsible_authority', 'legal_basis', 'deadline_days', 'geo_reference',
+        *ReferenceProps.DEFAULTS, 'original_element_type', 'members', 'collapsed',
+        *TimeLoopProps.DEFAULTS, *CounterProps.DEFAULTS, *ConditionProps.DEFAULTS,
+        *ErrorHandlerProps.DEFAULTS, *StateProps.DEFAULTS, *InterlockProps.DEFAULTS,
+        'canvas_items',
+    )
+    
+    def __init__(
+        self,
+        element_id: str,
+        element_type: str,
+        name: str,
+        x: int,
+        y: int,
+        description: str = "",
+        responsible_authority: str = "",
+        legal_basis: str = "",
+        deadline_days: int = 0,
+        geo_reference: str = "",
+        original_element_type: Optional[str] = None,
+        members: Optional[List[str]] = None,
+        collapsed: bool = False,
+        canvas_items: Optional[List[int]] = None,
+        **properties: Any,
+    ):
         """
-        Validate element properties.
+        Create an element.
+        
+        Args:
+            element_id .. canvas_items: Core fields (see class docstring)
+            **properties: Fields of the extension blocks (ref_*, loop_*,
+                counter_*, condition_*, error_handler_*, state_*, interlock_*)
         
         Raises:
+            TypeError: If an unknown property is given
             ValueError: If validation fails
         """
+        self.element_id = element_id
+        self.element_type = element_type
+        self.name = name
+        self.x = x
+        self.y = y
+        self.description = description
+        self.responsible_authority = responsible_authority
+        self.legal_basis = legal_basis
+        self.deadline_days = deadline_days
+        self.geo_reference = geo_reference
+        self.original_element_type = original_element_type
+        self._members = members
+        self.collapsed = collapsed
+        self._canvas_items = canvas_items
+        for slot in EXTENSION_BLOCKS:
+            setattr(self, slot, None)
+        typed_slot = TYPE_EXTENSIONS.get(element_type)
+        if typed_slot:
+            setattr(self, typed_slot, EXTENSION_BLOCKS[typed_slot]())
+        for key, value in properties.items():
+            if key not in _EXTENSION_FIELDS:
+                raise TypeError(f"VPBElement() got an unexpected keyword argument '{key}'")
+            setattr(self, key, value)
+        self._check_required()
+    
+    def _check_required(self) -> None:
+        """Hard checks run on construction (no logging)."""
         if not self.element_id:
             raise ValueError("element_id cannot be empty")
         
         if not self.element_type:
             raise ValueError("element_type cannot be empty")
         
+        if self.deadline_days < 0:
+            raise ValueError("deadline_days cannot be negative")
+    
+    def validate(self) -> None:
+        """
+        Validate element properties.
+        
+        Unknown types and missing names are only logged as warnings.
+        
+        Raises:
+            ValueError: If validation fails
+        """
+        self._check_required()
+        
         if self.element_type not in ELEMENT_TYPES:
             logger.warning(f"Unknown element type: {self.element_type}")
         
         if not self.name:
             logger.warning(f"Element {self.element_id} has no name")
+    
+    # ------------------------------------------------------------------------
+    # Lazily allocated fields
+    # ------------------------------------------------------------------------
+    
+    @property
+    def members(self) -> List[str]:
+        if self._members is None:
+            self._members = []
+        return self._members
+    
+    @members.setter
+    def members(self, value: List[str]) -> None:
+        self._members = value
+    
+    @members.deleter
+    def members(self) -> None:
+        self._members = None
+    
+    @property
+    def canvas_items(self) -> List[int]:
+        if self._canvas_items is None:
+            self._canvas_items = []
+        return self._canvas_items
+    
+    @canvas_items.setter
+    def canvas_items(self, value: List[int]) -> None:
+        self._canvas_items = value
+    
+    @canvas_items.deleter
+    def canvas_items(self) -> None:
+        self._canvas_items = None
+    
+    def extension(self, slot: str) -> Optional[_ExtensionBlock]:
+        """Get an allocated extension block (e.g. '_counter') or None."""
+        return getattr(self, slot)
+    
+    def state_items(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate over stored fields as (name, value).
         
-        if self.deadline_days < 0:
-            raise ValueError("deadline_days cannot be negative")
+        Yields the core fields and the fields of allocated extension blocks;
+        fields of unallocated blocks are skipped (they hold their defaults).
+        """
+        yield 'element_id', self.element_id
+        yield 'element_type', self.element_type
+        yield 'name', self.name
+        yield 'x', self.x
+        yield 'y', self.y
+        yield 'description', self.description
+        yield 'responsible_authority', self.responsible_authority
+        yield 'legal_basis', self.legal_basis
+        yield 'deadline_days', self.deadline_days
+        yield 'geo_reference', self.geo_reference
+        yield 'original_element_type', self.original_element_type
+        yield 'members', self._members if self._members is not None else []
+        yield 'collapsed', self.collapsed
+        yield 'canvas_items', self._canvas_items if self._canvas_items is not None else []
+        for slot in EXTENSION_BLOCKS:
+            block = getattr(self, slot)
+            if block is not None:
+                for name in block.DEFAULTS:
+                    yield name, getattr(block, name)
+    
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.FIELD_NAMES)
+    
+    __hash__ = None  # type: ignore[assignment]
     
     def center(self) -> Tuple[int, int]:
         """
@@ -409,7 +642,7 @@ class VPBElement:
             'ref_inline_truncated': self.ref_inline_truncated,
             'ref_source_mtime': self.ref_source_mtime,
             'original_element_type': self.original_element_type,
-            'members': self.members,
+            'members': self._members if self._members is not None else [],
             'collapsed': self.collapsed,
             # Zeit-Properties (conditional)
             'loop_type': self.loop_type if self.loop_type != "none" else None,
@@ -542,6 +775,43 @@ class VPBElement:
         )
 
 
+def _extension_property(slot: str, name: str, default: Any) -> property:
+    """Property reading/writing a field of an extension block (allocated on demand)."""
+    block_cls = EXTENSION_BLOCKS[slot]
+    
+    def fget(self: VPBElement) -> Any:
+        block = getattr(self, slot)
+        if block is None:
+            if default is not list:
+                return default
+            # Mutable default: allocate so that in-place edits persist
+            block = block_cls()
+            setattr(self, slot, block)
+        return getattr(block, name)
+    
+    def fset(self: VPBElement, value: Any) -> None:
+        block = getattr(self, slot)
+        if block is None:
+            if value == ([] if default is list else default):
+                return  # stays compact
+            block = block_cls()
+            setattr(self, slot, block)
+        setattr(block, name, value)
+    
+    def fdel(self: VPBElement) -> None:
+        # Reset to default
+        block = getattr(self, slot)
+        if block is not None:
+            setattr(block, name, [] if default is list else default)
+    
+    return property(fget, fset, fdel, doc=f"{name} (stored in {block_cls.__name__})")
+
+
+for _name, _slot in _EXTENSION_FIELDS.items():
+    setattr(VPBElement, _name, _extension_property(_slot, _name, EXTENSION_BLOCKS[_slot].DEFAULTS[_name]))
+del _name, _slot
+
+
 class ElementFactory:
     """
     Factory for creating VPB elements.
@@ -650,4 +920,17 @@ class ElementFactory:
         )
 
 
-__all__ = ['VPBElement', 'ElementFactory', 'ELEMENT_TYPES']
+__all__ = [
+    'VPBElement',
+    'ElementFactory',
+    'ELEMENT_TYPES',
+    'EXTENSION_BLOCKS',
+    'TYPE_EXTENSIONS',
+    'ReferenceProps',
+    'TimeLoopProps',
+    'CounterProps',
+    'ConditionProps',
+    'ErrorHandlerProps',
+    'StateProps',
+    'InterlockProps',
+]
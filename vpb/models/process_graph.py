@@ -0,0 +1,279 @@
+"""
+VPB Process Graph
+=================
+
+Read-only graph analysis of a VPB process.
+
+The ProcessGraph is built once from elements and connections and derives
+everything the validation, layout and compliance code needs:
+
+- Degree tables (in/out) and adjacency lists
+- Sources/sinks and start/end sets (typed start/end elements included)
+- Reachability from the start set and reverse reachability to the end set
+- Strongly connected components (cycles)
+- Topological layers (longest path over the SCC condensation)
+
+All analyses are linear in the number of elements and connections.
+DocumentModel caches one instance (see DocumentModel.get_process_graph)
+and drops it on every change notification.
+"""
+
+from __future__ import annotations
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from .connection import VPBConnection
+
+
+# Element types that always start/end a process, regardless of their degree
+START_TYPES: FrozenSet[str] = frozenset({'VorProzess', 'START_EVENT'})
+END_TYPES: FrozenSet[str] = frozenset({'NachProzess', 'END_EVENT'})
+
+
+class ProcessGraph:
+    """
+    Immutable graph view of a process.
+
+    Only connections whose endpoints both exist are used as edges. Parallel
+    connections between the same pair of elements count once per connection
+    in the degree tables.
+
+    Example:
+        ```python
+        graph = doc.get_process_graph()
+        unreachable = graph.node_ids - graph.reachable
+        for cycle in graph.cycles:
+            print("Loop:", cycle)
+        ```
+    """
+
+    def __init__(
+        self,
+        elements: Mapping[str, Any],
+        connections: Iterable[VPBConnection],
+    ):
+        """
+        Build the graph and run all analyses.
+
+        Args:
+            elements: Mapping element_id -> element (needs element_type)
+            connections: Connections between the elements
+        """
+        self._order: List[str] = list(elements.keys())
+        self._types: Dict[str, str] = {
+            eid: getattr(el, 'element_type', '') or '' for eid, el in elements.items()
+        }
+        self._succ: Dict[str, List[str]] = {eid: [] for eid in self._order}
+        self._pred: Dict[str, List[str]] = {eid: [] for eid in self._order}
+        self.edge_count = 0
+
+        for conn in connections:
+            s, t = conn.source_element, conn.target_element
+            if s in self._succ and t in self._succ:
+                self._succ[s].append(t)
+                self._pred[t].append(s)
+                self.edge_count += 1
+
+        self.node_ids: FrozenSet[str] = frozenset(self._order)
+        self.out_degree: Dict[str, int] = {eid: len(v) for eid, v in self._succ.items()}
+        self.in_degree: Dict[str, int] = {eid: len(v) for eid, v in self._pred.items()}
+
+        self.sources: Tuple[str, ...] = tuple(e for e in self._order if not self.in_degree[e])
+        self.sinks: Tuple[str, ...] = tuple(e for e in self._order if not self.out_degree[e])
+        self.start_ids: Tuple[str, ...] = tuple(
+            e for e in self._order
+            if self._types[e] in START_TYPES or not self.in_degree[e]
+        )
+        self.end_ids: Tuple[str, ...] = tuple(
+            e for e in self._order
+            if self._types[e] in END_TYPES or not self.out_degree[e]
+        )
+
+        self.reachable: FrozenSet[str] = self._bfs(self.start_ids, self._succ)
+        self.reaching_end: FrozenSet[str] = self._bfs(self.end_ids, self._pred)
+
+        self.sccs: List[List[str]] = self._strongly_connected_components()
+        self.cycles: List[List[str]] = [
+            comp for comp in self.sccs
+            if len(comp) > 1 or comp[0] in self._succ[comp[0]]
+        ]
+        self.layers: Dict[str, int] = self._topological_layers()
+
+    # ========================================================================
+    # Construction
+    # ========================================================================
+
+    @classmethod
+    def from_document(cls, document: Any) -> ProcessGraph:
+        """Build a graph from a DocumentModel (uncached)."""
+        return cls(
+            {el.element_id: el for el in document.get_all_elements()},
+            document.get_all_connections(),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> ProcessGraph:
+        """
+        Build a graph from document data (DocumentModel.to_dict format).
+
+        Same graph as DocumentModel.from_dict(data).get_process_graph(), but
+        without building element and connection objects (batch validation).
+        Like the model, a repeated connection ID keeps the later entry and
+        self-connections are skipped.
+        """
+        elements = {
+            e['element_id']: SimpleNamespace(element_type=e.get('element_type', ''))
+            for e in data.get('elements') or []
+            if e.get('element_id')
+        }
+        connections = {
+            c.get('connection_id'): SimpleNamespace(
+                source_element=c['source_element'], target_element=c['target_element']
+            )
+            for c in data.get('connections') or []
+            if c.get('source_element') and c.get('source_element') != c.get('target_element')
+        }
+        return cls(elements, connections.values())
+
+    # ========================================================================
+    # Queries
+    # ========================================================================
+
+    def successors(self, element_id: str) -> List[str]:
+        """Get target IDs of outgoing edges (do not mutate)."""
+        return self._succ.get(element_id, [])
+
+    def predecessors(self, element_id: str) -> List[str]:
+        """Get source IDs of incoming edges (do not mutate)."""
+        return self._pred.get(element_id, [])
+
+    def element_type(self, element_id: str) -> str:
+        """Get the element type recorded for an element."""
+        return self._types.get(element_id, '')
+
+    def ids_of_type(self, *element_types: str) -> List[str]:
+        """Get element IDs with one of the given types (document order)."""
+        wanted = set(element_types)
+        return [e for e in self._order if self._types[e] in wanted]
+
+    def layer_groups(self) -> Dict[int, List[str]]:
+        """Get element IDs grouped by topological layer (document order)."""
+        groups: Dict[int, List[str]] = {}
+        for eid in self._order:
+            groups.setdefault(self.layers[eid], []).append(eid)
+        return groups
+
+    def summary(self) -> Dict[str, int]:
+        """Get key figures of the graph."""
+        return {
+            'elements': len(self._order),
+            'connections': self.edge_count,
+            'start_elements': len(self.start_ids),
+            'end_elements': len(self.end_ids),
+            'unreachable': len(self.node_ids - self.reachable),
+            'dead_ends': len(self.node_ids - self.reaching_end),
+            'cycles': len(self.cycles),
+            'layers': (max(self.layers.values()) + 1) if self.layers else 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __repr__(self) -> str:
+        return f"ProcessGraph(elements={len(self._order)}, connections={self.edge_count})"
+
+    # ========================================================================
+    # Analyses
+    # ========================================================================
+
+    @staticmethod
+    def _bfs(starts: Iterable[str], adjacency: Dict[str, List[str]]) -> FrozenSet[str]:
+        """Collect all nodes reachable from starts along adjacency."""
+        seen = set(starts)
+        queue = deque(seen)
+        while queue:
+            for nxt in adjacency[queue.popleft()]:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    queue.append(nxt)
+        return frozenset(seen)
+
+    def _strongly_connected_components(self) -> List[List[str]]:
+        """
+        Tarjan's algorithm (iterative).
+
+        Returns:
+            SCCs in topological order of the condensation (sources first)
+        """
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: set = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        counter = 0
+
+        for root in self._order:
+            if root in index:
+                continue
+            work: List[Tuple[str, int]] = [(root, 0)]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, pos = work[-1]
+                succ = self._succ[node]
+                if pos < len(succ):
+                    work[-1] = (node, pos + 1)
+                    nxt = succ[pos]
+                    if nxt not in index:
+                        index[nxt] = lowlink[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        on_stack.add(nxt)
+                        work.append((nxt, 0))
+                    elif nxt in on_stack:
+                        lowlink[node] = min(lowlink[node], index[nxt])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    comp: List[str] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        comp.append(member)
+                        if member == node:
+                            break
+                    comp.reverse()
+                    components.append(comp)
+
+        # Tarjan emits components in reverse topological order
+        components.reverse()
+        return components
+
+    def _topological_layers(self) -> Dict[str, int]:
+        """Longest-path layering; all members of a cycle share one layer."""
+        comp_of: Dict[str, int] = {}
+        for ci, comp in enumerate(self.sccs):
+            for eid in comp:
+                comp_of[eid] = ci
+
+        comp_layer = [0] * len(self.sccs)
+        for ci, comp in enumerate(self.sccs):
+            layer = comp_layer[ci]
+            for eid in comp:
+                for nxt in self._succ[eid]:
+                    cj = comp_of[nxt]
+                    if cj != ci and comp_layer[cj] < layer + 1:
+                        comp_layer[cj] = layer + 1
+
+        return {eid: comp_layer[comp_of[eid]] for eid in self._order}
+
+
+__all__ = ['ProcessGraph', 'START_TYPES', 'END_TYPES']
@@ -7,6 +7,7 @@ Business logic and operations for VPB Process Designer.
 This package contains:
 - DocumentService: Document load/save operations, recent files management
 - ValidationService: Process validation (flow, naming, completeness)
+- IncrementalValidator: Observer-driven validation that re-checks only edits
 - ExportService: Export to PDF/SVG/PNG/BPMN/Mermaid formats
 - ImportService: Import from Mermaid diagrams
 - LayoutService: Auto-layout algorithms, element alignment, arrangement
@@ -21,6 +22,7 @@ from .document_service import (
 )
 from .validation_service import (
     ValidationService,
+    IncrementalValidator,
     ValidationResult,
     ValidationIssue,
     IssueSeverity,
@@ -65,6 +67,7 @@ __all__ = [
     'DocumentSaveError',
     # Validation Service
     'ValidationService',
+    'IncrementalValidator',
     'ValidationResult',
     'ValidationIssue',
     'IssueSeverity',
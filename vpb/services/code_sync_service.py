@@ -4,15 +4,84 @@ Code Sync Service - Bidirektionale Synchronisation zwischen Canvas und Code-Edit
 Synchronisiert Canvas-Daten mit JSON/XML Code-Editoren:
 - Canvas → JSON/XML (automatisch bei Änderungen)
 - JSON/XML → Canvas (auf Anfrage/Apply)
+
+diff_lines() berechnet die geänderten Zeilenbereiche zwischen altem und neuem
+Code, so dass Editoren nur diese Bereiche ersetzen statt den ganzen Text.
 """
 
+import difflib
 import json
 import xml.etree.ElementTree as ET
 from xml.dom import minidom
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, List, NamedTuple, Optional, Callable
 from datetime import datetime
 
 
+class LinePatch(NamedTuple):
+    """Ersetzt die Zeilen [start, end) (0-basiert) durch text (inkl. Zeilenumbrüchen)."""
+    start: int
+    end: int
+    text: str
+
+
+class CanvasDataDiff(NamedTuple):
+    """Delta zwischen zwei Canvas-Dicts (siehe CodeSyncService.diff_canvas_data)."""
+    elements: Dict[str, Dict[str, Any]]           # hinzugefügt/geändert: id → neuer Datensatz
+    removed_elements: List[str]
+    connections: Dict[str, Dict[str, Any]]
+    removed_connections: List[str]
+    element_order: Optional[List[str]]            # neue Reihenfolge, falls abweichend
+    connection_order: Optional[List[str]]
+    document: Dict[str, Any]                      # geänderte Dokumentfelder (metadata, ...)
+
+    def is_empty(self) -> bool:
+        return not (
+            self.elements or self.removed_elements or self.connections or self.removed_connections
+            or self.element_order is not None or self.connection_order is not None or self.document
+        )
+
+
+# Oberhalb dieser Größe des geänderten Mittelteils wird nicht weiter verfeinert
+_MAX_REFINE_LINES = 500
+
+
+def diff_lines(old_text: str, new_text: str) -> List[LinePatch]:
+    """
+    Zeilenbasierte Änderungen von old_text nach new_text.
+
+    Gemeinsamer Anfang/Ende wird abgeschnitten; ein kleiner Mittelteil wird per
+    difflib in mehrere Bereiche zerlegt. Die Patches sind aufsteigend sortiert,
+    beziehen sich auf die Zeilennummern von old_text und müssen von hinten nach
+    vorne angewendet werden. Zeilen enthalten ihren Zeilenumbruch, d.h. die
+    letzte Zeile kann ohne Umbruch enden.
+    
+    Returns:
+        Liste von LinePatch (leer, wenn die Texte gleich sind)
+    """
+    if old_text == new_text:
+        return []
+    old = old_text.splitlines(keepends=True)
+    new = new_text.splitlines(keepends=True)
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    old_mid = old[prefix:len(old) - suffix]
+    new_mid = new[prefix:len(new) - suffix]
+    if not old_mid or not new_mid or max(len(old_mid), len(new_mid)) > _MAX_REFINE_LINES:
+        return [LinePatch(prefix, prefix + len(old_mid), "".join(new_mid))]
+    matcher = difflib.SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+    return [
+        LinePatch(prefix + i1, prefix + i2, "".join(new_mid[j1:j2]))
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
 class CodeSyncService:
     """Service für Canvas ↔ Code Synchronisation."""
     
@@ -190,6 +259,50 @@ class CodeSyncService:
             self._handle_error(f"JSON Import Fehler: {e}")
             return None
     
+    def diff_canvas_data(self, current: Dict[str, Any], new: Dict[str, Any]) -> CanvasDataDiff:
+        """
+        Vergleicht den aktuellen Canvas-Stand mit importierten Daten.
+        
+        Elemente/Verbindungen werden über ihre ID zugeordnet; ein Datensatz gilt
+        als geändert, sobald er vom aktuellen (canvas.to_dict()) abweicht. Bei
+        doppelten IDs gilt wie beim Laden der letzte Datensatz.
+        
+        Args:
+            current: Dictionary vom Canvas (canvas.to_dict())
+            new: Ergebnis von json_to_canvas()/xml_to_canvas()
+            
+        Returns:
+            CanvasDataDiff für VPBCanvas.apply_data_diff()
+        """
+        def _by_id(records, key):
+            return {r.get(key): r for r in records or [] if isinstance(r, dict)}
+
+        def _diff(old_records, new_records, key):
+            old = _by_id(old_records, key)
+            new_map = _by_id(new_records, key)
+            changed = {k: r for k, r in new_map.items() if old.get(k) != r}
+            removed = [k for k in old if k not in new_map]
+            order = list(new_map) if list(new_map) != list(old) else None
+            return changed, removed, order
+
+        elements, removed_elements, element_order = _diff(
+            current.get("elements"), new.get("elements"), "element_id"
+        )
+        connections, removed_connections, connection_order = _diff(
+            current.get("connections"), new.get("connections"), "connection_id"
+        )
+        document: Dict[str, Any] = {}
+        metadata = new.get("metadata", {})
+        if metadata != current.get("metadata", {}):
+            document["metadata"] = metadata
+        categories = new.get("hierarchy_categories")
+        if isinstance(categories, list) and categories != current.get("hierarchy_categories"):
+            document["hierarchy_categories"] = categories
+        return CanvasDataDiff(
+            elements, removed_elements, connections, removed_connections,
+            element_order, connection_order, document,
+        )
+
     def xml_to_canvas(self, xml_text: str) -> Optional[Dict[str, Any]]:
         """
         Konvertiert XML (VPB Format) zu Canvas-Daten.
@@ -7,7 +7,7 @@ Service for automatic layout and arrangement of process diagram elements.
 This service provides layout algorithms including:
 - Element alignment (left, right, center, top, bottom, middle)
 - Circular arrangement
-- Auto-layout (hierarchical BFS-based)
+- Auto-layout (hierarchical, topological layers)
 - Distribution (horizontal, vertical)
 - Grid arrangement
 
@@ -18,7 +18,6 @@ without directly modifying the document.
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List, Tuple, Optional, Set
-from collections import deque
 import math
 import logging
 
@@ -395,8 +394,8 @@ class LayoutService:
         """
         Apply automatic hierarchical layout based on process flow.
         
-        Uses BFS from start events to create layers, then arranges
-        elements in columns based on their layer.
+        Uses the topological layers of the document's ProcessGraph, then
+        arranges elements in columns based on their layer.
         
         Args:
             document: Document to layout
@@ -420,46 +419,9 @@ class LayoutService:
         })
         
         try:
-            # Build graph structure
-            outgoing: Dict[str, List[str]] = {}
-            incoming_count: Dict[str, int] = {el.element_id: 0 for el in elements}
-            
-            for conn in connections:
-                s, t = conn.source_element, conn.target_element
-                element_ids = {el.element_id for el in elements}
-                if s in element_ids and t in element_ids:
-                    outgoing.setdefault(s, []).append(t)
-                    incoming_count[t] = incoming_count.get(t, 0) + 1
-            
-            # Find start nodes (START_EVENT or in-degree 0)
-            starts = [
-                el.element_id for el in elements 
-                if el.element_type in ("START_EVENT", "Ereignis")
-            ]
-            if not starts:
-                starts = [eid for eid, deg in incoming_count.items() if deg == 0]
-            if not starts and elements:
-                starts = [elements[0].element_id]
-            
-            # BFS to assign layers
-            level: Dict[str, int] = {}
-            queue = deque()
-            for s in starts:
-                level[s] = 0
-                queue.append(s)
-            
-            while queue:
-                u = queue.popleft()
-                for v in outgoing.get(u, []):
-                    if v not in level:
-                        level[v] = level[u] + 1
-                        queue.append(v)
-            
-            # Assign unvisited to last layer
-            max_level = max(level.values()) if level else 0
-            for el in elements:
-                if el.element_id not in level:
-                    level[el.element_id] = max_level + 1
+            # Topological layers from the shared graph analysis
+            # (longest path, cycles collapse into one layer)
+            level = document.get_process_graph().layers
             
             # Group elements by layer
             layers: Dict[int, List[VPBElement]] = {}
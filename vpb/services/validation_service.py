@@ -10,6 +10,7 @@ This service performs comprehensive validation including:
 - Naming conventions and best practices
 - Completeness checks
 - Business rule validation
+- Incremental mode (IncrementalValidator) re-checking only edited parts
 
 Example:
     ```python
@@ -30,13 +31,14 @@ Example:
 """
 
 import logging
-from typing import List, Set, Dict, Optional, Any
+from typing import Iterable, List, Set, Dict, Optional, Any
 from dataclasses import dataclass, field
 from enum import Enum
 
 from vpb.models.document import DocumentModel
 from vpb.models.element import VPBElement
 from vpb.models.connection import VPBConnection
+from vpb.models.process_graph import ProcessGraph, START_TYPES, END_TYPES
 
 logger = logging.getLogger(__name__)
 
@@ -258,6 +260,13 @@ class ValidationService:
         self.min_name_length = min_name_length
         self.max_name_length = max_name_length
         
+        # Validators for special elements (stateless, created once)
+        self.counter_validator = CounterValidator()
+        self.condition_validator = ConditionValidator()
+        self.error_handler_validator = ErrorHandlerValidator()
+        self.state_validator = StateValidator()
+        self.interlock_validator = InterlockValidator()
+        
         logger.info(
             f"ValidationService initialized (naming={check_naming}, "
             f"flow={check_flow}, completeness={check_completeness})"
@@ -347,60 +356,65 @@ class ValidationService:
         if not elements:
             return  # Nothing to validate
         
-        # Find start elements (VorProzess or elements with no incoming connections)
-        start_elements = self._find_start_elements(doc)
+        # Shared graph analysis (cached on the document)
+        graph = doc.get_process_graph()
+        self._check_flow_globals(graph, result)
+        
+        # Check for unreachable elements
+        if graph.start_ids:
+            for element in elements:
+                self._check_reachability(element, graph, result)
         
-        # Find end elements (NachProzess or elements with no outgoing connections)
-        end_elements = self._find_end_elements(doc)
+        # Check for dead ends (elements that don't lead to end)
+        if graph.end_ids:
+            for element in elements:
+                self._check_dead_end(element, graph, result)
         
-        # Check for missing start/end
-        if not start_elements:
+        # Check for decision/gateway elements
+        self._validate_decision_elements(doc, result)
+    
+    def _check_flow_globals(self, graph: ProcessGraph, result: ValidationResult) -> None:
+        """Check for missing start/end elements."""
+        # Start: VorProzess or elements with no incoming connections
+        # End: NachProzess or elements with no outgoing connections
+        if not graph.start_ids:
             result.add_warning(
                 'flow',
                 'No start elements found (VorProzess or elements without incoming connections)',
                 suggestion='Add a VorProzess element or ensure at least one element has no incoming connections'
             )
         
-        if not end_elements:
+        if not graph.end_ids:
             result.add_warning(
                 'flow',
                 'No end elements found (NachProzess or elements without outgoing connections)',
                 suggestion='Add a NachProzess element or ensure at least one element has no outgoing connections'
             )
-        
-        # Check for unreachable elements
-        if start_elements:
-            reachable = self._find_reachable_elements(doc, start_elements)
-            unreachable = set(e.element_id for e in elements) - reachable
-            
-            for element_id in unreachable:
-                element = doc.get_element(element_id)
-                result.add_error(
-                    'flow',
-                    f'Element "{element.name}" is unreachable from start',
-                    element_id=element_id,
-                    suggestion='Add a connection from a start element or another reachable element'
-                )
-        
-        # Check for dead ends (elements that don't lead to end)
-        if end_elements:
-            can_reach_end = self._find_elements_reaching_end(doc, end_elements)
-            dead_ends = set(e.element_id for e in elements) - can_reach_end - set(e.element_id for e in end_elements)
-            
-            for element_id in dead_ends:
-                element = doc.get_element(element_id)
-                # Only warn about dead ends if they have outgoing connections
-                # (if no outgoing, they ARE end elements)
-                if doc.get_outgoing_connections(element_id):
-                    result.add_warning(
-                        'flow',
-                        f'Element "{element.name}" doesn\'t lead to any end element',
-                        element_id=element_id,
-                        suggestion='Add a path to an end element or remove unnecessary connections'
-                    )
-        
-        # Check for decision/gateway elements
-        self._validate_decision_elements(doc, result)
+    
+    def _check_reachability(self, element: VPBElement, graph: ProcessGraph, result: ValidationResult) -> None:
+        """Check that an element is reachable from a start element."""
+        if element.element_id in graph.reachable:
+            return
+        result.add_error(
+            'flow',
+            f'Element "{element.name}" is unreachable from start',
+            element_id=element.element_id,
+            suggestion='Add a connection from a start element or another reachable element'
+        )
+    
+    def _check_dead_end(self, element: VPBElement, graph: ProcessGraph, result: ValidationResult) -> None:
+        """Check that an element with outgoing connections leads to an end element."""
+        element_id = element.element_id
+        # Only warn about dead ends if they have outgoing connections
+        # (if no outgoing, they ARE end elements)
+        if element_id in graph.reaching_end or not graph.out_degree[element_id]:
+            return
+        result.add_warning(
+            'flow',
+            f'Element "{element.name}" doesn\'t lead to any end element',
+            element_id=element_id,
+            suggestion='Add a path to an end element or remove unnecessary connections'
+        )
     
     def _validate_naming(self, doc: DocumentModel, result: ValidationResult) -> None:
         """
@@ -414,53 +428,70 @@ class ValidationService:
         
         for element in doc.get_all_elements():
             name = element.name.strip()
-            
-            # Check empty names
-            if not name:
-                result.add_error(
-                    'naming',
-                    'Element has empty name',
-                    element_id=element.element_id,
-                    suggestion='Provide a descriptive name for this element'
-                )
-                continue
-            
-            # Check name length
-            if len(name) < self.min_name_length:
-                result.add_warning(
-                    'naming',
-                    f'Element name "{name}" is too short (min: {self.min_name_length} characters)',
-                    element_id=element.element_id,
-                    suggestion='Use a more descriptive name'
-                )
-            
-            if len(name) > self.max_name_length:
-                result.add_warning(
-                    'naming',
-                    f'Element name "{name}" is too long (max: {self.max_name_length} characters)',
-                    element_id=element.element_id,
-                    suggestion='Use a shorter, more concise name'
-                )
-            
-            # Check for duplicate names
-            if name in seen_names:
-                result.add_warning(
-                    'naming',
-                    f'Duplicate element name "{name}"',
-                    element_id=element.element_id,
-                    suggestion=f'Element name is also used by element {seen_names[name]}'
-                )
-            else:
-                seen_names[name] = element.element_id
-            
-            # Check naming conventions (should start with uppercase)
-            if name and not name[0].isupper():
-                result.add_info(
-                    'naming',
-                    f'Element name "{name}" should start with uppercase letter',
-                    element_id=element.element_id,
-                    suggestion='Follow naming convention: start with uppercase'
-                )
+            self._check_element_name(element, seen_names.get(name), result)
+            if name:
+                seen_names.setdefault(name, element.element_id)
+    
+    def _check_element_name(
+        self,
+        element: VPBElement,
+        duplicate_of: Optional[str],
+        result: ValidationResult
+    ) -> None:
+        """
+        Check naming conventions of a single element.
+        
+        Args:
+            element: Element to check
+            duplicate_of: ID of the first element with the same name (if any)
+            result: Result object to add issues to
+        """
+        name = element.name.strip()
+        
+        # Check empty names
+        if not name:
+            result.add_error(
+                'naming',
+                'Element has empty name',
+                element_id=element.element_id,
+                suggestion='Provide a descriptive name for this element'
+            )
+            return
+        
+        # Check name length
+        if len(name) < self.min_name_length:
+            result.add_warning(
+                'naming',
+                f'Element name "{name}" is too short (min: {self.min_name_length} characters)',
+                element_id=element.element_id,
+                suggestion='Use a more descriptive name'
+            )
+        
+        if len(name) > self.max_name_length:
+            result.add_warning(
+                'naming',
+                f'Element name "{name}" is too long (max: {self.max_name_length} characters)',
+                element_id=element.element_id,
+                suggestion='Use a shorter, more concise name'
+            )
+        
+        # Check for duplicate names
+        if duplicate_of is not None:
+            result.add_warning(
+                'naming',
+                f'Duplicate element name "{name}"',
+                element_id=element.element_id,
+                suggestion=f'Element name is also used by element {duplicate_of}'
+            )
+        
+        # Check naming conventions (should start with uppercase)
+        if name and not name[0].isupper():
+            result.add_info(
+                'naming',
+                f'Element name "{name}" should start with uppercase letter',
+                element_id=element.element_id,
+                suggestion='Follow naming convention: start with uppercase'
+            )
     
     def _validate_completeness(self, doc: DocumentModel, result: ValidationResult) -> None:
         """
@@ -470,6 +501,26 @@ class ValidationService:
             doc: Document to validate
             result: Result object to add issues to
         """
+        missing_descriptions = sum(
+            1 for e in doc.get_all_elements()
+            if not e.description or not e.description.strip()
+        )
+        self._check_completeness(doc, missing_descriptions, result)
+    
+    def _check_completeness(
+        self,
+        doc: DocumentModel,
+        missing_descriptions: int,
+        result: ValidationResult
+    ) -> None:
+        """
+        Check document metadata and element descriptions.
+        
+        Args:
+            doc: Document to validate
+            missing_descriptions: Number of elements without description
+            result: Result object to add issues to
+        """
         # Check metadata
         if not doc.metadata.title or doc.metadata.title == "Untitled Process":
             result.add_warning(
@@ -493,15 +544,10 @@ class ValidationService:
             )
         
         # Check if elements have descriptions
-        elements_without_description = [
-            e for e in doc.get_all_elements()
-            if not e.description or not e.description.strip()
-        ]
-        
-        if elements_without_description:
+        if missing_descriptions:
             result.add_info(
                 'completeness',
-                f'{len(elements_without_description)} elements have no description',
+                f'{missing_descriptions} elements have no description',
                 suggestion='Add descriptions to elements for better documentation'
             )
     
@@ -514,140 +560,50 @@ class ValidationService:
             result: Result object to add issues to
         """
         for element in doc.get_all_elements():
-            if element.element_type == 'Entscheidung':
-                outgoing = doc.get_outgoing_connections(element.element_id)
-                
-                if len(outgoing) < 2:
-                    result.add_warning(
-                        'flow',
-                        f'Decision "{element.name}" has less than 2 outgoing connections',
-                        element_id=element.element_id,
-                        suggestion='Decisions should have at least 2 alternative paths'
-                    )
-                
-                if len(outgoing) > 4:
-                    result.add_info(
-                        'flow',
-                        f'Decision "{element.name}" has many ({len(outgoing)}) outgoing connections',
-                        element_id=element.element_id,
-                        suggestion='Consider breaking down complex decisions'
-                    )
-            
-            # Check gateways
-            if element.element_type.startswith('Gateway'):
-                incoming = doc.get_incoming_connections(element.element_id)
-                outgoing = doc.get_outgoing_connections(element.element_id)
-                
-                if len(incoming) == 0:
-                    result.add_error(
-                        'flow',
-                        f'Gateway "{element.name}" has no incoming connections',
-                        element_id=element.element_id,
-                        suggestion='Gateways must have at least one incoming connection'
-                    )
-                
-                if len(outgoing) == 0:
-                    result.add_error(
-                        'flow',
-                        f'Gateway "{element.name}" has no outgoing connections',
-                        element_id=element.element_id,
-                        suggestion='Gateways must have at least one outgoing connection'
-                    )
-    
-    def _find_start_elements(self, doc: DocumentModel) -> List[VPBElement]:
-        """Find elements that are process starts."""
-        start_elements = []
-        
-        for element in doc.get_all_elements():
-            # VorProzess is always a start
-            if element.element_type == 'VorProzess':
-                start_elements.append(element)
-            # Elements with no incoming connections
-            elif not doc.get_incoming_connections(element.element_id):
-                start_elements.append(element)
-        
-        return start_elements
+            self._check_decision_element(element, doc, result)
     
-    def _find_end_elements(self, doc: DocumentModel) -> List[VPBElement]:
-        """Find elements that are process ends."""
-        end_elements = []
-        
-        for element in doc.get_all_elements():
-            # NachProzess is always an end
-            if element.element_type == 'NachProzess':
-                end_elements.append(element)
-            # Elements with no outgoing connections
-            elif not doc.get_outgoing_connections(element.element_id):
-                end_elements.append(element)
-        
-        return end_elements
-    
-    def _find_reachable_elements(
-        self,
-        doc: DocumentModel,
-        start_elements: List[VPBElement]
-    ) -> Set[str]:
-        """
-        Find all elements reachable from start elements (BFS).
-        
-        Args:
-            doc: Document
-            start_elements: List of start elements
-        
-        Returns:
-            Set of reachable element IDs
-        """
-        reachable = set()
-        queue = [e.element_id for e in start_elements]
-        
-        while queue:
-            current_id = queue.pop(0)
-            
-            if current_id in reachable:
-                continue
+    def _check_decision_element(self, element: VPBElement, doc: DocumentModel, result: ValidationResult) -> None:
+        """Check outgoing/incoming paths of a single decision or gateway element."""
+        if element.element_type == 'Entscheidung':
+            outgoing = doc.get_outgoing_view(element.element_id)
             
-            reachable.add(current_id)
+            if len(outgoing) < 2:
+                result.add_warning(
+                    'flow',
+                    f'Decision "{element.name}" has less than 2 outgoing connections',
+                    element_id=element.element_id,
+                    suggestion='Decisions should have at least 2 alternative paths'
+                )
             
-            # Add all elements connected from current (using element_id)
-            for conn in doc.get_outgoing_connections(current_id):
-                if conn.target_element.element_id not in reachable:
-                    queue.append(conn.target_element.element_id)
-        
-        return reachable
-    
-    def _find_elements_reaching_end(
-        self,
-        doc: DocumentModel,
-        end_elements: List[VPBElement]
-    ) -> Set[str]:
-        """
-        Find all elements that can reach an end element (reverse BFS).
-        
-        Args:
-            doc: Document
-            end_elements: List of end elements
-        
-        Returns:
-            Set of element IDs that can reach end
-        """
-        can_reach_end = set()
-        queue = [e.element_id for e in end_elements]
+            if len(outgoing) > 4:
+                result.add_info(
+                    'flow',
+                    f'Decision "{element.name}" has many ({len(outgoing)}) outgoing connections',
+                    element_id=element.element_id,
+                    suggestion='Consider breaking down complex decisions'
+                )
         
-        while queue:
-            current_id = queue.pop(0)
-            
-            if current_id in can_reach_end:
-                continue
+        # Check gateways
+        if element.element_type.startswith('Gateway'):
+            incoming = doc.get_incoming_view(element.element_id)
+            outgoing = doc.get_outgoing_view(element.element_id)
             
-            can_reach_end.add(current_id)
+            if len(incoming) == 0:
+                result.add_error(
+                    'flow',
+                    f'Gateway "{element.name}" has no incoming connections',
+                    element_id=element.element_id,
+                    suggestion='Gateways must have at least one incoming connection'
+                )
             
-            # Add all elements connected to current (reverse direction, using element_id)
-            for conn in doc.get_incoming_connections(current_id):
-                if conn.source_element.element_id not in can_reach_end:
-                    queue.append(conn.source_element.element_id)
-        
-        return can_reach_end
-    
+            if len(outgoing) == 0:
+                result.add_error(
+                    'flow',
+                    f'Gateway "{element.name}" has no outgoing connections',
+                    element_id=element.element_id,
+                    suggestion='Gateways must have at least one outgoing connection'
+                )
+
     def _count_elements_by_type(self, doc: DocumentModel) -> Dict[str, int]:
         """Count elements by type."""
         counts: Dict[str, int] = {}
@@ -666,32 +622,42 @@ class ValidationService:
             doc: Document to validate
             result: Result object to add issues to
         """
-        counter_validator = CounterValidator()
-        condition_validator = ConditionValidator()
-        error_handler_validator = ErrorHandlerValidator()
-        state_validator = StateValidator()
-        interlock_validator = InterlockValidator()
-        
         for element in doc.get_all_elements():
-            # Validate COUNTER elements
-            if element.element_type == "COUNTER":
-                counter_validator.validate_counter(element, doc, result)
-            
-            # Validate CONDITION elements
-            elif element.element_type == "CONDITION":
-                condition_validator.validate_condition(element, doc, result)
-            
-            # Validate ERROR_HANDLER elements
-            elif element.element_type == "ERROR_HANDLER":
-                error_handler_validator.validate_error_handler(element, doc, result)
-            
-            # Validate STATE elements
-            elif element.element_type == "STATE":
-                state_validator.validate_state(element, doc, result)
-            
-            # Validate INTERLOCK elements
-            elif element.element_type == "INTERLOCK":
-                interlock_validator.validate_interlock(element, doc, result)
+            self._check_special_element(element, doc, result)
+    
+    def _check_special_element(self, element: VPBElement, doc: DocumentModel, result: ValidationResult) -> None:
+        """Run the type-specific validator of a single element (if any)."""
+        # Validate COUNTER elements
+        if element.element_type == "COUNTER":
+            self.counter_validator.validate_counter(element, doc, result)
+        
+        # Validate CONDITION elements
+        elif element.element_type == "CONDITION":
+            self.condition_validator.validate_condition(element, doc, result)
+        
+        # Validate ERROR_HANDLER elements
+        elif element.element_type == "ERROR_HANDLER":
+            self.error_handler_validator.validate_error_handler(element, doc, result)
+        
+        # Validate STATE elements
+        elif element.element_type == "STATE":
+            self.state_validator.validate_state(element, doc, result)
+        
+        # Validate INTERLOCK elements
+        elif element.element_type == "INTERLOCK":
+            self.interlock_validator.validate_interlock(element, doc, result)
+    
+    def create_incremental(self, doc: DocumentModel) -> 'IncrementalValidator':
+        """
+        Create an incremental validator following a document.
+        
+        Args:
+            doc: Document to follow (observer is attached)
+        
+        Returns:
+            IncrementalValidator using this service's rules and settings
+        """
+        return IncrementalValidator(doc, self)
     
     def __repr__(self) -> str:
         """String representation."""
@@ -701,6 +667,418 @@ class ValidationService:
         )
 
 
+class IncrementalValidator:
+    """
+    Incremental validation bound to one DocumentModel.
+    
+    Subscribes to the document's observer events and caches the issues of
+    every per-element rule. An edit re-runs only the rules whose inputs
+    changed:
+    
+    - naming for the edited element and the elements sharing its old/new name
+    - flow for the touched elements and the region whose reachability changed
+    - decision/gateway checks for elements whose degree changed
+    - the type-specific validator for special elements (COUNTER, STATE, ...)
+    
+    result() merges the cached issues in document order and returns the same
+    ValidationResult as ValidationService.validate_document().
+    
+    Example:
+        ```python
+        incremental = ValidationService().create_incremental(doc)
+        doc.add_element(element)            # re-checks only what changed
+        result = incremental.result()
+        incremental.detach()
+        ```
+    """
+    
+    SPECIAL_TYPES = frozenset({"COUNTER", "CONDITION", "ERROR_HANDLER", "STATE", "INTERLOCK"})
+    # Special types whose rules look at other elements of the same type
+    GROUPED_SPECIAL_TYPES = frozenset({"STATE", "INTERLOCK"})
+    # Per-element rule phases in the order of a full run
+    PHASES = ('unreachable', 'dead_end', 'decision', 'naming', 'special')
+    
+    def __init__(self, doc: DocumentModel, service: Optional[ValidationService] = None):
+        """
+        Initialize and run a full validation once.
+        
+        Args:
+            doc: Document to follow
+            service: ValidationService providing rules and settings
+        """
+        self.doc = doc
+        self.service = service or ValidationService()
+        self.checks_run = 0  # Number of per-element rule evaluations (diagnostics)
+        self._attached = False
+        self.attach()
+    
+    # ========================================================================
+    # Lifecycle
+    # ========================================================================
+    
+    def attach(self) -> None:
+        """Subscribe to document change events (re-checks the whole document)."""
+        if not self._attached:
+            self.rebuild()
+            self.doc.attach_observer(self._on_document_event)
+            self._attached = True
+    
+    def detach(self) -> None:
+        """Unsubscribe from document change events."""
+        if self._attached:
+            self.doc.detach_observer(self._on_document_event)
+            self._attached = False
+    
+    def rebuild(self) -> None:
+        """Drop all caches and re-check the whole document."""
+        self._issues: Dict[str, Dict[str, ValidationResult]] = {phase: {} for phase in self.PHASES}
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        self._types: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        self._name_groups: Dict[str, List[str]] = {}
+        self._missing_description: Set[str] = set()
+        self._type_counts: Dict[str, int] = {}
+        
+        for element in self.doc.get_all_elements():
+            self._register(element)
+        
+        self._graph = self.doc.get_process_graph()
+        self._structure = ValidationResult()
+        self._flow_globals = ValidationResult()
+        self._refresh_structure()
+        self._refresh_flow_globals()
+        
+        ids = list(self._seq)
+        self._recheck_flow(ids, ids)
+        for element_id, name in self._names.items():
+            if not name:
+                self._recheck_name(element_id, None)
+        for name in self._name_groups:
+            self._recheck_name_group(name)
+        self._recheck_special(ids)
+    
+    # ========================================================================
+    # Result
+    # ========================================================================
+    
+    def result(self) -> ValidationResult:
+        """
+        Get the merged validation result for the current document state.
+        
+        Returns:
+            ValidationResult equal to a full validate_document() run
+        """
+        result = ValidationResult()
+        result.stats = {
+            'element_count': self.doc.get_element_count(),
+            'connection_count': self.doc.get_connection_count(),
+            'elements_by_type': dict(self._type_counts),
+        }
+        
+        self._merge(result, self._structure)
+        if self.service.check_flow and self._seq:
+            self._merge(result, self._flow_globals)
+            for phase in ('unreachable', 'dead_end', 'decision'):
+                self._merge_phase(result, phase)
+        if self.service.check_naming:
+            self._merge_phase(result, 'naming')
+        if self.service.check_completeness:
+            # Metadata changes are not notified, so this part is always re-checked
+            self.service._check_completeness(self.doc, len(self._missing_description), result)
+        self._merge_phase(result, 'special')
+        
+        result.is_valid = not result.errors
+        return result
+    
+    def _merge_phase(self, result: ValidationResult, phase: str) -> None:
+        """Append cached issues of a phase in document order."""
+        cached = self._issues[phase]
+        for element_id in sorted(cached, key=self._seq.__getitem__):
+            self._merge(result, cached[element_id])
+    
+    @staticmethod
+    def _merge(result: ValidationResult, part: ValidationResult) -> None:
+        """Append the issues of a partial result."""
+        result.errors.extend(part.errors)
+        result.warnings.extend(part.warnings)
+        result.info.extend(part.info)
+    
+    # ========================================================================
+    # Event Handling
+    # ========================================================================
+    
+    def _on_document_event(self, event: str, data: Any) -> None:
+        """Observer: re-check what the change touched."""
+        handlers = {
+            'element.added': self._on_element_added,
+            'element.removed': self._on_element_removed,
+            'element.updated': self._on_element_updated,
+            'connection.added': self._on_connection_changed,
+            'connection.removed': self._on_connection_changed,
+        }
+        handler = handlers.get(event)
+        if handler is None:
+            # document.loaded, document.cleared, unknown events
+            self.rebuild()
+            return
+        try:
+            handler(data)
+        except Exception as e:
+            logger.error(f"Incremental validation failed on {event}, rebuilding: {e}")
+            self.rebuild()
+    
+    def _on_element_added(self, data: Dict[str, Any]) -> None:
+        element = data['element']
+        element_id = element.element_id
+        self._register(element)
+        self._refresh_structure()
+        self._refresh_graph({element_id})
+        self._recheck_naming_for(element_id)
+        # New element may resolve references of special elements
+        self._recheck_special(self._special_ids())
+    
+    def _on_element_removed(self, data: Dict[str, Any]) -> None:
+        element_id = data['element'].element_id
+        name = self._names.get(element_id, '')
+        self._unregister(element_id)
+        
+        neighbours = set()
+        for conn in data.get('orphaned_connections') or []:
+            neighbours.update((conn.source_element, conn.target_element))
+        neighbours.discard(element_id)
+        
+        self._refresh_structure()
+        self._refresh_graph(neighbours)
+        if name:
+            self._recheck_name_group(name)
+        self._recheck_special(self._special_ids())
+    
+    def _on_element_updated(self, data: Dict[str, Any]) -> None:
+        element = data['element']
+        element_id = element.element_id
+        if element_id not in self._seq:
+            self.rebuild()
+            return
+        
+        old_type = self._types[element_id]
+        old_name = self._names[element_id]
+        new_type = element.element_type
+        self._set_type(element_id, element.element_type)
+        self._set_name(element_id, element.name.strip())
+        self._set_description(element)
+        
+        # Flow: the graph only depends on element types via the start/end type sets
+        if (old_type in START_TYPES) != (new_type in START_TYPES) or \
+                (old_type in END_TYPES) != (new_type in END_TYPES):
+            self._refresh_graph({element_id})
+        else:
+            self._recheck_flow([element_id], [element_id])
+        
+        # Naming: old and new name group
+        if old_name and old_name != self._names[element_id]:
+            self._recheck_name_group(old_name)
+        self._recheck_naming_for(element_id)
+        
+        # Special elements: STATE rules check the type of referenced elements
+        if old_type != new_type:
+            self._recheck_special(set(self._special_ids()) | {element_id})
+        elif new_type in self.GROUPED_SPECIAL_TYPES:
+            self._recheck_special(self._special_ids(new_type))
+        else:
+            self._recheck_special([element_id])
+    
+    def _on_connection_changed(self, data: Dict[str, Any]) -> None:
+        connection = data['connection']
+        touched = {
+            eid for eid in (connection.source_element, connection.target_element)
+            if eid in self._seq
+        }
+        self._refresh_structure()
+        self._refresh_graph(touched)
+        self._recheck_special([eid for eid in touched if self._types[eid] in self.SPECIAL_TYPES])
+    
+    # ========================================================================
+    # Bookkeeping
+    # ========================================================================
+    
+    def _register(self, element: VPBElement) -> None:
+        """Track a new element (appended to document order)."""
+        element_id = element.element_id
+        self._seq[element_id] = self._next_seq
+        self._next_seq += 1
+        self._set_type(element_id, element.element_type)
+        self._set_name(element_id, element.name.strip())
+        self._set_description(element)
+    
+    def _unregister(self, element_id: str) -> None:
+        """Forget an element and its cached issues."""
+        self._set_type(element_id, None)
+        self._set_name(element_id, '')
+        self._types.pop(element_id, None)
+        self._names.pop(element_id, None)
+        self._missing_description.discard(element_id)
+        for cached in self._issues.values():
+            cached.pop(element_id, None)
+        self._seq.pop(element_id, None)
+    
+    def _set_type(self, element_id: str, element_type: Optional[str]) -> None:
+        """Update type of an element and the type counts."""
+        old_type = self._types.get(element_id)
+        if old_type == element_type:
+            return
+        if old_type is not None:
+            self._type_counts[old_type] -= 1
+            if not self._type_counts[old_type]:
+                del self._type_counts[old_type]
+        if element_type is not None:
+            self._type_counts[element_type] = self._type_counts.get(element_type, 0) + 1
+        self._types[element_id] = element_type
+    
+    def _set_name(self, element_id: str, name: str) -> None:
+        """Update (stripped) name of an element and the name groups."""
+        old_name = self._names.get(element_id, '')
+        self._names[element_id] = name
+        if old_name == name and element_id in self._name_groups.get(name, ()):
+            return
+        if old_name:
+            group = self._name_groups.get(old_name, [])
+            if element_id in group:
+                group.remove(element_id)
+            if not group:
+                self._name_groups.pop(old_name, None)
+        if name:
+            # Keep groups in document order (first element is the "original")
+            group = self._name_groups.setdefault(name, [])
+            seq = self._seq[element_id]
+            pos = len(group)
+            while pos and self._seq[group[pos - 1]] > seq:
+                pos -= 1
+            group.insert(pos, element_id)
+    
+    def _set_description(self, element: VPBElement) -> None:
+        """Track elements without description."""
+        if not element.description or not element.description.strip():
+            self._missing_description.add(element.element_id)
+        else:
+            self._missing_description.discard(element.element_id)
+    
+    def _special_ids(self, *types: str) -> List[str]:
+        """Get IDs of special elements (optionally of the given types)."""
+        wanted = set(types) or self.SPECIAL_TYPES
+        return [eid for eid, element_type in self._types.items() if element_type in wanted]
+    
+    def _store(self, phase: str, element_id: str, part: ValidationResult) -> None:
+        """Cache the issues of one rule phase for one element."""
+        self.checks_run += 1
+        if part.errors or part.warnings or part.info:
+            self._issues[phase][element_id] = part
+        else:
+            self._issues[phase].pop(element_id, None)
+    
+    # ========================================================================
+    # Re-checks
+    # ========================================================================
+    
+    def _refresh_structure(self) -> None:
+        """Re-run the document level structure checks."""
+        self._structure = ValidationResult()
+        self.service._validate_structure(self.doc, self._structure)
+    
+    def _refresh_flow_globals(self) -> None:
+        """Re-run the missing start/end checks."""
+        self._flow_globals = ValidationResult()
+        self.service._check_flow_globals(self._graph, self._flow_globals)
+    
+    def _refresh_graph(self, touched: Set[str]) -> None:
+        """
+        Pick up a structural change and re-check the affected flow region.
+        
+        Args:
+            touched: Elements whose own connections or type changed
+        """
+        old, new = self._graph, self.doc.get_process_graph()
+        self._graph = new
+        self._refresh_flow_globals()
+        
+        # Elements whose (reverse) reachability changed
+        unreachable_region = set(touched) | (old.reachable ^ new.reachable)
+        dead_end_region = set(touched) | (old.reaching_end ^ new.reaching_end)
+        
+        # Start/end set became empty or non-empty: the whole phase flips
+        if bool(old.start_ids) != bool(new.start_ids):
+            unreachable_region = set(self._seq)
+        if bool(old.end_ids) != bool(new.end_ids):
+            dead_end_region = set(self._seq)
+        
+        self._recheck_flow(
+            [eid for eid in unreachable_region if eid in self._seq],
+            [eid for eid in dead_end_region if eid in self._seq],
+            decision_ids=[eid for eid in touched if eid in self._seq],
+        )
+    
+    def _recheck_flow(
+        self,
+        unreachable_ids: List[str],
+        dead_end_ids: List[str],
+        decision_ids: Optional[List[str]] = None
+    ) -> None:
+        """Re-run the per-element flow rules."""
+        if not self.service.check_flow:
+            return
+        graph = self._graph
+        for element_id in unreachable_ids:
+            part = ValidationResult()
+            if graph.start_ids:
+                self.service._check_reachability(self.doc.get_element(element_id), graph, part)
+            self._store('unreachable', element_id, part)
+        for element_id in dead_end_ids:
+            part = ValidationResult()
+            if graph.end_ids:
+                self.service._check_dead_end(self.doc.get_element(element_id), graph, part)
+            self._store('dead_end', element_id, part)
+        for element_id in (unreachable_ids if decision_ids is None else decision_ids):
+            part = ValidationResult()
+            self.service._check_decision_element(self.doc.get_element(element_id), self.doc, part)
+            self._store('decision', element_id, part)
+    
+    def _recheck_naming_for(self, element_id: str) -> None:
+        """Re-run naming rules for an element and its name group."""
+        name = self._names[element_id]
+        if name:
+            self._recheck_name_group(name)
+        else:
+            self._recheck_name(element_id, None)
+    
+    def _recheck_name_group(self, name: str) -> None:
+        """Re-run naming rules for all elements sharing a name."""
+        group = self._name_groups.get(name)
+        if not group:
+            return
+        first = group[0]
+        for element_id in group:
+            self._recheck_name(element_id, None if element_id == first else first)
+    
+    def _recheck_name(self, element_id: str, duplicate_of: Optional[str]) -> None:
+        """Re-run naming rules for one element."""
+        if not self.service.check_naming:
+            return
+        part = ValidationResult()
+        self.service._check_element_name(self.doc.get_element(element_id), duplicate_of, part)
+        self._store('naming', element_id, part)
+    
+    def _recheck_special(self, element_ids: Iterable[str]) -> None:
+        """Re-run the type-specific validators."""
+        for element_id in element_ids:
+            part = ValidationResult()
+            self.service._check_special_element(self.doc.get_element(element_id), self.doc, part)
+            self._store('special', element_id, part)
+    
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"IncrementalValidator(elements={len(self._seq)}, attached={self._attached})"
+
+
 class CounterValidator:
     """
     Validator for COUNTER elements.
@@ -807,7 +1185,7 @@ class CounterValidator:
             )
         
         # Info: Suggest using reset if counter is in a loop
-        if len(incoming) > 1 or any(conn.source_element.element_id == element.element_id for conn in outgoing):
+        if len(incoming) > 1 or any(conn.target_element == element.element_id for conn in outgoing):
             reset_on_max = getattr(element, "counter_reset_on_max", False)
             if not reset_on_max:
                 result.add_info(
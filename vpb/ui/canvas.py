@@ -4,13 +4,15 @@ import json
 import os
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-import heapq
 import math
 
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 
-from vpb.models import VPBConnection, VPBElement
+from vpb.models import ProcessGraph, VPBConnection, VPBElement
+from vpb.ui.canvas_history import CanvasHistory, HistoryShadow, diff_shadow
+from vpb.ui.grid_router import GridRouter
+from vpb.ui.spatial_index import SpatialIndex, align_on_axis
 from vpb.styles import CONNECTION_STYLES, ELEMENT_STYLES
 
 
@@ -131,11 +133,30 @@ def _best_contrast_color(base_color: Optional[str], candidates: Iterable[str], d
     return best_color
 
 
+def _normalize_element_type(et: Optional[str]) -> str:
+    """Element-Typ-Synonyme auflösen (Kompatibilität)"""
+    t = (et or "FUNCTION").strip()
+    t_up = t.upper()
+    # Häufige Synonyme/Abkürzungen
+    synonyms = {
+        "TASK": "FUNCTION",
+        "DECISION": "GATEWAY",
+        "DECISION_GATEWAY": "GATEWAY",
+        # BPMN-Gateways ohne Suffix
+        "AND": "AND_CONNECTOR",
+        "OR": "OR_CONNECTOR",
+        "XOR": "XOR_CONNECTOR",
+    }
+    return synonyms.get(t_up, t_up)
+
+
 # -------- Haupt-Canvas --------
 
 class VPBCanvas(tk.Canvas):
     NODE_W = 150
     NODE_H = 60
+    # Fangradius (Pixel) für Klicks neben eine Verbindungslinie
+    CONNECTION_HIT_TOLERANCE = 6
 
     def __init__(self, master: tk.Widget, **kwargs):
         super().__init__(master, background="#ffffff", highlightthickness=0, **kwargs)
@@ -192,11 +213,13 @@ class VPBCanvas(tk.Canvas):
         # Callback für View-Änderungen (Lineale/Scrollbars)
         self.on_view_changed: Optional[Callable[[], None]] = None  # legacy single-callback
         self._view_changed_listeners: List[Callable[[], None]] = []
+        # Listener für Modelländerungen (Elemente/Verbindungen/Metadaten), z. B. Live-Code-Ansicht
+        self._model_changed_listeners: List[Callable[[], None]] = []
 
-        # Undo/Redo History
-        self._undo_stack: List[Dict] = []
-        self._redo_stack: List[Dict] = []
-        self._max_history: int = 50
+        # Undo/Redo History (Delta-Kommandos, begrenzt über Speicherbudget)
+        self._history = CanvasHistory()
+        self._history_shadow: Optional[HistoryShadow] = None  # Zustand am letzten Undo-Punkt
+        self._history_open: bool = False  # push_undo() erfolgt, Schritt noch nicht abgeschlossen
 
         # Stil-Overrides (global) und Palette-Defaults pro Elementtyp
         self.element_style_overrides = {}
@@ -214,7 +237,35 @@ class VPBCanvas(tk.Canvas):
         # Hand-Tool Status (Space zum temporären Pannen)
         self._space_pan_active: bool = False
         self._connection_points_cache: Dict[str, List[int]] = {}
+        # Gemeinsames Hindernis-Gitter für smart-plus (wird beim ersten Grid-Routing aufgebaut)
+        self._router = GridRouter()
         self._collapsed_redirect: Dict[str, str] = {}
+        # Retained-Mode Render-Index (wird von redraw_all aufgebaut):
+        # Element-ID -> gezeichnetes Zentrum (View), Verbindungs-ID -> Canvas-Items,
+        # effektive Element-ID -> inzidente Verbindungen, Mitglied -> direkte Gruppen
+        self._rendered_centers: Dict[str, Tuple[int, int]] = {}
+        self._connection_items: Dict[str, Dict[str, int]] = {}
+        self._element_connection_index: Dict[str, set[str]] = {}
+        self._group_parents: Dict[str, set[str]] = {}
+        self._hidden_members: set[str] = set()
+        self._render_index_valid: bool = False
+        self._drag_needs_settle: bool = False
+        # Viewport-Culling und Level-of-Detail (unterhalb lod_scale_threshold: keine Labels/
+        # SPS-Dekorationen, Elemente und Gruppen als einfache Boxen, Verbindungen als Geraden)
+        self.culling_enabled: bool = True
+        self.lod_scale_threshold: float = 0.4
+        self._lod_active: bool = False
+        self._route_culled: bool = False
+        self._content_signature: int = 0
+        # Räumlicher Index (Modellkoordinaten): Nominal-Boxen aller Elemente, Bounds der GROUPs
+        self._node_index = SpatialIndex(cell_size=max(self.NODE_W, self.NODE_H))
+        self._group_index = SpatialIndex(cell_size=max(self.NODE_W, self.NODE_H) * 2)
+        # Routensegmente (cid, i) für das Hit-Testing von Verbindungen; wird erst vor einer
+        # Abfrage aus _connection_points_cache nachgezogen (keine Kosten pro Drag-Frame)
+        self._segment_index = SpatialIndex(cell_size=max(self.NODE_W, self.NODE_H))
+        self._segment_counts: Dict[str, int] = {}
+        self._dirty_segments: set[str] = set()
+        self._segments_stale: bool = True
         self.ref_refresh_interval_ms = 2000  # type: int
         self._ref_refresh_job = None  # type: Optional[str]
         self._schedule_ref_refresh()
@@ -458,7 +509,10 @@ class VPBCanvas(tk.Canvas):
                     el.y = int(el.y + dy)
                 except Exception:
                     pass
-            self.redraw_all()
+            self.refresh_moved_elements(move_ids)
+            self._settle_after_drag()
+            # Schritt sofort abschließen: wiederholtes Nudgen wird zusammengefasst
+            self._seal_history_step()
         except Exception:
             pass
 
@@ -863,10 +917,15 @@ class VPBCanvas(tk.Canvas):
 
     def get_viewport_model_size(self) -> Tuple[float, float]:
         """Gibt die aktuelle Viewport-Größe in Model-Einheiten zurück."""
-        vw = max(1, int(self.winfo_width() or self.winfo_reqwidth() or 1))
-        vh = max(1, int(self.winfo_height() or self.winfo_reqheight() or 1))
+        vw = int(self.winfo_width() or 0)
+        vh = int(self.winfo_height() or 0)
+        # Noch nicht gemappt (winfo_* == 1): angeforderte Größe verwenden
+        if vw <= 1:
+            vw = int(self.winfo_reqwidth() or 1)
+        if vh <= 1:
+            vh = int(self.winfo_reqheight() or 1)
         s = max(self.view_scale, 1e-6)
-        return vw / s, vh / s
+        return max(1, vw) / s, max(1, vh) / s
 
     def get_view_origin_model(self) -> Tuple[float, float]:
         """Top-Left des Viewports in Model-Koordinaten."""
@@ -917,6 +976,26 @@ class VPBCanvas(tk.Canvas):
         except Exception:
             pass
 
+    def _notify_model_changed(self):
+        """Meldet eine (bevorstehende oder erfolgte) Modelländerung.
+
+        Wird u. a. aus push_undo() aufgerufen, also ggf. vor der eigentlichen
+        Änderung; Listener sollten daher verzögert (debounced) reagieren.
+        """
+        for cb in list(self._model_changed_listeners):
+            try:
+                cb()
+            except Exception:
+                pass
+
+    def add_model_changed_listener(self, cb: Callable[[], None]):
+        if cb not in self._model_changed_listeners:
+            self._model_changed_listeners.append(cb)
+
+    def remove_model_changed_listener(self, cb: Callable[[], None]):
+        if cb in self._model_changed_listeners:
+            self._model_changed_listeners.remove(cb)
+
     # ----- Laden/Speichern -----
     def load_from_dict(self, data: Dict):
         self.clear()
@@ -938,88 +1017,132 @@ class VPBCanvas(tk.Canvas):
         except Exception:
             pass
 
-        # Element-Typ-Synonyme auflösen (Kompatibilität)
-        def _normalize_element_type(et: Optional[str]) -> str:
-            t = (et or "FUNCTION").strip()
-            t_up = t.upper()
-            # Häufige Synonyme/Abkürzungen
-            synonyms = {
-                "TASK": "FUNCTION",
-                "DECISION": "GATEWAY",
-                "DECISION_GATEWAY": "GATEWAY",
-                # BPMN-Gateways ohne Suffix
-                "AND": "AND_CONNECTOR",
-                "OR": "OR_CONNECTOR",
-                "XOR": "XOR_CONNECTOR",
-            }
-            return synonyms.get(t_up, t_up)
-
         for e in data.get("elements", []):
-            el = VPBElement(
-                element_id=e.get("element_id"),
-                element_type=_normalize_element_type(e.get("element_type", "FUNCTION")),
-                name=e.get("name", e.get("element_id", "Element")),
-                x=int(e.get("x", 100)),
-                y=int(e.get("y", 100)),
-                description=e.get("description", ""),
-                responsible_authority=e.get("responsible_authority", ""),
-                legal_basis=e.get("legal_basis", ""),
-                deadline_days=int(e.get("deadline_days", 0) or 0),
-                geo_reference=e.get("geo_reference", ""),
-            )
-            try:
-                orig_type = e.get("original_element_type")
-                if orig_type:
-                    el.original_element_type = str(orig_type)
-            except Exception:
-                el.original_element_type = None
-            # SUBPROCESS: ref_file
-            try:
-                el.ref_file = str(e.get("ref_file", "") or "")
-            except Exception:
-                el.ref_file = ""
-            try:
-                if getattr(el, "ref_file", ""):
-                    self._load_ref_preview(el)
-                else:
-                    el.ref_inline_content = None
-                    el.ref_inline_error = None
-                    el.ref_inline_path = None
-                    el.ref_inline_truncated = False
-            except Exception:
-                el.ref_inline_error = "Vorschau konnte nicht geladen werden"
-            # Alte Daten ohne original_element_type für SUBPROCESS-Referenzen korrigieren
-            if getattr(el, "ref_file", "") and not getattr(el, "original_element_type", None):
-                el.original_element_type = e.get("element_type", "SUBPROCESS")
-            # GROUP Felder
-            if el.element_type == "GROUP":
-                try:
-                    el.members = [str(i) for i in e.get("members", []) if isinstance(i, (str, int))]
-                except Exception:
-                    el.members = []
-                el.collapsed = bool(e.get("collapsed", False))
-            if self._is_ref_subprocess(el):
-                self._ensure_ref_group(el)
-            # Optional: visuelle Hierarchie-Referenz
-            try:
-                el.hierarchy = str(e.get("hierarchy")) if e.get("hierarchy") is not None else None
-            except Exception:
-                el.hierarchy = None
+            el = self._element_from_dict(e)
             self.elements[el.element_id] = el
 
         for c in data.get("connections", []):
-            conn = VPBConnection(
-                connection_id=c.get("connection_id"),
-                source_element=c.get("source_element"),
-                target_element=c.get("target_element"),
-                connection_type=c.get("connection_type", "SEQUENCE"),
-                description=c.get("description", ""),
-                arrow_style=str(c.get("arrow_style", "single") or "single"),
-                routing_mode=str(c.get("routing_mode", "auto") or "auto"),
-            )
+            conn = self._connection_from_dict(c)
             self.connections[conn.connection_id] = conn
 
         self.redraw_all()
+        self._notify_model_changed()
+
+    def _element_from_dict(self, e: Dict) -> VPBElement:
+        """Baut ein Element aus einem Datensatz von to_dict()/load_from_dict() auf."""
+        el = VPBElement(
+            element_id=e.get("element_id"),
+            element_type=_normalize_element_type(e.get("element_type", "FUNCTION")),
+            name=e.get("name", e.get("element_id", "Element")),
+            x=int(e.get("x", 100)),
+            y=int(e.get("y", 100)),
+            description=e.get("description", ""),
+            responsible_authority=e.get("responsible_authority", ""),
+            legal_basis=e.get("legal_basis", ""),
+            deadline_days=int(e.get("deadline_days", 0) or 0),
+            geo_reference=e.get("geo_reference", ""),
+        )
+        try:
+            orig_type = e.get("original_element_type")
+            if orig_type:
+                el.original_element_type = str(orig_type)
+        except Exception:
+            el.original_element_type = None
+        # SUBPROCESS: ref_file
+        try:
+            el.ref_file = str(e.get("ref_file", "") or "")
+        except Exception:
+            el.ref_file = ""
+        try:
+            if getattr(el, "ref_file", ""):
+                self._load_ref_preview(el)
+            else:
+                el.ref_inline_content = None
+                el.ref_inline_error = None
+                el.ref_inline_path = None
+                el.ref_inline_truncated = False
+        except Exception:
+            el.ref_inline_error = "Vorschau konnte nicht geladen werden"
+        # Alte Daten ohne original_element_type für SUBPROCESS-Referenzen korrigieren
+        if getattr(el, "ref_file", "") and not getattr(el, "original_element_type", None):
+            el.original_element_type = e.get("element_type", "SUBPROCESS")
+        # GROUP Felder
+        if el.element_type == "GROUP":
+            try:
+                el.members = [str(i) for i in e.get("members", []) if isinstance(i, (str, int))]
+            except Exception:
+                el.members = []
+            el.collapsed = bool(e.get("collapsed", False))
+        if self._is_ref_subprocess(el):
+            self._ensure_ref_group(el)
+        # Optional: visuelle Hierarchie-Referenz
+        try:
+            el.hierarchy = str(e.get("hierarchy")) if e.get("hierarchy") is not None else None
+        except Exception:
+            el.hierarchy = None
+        return el
+
+    @staticmethod
+    def _connection_from_dict(c: Dict) -> VPBConnection:
+        return VPBConnection(
+            connection_id=c.get("connection_id"),
+            source_element=c.get("source_element"),
+            target_element=c.get("target_element"),
+            connection_type=c.get("connection_type", "SEQUENCE"),
+            description=c.get("description", ""),
+            arrow_style=str(c.get("arrow_style", "single") or "single"),
+            routing_mode=str(c.get("routing_mode", "auto") or "auto"),
+        )
+
+    def apply_data_diff(self, diff) -> bool:
+        """Übernimmt ein Delta (CodeSyncService.diff_canvas_data) statt load_from_dict().
+
+        Nur hinzugefügte/geänderte Elemente und Verbindungen werden neu aufgebaut,
+        entfernte gelöscht; Reihenfolge und Dokumentfelder folgen dem neuen Stand.
+        Ansicht und Auswahl bleiben erhalten, die Änderung ist ein Undo-Schritt.
+
+        Returns:
+            True, wenn sich etwas geändert hat
+        """
+        if diff.is_empty():
+            return False
+        self.push_undo()
+        for eid in diff.removed_elements:
+            self.elements.pop(eid, None)
+        for eid, record in diff.elements.items():
+            self.elements[eid] = self._element_from_dict(record)
+        if diff.element_order is not None:
+            ordered = [(eid, self.elements[eid]) for eid in diff.element_order]
+            self.elements.clear()
+            self.elements.update(ordered)
+        for cid in diff.removed_connections:
+            self.connections.pop(cid, None)
+        for cid, record in diff.connections.items():
+            self.connections[cid] = self._connection_from_dict(record)
+        if diff.connection_order is not None:
+            ordered = [(cid, self.connections[cid]) for cid in diff.connection_order]
+            self.connections.clear()
+            self.connections.update(ordered)
+        if "metadata" in diff.document:
+            self.metadata = dict(diff.document["metadata"])
+        if "hierarchy_categories" in diff.document:
+            self.hierarchy_categories = diff.document["hierarchy_categories"]
+            try:
+                self._hierarchy_color_cache.clear()
+            except Exception:
+                self._hierarchy_color_cache = {}
+        # Auswahl auf noch vorhandene Objekte beschränken
+        if self.selected_id and self.selected_id not in self.elements:
+            self.selected_id = None
+        try:
+            self.selected_ids.intersection_update(self.elements.keys())
+        except Exception:
+            pass
+        if self.selected_conn_id and self.selected_conn_id not in self.connections:
+            self.selected_conn_id = None
+        self._invalidate_render_index()
+        self.redraw_all()
+        return True
 
     def to_dict(self) -> Dict:
         # einfache Rekonstruktion mit nur relevanten Feldern
@@ -1105,16 +1228,22 @@ class VPBCanvas(tk.Canvas):
         self.link_mode = False
         self.link_source_id = None
         self._connection_points_cache = {}
+        self._segments_stale = True
+        self._router.reset()
+        self._router.retain_routes(())
         self._collapsed_redirect = {}
+        self._invalidate_render_index()
+        self._node_index.clear()
+        self._group_index.clear()
         try:
             self._hierarchy_color_cache.clear()
         except Exception:
             self._hierarchy_color_cache = {}
         # Historie zurücksetzen
-        if hasattr(self, '_undo_stack'):
-            self._undo_stack.clear()
-        if hasattr(self, '_redo_stack'):
-            self._redo_stack.clear()
+        if hasattr(self, '_history'):
+            self._history.clear()
+        self._history_shadow = None
+        self._history_open = False
         # View-Änderung signalisieren (z.B. Scrollbars/Minimap updaten)
         try:
             self._notify_view_changed()
@@ -1124,6 +1253,7 @@ class VPBCanvas(tk.Canvas):
 
     def redraw_all(self):
         self.delete("all")
+        self._lod_active = self.view_scale < self.lod_scale_threshold
         try:
             for el in list(self.elements.values()):
                 if not self._is_ref_subprocess(el):
@@ -1175,12 +1305,52 @@ class VPBCanvas(tk.Canvas):
                                 stack.append(sm)
         self._collapsed_redirect = collapsed_redirect
         self._connection_points_cache: Dict[str, List[int]] = {}
-        # Verbindungen zeichnen (unverändert)
+        self._segments_stale = True
+        self._router.reset()
+        self._router.retain_routes(self.connections.keys())
+        self._invalidate_render_index()
+        self._hidden_members = hidden_members
+        # Render-Index: inzidente Verbindungen je (effektivem) Element, Gruppen je Mitglied
+        conn_index: Dict[str, set[str]] = {}
+        for conn in self.connections.values():
+            for endpoint in (conn.source_element, conn.target_element):
+                eff = collapsed_redirect.get(endpoint, endpoint)
+                conn_index.setdefault(eff, set()).add(conn.connection_id)
+        group_parents: Dict[str, set[str]] = {}
+        for el in self.elements.values():
+            if el.element_type in ("GROUP", "TIME_LOOP"):
+                for mid in getattr(el, "members", []) or []:
+                    group_parents.setdefault(mid, set()).add(el.element_id)
+        self._element_connection_index = conn_index
+        self._group_parents = group_parents
+        self._content_signature = hash((
+            tuple((eid, el.element_type) for eid, el in self.elements.items()),
+            tuple((cid, conn.source_element, conn.target_element) for cid, conn in self.connections.items()),
+        ))
+        self._rebuild_spatial_index()
+        # Viewport-Culling: nur Elemente/Verbindungen im sichtbaren Bereich (plus Rand) zeichnen
+        view = self._visible_model_rect()
+        visible: Optional[set[str]] = None
+        if view is not None:
+            visible = set(self._node_index.query_rect(*view))
+            visible.update(self._group_index.query_rect(*view))
+        # smart-plus-Routen hängen von allen zuvor gezeichneten Verbindungen ab → auch verdeckte routen
+        self._route_culled = not self._lod_active and any(
+            self._uses_grid_routing(conn) for conn in self.connections.values()
+        )
+        drawn_connections: List[VPBConnection] = []
         for conn in self.connections.values():
-            self._draw_connection(conn)
-        # Container zuerst, dann andere
+            if view is None or self._connection_in_view(conn, view):
+                self._draw_connection(conn)
+                drawn_connections.append(conn)
+            else:
+                self._route_culled_connection(conn)
+        # Container zuerst, dann andere (TIME_LOOP-Rahmen folgen den Mitgliedern → nie cullen)
         groups = [e for e in self.elements.values() if e.element_type == "GROUP"]
         others = [e for e in self.elements.values() if e.element_type != "GROUP"]
+        if visible is not None:
+            groups = [e for e in groups if e.element_id in visible]
+            others = [e for e in others if e.element_id in visible or e.element_type == "TIME_LOOP"]
         for el in groups:
             if el.element_id in hidden_groups:
                 continue
@@ -1189,17 +1359,289 @@ class VPBCanvas(tk.Canvas):
             if el.element_id in hidden_members:
                 continue
             self._draw_element(el)
-        # Labels oben halten: nachzeichnen
-        for el in groups:
-            if el.element_id in hidden_groups:
+        # Labels oben halten: nachzeichnen (LOD: keine Labels)
+        if not self._lod_active:
+            for el in groups:
+                if el.element_id in hidden_groups:
+                    continue
+                self._draw_label(el)
+            for el in others:
+                if el.element_id in hidden_members:
+                    continue
+                self._draw_label(el)
+            for conn in drawn_connections:
+                self._draw_connection_label(conn)
+        self._render_index_valid = True
+
+    # ----- Inkrementelles Rendering (Retained Mode) -----
+    def _invalidate_render_index(self) -> None:
+        """Verwirft den Render-Index; der nächste Move fällt auf redraw_all zurück."""
+        self._render_index_valid = False
+        self._rendered_centers = {}
+        self._connection_items = {}
+        self._element_connection_index = {}
+        self._group_parents = {}
+        self._hidden_members = set()
+
+    def refresh_moved_elements(self, element_ids: Iterable[str]) -> None:
+        """Aktualisiert nach reinen Positionsänderungen nur die betroffenen Canvas-Items.
+
+        Verschiebt die Items der bewegten Elemente, zeichnet betroffene Gruppenrahmen neu
+        und routet nur die inzidenten Verbindungen. Fällt auf redraw_all() zurück, wenn
+        der Render-Index fehlt (z. B. nach strukturellen Änderungen).
+        """
+        if not self._render_index_valid:
+            self.redraw_all()
+            return
+        moved = {eid for eid in element_ids if eid in self.elements}
+        if not moved:
+            return
+        self._notify_model_changed()
+        self._update_spatial_index(moved)
+        hidden = getattr(self, "_hidden_members", set()) or set()
+        view = self._visible_model_rect()
+        rerender_groups: set[str] = set()
+        touched: set[str] = set()
+        for eid in moved:
+            if eid in hidden:
                 continue
-            self._draw_label(el)
-        for el in others:
-            if el.element_id in hidden_members:
+            el = self.elements[eid]
+            # Gruppenrahmen hängen von den Mitgliedern ab → neu zeichnen statt verschieben
+            if el.element_type in ("GROUP", "TIME_LOOP"):
+                rerender_groups.add(eid)
+            else:
+                old = self._rendered_centers.get(eid)
+                if old is None:
+                    # Bisher nicht gezeichnet (Culling): erst neu zeichnen, wenn es sichtbar wird
+                    if view is None or self._box_in_view(self._node_box_model(el), view):
+                        self.redraw_all()
+                        return
+                else:
+                    new = self.to_view(*el.center())
+                    dvx, dvy = new[0] - old[0], new[1] - old[1]
+                    if dvx or dvy:
+                        self.move(f"node:{eid}", dvx, dvy)
+                        self._rendered_centers[eid] = new
+            touched.add(eid)
+            for gid in self._group_parents.get(eid, ()):
+                if gid not in hidden:
+                    rerender_groups.add(gid)
+        for gid in rerender_groups:
+            group = self.elements.get(gid)
+            if not group:
                 continue
-            self._draw_label(el)
-        for conn in self.connections.values():
-            self._draw_connection_label(conn)
+            self.delete(f"node:{gid}")
+            self._draw_element(group)
+            self._draw_label(group)
+            try:
+                self.tag_lower(f"node:{gid}", "node")
+            except Exception:
+                pass
+            touched.add(gid)
+        conn_ids: set[str] = set()
+        for eid in touched:
+            conn_ids.update(self._element_connection_index.get(eid, ()))
+        for cid in conn_ids:
+            conn = self.connections.get(cid)
+            if conn is None:
+                continue
+            if cid in self._connection_items:
+                self._update_connection_geometry(conn)
+            elif view is not None and self._connection_in_view(conn, view):
+                # verdeckte Verbindung wird sichtbar
+                self.redraw_all()
+                return
+            else:
+                self._route_culled_connection(conn)
+
+    # ----- Räumlicher Index -----
+    def _node_box_model(self, el: VPBElement) -> Tuple[float, float, float, float]:
+        """Nominale Element-Box (NODE_W x NODE_H um x/y) in Modellkoordinaten."""
+        half_w = self.NODE_W / 2
+        half_h = self.NODE_H / 2
+        return (el.x - half_w, el.y - half_h, el.x + half_w, el.y + half_h)
+
+    def _rebuild_spatial_index(self) -> None:
+        self._node_index.rebuild((eid, self._node_box_model(el)) for eid, el in self.elements.items())
+        groups = []
+        for eid, el in self.elements.items():
+            if el.element_type == "GROUP":
+                bounds = self._group_bounds_model(el)
+                if bounds:
+                    groups.append((eid, bounds))
+        self._group_index.rebuild(groups)
+
+    def _ensure_spatial_index(self) -> None:
+        """Baut den Index neu auf, falls er nicht zum Modell passt (z. B. vor dem ersten redraw_all)."""
+        if len(self._node_index) != len(self.elements):
+            self._rebuild_spatial_index()
+
+    def _route_segments_model(self, pts: List[int]) -> List[Tuple[float, float, float, float]]:
+        """Segmente einer gezeichneten Route (View-Punkte) in Modellkoordinaten."""
+        coords = [self.to_model(pts[i], pts[i + 1]) for i in range(0, len(pts) - 1, 2)]
+        return [(x0, y0, x1, y1) for (x0, y0), (x1, y1) in zip(coords, coords[1:])]
+
+    def _ensure_segment_index(self) -> None:
+        """Zieht den Segment-Index nach: komplett nach redraw_all, sonst nur geänderte Routen."""
+        if self._segments_stale:
+            self._segments_stale = False
+            self._dirty_segments.clear()
+            self._segment_counts = {}
+            items = []
+            for cid, pts in self._connection_points_cache.items():
+                segments = self._route_segments_model(pts)
+                self._segment_counts[cid] = len(segments)
+                items.extend(((cid, i), seg) for i, seg in enumerate(segments))
+            self._segment_index.rebuild(items)
+            return
+        for cid in self._dirty_segments:
+            pts = self._connection_points_cache.get(cid)
+            segments = self._route_segments_model(pts) if pts else []
+            for i, seg in enumerate(segments):
+                self._segment_index.insert((cid, i), seg)
+            for i in range(len(segments), self._segment_counts.get(cid, 0)):
+                self._segment_index.remove((cid, i))
+            if segments:
+                self._segment_counts[cid] = len(segments)
+            else:
+                self._segment_counts.pop(cid, None)
+        self._dirty_segments.clear()
+
+    @staticmethod
+    def _point_segment_distance(px: float, py: float, seg: Tuple[float, float, float, float]) -> float:
+        x0, y0, x1, y1 = seg
+        dx, dy = x1 - x0, y1 - y0
+        length_sq = dx * dx + dy * dy
+        t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((px - x0) * dx + (py - y0) * dy) / length_sq))
+        return math.hypot(px - (x0 + t * dx), py - (y0 + t * dy))
+
+    def _update_spatial_index(self, element_ids: Iterable[str]) -> None:
+        """Aktualisiert die Boxen verschobener Elemente und der davon abhängigen Gruppen
+        (räumlicher Index und Hindernis-Gitter)."""
+        groups: set[str] = set()
+        for eid in element_ids:
+            el = self.elements.get(eid)
+            if el is None:
+                continue
+            self._node_index.insert(eid, self._node_box_model(el))
+            self._router.update_element(eid, self._element_view_box(el))
+            if el.element_type == "GROUP":
+                groups.add(eid)
+            groups.update(self._group_parents.get(eid, ()))
+        for gid in groups:
+            group = self.elements.get(gid)
+            bounds = self._group_bounds_model(group) if group is not None else None
+            if bounds:
+                self._group_index.insert(gid, bounds)
+            else:
+                self._group_index.remove(gid)
+            if group is not None:
+                self._router.update_element(gid, self._element_view_box(group))
+
+    # ----- Viewport-Culling / Level-of-Detail -----
+    def _visible_model_rect(self) -> Optional[Tuple[float, float, float, float]]:
+        """Sichtbarer Bereich in Modellkoordinaten inkl. Rand (Labels, Schatten); None = kein Culling."""
+        if not self.culling_enabled:
+            return None
+        try:
+            x0, y0 = self.get_view_origin_model()
+            vw, vh = self.get_viewport_model_size()
+        except Exception:
+            return None
+        margin = max(self.NODE_W, self.NODE_H) + 80 / max(self.view_scale, 1e-6)
+        return (x0 - margin, y0 - margin, x0 + vw + margin, y0 + vh + margin)
+
+    @staticmethod
+    def _box_in_view(box: Tuple[float, float, float, float], view: Tuple[float, float, float, float]) -> bool:
+        return not (box[2] < view[0] or box[0] > view[2] or box[3] < view[1] or box[1] > view[3])
+
+    def _connection_in_view(self, conn: VPBConnection, view: Tuple[float, float, float, float]) -> bool:
+        """Schneidet die Hülle von Quelle und Ziel (plus Routing-Umweg) den sichtbaren Bereich?"""
+        resolved_endpoints = self._resolve_connection_render(conn)
+        if not resolved_endpoints:
+            return False
+        boxes = []
+        for el in resolved_endpoints:
+            box = self._group_index.bounds(el.element_id) if el.element_type == "GROUP" else None
+            boxes.append(box or self._node_box_model(el))
+        pad = 2 * self.NODE_W
+        hull = (
+            min(b[0] for b in boxes) - pad, min(b[1] for b in boxes) - pad,
+            max(b[2] for b in boxes) + pad, max(b[3] for b in boxes) + pad,
+        )
+        return self._box_in_view(hull, view)
+
+    def _uses_grid_routing(self, conn: VPBConnection) -> bool:
+        mode = str(getattr(conn, "routing_mode", "auto") or "auto").lower()
+        if mode in {"auto", "default", "inherit"}:
+            mode = str(getattr(self, "routing_style", "smart") or "smart").lower()
+        return mode in {"smart-plus", "smart+", "smartplus"}
+
+    def _route_culled_connection(self, conn: VPBConnection) -> None:
+        """Nicht gezeichnete Verbindung: Route nur für das Hindernis-Routing (smart-plus) vorhalten."""
+        conn.canvas_item = None
+        resolved_endpoints = self._resolve_connection_render(conn) if self._route_culled else None
+        if not resolved_endpoints:
+            self._set_connection_points(conn.connection_id, None)
+            return
+        pts, _mode = self._connection_render_points(resolved_endpoints[0], resolved_endpoints[1], conn)
+        self._set_connection_points(conn.connection_id, pts)
+
+    def _connection_render_points(self, src: VPBElement, tgt: VPBElement, conn: VPBConnection) -> Tuple[List[int], str]:
+        """Routenpunkte zum Zeichnen; im LOD-Modus Gerade zwischen den Element-Mitten."""
+        if self._lod_active:
+            scx, scy = self._element_view_size(src)[:2]
+            tcx, tcy = self._element_view_size(tgt)[:2]
+            return [scx, scy, tcx, tcy], "straight"
+        return self._get_route_points(src, tgt, conn)
+
+    def content_revision(self) -> Tuple[int, int, int]:
+        """Ändert sich bei Struktur-/Positionsänderungen, nicht bei Pan/Zoom (für gecachte Übersichten)."""
+        self._ensure_spatial_index()
+        return (self._node_index.version, self._group_index.version, self._content_signature)
+
+    def _set_connection_points(self, connection_id: str, pts: Optional[List[int]]) -> None:
+        """Aktualisiert die gezeichnete Route (None = entfernen) samt Strafzellen im Hindernis-Gitter."""
+        if pts is None:
+            self._connection_points_cache.pop(connection_id, None)
+        else:
+            self._connection_points_cache[connection_id] = pts
+        self._dirty_segments.add(connection_id)
+        self._router.set_polyline(connection_id, pts)
+
+    def _update_connection_geometry(self, conn: VPBConnection) -> None:
+        """Setzt Route und Label einer bereits gezeichneten Verbindung per coords() neu."""
+        items = self._connection_items.get(conn.connection_id)
+        resolved_endpoints = self._resolve_connection_render(conn)
+        if not items or not resolved_endpoints:
+            return
+        src, tgt = resolved_endpoints
+        pts, resolved_mode = self._connection_render_points(src, tgt, conn)
+        if resolved_mode == "smart-plus":
+            # Hindernis-Routen anderer Verbindungen hängen ebenfalls von der Position ab
+            self._drag_needs_settle = True
+        self._set_connection_points(conn.connection_id, pts)
+        line = items.get("line")
+        if line is not None:
+            self.coords(line, *pts)
+        shadow = items.get("shadow")
+        if shadow is not None:
+            self.coords(shadow, *[p + 2 for p in pts])
+        if items.get("label") is None and items.get("label_bg") is None:
+            return
+        label_layout = self._connection_label_layout(conn, pts)
+        if label_layout:
+            mx, my, _txt, bg_box = label_layout
+            if items.get("label_bg") is not None:
+                self.coords(items["label_bg"], *bg_box)
+            if items.get("label") is not None:
+                self.coords(items["label"], mx, my - 10)
+
+    def _settle_after_drag(self) -> None:
+        """Nach Drag-Ende: Hindernis-Routing (smart-plus) einmalig vollständig neu berechnen."""
+        if self._drag_needs_settle:
+            self._drag_needs_settle = False
+            self.redraw_all()
 
     def _create_selection_outline_item(self, shape: Optional[str], cx: int, cy: int, w: int, h: int) -> Optional[int]:
         margin = max(4, int(round(4 * max(self.view_scale, 0.25))))
@@ -1239,6 +1681,9 @@ class VPBCanvas(tk.Canvas):
         )
 
     def _draw_element(self, el: VPBElement):
+        if self._lod_active:
+            self._draw_element_lod(el)
+            return
         style = self._resolve_element_style(el.element_type, el)
         try:
             el._resolved_style = style
@@ -1307,9 +1752,11 @@ class VPBCanvas(tk.Canvas):
 
             for it in items:
                 self.addtag_withtag(f"node:{el.element_id}", it)
+                self.addtag_withtag("node", it)
                 self._id_to_element[it] = el.element_id
             self._decorate_ref_element(el)
             el.canvas_items = items
+            self._rendered_centers[el.element_id] = (cx, cy)
             return
 
         shape = style.get("shape")
@@ -1586,6 +2033,7 @@ class VPBCanvas(tk.Canvas):
         # Klickbereich mit Tag für Selektion
         for it in items:
             self.addtag_withtag(f"node:{el.element_id}", it)
+            self.addtag_withtag("node", it)
             self._id_to_element[it] = el.element_id
 
         self._decorate_ref_element(el)
@@ -1613,8 +2061,38 @@ class VPBCanvas(tk.Canvas):
                 pass
 
         el.canvas_items = items
+        self._rendered_centers[el.element_id] = (cx, cy)
+
+    def _draw_element_lod(self, el: VPBElement) -> None:
+        """Vereinfachte Darstellung bei kleinem Zoom: eine Box je Element (Gruppen als Rahmen),
+        ohne Schatten, SPS-Dekorationen und Referenz-Markierungen."""
+        style = self._resolve_element_style(el.element_type, el)
+        try:
+            el._resolved_style = style
+        except Exception:
+            pass
+        cx, cy, w, h, _ = self._element_view_size(el)
+        x0, y0, x1, y1 = cx - w // 2, cy - h // 2, cx + w // 2, cy + h // 2
+        if el.element_type in ("GROUP", "TIME_LOOP"):
+            item = self.create_rectangle(x0, y0, x1, y1, outline=style.get("outline", "#666"), width=1, fill="")
+        else:
+            item = self.create_rectangle(
+                x0, y0, x1, y1,
+                fill=style.get("fill") or "#EEEEEE", outline=style.get("outline") or "#888", width=1,
+            )
+        items = [item]
+        if el.element_id in self.selected_ids or self.selected_id == el.element_id:
+            items.append(self.create_rectangle(x0 - 3, y0 - 3, x1 + 3, y1 + 3, outline="#FF9900", width=2))
+        for it in items:
+            self.addtag_withtag(f"node:{el.element_id}", it)
+            self.addtag_withtag("node", it)
+            self._id_to_element[it] = el.element_id
+        el.canvas_items = items
+        self._rendered_centers[el.element_id] = self.to_view(*el.center())
 
     def _draw_label(self, el: VPBElement):
+        if self._lod_active:
+            return
         cx, cy = self.to_view(*el.center())
         text = el.name or el.element_id
         style = getattr(el, "_resolved_style", None)
@@ -1688,10 +2166,10 @@ class VPBCanvas(tk.Canvas):
         resolved_endpoints = self._resolve_connection_render(conn)
         if not resolved_endpoints:
             conn.canvas_item = None
-            self._connection_points_cache.pop(conn.connection_id, None)
+            self._set_connection_points(conn.connection_id, None)
             return
         src, tgt = resolved_endpoints
-        pts, resolved_mode = self._get_route_points(src, tgt, conn)
+        pts, resolved_mode = self._connection_render_points(src, tgt, conn)
         style = CONNECTION_STYLES.get(conn.connection_type, {"fill": "#000", "width": 2, "dash": None})
         smooth = resolved_mode == 'curved'
         
@@ -1715,6 +2193,9 @@ class VPBCanvas(tk.Canvas):
         if highlight_color:
             line_color = highlight_color
             line_width = max(line_width + 1, line_width)
+        if self._lod_active:
+            arrow_opt = None
+            line_width = 1
         
         # Draw subtle shadow for depth (Blender-inspired)
         if resolved_mode == 'curved' and not highlight_color:
@@ -1735,6 +2216,7 @@ class VPBCanvas(tk.Canvas):
             )
             self.tag_lower(shadow_item)
             self._id_to_connection[shadow_item] = conn.connection_id
+            self._connection_items.setdefault(conn.connection_id, {})["shadow"] = shadow_item
         
         # Main connection line
         conn.canvas_item = self.create_line(
@@ -1746,13 +2228,15 @@ class VPBCanvas(tk.Canvas):
             smooth=smooth,
             splinesteps=splinesteps if smooth and splinesteps else None
         )
-        self._connection_points_cache[conn.connection_id] = pts
+        self._set_connection_points(conn.connection_id, pts)
         self._id_to_connection[conn.canvas_item] = conn.connection_id
+        self._connection_items.setdefault(conn.connection_id, {})["line"] = conn.canvas_item
         # Highlight bei Auswahl
         if getattr(self, 'selected_conn_id', None) == conn.connection_id:
             self.itemconfigure(conn.canvas_item, width=line_width + 2)
 
-    def _element_view_geometry(self, el: VPBElement) -> Tuple[int, int, int, int, str]:
+    def _element_view_size(self, el: VPBElement) -> Tuple[int, int, int, int, bool]:
+        """(cx, cy, w, h, is_group_rect) in View-Koordinaten, ohne Stil-Auflösung."""
         cx, cy = self.to_view(*el.center())
         if getattr(el, "element_type", "") == "GROUP":
             bounds = self._group_bounds_model(el)
@@ -1763,16 +2247,22 @@ class VPBCanvas(tk.Canvas):
                 cy = int((vy0 + vy1) / 2)
                 w = max(2, abs(vx1 - vx0))
                 h = max(2, abs(vy1 - vy0))
-                return cx, cy, w, h, "rect"
+                return cx, cy, w, h, True
         w = max(30, int(self.NODE_W * self.view_scale))
         h = max(20, int(self.NODE_H * self.view_scale))
+        return cx, cy, w, h, False
+
+    def _element_view_geometry(self, el: VPBElement) -> Tuple[int, int, int, int, str]:
+        cx, cy, w, h, is_group_rect = self._element_view_size(el)
+        if is_group_rect:
+            return cx, cy, w, h, "rect"
         style = self._resolve_element_style(getattr(el, "element_type", ""), el)
         shape = (style.get("shape") or "rect").lower()
         return cx, cy, w, h, shape
 
     def _element_view_box(self, el: VPBElement) -> Tuple[int, int, int, int]:
         """Gibt (cx, cy, hw, hh) in View-Koordinaten zurück."""
-        cx, cy, w, h, _ = self._element_view_geometry(el)
+        cx, cy, w, h, _ = self._element_view_size(el)
         return cx, cy, w // 2, h // 2
 
     def _anchor_on_polygon(self, cx: int, cy: int, points: List[Tuple[int, int]], tx: int, ty: int) -> Tuple[int, int]:
@@ -2072,181 +2562,41 @@ class VPBCanvas(tk.Canvas):
         src: VPBElement,
         tgt: VPBElement,
     ) -> Optional[List[int]]:
-        try:
-            cache_key = (
-                sx,
-                sy,
-                tx,
-                ty,
-                int(round(self.view_scale * 100)),
-                len(self.elements),
-                len(self.connections),
-            )
-        except Exception:
-            cache_key = None
-        cache = getattr(conn, "_grid_route_cache", None)
-        if isinstance(cache, dict) and cache_key and cache.get("key") == cache_key:
-            cached_points = cache.get("points")
-            if isinstance(cached_points, list) and cached_points:
-                return [int(p) for p in cached_points]
-
         try:
             grid_step = int(max(24, min(120, self.NODE_W * max(self.view_scale, 0.6))))
         except Exception:
             grid_step = 60
         grid_step = max(24, min(grid_step, 140))
-        margin = grid_step * 2
-
-        xs = [sx, tx]
-        ys = [sy, ty]
-        try:
-            for el in self.elements.values():
-                cx, cy, hw, hh = self._element_view_box(el)
-                xs.extend([cx - hw - margin, cx + hw + margin])
-                ys.extend([cy - hh - margin, cy + hh + margin])
-        except Exception:
-            pass
-        min_x = int(math.floor(min(xs) / grid_step) * grid_step)
-        max_x = int(math.ceil(max(xs) / grid_step) * grid_step)
-        min_y = int(math.floor(min(ys) / grid_step) * grid_step)
-        max_y = int(math.ceil(max(ys) / grid_step) * grid_step)
-
-        width = int((max_x - min_x) / grid_step) + 1
-        height = int((max_y - min_y) / grid_step) + 1
-        if width <= 0 or height <= 0:
-            return None
-        if width * height > 60000:
-            return None
-
-        def _to_cell(x: int, y: int) -> Tuple[int, int]:
-            gx = int(math.floor((x - min_x) / grid_step))
-            gy = int(math.floor((y - min_y) / grid_step))
-            return gx, gy
-
-        def _clamp_cell(cell: Tuple[int, int]) -> Tuple[int, int]:
-            return (max(0, min(width - 1, cell[0])), max(0, min(height - 1, cell[1])))
-
-        start = _clamp_cell(_to_cell(sx, sy))
-        goal = _clamp_cell(_to_cell(tx, ty))
-        if start == goal:
-            return [sx, sy, tx, ty]
-
-        blocked = set()
-        penalty = set()
-
-        src_id = getattr(src, "element_id", None)
-        tgt_id = getattr(tgt, "element_id", None)
-
-        try:
-            for el in self.elements.values():
-                cx, cy, hw, hh = self._element_view_box(el)
-                pad_x = hw + grid_step // 2
-                pad_y = hh + grid_step // 2
-                if getattr(el, "element_id", None) in {src_id, tgt_id}:
-                    pad_x = max(0, pad_x - grid_step // 2)
-                    pad_y = max(0, pad_y - grid_step // 2)
-                ix0 = max(0, int(math.floor((cx - pad_x - min_x) / grid_step)))
-                ix1 = min(width - 1, int(math.ceil((cx + pad_x - min_x) / grid_step)))
-                iy0 = max(0, int(math.floor((cy - pad_y - min_y) / grid_step)))
-                iy1 = min(height - 1, int(math.ceil((cy + pad_y - min_y) / grid_step)))
-                for gx in range(ix0, ix1 + 1):
-                    for gy in range(iy0, iy1 + 1):
-                        blocked.add((gx, gy))
-        except Exception:
-            pass
 
-        clearance = max(6, grid_step // 2)
-        try:
-            for cid, pts in (getattr(self, "_connection_points_cache", {}) or {}).items():
-                if not pts or len(pts) < 4 or cid == getattr(conn, "connection_id", None):
-                    continue
-                for idx in range(0, len(pts) - 2, 2):
-                    x1, y1 = pts[idx], pts[idx + 1]
-                    x2, y2 = pts[idx + 2], pts[idx + 3]
-                    min_seg_x = min(x1, x2) - clearance
-                    max_seg_x = max(x1, x2) + clearance
-                    min_seg_y = min(y1, y2) - clearance
-                    max_seg_y = max(y1, y2) + clearance
-                    ix0 = max(0, int(math.floor((min_seg_x - min_x) / grid_step)))
-                    ix1 = min(width - 1, int(math.ceil((max_seg_x - min_x) / grid_step)))
-                    iy0 = max(0, int(math.floor((min_seg_y - min_y) / grid_step)))
-                    iy1 = min(height - 1, int(math.ceil((max_seg_y - min_y) / grid_step)))
-                    for gx in range(ix0, ix1 + 1):
-                        for gy in range(iy0, iy1 + 1):
-                            if (gx, gy) in blocked:
-                                continue
-                            penalty.add((gx, gy))
-        except Exception:
-            pass
-
-        blocked.discard(start)
-        blocked.discard(goal)
-
-        def _heuristic(cell: Tuple[int, int]) -> float:
-            return abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])
-
-        open_heap: List[Tuple[float, int, Tuple[int, int]]] = []
-        g_score = {start: 0.0}
-        came_from: Dict[Tuple[int, int], Tuple[int, int]] = {}
-        counter = 0
-        heapq.heappush(open_heap, (_heuristic(start), counter, start))
-
-        found = False
-        while open_heap:
-            _, _, current = heapq.heappop(open_heap)
-            if current == goal:
-                found = True
-                break
-            base_cost = g_score[current]
-            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-                nb = (current[0] + dx, current[1] + dy)
-                if not (0 <= nb[0] < width and 0 <= nb[1] < height):
-                    continue
-                if nb in blocked:
-                    continue
-                step_cost = 1.0
-                if nb in penalty:
-                    step_cost += 4.0
-                tentative = base_cost + step_cost
-                if tentative + 1e-6 < g_score.get(nb, float("inf")):
-                    came_from[nb] = current
-                    g_score[nb] = tentative
-                    counter += 1
-                    heapq.heappush(open_heap, (tentative + _heuristic(nb), counter, nb))
-
-        if not found:
-            return None
-
-        path_cells = [goal]
-        while path_cells[-1] != start:
-            prev = came_from.get(path_cells[-1])
-            if prev is None:
-                return None
-            path_cells.append(prev)
-        path_cells.reverse()
-
-        coords: List[int] = []
-        for gx, gy in path_cells:
-            px = int(min_x + gx * grid_step)
-            py = int(min_y + gy * grid_step)
-            coords.extend([px, py])
-        if len(coords) < 4:
+        router = self._router
+        if not router.built or router.grid_step != grid_step:
+            # Ein Gitter für alle Routen bis zum nächsten redraw_all (Moves pflegen es inkrementell)
+            boxes: List[Tuple[str, Tuple[int, int, int, int]]] = []
+            try:
+                for eid, el in self.elements.items():
+                    boxes.append((eid, self._element_view_box(el)))
+            except Exception:
+                pass
+            router.build(boxes, grid_step, self._connection_points_cache)
+
+        coords = router.route(
+            getattr(conn, "connection_id", None),
+            sx,
+            sy,
+            tx,
+            ty,
+            getattr(src, "element_id", None),
+            getattr(tgt, "element_id", None),
+        )
+        if not coords:
             return None
-        coords[0], coords[1] = sx, sy
-        coords[-2], coords[-1] = tx, ty
         simplified = self._simplify_polyline(coords)
         if simplified:
             simplified[0], simplified[1] = sx, sy
             simplified[-2], simplified[-1] = tx, ty
         else:
             simplified = coords
-        simplified = [int(p) for p in simplified]
-        if cache_key:
-            try:
-                conn._grid_route_cache = {"key": cache_key, "points": simplified}
-            except Exception:
-                pass
-        return simplified
+        return [int(p) for p in simplified]
 
     def _simplify_polyline(self, points: List[int]) -> List[int]:
         if not points:
@@ -2341,7 +2691,7 @@ class VPBCanvas(tk.Canvas):
     # ----- Auto-Layout (einfach) -----
     def auto_layout(self):
         """Ein einfaches automatisches Layout:
-        - Graph in Ebenen aufteilen (grobe Topologie via BFS ab Start-ähnlichen Knoten)
+        - Graph in topologische Ebenen aufteilen (ProcessGraph)
         - Elemente spaltenweise anordnen, Verbindungen minimieren
         - Gruppen: lassen Mitgliederpositionen mitlaufen; Gruppe selbst mittig der Mitglieder
         """
@@ -2351,39 +2701,8 @@ class VPBCanvas(tk.Canvas):
             self.push_undo()
         except Exception:
             pass
-        # 1) Graph-Kanten aus Verbindungen (nur existierende Elemente)
-        outgoing: Dict[str, List[str]] = {}
-        incoming_count: Dict[str, int] = {eid: 0 for eid in self.elements.keys()}
-        for conn in self.connections.values():
-            s, t = conn.source_element, conn.target_element
-            if s in self.elements and t in self.elements:
-                outgoing.setdefault(s, []).append(t)
-                incoming_count[t] = incoming_count.get(t, 0) + 1
-                incoming_count.setdefault(s, incoming_count.get(s, 0))
-        # 2) Startkandidaten: START_EVENT oder Knoten mit in-degree 0
-        starts = [eid for eid, el in self.elements.items() if el.element_type in ("START_EVENT", "EVENT")]
-        if not starts:
-            starts = [eid for eid, deg in incoming_count.items() if deg == 0]
-        if not starts:
-            starts = list(self.elements.keys())[:1]
-        # 3) BFS-Schichten
-        level: Dict[str, int] = {}
-        from collections import deque
-        dq = deque()
-        for s in starts:
-            level[s] = 0
-            dq.append(s)
-        while dq:
-            u = dq.popleft()
-            for v in outgoing.get(u, []) or []:
-                if v not in level:
-                    level[v] = level[u] + 1
-                    dq.append(v)
-        # Unbesuchte auf letzte Ebene setzen
-        maxlvl = max(level.values()) if level else 0
-        for eid in self.elements.keys():
-            if eid not in level:
-                level[eid] = maxlvl + 1
+        # 1-3) Ebenen aus der gemeinsamen Graph-Analyse (längster Pfad, Zyklen = eine Ebene)
+        level: Dict[str, int] = ProcessGraph(self.elements, self.connections.values()).layers
         # 4) Pro Ebene anordnen
         layers: Dict[int, List[str]] = {}
         for eid, lv in level.items():
@@ -2624,17 +2943,12 @@ class VPBCanvas(tk.Canvas):
         except Exception:
             mx, my = None, None
         if mx is not None and my is not None:
+            self._ensure_spatial_index()
             candidates: List[Tuple[float, str]] = []
-            for el in self.elements.values():
-                if getattr(el, 'element_type', '') != 'GROUP':
-                    continue
-                bounds = self._group_bounds_model(el)
-                if not bounds:
-                    continue
-                left, top, right, bottom = bounds
-                if left <= mx <= right and top <= my <= bottom:
-                    area = max((right - left) * (bottom - top), 1.0)
-                    candidates.append((area, el.element_id))
+            for gid in self._group_index.query_point(mx, my):
+                left, top, right, bottom = self._group_index.bounds(gid)
+                area = max((right - left) * (bottom - top), 1.0)
+                candidates.append((area, gid))
             if candidates:
                 candidates.sort(key=lambda item: item[0])
                 return candidates[0][1]
@@ -2646,7 +2960,23 @@ class VPBCanvas(tk.Canvas):
             conn_id = self._id_to_connection.get(cid)
             if conn_id:
                 return conn_id
-        return None
+        # Elemente haben Vorrang vor dem Fangradius der Linien
+        if any(cid in self._id_to_element for cid in ids):
+            return None
+        # Fallback: nächstgelegene gezeichnete Route innerhalb des Fangradius (Segment-Index)
+        mx, my = self.to_model(event.x, event.y)
+        radius = self.CONNECTION_HIT_TOLERANCE / max(self.view_scale, 1e-6)
+        self._ensure_segment_index()
+        best: Optional[Tuple[float, str]] = None
+        for conn_id, i in self._segment_index.query_rect(mx - radius, my - radius, mx + radius, my + radius):
+            if conn_id not in self._connection_items:
+                continue
+            pts = self._connection_points_cache[conn_id]
+            seg = self._route_segments_model(pts[2 * i:2 * i + 4])[0]
+            distance = self._point_segment_distance(mx, my, seg)
+            if distance <= radius and (best is None or distance < best[0]):
+                best = (distance, conn_id)
+        return best[1] if best else None
 
     def _on_press(self, event):
         # Hand-Tool (Space) aktiv? Dann keine Auswahl/Drag starten
@@ -2886,17 +3216,8 @@ class VPBCanvas(tk.Canvas):
         left, right = sorted([mx0, mx1])
         top, bottom = sorted([my0, my1])
         # Elemente, deren Bounding-Box den Bereich schneidet, selektieren
-        new_sel = set()
-        half_w = self.NODE_W / 2
-        half_h = self.NODE_H / 2
-        for eid, el in self.elements.items():
-            el_left = el.x - half_w
-            el_right = el.x + half_w
-            el_top = el.y - half_h
-            el_bottom = el.y + half_h
-            # Schnittmenge prüfen
-            if not (el_right < left or el_left > right or el_bottom < top or el_top > bottom):
-                new_sel.add(eid)
+        self._ensure_spatial_index()
+        new_sel = set(self._node_index.query_rect(left, top, right, bottom))
         # Falls eine Gruppe selektiert wird, ist es meist hilfreicher, nicht gleichzeitig alle Kinder zu selektieren
         groups = {eid for eid in new_sel if self.elements.get(eid) and self.elements[eid].element_type == "GROUP"}
         if groups:
@@ -2956,7 +3277,7 @@ class VPBCanvas(tk.Canvas):
                     ny = int(round(ny / g) * g)
                 el.x = int(nx)
                 el.y = int(ny)
-            self.redraw_all()
+            self.refresh_moved_elements(self._drag_multi.keys())
             return
         el_id, dx, dy = self._drag_state
         el = self.elements.get(el_id)
@@ -2986,7 +3307,7 @@ class VPBCanvas(tk.Canvas):
             ny = int(round(ny / g) * g)
         el.x = int(nx)
         el.y = int(ny)
-        self.redraw_all()
+        self.refresh_moved_elements((el_id,))
 
     def _on_release(self, event):
         # Hand-Tool aktiv? Auswahl-Drag ignorieren (Pan endet in _on_left_pan_release)
@@ -2998,6 +3319,14 @@ class VPBCanvas(tk.Canvas):
         self._drag_state = None
         self._drag_multi = None
         self._clear_guides()
+        self._settle_after_drag()
+        # Drag als eigenen Undo-Schritt abschließen (ermöglicht Zusammenfassen
+        # aufeinanderfolgender Verschiebungen derselben Auswahl)
+        if self._history_open:
+            try:
+                self._seal_history_step()
+            except Exception:
+                pass
 
     def _on_double_click(self, event):
         el_id = self._hit_test(event)
@@ -3357,62 +3686,15 @@ class VPBCanvas(tk.Canvas):
         if not el:
             return nx, ny, None, None
         threshold = getattr(self, '_align_threshold', 8)
-        w = self.NODE_W
-        h = self.NODE_H
-        best_v = (None, threshold + 1)  # (x, dist)
-        best_h = (None, threshold + 1)  # (y, dist)
-
-        def edges_for(xc: float, yc: float) -> Tuple[float, float, float, float, float, float]:
-            left = xc - w / 2
-            right = xc + w / 2
-            top = yc - h / 2
-            bottom = yc + h / 2
-            return left, right, top, bottom, xc, yc
-
-        l, r, t, b, cx, cy = edges_for(nx, ny)
-        for oid, other in self.elements.items():
-            if oid == moving_id:
-                continue
-            ol, or_, ot, ob, ocx, ocy = edges_for(other.x, other.y)
-            # Vertikal ausrichten (X)
-            candidates_v = [
-                (l, ol), (l, or_), (r, ol), (r, or_), (cx, ocx)
-            ]
-            for a, b2 in candidates_v:
-                d = abs(a - b2)
-                if d <= best_v[1]:
-                    best_v = (b2 if a in (l, cx) else (b2 + w / 2 if a == r else b2), d)
-                    # Korrektur:
-                    if a == l:
-                        nx = b2 + w / 2
-                    elif a == r:
-                        nx = b2 - w / 2
-                    elif a == cx:
-                        nx = b2
-            # Horizontal ausrichten (Y)
-            candidates_h = [
-                (t, ot), (t, ob), (b, ot), (b, ob), (cy, ocy)
-            ]
-            for a, b2 in candidates_h:
-                d = abs(a - b2)
-                if d <= best_h[1]:
-                    best_h = (b2 if a in (t, cy) else (b2 + h / 2 if a == b else b2), d)
-                    if a == t:
-                        ny = b2 + h / 2
-                    elif a == b:
-                        ny = b2 - h / 2
-                    elif a == cy:
-                        ny = b2
-
-            # Update aktuelle Kanten nach eventueller Anpassung
-            l, r, t, b, cx, cy = edges_for(nx, ny)
-
-        vline_x = None
-        hline_y = None
-        if best_v[0] is not None and best_v[1] <= threshold:
-            vline_x = best_v[0]
-        if best_h[0] is not None and best_h[1] <= threshold:
-            hline_y = best_h[0]
+        # Vertikale (X) und horizontale (Y) Ausrichtung sind unabhängig; Kandidaten liefert der Index
+        self._ensure_spatial_index()
+        elements = self.elements
+        nx, vline_x = align_on_axis(
+            self._node_index, "x", moving_id, nx, self.NODE_W, threshold, lambda oid: elements[oid].x
+        )
+        ny, hline_y = align_on_axis(
+            self._node_index, "y", moving_id, ny, self.NODE_H, threshold, lambda oid: elements[oid].y
+        )
         return nx, ny, vline_x, hline_y
 
     def _draw_guides(self, vline_x: Optional[float], hline_y: Optional[float]):
@@ -3435,17 +3717,12 @@ class VPBCanvas(tk.Canvas):
             self._guide_items.append(gid)
 
     # ----- Verbindung: Label/Typ/Löschen -----
-    def _draw_connection_label(self, conn: VPBConnection):
-        """Zeichnet ein Label auf der Verbindung (Mermaid-inspired with background)."""
-        pts = self._connection_points_cache.get(conn.connection_id)
-        if pts is None:
-            resolved_endpoints = self._resolve_connection_render(conn)
-            if not resolved_endpoints:
-                return
-            src, tgt = resolved_endpoints
-            pts, _ = self._get_route_points(src, tgt, conn)
+    def _connection_label_layout(
+        self, conn: VPBConnection, pts: List[int]
+    ) -> Optional[Tuple[int, int, str, Tuple[float, float, float, float]]]:
+        """Position, Text und Hintergrund-Box eines Verbindungslabels (View-Koordinaten)."""
         if not pts:
-            return
+            return None
         # Label ungefähr in der Mitte platzieren
         if len(pts) >= 4:
             # nehme mittleres Segment
@@ -3456,27 +3733,47 @@ class VPBCanvas(tk.Canvas):
             mx, my = pts[0], pts[1]
         desc = (conn.description or "").strip()
         txt = desc if desc else (conn.connection_type or "SEQUENCE")
-        
-        # Create background rectangle for label (Mermaid-style)
-        font_size = 9
-        font = ("Segoe UI", font_size)
-        
+
         # Estimate text dimensions
+        font_size = 9
         text_width = len(txt) * font_size * 0.6
         text_height = font_size * 1.4
         padding = 4
-        
-        # Draw background
-        bg = self.create_rectangle(
+        bg_box = (
             mx - text_width/2 - padding, my - 10 - text_height/2 - padding,
             mx + text_width/2 + padding, my - 10 + text_height/2 + padding,
-            fill="#FFFFFF", outline="#CCCCCC", width=1
         )
+        return mx, my, txt, bg_box
+
+    def _draw_connection_label(self, conn: VPBConnection):
+        """Zeichnet ein Label auf der Verbindung (Mermaid-inspired with background)."""
+        if self._lod_active:
+            return
+        pts = self._connection_points_cache.get(conn.connection_id)
+        if pts is None:
+            resolved_endpoints = self._resolve_connection_render(conn)
+            if not resolved_endpoints:
+                return
+            src, tgt = resolved_endpoints
+            pts, _ = self._get_route_points(src, tgt, conn)
+        layout = self._connection_label_layout(conn, pts)
+        if not layout:
+            return
+        mx, my, txt, bg_box = layout
+        
+        # Create background rectangle for label (Mermaid-style)
+        font = ("Segoe UI", 9)
+        
+        # Draw background
+        bg = self.create_rectangle(*bg_box, fill="#FFFFFF", outline="#CCCCCC", width=1)
         self._id_to_connection[bg] = conn.connection_id
         
         # Draw label text
         label = self.create_text(mx, my - 10, text=txt, fill="#222", font=font)
         self._id_to_connection[label] = conn.connection_id
+        items = self._connection_items.setdefault(conn.connection_id, {})
+        items["label_bg"] = bg
+        items["label"] = label
         
         # Ensure label is on top
         self.tag_raise(bg)
@@ -4358,40 +4655,90 @@ class VPBCanvas(tk.Canvas):
             pass
 
     # ----- Undo/Redo -----
-    def _snapshot(self) -> Dict:
-        return self.to_dict()
+    def _seal_history_step(self) -> None:
+        """Schließt den offenen Undo-Schritt ab.
 
-    def _load_snapshot(self, data: Dict):
-        # Lädt Zustand ohne Historienänderung
-        self.load_from_dict(data)
+        Das Delta zum Schattenzustand wird als Kommando abgelegt (nur wenn seit
+        push_undo() ein Schritt offen ist); Änderungen ohne Undo-Punkt werden
+        lediglich in den Schattenzustand übernommen.
+        """
+        shadow = self._history_shadow
+        if shadow is None:
+            return
+        command = diff_shadow(shadow, self)
+        if command is not None:
+            if self._history_open:
+                self._history.record(command)
+            shadow.update(self, command)
+        self._history_open = False
 
     def push_undo(self):
         try:
-            self._undo_stack.append(self._snapshot())
-            if len(self._undo_stack) > self._max_history:
-                self._undo_stack = self._undo_stack[-self._max_history:]
-            self._redo_stack.clear()
+            if self._history_shadow is None:
+                self._history_shadow = HistoryShadow(self)
+            else:
+                self._seal_history_step()
+            self._history_open = True
+        except Exception:
+            pass
+        self._notify_model_changed()
+
+    def _after_history_change(self, command) -> None:
+        """Zeichnet nach Undo/Redo nur das Nötige neu und gleicht den Schattenzustand ab."""
+        if self._history_shadow is not None:
+            self._history_shadow.update(self, command)
+        self._notify_model_changed()
+        moved = command.moved_ids()
+        if moved is not None:
+            self.refresh_moved_elements(moved)
+            self._settle_after_drag()
+            return
+        if command.touches_document():
+            try:
+                self._hierarchy_color_cache.clear()
+            except Exception:
+                self._hierarchy_color_cache = {}
+        # Auswahl auf noch vorhandene Objekte beschränken
+        if self.selected_id and self.selected_id not in self.elements:
+            self.selected_id = None
+        try:
+            self.selected_ids.intersection_update(self.elements.keys())
         except Exception:
             pass
+        if self.selected_conn_id and self.selected_conn_id not in self.connections:
+            self.selected_conn_id = None
+        self.redraw_all()
+        try:
+            self._notify_view_changed()
+        except Exception:
+            pass
+        self._notify_selection(self.elements.get(self.selected_id) if self.selected_id else None,
+                               self.connections.get(self.selected_conn_id) if self.selected_conn_id else None)
 
     def undo(self):
-        if not self._undo_stack:
+        try:
+            self._seal_history_step()
+        except Exception:
+            pass
+        command = self._history.pop_undo()
+        if command is None:
             self._status("Nichts zum Rückgängig machen")
             return
-        current = self._snapshot()
-        state = self._undo_stack.pop()
-        self._redo_stack.append(current)
-        self._load_snapshot(state)
+        command.revert(self)
+        self._after_history_change(command)
         self._status("Rückgängig")
 
     def redo(self):
-        if not self._redo_stack:
+        try:
+            self._seal_history_step()
+        except Exception:
+            pass
+        command = self._history.pop_redo()
+        if command is None:
             self._status("Nichts zum Wiederholen")
             return
-        current = self._snapshot()
-        state = self._redo_stack.pop()
-        self._undo_stack.append(current)
-        self._load_snapshot(state)
+        command.apply(self)
+        self._after_history_change(command)
         self._status("Wiederholen")
 
     # ----- Ansicht: Reset & Fit -----
@@ -4621,13 +4968,22 @@ class RulerCanvas(tk.Canvas):
 # -------- Hauptfenster --------
 
 class MiniMapCanvas(tk.Canvas):
-    """Zeigt eine Übersicht des gesamten Diagramms und den aktuellen Viewport."""
+    """Zeigt eine Übersicht des gesamten Diagramms und den aktuellen Viewport.
+
+    Die Übersicht (Elemente, Verbindungen) wird nur bei inhaltlichen Änderungen des
+    Ziel-Canvas neu aufgebaut (VPBCanvas.content_revision); bei Pan/Zoom werden nur
+    Viewport-Rechteck und Abschattung per coords() verschoben.
+    """
     def __init__(self, master: tk.Widget, **kw):
         height = kw.pop('height', 120)
         super().__init__(master, height=height, background="#fafafa", highlightthickness=0, **kw)
         self._target: Optional[VPBCanvas] = None
         self._dragging: bool = False
-        self.bind('<Configure>', lambda e: self.redraw())
+        self._mapping: Optional[Tuple[float, float, float, float, float, float, float]] = None
+        self._overview_signature: Optional[Tuple[Any, ...]] = None
+        self._viewport_items: List[int] = []
+        self.overview_builds: int = 0
+        self.bind('<Configure>', lambda e: self.redraw(force=True))
         self.bind('<ButtonPress-1>', self._on_press)
         self.bind('<B1-Motion>', self._on_drag)
         self.bind('<ButtonRelease-1>', self._on_release)
@@ -4640,7 +4996,7 @@ class MiniMapCanvas(tk.Canvas):
             canvas.add_view_changed_listener(_sync)
         else:
             canvas.on_view_changed = _sync
-        self.redraw()
+        self.redraw(force=True)
 
     def _compute_mapping(self) -> Optional[Tuple[float, float, float, float]]:
         if not self._target:
@@ -4652,10 +5008,33 @@ class MiniMapCanvas(tk.Canvas):
         h = max(1, int(self.winfo_height() or 0))
         return (min_x, min_y, max_x, max_y, w, h)
 
-    def redraw(self):
-        self.delete('all')
+    def redraw(self, force: bool = False):
         if not self._target:
+            self.delete('all')
+            self._mapping = None
+            self._overview_signature = None
             return
+        selected = set(getattr(self._target, "selected_ids", set()) or [])
+        if getattr(self._target, "selected_id", None):
+            selected.add(self._target.selected_id)
+        revision = self._target.content_revision() if hasattr(self._target, "content_revision") else None
+        signature = (
+            revision,
+            getattr(self._target, "_lod_active", False),
+            frozenset(selected),
+            int(self.winfo_width() or 0),
+            int(self.winfo_height() or 0),
+        )
+        if force or revision is None or signature != self._overview_signature:
+            self._render_overview(selected)
+            self._overview_signature = signature
+        self._update_viewport()
+
+    def _render_overview(self, selected: set) -> None:
+        self.delete('all')
+        self._viewport_items = []
+        self._mapping = None
+        self.overview_builds += 1
         mapping = self._compute_mapping()
         if not mapping:
             return
@@ -4667,6 +5046,7 @@ class MiniMapCanvas(tk.Canvas):
         s = min(sx, sy)
         offx = (w - bx * s) / 2
         offy = (h - by * s) / 2
+        self._mapping = (min_x, min_y, offx, offy, s, bx, by)
         content_vx0 = offx
         content_vy0 = offy
         content_vx1 = offx + bx * s
@@ -4676,7 +5056,7 @@ class MiniMapCanvas(tk.Canvas):
         def _map(x: float, y: float) -> Tuple[float, float]:
             return (offx + (x - min_x) * s, offy + (y - min_y) * s)
 
-        # Verbindungen zeichnen (falls Routing verfügbar)
+        # Verbindungen zeichnen (falls Routing verfügbar; Cache liegt in View-Koordinaten)
         cache = getattr(self._target, "_connection_points_cache", {}) or {}
         for conn in self._target.connections.values():
             pts = cache.get(getattr(conn, "connection_id", None))
@@ -4685,7 +5065,7 @@ class MiniMapCanvas(tk.Canvas):
                 try:
                     it = iter(pts)
                     for px, py in zip(it, it):
-                        vx, vy = _map(float(px), float(py))
+                        vx, vy = _map(*self._target.to_model(float(px), float(py)))
                         coords.extend([vx, vy])
                 except Exception:
                     coords = []
@@ -4702,10 +5082,6 @@ class MiniMapCanvas(tk.Canvas):
             if len(coords) >= 4:
                 self.create_line(*coords, fill="#9aa7c1", width=1, smooth=False)
 
-        selected = set(getattr(self._target, "selected_ids", set()) or [])
-        if getattr(self._target, "selected_id", None):
-            selected.add(self._target.selected_id)
-
         # Elemente als grobe Rechtecke
         node_w = getattr(self._target, "NODE_W", 150)
         node_h = getattr(self._target, "NODE_H", 60)
@@ -4724,10 +5100,26 @@ class MiniMapCanvas(tk.Canvas):
             if getattr(el, "element_type", "").upper() == "EVENT":
                 fill = "#92d36e"
             outline = "#405f9e"
-            rect = self.create_rectangle(vx - hw, vy - hh, vx + hw, vy + hh, fill=fill, outline=outline, width=1)
+            self.create_rectangle(vx - hw, vy - hh, vx + hw, vy + hh, fill=fill, outline=outline, width=1)
             if getattr(el, "element_id", None) in selected:
                 self.create_rectangle(vx - hw, vy - hh, vx + hw, vy + hh, outline="#ff8c00", width=2)
 
+        # Abschattung (oben, unten, links, rechts) und Viewport-Rahmen; Position setzt _update_viewport
+        shade_opts = {"fill": "#1f2a44", "stipple": "gray25", "outline": ""}
+        for _ in range(4):
+            try:
+                self._viewport_items.append(self.create_rectangle(0, 0, 0, 0, **shade_opts))
+            except Exception:
+                pass
+        self._viewport_items.append(self.create_rectangle(0, 0, 0, 0, outline="#2d7ff9", width=2))
+
+    def _update_viewport(self) -> None:
+        """Verschiebt Viewport-Rahmen und Abschattung auf den aktuellen Ausschnitt."""
+        if not self._target or not self._mapping or not self._viewport_items:
+            return
+        min_x, min_y, offx, offy, s, bx, by = self._mapping
+        content_vx0, content_vy0 = offx, offy
+        content_vx1, content_vy1 = offx + bx * s, offy + by * s
         x0_m, y0_m = self._target.get_view_origin_model()
         vw_m, vh_m = self._target.get_viewport_model_size()
         x1_m, y1_m = x0_m + vw_m, y0_m + vh_m
@@ -4735,26 +5127,21 @@ class MiniMapCanvas(tk.Canvas):
         vy0 = offy + (y0_m - min_y) * s
         vx1 = offx + (x1_m - min_x) * s
         vy1 = offy + (y1_m - min_y) * s
-        shade_opts = {"fill": "#1f2a44", "stipple": "gray25", "outline": ""}
-        try:
-            self.create_rectangle(content_vx0, content_vy0, content_vx1, vy0, **shade_opts)
-            self.create_rectangle(content_vx0, vy1, content_vx1, content_vy1, **shade_opts)
-            self.create_rectangle(content_vx0, vy0, vx0, vy1, **shade_opts)
-            self.create_rectangle(vx1, vy0, content_vx1, vy1, **shade_opts)
-        except Exception:
-            pass
-        self.create_rectangle(vx0, vy0, vx1, vy1, outline="#2d7ff9", width=2)
+        boxes = [
+            (content_vx0, content_vy0, content_vx1, vy0),
+            (content_vx0, vy1, content_vx1, content_vy1),
+            (content_vx0, vy0, vx0, vy1),
+            (vx1, vy0, content_vx1, vy1),
+        ][: len(self._viewport_items) - 1]
+        boxes.append((vx0, vy0, vx1, vy1))
+        for item, box in zip(self._viewport_items, boxes):
+            self.coords(item, *box)
+            self.tag_raise(item)
 
     def _to_model_from_minimap(self, vx: float, vy: float) -> Optional[Tuple[float, float]]:
-        mapping = self._compute_mapping()
-        if not mapping:
+        if not self._mapping:
             return None
-        min_x, min_y, max_x, max_y, w, h = mapping
-        bx = max_x - min_x
-        by = max_y - min_y
-        s = min(w / bx, h / by)
-        offx = (w - bx * s) / 2
-        offy = (h - by * s) / 2
+        min_x, min_y, offx, offy, s, _bx, _by = self._mapping
         mx = (vx - offx) / s + min_x
         my = (vy - offy) / s + min_y
         return (mx, my)
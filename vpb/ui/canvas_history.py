@@ -0,0 +1,494 @@
+"""
+Delta-basierte Undo/Redo-Historie für VPBCanvas.
+
+Statt bei jedem Undo-Punkt den kompletten Prozess per to_dict() zu sichern,
+werden nur die Änderungen als Kommandos abgelegt:
+
+- AddItemsCommand / RemoveItemsCommand: Elemente/Verbindungen (inkl. Zustand)
+- MoveBatchCommand: {element_id: (alt_x, alt_y, neu_x, neu_y)}
+- PatchPropertiesCommand: nur die geänderten Attribute (vorher/nachher)
+- CompoundCommand: mehrere Kommandos als ein Undo-Schritt
+
+apply()/revert() arbeiten in O(geänderte Objekte). Die Historie ist über ein
+Speicherbudget (geschätzte Bytes) statt über eine feste Schrittzahl begrenzt;
+aufeinanderfolgende Verschiebungen derselben Auswahl werden zusammengefasst.
+
+Bestehende Aufrufer nutzen weiterhin canvas.push_undo(): Der Canvas hält einen
+Schattenzustand (HistoryShadow) und berechnet beim Abschluss eines Schritts mit
+diff_shadow() das Delta-Kommando.
+"""
+
+from __future__ import annotations
+
+import copy
+import itertools
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Zustand auf Canvas-/Dokumentebene, der zusätzlich zu Elementen/Verbindungen
+# in die Historie eingeht
+DOCUMENT_ATTRS: Tuple[str, ...] = ("metadata", "hierarchy_categories")
+
+# Transiente Render-Attribute (Canvas-Item-IDs) gehören nicht zum Zustand
+TRANSIENT_ATTRS = frozenset({"canvas_items", "canvas_item"})
+
+_IMMUTABLE = (str, int, float, bool, type(None))
+_MISSING = object()
+
+
+def _copy_value(value: Any) -> Any:
+    if isinstance(value, _IMMUTABLE):
+        return value
+    return copy.deepcopy(value)
+
+
+def _public_items(obj: Any) -> Iterable[Tuple[str, Any]]:
+    """Öffentliche Attribute eines Objekts (private Caches wie _resolved_style ausgenommen).
+
+    Modellobjekte mit __slots__ liefern ihre Felder über state_items();
+    ad-hoc gesetzte Attribute liegen zusätzlich in __dict__.
+    """
+    fields = obj.state_items() if hasattr(obj, "state_items") else ()
+    extra = getattr(obj, "__dict__", {}).items()
+    return (
+        (k, v) for k, v in itertools.chain(fields, extra)
+        if not k.startswith("_") and k not in TRANSIENT_ATTRS
+    )
+
+
+def capture_state(obj: Any) -> Dict[str, Any]:
+    """Kopie aller öffentlichen Attribute eines Elements/einer Verbindung."""
+    return {k: _copy_value(v) for k, v in _public_items(obj)}
+
+
+def restore_state(obj: Any, state: Dict[str, Any]) -> None:
+    """Setzt die öffentlichen Attribute eines Objekts exakt auf state."""
+    for key in [k for k, _ in _public_items(obj) if k not in state]:
+        try:
+            delattr(obj, key)
+        except AttributeError:
+            pass
+    for key, value in state.items():
+        setattr(obj, key, _copy_value(value))
+
+
+def _state_differs(obj: Any, state: Dict[str, Any]) -> bool:
+    count = 0
+    get = state.get
+    for key, value in _public_items(obj):
+        count += 1
+        if get(key, _MISSING) != value:
+            return True
+    return count != len(state)
+
+
+def _state_patch(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    patch: Dict[str, Tuple[Any, Any]] = {}
+    for key in before.keys() | after.keys():
+        old = before.get(key, _MISSING)
+        new = after.get(key, _MISSING)
+        if old != new:
+            patch[key] = (old, new)
+    return patch
+
+
+def _estimate_size(value: Any) -> int:
+    """Grobe Größenschätzung in Bytes (für das Speicherbudget)."""
+    try:
+        return 64 + len(repr(value))
+    except Exception:
+        return 256
+
+
+def _set_or_delete(obj: Any, key: str, value: Any) -> None:
+    if value is _MISSING:
+        try:
+            delattr(obj, key)
+        except AttributeError:
+            pass
+    else:
+        setattr(obj, key, _copy_value(value))
+
+
+# ============================================================================
+# Kommandos
+# ============================================================================
+
+class HistoryCommand:
+    """Basisklasse: ein umkehrbarer Undo-Schritt."""
+
+    label = ""
+
+    def apply(self, target: Any) -> None:
+        raise NotImplementedError
+
+    def revert(self, target: Any) -> None:
+        raise NotImplementedError
+
+    def size_bytes(self) -> int:
+        raise NotImplementedError
+
+    def moved_ids(self) -> Optional[List[str]]:
+        """IDs bei reinen Verschiebungen, sonst None (dann voller Redraw)."""
+        return None
+
+    def affected_ids(self) -> Dict[str, List[str]]:
+        """Betroffene IDs: {'elements': [...], 'connections': [...]} (für den Schattenzustand)."""
+        return {"elements": [], "connections": []}
+
+    def touches_document(self) -> bool:
+        return False
+
+
+class AddItemsCommand(HistoryCommand):
+    """Elemente/Verbindungen hinzufügen (revert entfernt sie wieder)."""
+
+    label = "Hinzufügen"
+
+    def __init__(self, elements: Dict[str, Tuple[Any, Dict[str, Any]]],
+                 connections: Dict[str, Tuple[Any, Dict[str, Any]]]):
+        # id -> (Objekt, Zustand)
+        self.elements = elements
+        self.connections = connections
+
+    def _insert(self, target: Any) -> None:
+        for eid, (obj, state) in self.elements.items():
+            restore_state(obj, state)
+            target.elements[eid] = obj
+        for cid, (obj, state) in self.connections.items():
+            restore_state(obj, state)
+            target.connections[cid] = obj
+
+    def _remove(self, target: Any) -> None:
+        for cid in self.connections:
+            target.connections.pop(cid, None)
+        for eid in self.elements:
+            target.elements.pop(eid, None)
+
+    def apply(self, target: Any) -> None:
+        self._insert(target)
+
+    def revert(self, target: Any) -> None:
+        self._remove(target)
+
+    def size_bytes(self) -> int:
+        return sum(_estimate_size(state) for _, state in self.elements.values()) + \
+            sum(_estimate_size(state) for _, state in self.connections.values())
+
+    def affected_ids(self) -> Dict[str, List[str]]:
+        return {"elements": list(self.elements), "connections": list(self.connections)}
+
+
+class RemoveItemsCommand(AddItemsCommand):
+    """Elemente/Verbindungen entfernen (revert fügt sie mit altem Zustand wieder ein)."""
+
+    label = "Entfernen"
+
+    def apply(self, target: Any) -> None:
+        self._remove(target)
+
+    def revert(self, target: Any) -> None:
+        self._insert(target)
+
+
+class MoveBatchCommand(HistoryCommand):
+    """Verschiebung mehrerer Elemente."""
+
+    label = "Verschieben"
+
+    def __init__(self, moves: Dict[str, Tuple[Any, Any, Any, Any]]):
+        # element_id -> (alt_x, alt_y, neu_x, neu_y)
+        self.moves = moves
+
+    def _set(self, target: Any, new: bool) -> None:
+        for eid, (ox, oy, nx, ny) in self.moves.items():
+            el = target.elements.get(eid)
+            if el is None:
+                continue
+            el.x, el.y = (nx, ny) if new else (ox, oy)
+
+    def apply(self, target: Any) -> None:
+        self._set(target, True)
+
+    def revert(self, target: Any) -> None:
+        self._set(target, False)
+
+    def can_merge(self, other: HistoryCommand) -> bool:
+        return isinstance(other, MoveBatchCommand) and other.moves.keys() == self.moves.keys()
+
+    def merge(self, other: MoveBatchCommand) -> None:
+        """Übernimmt die Zielpositionen einer direkt folgenden Verschiebung."""
+        for eid, (_, _, nx, ny) in other.moves.items():
+            ox, oy, _, _ = self.moves[eid]
+            self.moves[eid] = (ox, oy, nx, ny)
+
+    def size_bytes(self) -> int:
+        return 64 + 96 * len(self.moves)
+
+    def moved_ids(self) -> Optional[List[str]]:
+        return list(self.moves)
+
+    def affected_ids(self) -> Dict[str, List[str]]:
+        return {"elements": list(self.moves), "connections": []}
+
+
+class PatchPropertiesCommand(HistoryCommand):
+    """Geänderte Attribute von Elementen, Verbindungen oder Dokument (vorher/nachher)."""
+
+    label = "Eigenschaften"
+
+    def __init__(self, kind: str, patches: Dict[Optional[str], Dict[str, Tuple[Any, Any]]]):
+        # kind: 'elements' | 'connections' | 'document'; beim Dokument ist die ID None
+        self.kind = kind
+        self.patches = patches
+
+    def _objects(self, target: Any):
+        if self.kind == "document":
+            yield None, target, self.patches.get(None, {})
+            return
+        container = getattr(target, self.kind)
+        for oid, patch in self.patches.items():
+            obj = container.get(oid)
+            if obj is not None:
+                yield oid, obj, patch
+
+    def apply(self, target: Any) -> None:
+        for _, obj, patch in self._objects(target):
+            for key, (_, new) in patch.items():
+                _set_or_delete(obj, key, new)
+
+    def revert(self, target: Any) -> None:
+        for _, obj, patch in self._objects(target):
+            for key, (old, _) in patch.items():
+                _set_or_delete(obj, key, old)
+
+    def size_bytes(self) -> int:
+        return sum(
+            64 + sum(_estimate_size(old) + _estimate_size(new) for old, new in patch.values())
+            for patch in self.patches.values()
+        )
+
+    def affected_ids(self) -> Dict[str, List[str]]:
+        ids: Dict[str, List[str]] = {"elements": [], "connections": []}
+        if self.kind != "document":
+            ids[self.kind] = [oid for oid in self.patches if oid is not None]
+        return ids
+
+    def touches_document(self) -> bool:
+        return self.kind == "document"
+
+
+class CompoundCommand(HistoryCommand):
+    """Mehrere Kommandos als ein Undo-Schritt."""
+
+    def __init__(self, commands: List[HistoryCommand], label: str = ""):
+        self.commands = commands
+        self.label = label or "+".join(c.label for c in commands)
+
+    def apply(self, target: Any) -> None:
+        for cmd in self.commands:
+            cmd.apply(target)
+
+    def revert(self, target: Any) -> None:
+        for cmd in reversed(self.commands):
+            cmd.revert(target)
+
+    def size_bytes(self) -> int:
+        return sum(cmd.size_bytes() for cmd in self.commands)
+
+    def moved_ids(self) -> Optional[List[str]]:
+        ids: List[str] = []
+        for cmd in self.commands:
+            moved = cmd.moved_ids()
+            if moved is None:
+                return None
+            ids.extend(moved)
+        return ids
+
+    def affected_ids(self) -> Dict[str, List[str]]:
+        ids: Dict[str, List[str]] = {"elements": [], "connections": []}
+        for cmd in self.commands:
+            for kind, values in cmd.affected_ids().items():
+                ids[kind].extend(values)
+        return ids
+
+    def touches_document(self) -> bool:
+        return any(cmd.touches_document() for cmd in self.commands)
+
+
+# ============================================================================
+# Schattenzustand + Diff
+# ============================================================================
+
+class HistoryShadow:
+    """Zustand zum Zeitpunkt des letzten Undo-Punkts (Referenz für diff_shadow)."""
+
+    def __init__(self, target: Any):
+        self.elements: Dict[str, Tuple[Any, Dict[str, Any]]] = {
+            eid: (el, capture_state(el)) for eid, el in target.elements.items()
+        }
+        self.connections: Dict[str, Tuple[Any, Dict[str, Any]]] = {
+            cid: (conn, capture_state(conn)) for cid, conn in target.connections.items()
+        }
+        self.document: Dict[str, Any] = self._document_state(target)
+
+    @staticmethod
+    def _document_state(target: Any) -> Dict[str, Any]:
+        return {name: _copy_value(getattr(target, name, None)) for name in DOCUMENT_ATTRS}
+
+    def update(self, target: Any, command: HistoryCommand) -> None:
+        """Übernimmt den aktuellen Zustand der vom Kommando betroffenen Objekte."""
+        for kind, ids in command.affected_ids().items():
+            shadow = getattr(self, kind)
+            container = getattr(target, kind)
+            for oid in ids:
+                obj = container.get(oid)
+                if obj is None:
+                    shadow.pop(oid, None)
+                else:
+                    shadow[oid] = (obj, capture_state(obj))
+        if command.touches_document():
+            self.document = self._document_state(target)
+
+
+def diff_shadow(shadow: HistoryShadow, target: Any) -> Optional[HistoryCommand]:
+    """
+    Vergleicht den aktuellen Zustand mit dem Schattenzustand.
+
+    Der Vergleich ist O(n), gespeichert werden nur die Änderungen.
+    Gibt None zurück, wenn sich nichts geändert hat.
+    """
+    commands: List[HistoryCommand] = []
+    for kind in ("elements", "connections"):
+        before = getattr(shadow, kind)
+        current = getattr(target, kind)
+        removed = {oid: entry for oid, entry in before.items() if oid not in current}
+        added = {oid: (obj, capture_state(obj)) for oid, obj in current.items() if oid not in before}
+        moves: Dict[str, Tuple[Any, Any, Any, Any]] = {}
+        patches: Dict[Optional[str], Dict[str, Tuple[Any, Any]]] = {}
+        for oid, obj in current.items():
+            entry = before.get(oid)
+            if entry is None or not _state_differs(obj, entry[1]):
+                continue
+            patch = _state_patch(entry[1], capture_state(obj))
+            if kind == "elements" and patch.keys() <= {"x", "y"}:
+                moves[oid] = (entry[1].get("x"), entry[1].get("y"), obj.x, obj.y)
+            else:
+                patches[oid] = patch
+        if removed:
+            commands.append(RemoveItemsCommand(removed, {}) if kind == "elements" else RemoveItemsCommand({}, removed))
+        if added:
+            commands.append(AddItemsCommand(added, {}) if kind == "elements" else AddItemsCommand({}, added))
+        if moves:
+            commands.append(MoveBatchCommand(moves))
+        if patches:
+            commands.append(PatchPropertiesCommand(kind, patches))
+
+    document = HistoryShadow._document_state(target)
+    doc_patch = _state_patch(shadow.document, document)
+    if doc_patch:
+        commands.append(PatchPropertiesCommand("document", {None: doc_patch}))
+
+    if not commands:
+        return None
+    if len(commands) == 1:
+        return commands[0]
+    return CompoundCommand(commands)
+
+
+# ============================================================================
+# Historie
+# ============================================================================
+
+class CanvasHistory:
+    """
+    Undo-/Redo-Stapel mit Speicherbudget.
+
+    Args:
+        budget_bytes: Obergrenze der geschätzten Größe aller Einträge; die
+            ältesten Undo-Schritte werden verworfen (der jüngste bleibt immer).
+        coalesce_window_s: Verschiebungen derselben Auswahl innerhalb dieses
+            Zeitfensters werden zu einem Schritt zusammengefasst.
+    """
+
+    def __init__(self, budget_bytes: int = 32 * 1024 * 1024, coalesce_window_s: float = 1.0):
+        self.budget_bytes = budget_bytes
+        self.coalesce_window_s = coalesce_window_s
+        self._undo: List[Tuple[HistoryCommand, int]] = []
+        self._redo: List[Tuple[HistoryCommand, int]] = []
+        self._bytes = 0
+        self._last_record: Optional[float] = None
+
+    # ----- Abfragen -----
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @property
+    def undo_depth(self) -> int:
+        return len(self._undo)
+
+    @property
+    def redo_depth(self) -> int:
+        return len(self._redo)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    # ----- Änderungen -----
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+        self._last_record = None
+
+    def record(self, command: HistoryCommand, now: Optional[float] = None) -> None:
+        """Legt einen neuen Schritt ab (verwirft Redo-Einträge)."""
+        now = time.monotonic() if now is None else now
+        for _, size in self._redo:
+            self._bytes -= size
+        self._redo.clear()
+
+        top = self._undo[-1][0] if self._undo else None
+        if (isinstance(top, MoveBatchCommand) and top.can_merge(command)
+                and self._last_record is not None
+                and now - self._last_record <= self.coalesce_window_s):
+            top.merge(command)
+        else:
+            size = command.size_bytes()
+            self._undo.append((command, size))
+            self._bytes += size
+            self._trim()
+        self._last_record = now
+
+    def pop_undo(self) -> Optional[HistoryCommand]:
+        if not self._undo:
+            return None
+        entry = self._undo.pop()
+        self._redo.append(entry)
+        self._last_record = None
+        return entry[0]
+
+    def pop_redo(self) -> Optional[HistoryCommand]:
+        if not self._redo:
+            return None
+        entry = self._redo.pop()
+        self._undo.append(entry)
+        self._last_record = None
+        return entry[0]
+
+    def _trim(self) -> None:
+        while self._bytes > self.budget_bytes and len(self._undo) > 1:
+            _, size = self._undo.pop(0)
+            self._bytes -= size
+
+
+__all__ = [
+    'CanvasHistory', 'HistoryShadow', 'diff_shadow', 'capture_state', 'restore_state',
+    'HistoryCommand', 'AddItemsCommand', 'RemoveItemsCommand', 'MoveBatchCommand',
+    'PatchPropertiesCommand', 'CompoundCommand', 'DOCUMENT_ATTRS',
+]
@@ -0,0 +1,434 @@
+"""
+Gemeinsames Hindernis-Gitter und A*-Routing für smart-plus-Verbindungen.
+
+Statt für jede Verbindung blockierte Zellen (Element-Boxen) und Strafzellen
+(bereits gezeichnete Verbindungen) neu zu sammeln, hält GridRouter ein Gitter
+pro Neuzeichnen:
+
+- Zähler-Arrays (array('I'), zeilenweise) für Blockierung und Strafe
+- inkrementelle Pflege bei verschobenen Elementen und geänderten Polylinien
+- Routen-Cache je Verbindung: eine Route bleibt gültig, solange Endpunkte,
+  Quell-/Ziel-Box und alle von A* betrachteten Zellen (Korridor) unverändert
+  sind; Änderungen außerhalb des Korridors lösen kein Neu-Routing aus
+
+Zellen, Kosten und Tie-Breaks entsprechen dem bisherigen Einzel-Routing von
+VPBCanvas._route_polyline_grid; die Routen sind identisch.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+ViewBox = Tuple[int, int, int, int]  # (cx, cy, hw, hh) in View-Koordinaten
+Window = Tuple[int, int, int, int]  # (min_x, min_y, width, height)
+
+MAX_CELLS = 60000
+PENALTY_COST = 4.0
+
+
+class _RouteEntry:
+    __slots__ = ("key", "size", "corridor", "digest", "points")
+
+    def __init__(self, key, size, corridor, digest, points):
+        self.key = key
+        self.size = size
+        self.corridor = corridor
+        self.digest = digest
+        self.points = points
+
+    def fits(self, width: int, height: int) -> bool:
+        """Gitter-Breite/-Höhe sind egal, solange der Korridor den Rand nicht berührt hat"""
+        if self.size == (width, height):
+            return True
+        _, _, gx1, gy1 = self.corridor
+        return gx1 < min(self.size[0], width) - 1 and gy1 < min(self.size[1], height) - 1
+
+
+class GridRouter:
+    """Hindernis-Gitter über alle Elemente und gezeichneten Verbindungen eines Canvas.
+
+    Ablauf: reset() beim Neuzeichnen, build() vor der ersten Route, danach
+    update_element()/set_polyline() für Änderungen und route() je Verbindung.
+    """
+
+    def __init__(self):
+        self.grid_step = 0
+        self.stats = {"routed": 0, "reused": 0}
+        self._boxes: Dict[str, ViewBox] = {}
+        self._polylines: Dict[str, Tuple[int, ...]] = {}
+        self._routes: Dict[str, _RouteEntry] = {}
+        self._built = False
+        self._raw: Optional[Tuple[int, int, int, int]] = None
+        self._window: Window = (0, 0, 0, 0)
+        self._blocked = array("I")
+        self._penalty = array("I")
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    # ----- Aufbau -----
+    def reset(self) -> None:
+        """Verwirft das Gitter und die Polylinien (Routen-Cache bleibt erhalten)"""
+        self._built = False
+        self._boxes = {}
+        self._polylines = {}
+        self._blocked = array("I")
+        self._penalty = array("I")
+
+    def build(
+        self,
+        boxes: Iterable[Tuple[str, ViewBox]],
+        grid_step: int,
+        polylines: Optional[Mapping[str, Sequence[int]]] = None,
+        extra_points: Sequence[int] = (),
+    ) -> None:
+        """Baut das Gitter aus Element-Boxen und bereits gezeichneten Polylinien auf"""
+        self.grid_step = int(grid_step)
+        self._boxes = dict(boxes)
+        self._polylines = {}
+        for cid, pts in (polylines or {}).items():
+            if pts and len(pts) >= 4:
+                self._polylines[cid] = tuple(pts)
+        self._raw = _merge_raw(self._raw_extent(), extra_points)
+        self._layout()
+        self._built = True
+
+    def retain_routes(self, connection_ids: Iterable[str]) -> None:
+        """Entfernt Cache-Einträge gelöschter Verbindungen"""
+        keep = set(connection_ids)
+        for cid in [cid for cid in self._routes if cid not in keep]:
+            del self._routes[cid]
+
+    # ----- Inkrementelle Pflege -----
+    def update_element(self, element_id: str, box: Optional[ViewBox]) -> None:
+        """Setzt die View-Box eines Elements (None = entfernen)"""
+        if not self._built:
+            return
+        old = self._boxes.get(element_id)
+        if old == box:
+            return
+        if box is None:
+            del self._boxes[element_id]
+        else:
+            self._boxes[element_id] = box
+        raw = self._raw
+        if box is not None and raw is not None:
+            bx0, by0, bx1, by1 = self._box_raw(box)
+            grows = bx0 < raw[0] or by0 < raw[1] or bx1 > raw[2] or by1 > raw[3]
+        else:
+            grows = raw is None
+        if old is not None and raw is not None:
+            ox0, oy0, ox1, oy1 = self._box_raw(old)
+            shrinks = ox0 == raw[0] or oy0 == raw[1] or ox1 == raw[2] or oy1 == raw[3]
+        else:
+            shrinks = False
+        if grows or shrinks:
+            self._raw = self._raw_extent()
+            if self._window_for(self._raw) != self._window:
+                self._layout()
+                return
+        if old is not None:
+            self._mark_box(old, -1)
+        if box is not None:
+            self._mark_box(box, 1)
+
+    def set_polyline(self, connection_id: str, pts: Optional[Sequence[int]]) -> None:
+        """Setzt die gezeichnete Polylinie einer Verbindung (None = entfernen)"""
+        old = self._polylines.pop(connection_id, None)
+        new = tuple(pts) if pts and len(pts) >= 4 else None
+        if new is not None:
+            self._polylines[connection_id] = new
+        if not self._built or old == new:
+            return
+        if old is not None:
+            self._mark_polyline(old, -1)
+        if new is not None:
+            self._mark_polyline(new, 1)
+
+    # ----- Routing -----
+    def route(
+        self,
+        connection_id: Optional[str],
+        sx: int,
+        sy: int,
+        tx: int,
+        ty: int,
+        src_id: Optional[str],
+        tgt_id: Optional[str],
+    ) -> Optional[List[int]]:
+        """A*-Route von (sx, sy) nach (tx, ty) als Punktliste über Zellmittelpunkte.
+
+        Gibt None zurück, wenn das Gitter zu groß ist oder kein Weg existiert.
+        Liegen die Endpunkte außerhalb des Gitters, wird ein eigenes, um die
+        Endpunkte erweitertes Gitter verwendet (ohne Cache).
+        """
+        window = self._window_for(_merge_raw(self._raw, (sx, sy, tx, ty)))
+        if window != self._window:
+            detached = GridRouter()
+            detached.build(self._boxes.items(), self.grid_step, self._polylines, (sx, sy, tx, ty))
+            return detached.route(None, sx, sy, tx, ty, src_id, tgt_id)
+        min_x, min_y, width, height = window
+        if width <= 0 or height <= 0 or width * height > MAX_CELLS:
+            return None
+        start = self._cell(sx, sy)
+        goal = self._cell(tx, ty)
+        if start == goal:
+            return [sx, sy, tx, ty]
+
+        own = self._polylines.get(connection_id) if connection_id is not None else None
+        key = (
+            sx, sy, tx, ty, min_x, min_y, self.grid_step, src_id, tgt_id,
+            self._boxes.get(src_id), self._boxes.get(tgt_id), own,
+        )
+        entry = self._routes.get(connection_id) if connection_id is not None else None
+        if (
+            entry is not None
+            and entry.key == key
+            and entry.fits(width, height)
+            and self._digest(entry.corridor) == entry.digest
+        ):
+            self.stats["reused"] += 1
+            return list(entry.points) if entry.points is not None else None
+
+        points, corridor = self._search(start, goal, sx, sy, tx, ty, src_id, tgt_id, own)
+        self.stats["routed"] += 1
+        if connection_id is not None:
+            self._routes[connection_id] = _RouteEntry(key, (width, height), corridor, self._digest(corridor), points)
+        return list(points) if points is not None else None
+
+    def _search(self, start, goal, sx, sy, tx, ty, src_id, tgt_id, own):
+        min_x, min_y, width, height = self._window
+        step = self.grid_step
+        blocked = self._blocked
+        penalty = self._penalty
+
+        # Quell-/Zielelement mit verkleinertem Polster: Zellen, die nur das volle Polster belegt
+        relief: Dict[int, int] = {}
+        for eid in {src_id, tgt_id}:
+            box = self._boxes.get(eid) if eid is not None else None
+            if box is None:
+                continue
+            inner = self._box_range(box, reduced=True)
+            for cell in self._range_cells(self._box_range(box)):
+                if not _in_range(cell, width, inner):
+                    relief[cell] = relief.get(cell, 0) - 1
+        own_cells = self._polyline_counts(own) if own else {}
+
+        def is_blocked(cell: int) -> bool:
+            count = blocked[cell]
+            if count and relief:
+                count += relief.get(cell, 0)
+            return count > 0
+
+        start_flat = start[1] * width + start[0]
+        goal_flat = goal[1] * width + goal[0]
+        # Start/Ziel sind nie blockiert; blockierte Ziele tragen keine Strafe
+        goal_unpenalized = is_blocked(goal_flat)
+        gx_goal, gy_goal = goal
+
+        g_score = {start_flat: 0.0}
+        came_from: Dict[int, int] = {}
+        counter = 0
+        open_heap: List[Tuple[float, int, int]] = []
+        heapq.heappush(open_heap, (abs(start[0] - gx_goal) + abs(start[1] - gy_goal), counter, start_flat))
+        cx0 = cx1 = start[0]
+        cy0 = cy1 = start[1]
+        cx0, cx1 = min(cx0, gx_goal), max(cx1, gx_goal)
+        cy0, cy1 = min(cy0, gy_goal), max(cy1, gy_goal)
+        inf = float("inf")
+        found = False
+        while open_heap:
+            _, _, current = heapq.heappop(open_heap)
+            if current == goal_flat:
+                found = True
+                break
+            base_cost = g_score[current]
+            cy, cx = divmod(current, width)
+            for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                if nx < cx0:
+                    cx0 = nx
+                elif nx > cx1:
+                    cx1 = nx
+                if ny < cy0:
+                    cy0 = ny
+                elif ny > cy1:
+                    cy1 = ny
+                nb = ny * width + nx
+                if nb != goal_flat and nb != start_flat and is_blocked(nb):
+                    continue
+                step_cost = 1.0
+                pen = penalty[nb]
+                if pen and own_cells:
+                    pen -= own_cells.get(nb, 0)
+                if pen > 0 and not (nb == goal_flat and goal_unpenalized):
+                    step_cost += PENALTY_COST
+                tentative = base_cost + step_cost
+                if tentative + 1e-6 < g_score.get(nb, inf):
+                    came_from[nb] = current
+                    g_score[nb] = tentative
+                    counter += 1
+                    heapq.heappush(open_heap, (tentative + abs(nx - gx_goal) + abs(ny - gy_goal), counter, nb))
+        corridor = (cx0, cy0, cx1, cy1)
+        if not found:
+            return None, corridor
+
+        path = [goal_flat]
+        while path[-1] != start_flat:
+            prev = came_from.get(path[-1])
+            if prev is None:
+                return None, corridor
+            path.append(prev)
+        path.reverse()
+        coords: List[int] = []
+        for flat in path:
+            gy, gx = divmod(flat, width)
+            coords.extend([int(min_x + gx * step), int(min_y + gy * step)])
+        if len(coords) < 4:
+            return None, corridor
+        coords[0], coords[1] = sx, sy
+        coords[-2], coords[-1] = tx, ty
+        return coords, corridor
+
+    # ----- Gitter -----
+    def _box_raw(self, box: ViewBox) -> Tuple[int, int, int, int]:
+        cx, cy, hw, hh = box
+        margin = self.grid_step * 2
+        return (cx - hw - margin, cy - hh - margin, cx + hw + margin, cy + hh + margin)
+
+    def _raw_extent(self) -> Optional[Tuple[int, int, int, int]]:
+        raw = None
+        for box in self._boxes.values():
+            bx0, by0, bx1, by1 = self._box_raw(box)
+            if raw is None:
+                raw = (bx0, by0, bx1, by1)
+            else:
+                raw = (min(raw[0], bx0), min(raw[1], by0), max(raw[2], bx1), max(raw[3], by1))
+        return raw
+
+    def _window_for(self, raw: Optional[Tuple[int, int, int, int]]) -> Window:
+        if raw is None:
+            return (0, 0, 0, 0)
+        step = self.grid_step
+        min_x = int(math.floor(raw[0] / step) * step)
+        max_x = int(math.ceil(raw[2] / step) * step)
+        min_y = int(math.floor(raw[1] / step) * step)
+        max_y = int(math.ceil(raw[3] / step) * step)
+        return (min_x, min_y, int((max_x - min_x) / step) + 1, int((max_y - min_y) / step) + 1)
+
+    def _layout(self) -> None:
+        self._window = self._window_for(self._raw)
+        _, _, width, height = self._window
+        cells = width * height if width > 0 and height > 0 and width * height <= MAX_CELLS else 0
+        self._blocked = array("I", bytes(4 * cells)) if cells else array("I")
+        self._penalty = array("I", bytes(4 * cells)) if cells else array("I")
+        if not cells:
+            return
+        for box in self._boxes.values():
+            self._mark_box(box, 1)
+        for pts in self._polylines.values():
+            self._mark_polyline(pts, 1)
+
+    def _cell(self, x: int, y: int) -> Tuple[int, int]:
+        min_x, min_y, width, height = self._window
+        gx = int(math.floor((x - min_x) / self.grid_step))
+        gy = int(math.floor((y - min_y) / self.grid_step))
+        return (max(0, min(width - 1, gx)), max(0, min(height - 1, gy)))
+
+    def _span(self, x0: float, x1: float, y0: float, y1: float) -> Tuple[int, int, int, int]:
+        min_x, min_y, width, height = self._window
+        step = self.grid_step
+        return (
+            max(0, int(math.floor((x0 - min_x) / step))),
+            min(width - 1, int(math.ceil((x1 - min_x) / step))),
+            max(0, int(math.floor((y0 - min_y) / step))),
+            min(height - 1, int(math.ceil((y1 - min_y) / step))),
+        )
+
+    def _box_range(self, box: ViewBox, reduced: bool = False) -> Tuple[int, int, int, int]:
+        cx, cy, hw, hh = box
+        half = self.grid_step // 2
+        pad_x = hw + half
+        pad_y = hh + half
+        if reduced:
+            pad_x = max(0, pad_x - half)
+            pad_y = max(0, pad_y - half)
+        return self._span(cx - pad_x, cx + pad_x, cy - pad_y, cy + pad_y)
+
+    def _segment_ranges(self, pts: Sequence[int]) -> Iterable[Tuple[int, int, int, int]]:
+        clearance = max(6, self.grid_step // 2)
+        for idx in range(0, len(pts) - 2, 2):
+            x1, y1 = pts[idx], pts[idx + 1]
+            x2, y2 = pts[idx + 2], pts[idx + 3]
+            yield self._span(
+                min(x1, x2) - clearance, max(x1, x2) + clearance,
+                min(y1, y2) - clearance, max(y1, y2) + clearance,
+            )
+
+    def _range_cells(self, rng: Tuple[int, int, int, int]) -> Iterable[int]:
+        ix0, ix1, iy0, iy1 = rng
+        width = self._window[2]
+        for gy in range(iy0, iy1 + 1):
+            row = gy * width
+            yield from range(row + ix0, row + ix1 + 1)
+
+    def _mark_box(self, box: ViewBox, delta: int) -> None:
+        if not self._blocked:
+            return
+        blocked = self._blocked
+        for cell in self._range_cells(self._box_range(box)):
+            blocked[cell] += delta
+
+    def _mark_polyline(self, pts: Sequence[int], delta: int) -> None:
+        if not self._penalty:
+            return
+        penalty = self._penalty
+        for rng in self._segment_ranges(pts):
+            for cell in self._range_cells(rng):
+                penalty[cell] += delta
+
+    def _polyline_counts(self, pts: Sequence[int]) -> Dict[int, int]:
+        counts: Counter = Counter()
+        for rng in self._segment_ranges(pts):
+            counts.update(self._range_cells(rng))
+        return counts
+
+    def _digest(self, corridor: Tuple[int, int, int, int]) -> bytes:
+        """Prüfsumme über Blockierung und Strafe aller Zellen im Korridor"""
+        gx0, gy0, gx1, gy1 = corridor
+        width = self._window[2]
+        digest = hashlib.blake2b(digest_size=16)
+        blocked = memoryview(self._blocked)
+        penalty = memoryview(self._penalty)
+        for gy in range(gy0, gy1 + 1):
+            row = gy * width
+            digest.update(blocked[row + gx0:row + gx1 + 1])
+            digest.update(penalty[row + gx0:row + gx1 + 1])
+        return digest.digest()
+
+
+def _merge_raw(raw: Optional[Tuple[int, int, int, int]], points: Sequence[int]) -> Optional[Tuple[int, int, int, int]]:
+    """Erweitert die Roh-Ausdehnung um (x, y)-Punkte"""
+    if not points:
+        return raw
+    xs = list(points[0::2])
+    ys = list(points[1::2])
+    if raw is not None:
+        xs.extend((raw[0], raw[2]))
+        ys.extend((raw[1], raw[3]))
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _in_range(cell: int, width: int, rng: Tuple[int, int, int, int]) -> bool:
+    gy, gx = divmod(cell, width)
+    return rng[0] <= gx <= rng[1] and rng[2] <= gy <= rng[3]
+
+
+__all__ = ["GridRouter", "MAX_CELLS"]
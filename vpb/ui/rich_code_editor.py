@@ -1,11 +1,66 @@
 """
 Rich Code Editor Widget mit Syntax-Highlighting für JSON und XML.
+
+set_text() ersetzt nur die geänderten Zeilenbereiche (diff_lines), und das
+Highlighting läuft über einen Tokenizer nur für sichtbare bzw. bearbeitete
+Zeilen. Bereits hervorgehobene Zeilen tragen das Tag HIGHLIGHTED_TAG, das Tk
+bei Einfügungen/Löschungen automatisch mitverschiebt.
 """
 
 import tkinter as tk
 from tkinter import font as tkfont
 import re
-from typing import Optional
+from bisect import bisect_right
+from typing import Iterator, Optional, Tuple
+
+from vpb.services.code_sync_service import diff_lines
+
+HIGHLIGHT_TAGS = ('keyword', 'string', 'number', 'comment', 'tag', 'attribute', 'bracket')
+HIGHLIGHTED_TAG = 'highlighted'
+
+# Zusätzliche Zeilen über/unter dem sichtbaren Bereich, die mit hervorgehoben werden
+_HIGHLIGHT_MARGIN_LINES = 40
+
+_TOKEN_PATTERNS = {
+    'json': re.compile(
+        r'(?P<string>"(?:[^"\\\n]|\\.)*")'
+        r'|(?P<keyword>\b(?:true|false|null)\b)'
+        r'|(?P<number>-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b)'
+        r'|(?P<bracket>[{}\[\],:])'
+    ),
+    'xml': re.compile(
+        r'(?P<comment><!--.*?-->)'
+        r'|(?P<open></?)(?P<tag>[\w:.-]+)?'
+        r'|(?P<attribute>[\w:.-]+)(?==)'
+        r'|(?P<string>"[^"]*")'
+        r'|(?P<bracket>/?>)',
+        re.DOTALL,
+    ),
+}
+
+
+def tokenize(language: str, text: str) -> Iterator[Tuple[str, int, int]]:
+    """
+    Zerlegt Code in einem Durchlauf in Highlight-Token.
+    
+    Args:
+        language: "json" oder "xml"
+        text: Code (beliebiger Ausschnitt aus ganzen Zeilen)
+        
+    Yields:
+        (tag, start, end) als Zeichen-Offsets in text; Token überlappen nicht
+    """
+    pattern = _TOKEN_PATTERNS.get(language)
+    if pattern is None:
+        return
+    for match in pattern.finditer(text):
+        kind = match.lastgroup
+        if kind in ('open', 'tag'):
+            yield ('bracket', match.start('open'), match.end('open'))
+            if match.group('tag'):
+                yield ('tag', match.start('tag'), match.end('tag'))
+        else:
+            yield (kind, match.start(), match.end())
 
 
 class RichCodeEditor(tk.Frame):
@@ -28,6 +83,8 @@ class RichCodeEditor(tk.Frame):
         self._read_only = True  # Start als Read-Only
         self.on_refresh = on_refresh
         self.on_apply = on_apply
+        self._highlight_job = None
+        self._line_count = 0
         
         # Fonts
         try:
@@ -101,7 +158,7 @@ class RichCodeEditor(tk.Frame):
             insertbackground='white',
             selectbackground=self.colors['selection'],
             selectforeground=self.colors['fg'],
-            yscrollcommand=y_scroll.set,
+            yscrollcommand=self._on_text_scrolled,
             xscrollcommand=x_scroll.set,
             padx=5,
             pady=5,
@@ -109,6 +166,7 @@ class RichCodeEditor(tk.Frame):
             state='disabled'  # Start als Read-Only
         )
         self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._y_scroll = y_scroll
         
         y_scroll.config(command=self._on_y_scroll)
         x_scroll.config(command=self.text.xview)
@@ -120,6 +178,7 @@ class RichCodeEditor(tk.Frame):
         self.text.bind('<KeyRelease>', self._on_key_release)
         self.text.bind('<<Modified>>', self._on_modified)
         self.text.bind('<Button-1>', self._update_line_numbers)
+        self.text.bind('<Configure>', lambda e: self._schedule_highlighting())
         
         # Initial line numbers
         self._update_line_numbers()
@@ -230,6 +289,12 @@ class RichCodeEditor(tk.Frame):
         self.text.yview(*args)
         self.line_numbers.yview(*args)
     
+    def _on_text_scrolled(self, first, last):
+        """yscrollcommand des Textes: Scrollbar setzen, neu sichtbare Zeilen hervorheben."""
+        self._y_scroll.set(first, last)
+        self.line_numbers.yview_moveto(first)
+        self._schedule_highlighting()
+    
     def _on_key_release(self, event=None):
         """Handler für Tastatur-Events."""
         self._update_line_numbers()
@@ -239,96 +304,90 @@ class RichCodeEditor(tk.Frame):
         if self.text.edit_modified():
             # Reset modified flag
             self.text.edit_modified(False)
-            # Trigger syntax highlighting nach kurzer Verzögerung
-            if hasattr(self, '_highlight_job'):
-                self.after_cancel(self._highlight_job)
-            self._highlight_job = self.after(300, self._apply_syntax_highlighting)
+            # Bearbeitete Zeile und sichtbaren Bereich neu hervorheben
+            # (eingetippter/eingefügter Text erbt die Tags der Nachbarzeichen)
+            line = int(self.text.index('insert').split('.')[0])
+            self.text.tag_remove(HIGHLIGHTED_TAG, f"{line}.0", f"{line + 1}.0")
+            self.text.tag_remove(
+                HIGHLIGHTED_TAG, '@0,0', f"@0,{max(1, self.text.winfo_height())} lineend +1c"
+            )
+            self._update_line_numbers()
+            self._schedule_highlighting(delay_ms=300)
     
     def _update_line_numbers(self, event=None):
-        """Aktualisiert Zeilennummern."""
-        self.line_numbers.config(state='normal')
-        self.line_numbers.delete('1.0', tk.END)
-        
-        # Zeilennummern generieren
+        """Aktualisiert Zeilennummern (nur bei geänderter Zeilenzahl, nur die Differenz)."""
         try:
             line_count = int(self.text.index('end-1c').split('.')[0])
-            line_numbers_text = "\n".join(str(i) for i in range(1, line_count + 1))
-            self.line_numbers.insert('1.0', line_numbers_text)
-        except:
-            pass
-        
+        except Exception:
+            return
+        if line_count == self._line_count:
+            return
+        self.line_numbers.config(state='normal')
+        if line_count > self._line_count:
+            numbers = "\n".join(str(i) for i in range(self._line_count + 1, line_count + 1))
+            self.line_numbers.insert('end-1c', ("\n" if self._line_count else "") + numbers)
+        else:
+            self.line_numbers.delete(f"{line_count}.end", 'end-1c')
+        self._line_count = line_count
         self.line_numbers.config(state='disabled')
     
+    def _schedule_highlighting(self, delay_ms: int = 0):
+        """Plant das Highlighting der sichtbaren Zeilen (zusammengefasst)."""
+        if self._highlight_job is not None:
+            self.after_cancel(self._highlight_job)
+        if delay_ms:
+            self._highlight_job = self.after(delay_ms, self._highlight_visible)
+        else:
+            self._highlight_job = self.after_idle(self._highlight_visible)
+    
     def _apply_syntax_highlighting(self):
-        """Wendet Syntax-Highlighting an."""
-        # Entferne alte Tags
-        for tag in ['keyword', 'string', 'number', 'comment', 'tag', 'attribute', 'bracket']:
-            self.text.tag_remove(tag, '1.0', tk.END)
-        
-        content = self.text.get('1.0', tk.END)
-        
-        if self.language == 'json':
-            self._highlight_json(content)
-        elif self.language == 'xml':
-            self._highlight_xml(content)
+        """Wendet Syntax-Highlighting an (verwirft den Stand, hebt sichtbare Zeilen neu hervor)."""
+        self.text.tag_remove(HIGHLIGHTED_TAG, '1.0', tk.END)
+        self._highlight_visible()
     
-    def _highlight_json(self, content):
-        """Syntax-Highlighting für JSON."""
-        # Keywords (true, false, null)
-        for match in re.finditer(r'\b(true|false|null)\b', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text.tag_add('keyword', start, end)
-        
-        # Strings
-        for match in re.finditer(r'"([^"\\]|\\.)*"', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text.tag_add('string', start, end)
-        
-        # Numbers
-        for match in re.finditer(r'\b-?\d+\.?\d*([eE][+-]?\d+)?\b', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text.tag_add('number', start, end)
-        
-        # Brackets
-        for match in re.finditer(r'[{}[\],:]', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text.tag_add('bracket', start, end)
+    def _highlight_visible(self):
+        """Hebt alle noch nicht hervorgehobenen Zeilen im sichtbaren Bereich (plus Rand) hervor."""
+        self._highlight_job = None
+        try:
+            first = int(self.text.index('@0,0').split('.')[0])
+            last = int(self.text.index(f"@0,{max(1, self.text.winfo_height())}").split('.')[0])
+            total = int(self.text.index('end-1c').split('.')[0])
+        except tk.TclError:
+            return
+        first = max(1, first - _HIGHLIGHT_MARGIN_LINES)
+        last = min(total, last + _HIGHLIGHT_MARGIN_LINES)
+        run_start = None
+        for line in range(first, last + 2):
+            done = line > last or HIGHLIGHTED_TAG in self.text.tag_names(f"{line}.0")
+            if not done and run_start is None:
+                run_start = line
+            elif done and run_start is not None:
+                self._highlight_lines(run_start, line - 1)
+                run_start = None
     
-    def _highlight_xml(self, content):
-        """Syntax-Highlighting für XML."""
-        # Comments
-        for match in re.finditer(r'<!--.*?-->', content, re.DOTALL):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text.tag_add('comment', start, end)
-        
-        # Tags
-        for match in re.finditer(r'</?(\w+)', content):
-            start = f"1.0+{match.start(1)}c"
-            end = f"1.0+{match.end(1)}c"
-            self.text.tag_add('tag', start, end)
-        
-        # Attributes
-        for match in re.finditer(r'(\w+)=', content):
-            start = f"1.0+{match.start(1)}c"
-            end = f"1.0+{match.end(1)}c"
-            self.text.tag_add('attribute', start, end)
-        
-        # Strings
-        for match in re.finditer(r'"([^"\\]|\\.)*"', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text.tag_add('string', start, end)
-        
-        # Brackets
-        for match in re.finditer(r'[<>/]', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text.tag_add('bracket', start, end)
+    def _highlight_lines(self, first: int, last: int):
+        """Tokenisiert die Zeilen first..last (1-basiert, inklusive) und setzt die Tags."""
+        start, end = f"{first}.0", f"{last}.end"
+        for tag in HIGHLIGHT_TAGS:
+            self.text.tag_remove(tag, start, end)
+        content = self.text.get(start, end)
+        # Zeichen-Offset → Zeile/Spalte über die Zeilenanfänge des Ausschnitts
+        line_starts = [0]
+        pos = content.find('\n')
+        while pos != -1:
+            line_starts.append(pos + 1)
+            pos = content.find('\n', pos + 1)
+        
+        def _index(offset):
+            row = bisect_right(line_starts, offset) - 1
+            return f"{first + row}.{offset - line_starts[row]}"
+        
+        ranges = {}
+        for tag, a, b in tokenize(self.language, content):
+            ranges.setdefault(tag, []).extend((_index(a), _index(b)))
+        for tag, indices in ranges.items():
+            self.text.tag_add(tag, *indices)
+        self.text.tag_add(HIGHLIGHTED_TAG, start, f"{last}.end+1c")
     
     def _format_code(self):
         """Formatiert den Code (pretty-print)."""
@@ -389,24 +448,40 @@ class RichCodeEditor(tk.Frame):
     # Public API
     
     def set_text(self, text: str):
-        """Setzt den Text im Editor."""
+        """Setzt den Text im Editor.
+        
+        Es werden nur die geänderten Zeilenbereiche ersetzt; Scrollposition und
+        Hervorhebung unveränderter Zeilen bleiben erhalten.
+        """
+        patches = diff_lines(self.get_text(), text)
+        if not patches:
+            return
         was_readonly = self._read_only
         if was_readonly:
             self.text.config(state='normal')
         
-        self.text.delete('1.0', tk.END)
-        self.text.insert('1.0', text)
+        # Von hinten nach vorne, damit die Zeilennummern der übrigen Patches gültig bleiben
+        for patch in reversed(patches):
+            if patch.end > patch.start:
+                self.text.delete(f"{patch.start + 1}.0", f"{patch.end + 1}.0")
+            if patch.text:
+                # Leere Tag-Liste: neuer Text erbt keine Tags der Nachbarzeichen
+                self.text.insert(f"{patch.start + 1}.0", patch.text, ())
         
         if was_readonly:
             self.text.config(state='disabled')
         
         self._update_line_numbers()
-        self._apply_syntax_highlighting()
+        self._highlight_visible()
     
     def get_text(self) -> str:
         """Gibt den Text aus dem Editor zurück."""
         return self.text.get('1.0', 'end-1c')
     
+    def is_readonly(self) -> bool:
+        """Gibt zurück, ob der Editor schreibgeschützt ist (keine laufende Bearbeitung)."""
+        return self._read_only
+    
     def set_readonly(self, readonly: bool):
         """Setzt Read-Only Mode."""
         if readonly != self._read_only:
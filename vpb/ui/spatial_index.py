@@ -0,0 +1,303 @@
+"""
+Räumlicher Index (Uniform Grid) für VPBCanvas.
+
+Hält achsenparallele Boxen (left, top, right, bottom) unter beliebigen
+Schlüsseln und wird bei Verschieben/Hinzufügen/Entfernen inkrementell
+aktualisiert:
+
+- query_point / query_rect: Treffer für Hit-Testing und Rechteckauswahl
+- query_axis: Boxen, deren Ausdehnung auf einer Achse ein Intervall schneidet
+  (Kandidaten für Ausrichtungs-Snapping, über sortierte Kantenlisten)
+- extent: Gesamtausdehnung aller Boxen
+
+align_on_axis() ist die Ausrichtungs-Logik des Canvas (magnetisches Snapping an
+Kanten/Mittellinien anderer Elemente) über den Kandidaten einer Achsenabfrage
+statt über alle Elemente.
+
+Alle Abfragen liefern Schlüssel in Einfügereihenfolge (ein Update behält die
+Position), damit Aufrufer dieselbe Reihenfolge wie beim Durchlaufen des
+ursprünglichen Dicts erhalten. Intervalle sind geschlossen (Berührung zählt).
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+Bounds = Tuple[float, float, float, float]
+
+_AXES = {"x": (0, 2), "y": (1, 3)}
+
+
+class SpatialIndex:
+    """Uniform Grid über Boxen in Modellkoordinaten.
+
+    Args:
+        cell_size: Kantenlänge einer Gitterzelle (Modell-Einheiten); sinnvoll ist
+            etwa die typische Elementgröße
+    """
+
+    def __init__(self, cell_size: float = 200.0):
+        self.cell_size = float(cell_size)
+        self._bounds: Dict[Hashable, Bounds] = {}
+        self._seq: Dict[Hashable, int] = {}
+        self._by_seq: Dict[int, Hashable] = {}
+        self._next_seq = 0
+        # Wird bei jeder inhaltlichen Änderung erhöht (z. B. für Caches der Minimap)
+        self.version = 0
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        # Je Achse sortierte (min, seq) und (max, seq) für Achsen- und Extent-Abfragen
+        self._mins: Dict[str, List[Tuple[float, int]]] = {"x": [], "y": []}
+        self._maxs: Dict[str, List[Tuple[float, int]]] = {"x": [], "y": []}
+        # Größte Ausdehnung je Achse (Hochwassermarke, sinkt erst bei clear())
+        self._max_span: Dict[str, float] = {"x": 0.0, "y": 0.0}
+
+    # ----- Pflege -----
+    def insert(self, key: Hashable, bounds: Bounds) -> None:
+        """Fügt eine Box ein oder aktualisiert sie (Reihenfolge bleibt erhalten)"""
+        left, top, right, bottom = bounds
+        bounds = (min(left, right), min(top, bottom), max(left, right), max(top, bottom))
+        old = self._bounds.get(key)
+        if old == bounds:
+            return
+        self.version += 1
+        seq = self._seq.get(key)
+        if seq is None:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._seq[key] = seq
+            self._by_seq[seq] = key
+        old_cells = self._cell_range(old) if old is not None else None
+        new_cells = self._cell_range(bounds)
+        if old_cells != new_cells:
+            if old_cells is not None:
+                self._unlink(key, old_cells)
+            self._link(key, new_cells)
+        for axis, (lo, hi) in _AXES.items():
+            if old is not None:
+                _remove_sorted(self._mins[axis], (old[lo], seq))
+                _remove_sorted(self._maxs[axis], (old[hi], seq))
+            insort(self._mins[axis], (bounds[lo], seq))
+            insort(self._maxs[axis], (bounds[hi], seq))
+            self._max_span[axis] = max(self._max_span[axis], bounds[hi] - bounds[lo])
+        self._bounds[key] = bounds
+
+    update = insert
+
+    def rebuild(self, items: Iterable[Tuple[Hashable, Bounds]]) -> None:
+        """Baut den Index aus (key, bounds)-Paaren neu auf (Reihenfolge = Iterationsreihenfolge).
+
+        Stimmen Schlüssel, Reihenfolge und Boxen mit dem aktuellen Stand überein
+        (z. B. beim Neuzeichnen nach Pan/Zoom), bleibt der Index unverändert.
+        """
+        normalized = [
+            (key, (min(left, right), min(top, bottom), max(left, right), max(top, bottom)))
+            for key, (left, top, right, bottom) in items
+        ]
+        if normalized == list(self._bounds.items()):
+            return
+        self.clear()
+        for key, bounds in normalized:
+            if key in self._bounds:
+                self.insert(key, bounds)
+                continue
+            seq = self._next_seq
+            self._next_seq += 1
+            self._seq[key] = seq
+            self._by_seq[seq] = key
+            self._bounds[key] = bounds
+            self._link(key, self._cell_range(bounds))
+            for axis, (lo, hi) in _AXES.items():
+                self._mins[axis].append((bounds[lo], seq))
+                self._maxs[axis].append((bounds[hi], seq))
+                self._max_span[axis] = max(self._max_span[axis], bounds[hi] - bounds[lo])
+        for axis in _AXES:
+            self._mins[axis].sort()
+            self._maxs[axis].sort()
+        self.version += 1
+
+    def remove(self, key: Hashable) -> bool:
+        old = self._bounds.pop(key, None)
+        if old is None:
+            return False
+        self.version += 1
+        seq = self._seq.pop(key)
+        del self._by_seq[seq]
+        self._unlink(key, self._cell_range(old))
+        for axis, (lo, hi) in _AXES.items():
+            _remove_sorted(self._mins[axis], (old[lo], seq))
+            _remove_sorted(self._maxs[axis], (old[hi], seq))
+        return True
+
+    def clear(self) -> None:
+        if self._bounds:
+            self.version += 1
+        self._next_seq = 0
+        self._bounds.clear()
+        self._seq.clear()
+        self._by_seq.clear()
+        self._cells.clear()
+        for axis in _AXES:
+            self._mins[axis].clear()
+            self._maxs[axis].clear()
+            self._max_span[axis] = 0.0
+
+    # ----- Abfragen -----
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._bounds
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._ordered(self._bounds))
+
+    def bounds(self, key: Hashable) -> Optional[Bounds]:
+        return self._bounds.get(key)
+
+    def extent(self) -> Optional[Bounds]:
+        """(min_left, min_top, max_right, max_bottom) aller Boxen oder None"""
+        if not self._bounds:
+            return None
+        return (self._mins["x"][0][0], self._mins["y"][0][0], self._maxs["x"][-1][0], self._maxs["y"][-1][0])
+
+    def query_point(self, x: float, y: float) -> List[Hashable]:
+        """Boxen, die den Punkt enthalten"""
+        return self.query_rect(x, y, x, y)
+
+    def query_rect(self, left: float, top: float, right: float, bottom: float) -> List[Hashable]:
+        """Boxen, die das Rechteck schneiden oder berühren"""
+        if not self._bounds:
+            return []
+        left, right = min(left, right), max(left, right)
+        top, bottom = min(top, bottom), max(top, bottom)
+        ix0, iy0, ix1, iy1 = self._cell_range((left, top, right, bottom))
+        candidates: Set[Hashable] = set()
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > len(self._cells):
+            # Großes Rechteck: belegte Zellen durchlaufen statt leerer Gitterfläche
+            for (ix, iy), keys in self._cells.items():
+                if ix0 <= ix <= ix1 and iy0 <= iy <= iy1:
+                    candidates.update(keys)
+        else:
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    keys = self._cells.get((ix, iy))
+                    if keys:
+                        candidates.update(keys)
+        hits = []
+        for key in candidates:
+            b = self._bounds[key]
+            if b[0] <= right and b[2] >= left and b[1] <= bottom and b[3] >= top:
+                hits.append(key)
+        return self._ordered(hits)
+
+    def query_axis(self, axis: str, lo: float, hi: float) -> List[Hashable]:
+        """Boxen, deren Ausdehnung auf der Achse ('x'/'y') das Intervall [lo, hi] schneidet"""
+        lo_i, hi_i = _AXES[axis]
+        mins = self._mins[axis]
+        start = bisect_left(mins, (lo - self._max_span[axis], -1))
+        end = bisect_right(mins, (hi, math.inf))
+        hits = []
+        for _, seq in mins[start:end]:
+            key = self._by_seq[seq]
+            if self._bounds[key][hi_i] >= lo:
+                hits.append(key)
+        return self._ordered(hits)
+
+    # ----- Intern -----
+    def _ordered(self, keys) -> List[Hashable]:
+        return sorted(keys, key=self._seq.__getitem__)
+
+    def _cell_range(self, bounds: Bounds) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            int(math.floor(bounds[0] / size)), int(math.floor(bounds[1] / size)),
+            int(math.floor(bounds[2] / size)), int(math.floor(bounds[3] / size)),
+        )
+
+    def _link(self, key: Hashable, cells: Tuple[int, int, int, int]) -> None:
+        ix0, iy0, ix1, iy1 = cells
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                self._cells.setdefault((ix, iy), set()).add(key)
+
+    def _unlink(self, key: Hashable, cells: Tuple[int, int, int, int]) -> None:
+        ix0, iy0, ix1, iy1 = cells
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                keys = self._cells.get((ix, iy))
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._cells[(ix, iy)]
+
+
+def align_on_axis(
+    index: SpatialIndex,
+    axis: str,
+    moving_key: Hashable,
+    pos: float,
+    size: float,
+    threshold: float,
+    center_of: Callable[[Hashable], float],
+) -> Tuple[float, Optional[float]]:
+    """Magnetische Ausrichtung auf einer Achse.
+
+    Vergleicht Kanten und Mitte des bewegten Elements (Mittelpunkt ``pos``,
+    Ausdehnung ``size``) mit denen der anderen Elemente in Index-Reihenfolge und
+    übernimmt jeweils den nächsten Treffer (<= bisheriger Abstand).
+
+    Es werden nur Elemente betrachtet, die laut Index in Reichweite liegen; wandert
+    die Position beim Einrasten weiter als der eingeplante Spielraum, wird über alle
+    Elemente wiederholt, so dass das Ergebnis dem vollständigen Durchlauf entspricht.
+
+    Returns:
+        (Position, Guide-Linie oder None)
+    """
+    half = size / 2
+    slack = size + 1
+    reach = half + threshold + 1 + slack
+    candidates = index.query_axis(axis, pos - reach, pos + reach)
+    snapped, guide, drift = _align_pass(candidates, moving_key, pos, half, threshold, center_of)
+    if drift > slack:
+        snapped, guide, drift = _align_pass(index, moving_key, pos, half, threshold, center_of)
+    return snapped, guide
+
+
+def _align_pass(keys, moving_key, pos, half, threshold, center_of):
+    current = pos
+    best_guide: Optional[float] = None
+    best_dist = threshold + 1
+    drift = 0.0
+    for key in keys:
+        if key == moving_key:
+            continue
+        center = center_of(key)
+        # Kanten gelten für den ganzen Vergleich mit diesem Element (wie bisher im Canvas)
+        low, high, mid = current - half, current + half, current
+        other_low, other_high = center - half, center + half
+        for a, b in ((low, other_low), (low, other_high), (high, other_low), (high, other_high), (mid, center)):
+            d = abs(a - b)
+            if d <= best_dist:
+                best_guide = b if a in (low, mid) else (b + half if a == high else b)
+                best_dist = d
+                if a == low:
+                    current = b + half
+                elif a == high:
+                    current = b - half
+                elif a == mid:
+                    current = b
+        drift = max(drift, abs(current - pos))
+    if best_guide is None or best_dist > threshold:
+        return current, None, drift
+    return current, best_guide, drift
+
+
+def _remove_sorted(items: List[Tuple[float, int]], item: Tuple[float, int]) -> None:
+    idx = bisect_left(items, item)
+    if idx < len(items) and items[idx] == item:
+        del items[idx]
+
+
+__all__ = ["SpatialIndex", "Bounds", "align_on_axis"]
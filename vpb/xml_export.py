@@ -1,11 +1,18 @@
-"""Utilities to translate VPB process dictionaries into XML formats."""
+"""Utilities to translate VPB process dictionaries into XML formats.
+
+The exporters stream indented XML through a small incremental writer instead
+of building an ElementTree and re-parsing it for pretty-printing. The
+``vpb_to_*_xml``/``render_vpb_xml`` functions return the document as a string;
+``write_vpb_xml`` writes it straight to a path or text stream without holding
+the full document in memory.
+"""
 
 from __future__ import annotations
 
+import io
+import os
 import re
-from typing import Any, Dict, Iterable, List, Tuple
-from xml.dom import minidom
-from xml.etree.ElementTree import Element, SubElement, tostring
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 
 def _safe_text(value: Any) -> str:
@@ -28,26 +35,79 @@ def _iter_dicts(items: Iterable[Any]) -> Iterable[Dict[str, Any]]:
             yield item
 
 
-def _prettify(root: Element, indent: str) -> str:
-    raw = tostring(root, encoding="utf-8")
-    pretty = minidom.parseString(raw).toprettyxml(indent=indent)
-    lines = [line for line in pretty.splitlines() if line.strip()]
-    return "\n".join(lines) + "\n"
+def _escape_text(value: str) -> str:
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace('"', "&quot;").replace(">", "&gt;")
 
 
-def vpb_to_atok_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
-    """Render a VPB process dictionary as ATOK-oriented XML."""
+def _escape_attr(value: str) -> str:
+    return (
+        _escape_text(value)
+        .replace("\n", "&#10;")
+        .replace("\r", "&#13;")
+        .replace("\t", "&#9;")
+    )
+
+
+class _XmlWriter:
+    """Incremental, indenting XML writer on top of a text stream.
+
+    Produces the layout of ``minidom.toprettyxml``: one element per line,
+    text-only elements inline and childless elements self-closing.
+    """
+
+    def __init__(self, out: IO[str], indent: str) -> None:
+        self._write = out.write
+        self._indent = indent
+        self._stack: List[str] = []
+        self._pending = False  # start tag written, ">" or "/>" still open
+        self._write('<?xml version="1.0" ?>\n')
+
+    def _open_tag(self, tag: str, attrs: Optional[Dict[str, str]]) -> None:
+        parts = [">\n"] if self._pending else []
+        self._pending = False
+        parts.extend((self._indent * len(self._stack), "<", tag))
+        for key, value in (attrs or {}).items():
+            parts.append(f' {key}="{_escape_attr(value)}"')
+        self._write("".join(parts))
+
+    def start(self, tag: str, attrs: Optional[Dict[str, str]] = None) -> None:
+        self._open_tag(tag, attrs)
+        self._stack.append(tag)
+        self._pending = True
+
+    def end(self) -> None:
+        tag = self._stack.pop()
+        if self._pending:
+            self._pending = False
+            self._write("/>\n")
+        else:
+            self._write(f"{self._indent * len(self._stack)}</{tag}>\n")
+
+    def leaf(self, tag: str, attrs: Optional[Dict[str, str]] = None, text: str = "") -> None:
+        self._open_tag(tag, attrs)
+        if text:
+            self._write(f">{_escape_text(text)}</{tag}>\n")
+        else:
+            self._write("/>\n")
+
+
+def _render(write: Callable[[Dict[str, Any], _XmlWriter], None], data: Dict[str, Any], indent: str) -> str:
+    buffer = io.StringIO()
+    write(data, _XmlWriter(buffer, indent))
+    return buffer.getvalue()
+
 
-    root = Element("atokProcess")
+def _write_atok(data: Dict[str, Any], xml: _XmlWriter) -> None:
+    xml.start("atokProcess")
 
-    metadata_node = SubElement(root, "metadata")
+    xml.start("metadata")
     metadata = data.get("metadata") if isinstance(data, dict) else {}
     if isinstance(metadata, dict):
         for key, value in metadata.items():
-            field = SubElement(metadata_node, "field", name=str(key))
-            field.text = _safe_text(value)
+            xml.leaf("field", {"name": str(key)}, _safe_text(value))
+    xml.end()
 
-    elements_node = SubElement(root, "elements")
+    xml.start("elements")
     for element in _iter_dicts((data or {}).get("elements")):  # type: ignore[union-attr]
         attrs = {
             "id": _safe_text(element.get("element_id")),
@@ -56,10 +116,9 @@ def vpb_to_atok_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
         name = element.get("name")
         if name:
             attrs["name"] = _safe_text(name)
-        element_node = SubElement(elements_node, "element", attrs)
+        xml.start("element", attrs)
 
-        SubElement(
-            element_node,
+        xml.leaf(
             "position",
             {
                 "x": _safe_text(element.get("x", 0)),
@@ -78,10 +137,11 @@ def vpb_to_atok_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
             if optional_key in element:
                 opt_value = element.get(optional_key)
                 if opt_value is not None and opt_value != "":
-                    opt_node = SubElement(element_node, optional_key)
-                    opt_node.text = _safe_text(opt_value)
+                    xml.leaf(optional_key, None, _safe_text(opt_value))
+        xml.end()
+    xml.end()
 
-    connections_node = SubElement(root, "connections")
+    xml.start("connections")
     for connection in _iter_dicts((data or {}).get("connections")):  # type: ignore[union-attr]
         attrs = {
             "id": _safe_text(connection.get("connection_id")),
@@ -89,22 +149,47 @@ def vpb_to_atok_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
             "source": _safe_text(connection.get("source_element")),
             "target": _safe_text(connection.get("target_element")),
         }
-        connection_node = SubElement(connections_node, "connection", attrs)
+        xml.start("connection", attrs)
         label = connection.get("description") or connection.get("name")
         if label:
-            label_node = SubElement(connection_node, "label")
-            label_node.text = _safe_text(label)
+            xml.leaf("label", None, _safe_text(label))
+        xml.end()
+    xml.end()
 
-    return _prettify(root, indent)
+    xml.end()
 
 
-def vpb_to_eepk_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
-    """Render a VPB process dictionary as eEPK XML."""
+def vpb_to_atok_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
+    """Render a VPB process dictionary as ATOK-oriented XML."""
 
+    return _render(_write_atok, data, indent)
+
+
+def _eepk_category(element: Dict[str, Any]) -> str:
+    etype = _safe_text(element.get("element_type")).upper()
+    if "CONNECTOR" in etype or "GATEWAY" in etype:
+        return "connector"
+    if etype.endswith("EVENT") or etype.startswith("EVENT") or "EVENT" in etype:
+        return "event"
+    return "function"
+
+
+def _eepk_connector_class(element: Dict[str, Any]) -> str:
+    etype = _safe_text(element.get("element_type")).upper()
+    if "XOR" in etype:
+        return "exclusive"
+    if "AND" in etype:
+        return "parallel"
+    if "OR" in etype:
+        return "inclusive"
+    return "connector"
+
+
+def _write_eepk(data: Dict[str, Any], xml: _XmlWriter) -> None:
     metadata = data.get("metadata") if isinstance(data, dict) else {}
     process_id = _slugify((metadata or {}).get("id") if isinstance(metadata, dict) else None, "VPB_Process")
 
-    root = Element(
+    xml.start(
         "eepk:Process",
         {
             "xmlns:eem": "https://vpb.ai/schema/eepk/metadata",
@@ -115,72 +200,58 @@ def vpb_to_eepk_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
         },
     )
 
-    meta_node = SubElement(root, "eem:Metadata")
+    xml.start("eem:Metadata")
     if isinstance(metadata, dict):
         for key, value in metadata.items():
-            field = SubElement(meta_node, "eem:Field", name=str(key))
-            field.text = _safe_text(value)
+            xml.leaf("eem:Field", {"name": str(key)}, _safe_text(value))
+    xml.end()
 
     elements = list(_iter_dicts((data or {}).get("elements")))  # type: ignore[union-attr]
-
-    events_node = SubElement(root, "eepk:Events")
-    functions_node = SubElement(root, "eepk:Functions")
-    connectors_node = SubElement(root, "eepk:Connectors")
-
-    layout_node = SubElement(root, "eepk:Layout")
-
-    def _categorise_element(element: Dict[str, Any]) -> str:
-        etype = _safe_text(element.get("element_type")).upper()
-        if "CONNECTOR" in etype or "GATEWAY" in etype:
-            return "connector"
-        if etype.endswith("EVENT") or etype.startswith("EVENT") or "EVENT" in etype:
-            return "event"
-        return "function"
-
-    def _connector_class(element: Dict[str, Any]) -> str:
-        etype = _safe_text(element.get("element_type")).upper()
-        if "XOR" in etype:
-            return "exclusive"
-        if "AND" in etype:
-            return "parallel"
-        if "OR" in etype:
-            return "inclusive"
-        return "connector"
-
+    categories = [_eepk_category(element) for element in elements]
+
+    # Events, functions and connectors are separate sections: one pass per section
+    for section, category, tag in (
+        ("eepk:Events", "event", "eepk:Event"),
+        ("eepk:Functions", "function", "eepk:Function"),
+        ("eepk:Connectors", "connector", "eepk:Connector"),
+    ):
+        xml.start(section)
+        for element, element_category in zip(elements, categories):
+            if element_category != category:
+                continue
+            attrs = {
+                "id": _safe_text(element.get("element_id")),
+                "name": _safe_text(element.get("name")),
+                "type": _safe_text(element.get("element_type")),
+            }
+            if category == "connector":
+                attrs["class"] = _eepk_connector_class(element)
+
+            doc_lines: List[str] = []
+            for key in ("description", "responsible_authority", "legal_basis", "deadline_days"):
+                value = element.get(key)
+                if value not in (None, ""):
+                    doc_lines.append(f"{key}: {_safe_text(value)}")
+
+            if doc_lines:
+                xml.start(tag, attrs)
+                xml.leaf("eepk:Documentation", None, "\n".join(doc_lines))
+                xml.end()
+            else:
+                xml.leaf(tag, attrs)
+        xml.end()
+
+    xml.start("eepk:Layout")
     for element in elements:
-        category = _categorise_element(element)
-        attrs = {
-            "id": _safe_text(element.get("element_id")),
-            "name": _safe_text(element.get("name")),
-            "type": _safe_text(element.get("element_type")),
-        }
-
-        doc_lines: List[str] = []
-        for key in ("description", "responsible_authority", "legal_basis", "deadline_days"):
-            value = element.get(key)
-            if value not in (None, ""):
-                doc_lines.append(f"{key}: {_safe_text(value)}")
-
-        if category == "event":
-            node = SubElement(events_node, "eepk:Event", attrs)
-        elif category == "connector":
-            attrs["class"] = _connector_class(element)
-            node = SubElement(connectors_node, "eepk:Connector", attrs)
-        else:
-            node = SubElement(functions_node, "eepk:Function", attrs)
-
-        if doc_lines:
-            documentation = SubElement(node, "eepk:Documentation")
-            documentation.text = "\n".join(doc_lines)
-
         layout_attrs = {
             "ref": _safe_text(element.get("element_id")),
             "x": _safe_text(element.get("x", 0)),
             "y": _safe_text(element.get("y", 0)),
         }
-        SubElement(layout_node, "eepk:Node", layout_attrs)
+        xml.leaf("eepk:Node", layout_attrs)
+    xml.end()
 
-    flows_node = SubElement(root, "eepk:Flows")
+    xml.start("eepk:Flows")
     for connection in _iter_dicts((data or {}).get("connections")):  # type: ignore[union-attr]
         attrs = {
             "id": _safe_text(connection.get("connection_id")),
@@ -188,22 +259,83 @@ def vpb_to_eepk_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
             "target": _safe_text(connection.get("target_element")),
             "type": _safe_text(connection.get("connection_type", "SEQUENCE")),
         }
-        flow_node = SubElement(flows_node, "eepk:Flow", attrs)
         label = connection.get("description") or connection.get("name")
         if label:
-            SubElement(flow_node, "eepk:Label").text = _safe_text(label)
+            xml.start("eepk:Flow", attrs)
+            xml.leaf("eepk:Label", None, _safe_text(label))
+            xml.end()
+        else:
+            xml.leaf("eepk:Flow", attrs)
+    xml.end()
 
-    return _prettify(root, indent)
+    xml.end()
 
 
-def vpb_to_bpmn20_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
-    """Render a VPB process dictionary as BPMN 2.0 compatible XML."""
+def vpb_to_eepk_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
+    """Render a VPB process dictionary as eEPK XML."""
 
+    return _render(_write_eepk, data, indent)
+
+
+def _bpmn_element(element: Dict[str, Any]) -> Tuple[str, Dict[str, str]]:
+    etype = _safe_text(element.get("element_type")).upper()
+    if etype in {"START_EVENT", "START"}:
+        return "bpmn:startEvent", {}
+    if etype in {"END_EVENT", "TERMINATE_EVENT"}:
+        return "bpmn:endEvent", {}
+    if "EVENT" in etype:
+        return "bpmn:intermediateThrowEvent", {}
+    if "XOR" in etype or "EXCLUSIVE" in etype:
+        return "bpmn:exclusiveGateway", {}
+    if "AND" in etype or "PARALLEL" in etype:
+        return "bpmn:parallelGateway", {}
+    if "OR" in etype or "INCLUSIVE" in etype:
+        return "bpmn:inclusiveGateway", {}
+    if "SUB" in etype or etype == "CALL_ACTIVITY":
+        attrs: Dict[str, str] = {}
+        ref_file = element.get("ref_file")
+        if ref_file:
+            attrs["calledElement"] = _safe_text(ref_file)
+        return "bpmn:callActivity", attrs
+    if etype == "GROUP":
+        return "bpmn:subProcess", {"triggeredByEvent": "false"}
+    return "bpmn:task", {}
+
+
+def _bpmn_documentation(element: Dict[str, Any]) -> str:
+    doc_lines: List[str] = []
+    for key in ("description", "responsible_authority", "legal_basis", "deadline_days"):
+        value = element.get(key)
+        if value in (None, ""):
+            continue
+        doc_lines.append(f"{key}: {_safe_text(value)}")
+    ref = element.get("ref_file")
+    if ref:
+        doc_lines.append(f"reference: {_safe_text(ref)}")
+    return "\n".join(doc_lines)
+
+
+def _bpmn_bounds(element: Dict[str, Any]) -> Tuple[float, float]:
+    etype = _safe_text(element.get("element_type")).upper()
+    if etype in {"START_EVENT", "END_EVENT"} or etype.endswith("EVENT"):
+        return 36.0, 36.0
+    if "GATEWAY" in etype or "CONNECTOR" in etype:
+        return 50.0, 50.0
+    if etype == "GROUP" or "SUB" in etype:
+        return 160.0, 120.0
+    return 120.0, 80.0
+
+
+def _bpmn_center(element: Dict[str, Any]) -> Tuple[float, float]:
+    return float(element.get("x", 0)), float(element.get("y", 0))
+
+
+def _write_bpmn20(data: Dict[str, Any], xml: _XmlWriter) -> None:
     metadata = data.get("metadata") if isinstance(data, dict) else {}
     process_id = _slugify((metadata or {}).get("id") if isinstance(metadata, dict) else None, "Process_1")
     definitions_id = f"Definitions_{process_id}"
 
-    root = Element(
+    xml.start(
         "bpmn:definitions",
         {
             "xmlns:bpmn": "http://www.omg.org/spec/BPMN/20100524/MODEL",
@@ -220,7 +352,7 @@ def vpb_to_bpmn20_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
     process_attrs = {"id": process_id or "Process_1", "isExecutable": "false"}
     if process_name:
         process_attrs["name"] = process_name
-    process_node = SubElement(root, "bpmn:process", process_attrs)
+    xml.start("bpmn:process", process_attrs)
 
     documentation_texts: List[str] = []
     if isinstance(metadata, dict):
@@ -229,61 +361,28 @@ def vpb_to_bpmn20_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
                 continue
             documentation_texts.append(f"{key}: {_safe_text(value)}")
     if documentation_texts:
-        documentation = SubElement(process_node, "bpmn:documentation")
-        documentation.text = "\n".join(documentation_texts)
+        xml.leaf("bpmn:documentation", None, "\n".join(documentation_texts))
 
     elements = list(_iter_dicts((data or {}).get("elements")))  # type: ignore[union-attr]
     element_index = { _safe_text(e.get("element_id")): e for e in elements }
-
-    def _map_bpmn_element(element: Dict[str, Any]) -> Tuple[str, Dict[str, str]]:
-        etype = _safe_text(element.get("element_type")).upper()
-        if etype in {"START_EVENT", "START"}:
-            return "bpmn:startEvent", {}
-        if etype in {"END_EVENT", "TERMINATE_EVENT"}:
-            return "bpmn:endEvent", {}
-        if "EVENT" in etype:
-            return "bpmn:intermediateThrowEvent", {}
-        if "XOR" in etype or "EXCLUSIVE" in etype:
-            return "bpmn:exclusiveGateway", {}
-        if "AND" in etype or "PARALLEL" in etype:
-            return "bpmn:parallelGateway", {}
-        if "OR" in etype or "INCLUSIVE" in etype:
-            return "bpmn:inclusiveGateway", {}
-        if "SUB" in etype or etype == "CALL_ACTIVITY":
-            attrs: Dict[str, str] = {}
-            ref_file = element.get("ref_file")
-            if ref_file:
-                attrs["calledElement"] = _safe_text(ref_file)
-            return "bpmn:callActivity", attrs
-        if etype == "GROUP":
-            return "bpmn:subProcess", {"triggeredByEvent": "false"}
-        return "bpmn:task", {}
-
-    def _documentation_for_element(element: Dict[str, Any]) -> str:
-        doc_lines: List[str] = []
-        for key in ("description", "responsible_authority", "legal_basis", "deadline_days"):
-            value = element.get(key)
-            if value in (None, ""):
-                continue
-            doc_lines.append(f"{key}: {_safe_text(value)}")
-        ref = element.get("ref_file")
-        if ref:
-            doc_lines.append(f"reference: {_safe_text(ref)}")
-        return "\n".join(doc_lines)
+    connections = list(_iter_dicts((data or {}).get("connections")))  # type: ignore[union-attr]
 
     for element in elements:
-        tag_name, extra_attrs = _map_bpmn_element(element)
+        tag_name, extra_attrs = _bpmn_element(element)
         attrs = {"id": _safe_text(element.get("element_id"))}
         name = _safe_text(element.get("name"))
         if name:
             attrs["name"] = name
         attrs.update(extra_attrs)
-        node = SubElement(process_node, tag_name, attrs)
-        doc = _documentation_for_element(element)
+        doc = _bpmn_documentation(element)
         if doc:
-            SubElement(node, "bpmn:documentation").text = doc
+            xml.start(tag_name, attrs)
+            xml.leaf("bpmn:documentation", None, doc)
+            xml.end()
+        else:
+            xml.leaf(tag_name, attrs)
 
-    for connection in _iter_dicts((data or {}).get("connections")):  # type: ignore[union-attr]
+    for connection in connections:
         attrs = {
             "id": _safe_text(connection.get("connection_id")),
             "sourceRef": _safe_text(connection.get("source_element")),
@@ -292,37 +391,19 @@ def vpb_to_bpmn20_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
         label = connection.get("description") or connection.get("name")
         if label:
             attrs["name"] = _safe_text(label)
-        SubElement(process_node, "bpmn:sequenceFlow", attrs)
-
-    diagram = SubElement(root, "bpmndi:BPMNDiagram", {"id": f"Diagram_{process_id}"})
-    plane = SubElement(
-        diagram,
-        "bpmndi:BPMNPlane",
-        {"id": f"Plane_{process_id}", "bpmnElement": process_attrs["id"]},
-    )
+        xml.leaf("bpmn:sequenceFlow", attrs)
+    xml.end()
 
-    def _bounds_for_element(element: Dict[str, Any]) -> Tuple[float, float]:
-        etype = _safe_text(element.get("element_type")).upper()
-        if etype in {"START_EVENT", "END_EVENT"} or etype.endswith("EVENT"):
-            return 36.0, 36.0
-        if "GATEWAY" in etype or "CONNECTOR" in etype:
-            return 50.0, 50.0
-        if etype == "GROUP" or "SUB" in etype:
-            return 160.0, 120.0
-        return 120.0, 80.0
+    xml.start("bpmndi:BPMNDiagram", {"id": f"Diagram_{process_id}"})
+    xml.start("bpmndi:BPMNPlane", {"id": f"Plane_{process_id}", "bpmnElement": process_attrs["id"]})
 
     for element in elements:
         element_id = _safe_text(element.get("element_id"))
-        width, height = _bounds_for_element(element)
+        width, height = _bpmn_bounds(element)
         x = float(element.get("x", 0)) - width / 2
         y = float(element.get("y", 0)) - height / 2
-        shape = SubElement(
-            plane,
-            "bpmndi:BPMNShape",
-            {"id": f"BPMNShape_{element_id}", "bpmnElement": element_id},
-        )
-        SubElement(
-            shape,
+        xml.start("bpmndi:BPMNShape", {"id": f"BPMNShape_{element_id}", "bpmnElement": element_id})
+        xml.leaf(
             "dc:Bounds",
             {
                 "x": f"{x:.2f}",
@@ -331,47 +412,83 @@ def vpb_to_bpmn20_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
                 "height": f"{height:.2f}",
             },
         )
+        xml.end()
 
-    for connection in _iter_dicts((data or {}).get("connections")):  # type: ignore[union-attr]
+    for connection in connections:
         cid = _safe_text(connection.get("connection_id"))
-        edge = SubElement(
-            plane,
-            "bpmndi:BPMNEdge",
-            {"id": f"BPMNEdge_{cid}", "bpmnElement": cid},
-        )
+        xml.start("bpmndi:BPMNEdge", {"id": f"BPMNEdge_{cid}", "bpmnElement": cid})
         src = element_index.get(_safe_text(connection.get("source_element")))
         tgt = element_index.get(_safe_text(connection.get("target_element")))
 
-        def _center(element_dict: Dict[str, Any]) -> Tuple[float, float]:
-            return float(element_dict.get("x", 0)), float(element_dict.get("y", 0))
-
         points: List[Tuple[float, float]] = []
         if src:
-            points.append(_center(src))
+            points.append(_bpmn_center(src))
         if tgt:
-            points.append(_center(tgt))
+            points.append(_bpmn_center(tgt))
         if not points:
             points = [(0.0, 0.0), (0.0, 0.0)]
         elif len(points) == 1:
             points = [points[0], points[0]]
 
         for px, py in points:
-            SubElement(edge, "di:waypoint", {"x": f"{px:.2f}", "y": f"{py:.2f}"})
+            xml.leaf("di:waypoint", {"x": f"{px:.2f}", "y": f"{py:.2f}"})
+        xml.end()
+
+    xml.end()
+    xml.end()
+    xml.end()
+
+
+def vpb_to_bpmn20_xml(data: Dict[str, Any], *, indent: str = "  ") -> str:
+    """Render a VPB process dictionary as BPMN 2.0 compatible XML."""
 
-    return _prettify(root, indent)
+    return _render(_write_bpmn20, data, indent)
+
+
+_FORMAT_WRITERS: Dict[str, Callable[[Dict[str, Any], _XmlWriter], None]] = {
+    "atok": _write_atok,
+    "xml": _write_atok,
+    "eepk": _write_eepk,
+    "epk": _write_eepk,
+    "bpmn": _write_bpmn20,
+    "bpmn20": _write_bpmn20,
+    "bpmn2": _write_bpmn20,
+    "bpmn_20": _write_bpmn20,
+}
+
+
+def _writer_for(format: str) -> Callable[[Dict[str, Any], _XmlWriter], None]:
+    writer = _FORMAT_WRITERS.get((format or "atok").lower())
+    if writer is None:
+        raise ValueError(f"Unsupported XML export format: {format}")
+    return writer
 
 
 def render_vpb_xml(data: Dict[str, Any], *, format: str, indent: str = "  ") -> str:
     """Render VPB data to the desired XML format."""
 
-    fmt = (format or "atok").lower()
-    if fmt in {"atok", "xml"}:
-        return vpb_to_atok_xml(data, indent=indent)
-    if fmt in {"eepk", "epk"}:
-        return vpb_to_eepk_xml(data, indent=indent)
-    if fmt in {"bpmn", "bpmn20", "bpmn2", "bpmn_20"}:
-        return vpb_to_bpmn20_xml(data, indent=indent)
-    raise ValueError(f"Unsupported XML export format: {format}")
+    return _render(_writer_for(format), data, indent)
+
+
+def write_vpb_xml(
+    data: Dict[str, Any],
+    target: Union[str, "os.PathLike[str]", IO[str]],
+    *,
+    format: str,
+    indent: str = "  ",
+) -> None:
+    """Stream VPB data in the desired XML format to a file path or text stream.
+
+    The document is written element by element; the full XML string is never
+    built in memory. Paths are written as UTF-8.
+    """
+
+    writer = _writer_for(format)
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "w", encoding="utf-8", newline="\n") as handle:
+            writer(data, _XmlWriter(handle, indent))
+    else:
+        writer(data, _XmlWriter(target, indent))
 
 
 __all__ = [
@@ -379,4 +496,5 @@ __all__ = [
     "vpb_to_eepk_xml",
     "vpb_to_bpmn20_xml",
     "render_vpb_xml",
+    "write_vpb_xml",
 ]
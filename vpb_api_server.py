@@ -46,6 +46,7 @@ import subprocess
 
 # VPB SQLite Integration
 from vpb_sqlite_db import VPBSQLiteDB
+from core.pagination import parse_tags
 from uds3_vpb_schema import VPBProcessRecord, migrate_legacy_vpb_data
 from uds3_api_backend import UDS3APIBackend, ProcessAnalysisResult
 
@@ -90,20 +91,32 @@ class VPBAPIServer:
         # VPB Process CRUD Endpoints
         @self.app.route('/api/vpb/processes', methods=['GET'])
         def list_processes():
-            """Liste alle VPB Prozesse"""
+            """Liste alle VPB Prozesse (seitenweise, ?limit=&cursor=&tags=a,b)"""
             try:
-                status = request.args.get('status')
-                authority = request.args.get('authority_level')
-                
-                processes = self.vpb_db.list_processes(status=status, authority_level=authority)
+                page = self.vpb_db.list_processes_page(
+                    limit=request.args.get('limit'),
+                    cursor=request.args.get('cursor'),
+                    status=request.args.get('status'),
+                    authority_level=request.args.get('authority_level'),
+                    tags=parse_tags(request.args.getlist('tags')),
+                )
                 
                 return jsonify({
                     "success": True,
-                    "processes": processes,
-                    "count": len(processes),
+                    "processes": page["processes"],
+                    "count": len(page["processes"]),
+                    "limit": page["limit"],
+                    "next_cursor": page["next_cursor"],
                     "timestamp": datetime.now().isoformat()
                 }), 200
                 
+            except ValueError as e:
+                # Ungültiger Cursor oder limit
+                return jsonify({
+                    "success": False,
+                    "error": str(e),
+                    "timestamp": datetime.now().isoformat()
+                }), 400
             except Exception as e:
                 logger.error(f"Fehler beim Auflisten der Prozesse: {e}")
                 return jsonify({
@@ -35,6 +35,9 @@ from vpb.controllers.export_controller import ExportController
 from vpb.controllers.background_task_controller import BackgroundTaskController
 from vpb.services.code_sync_service import CodeSyncService
 
+# Verzögerung der Live-Code-Ansicht nach der letzten Modelländerung
+CODE_SYNC_DEBOUNCE_MS = 400
+
 class VPBApplication:
     def __init__(self, args=None):
         """
@@ -224,6 +227,11 @@ class VPBApplication:
         self.mid_notebook.add(self.xml_frame, text="XML Code")
         self._create_code_tab(self.xml_frame, "xml")
         
+        # Live-Sync: Code-Ansichten folgen Modelländerungen des Canvas (debounced)
+        self._code_sync_job = None
+        self._code_sync_stale = set()
+        self.canvas.add_model_changed_listener(self._schedule_code_sync)
+        
         # Unterer Bereich: AI Chat Terminal
         self._init_chat_terminal(self.vertical_paned)
         
@@ -389,6 +397,8 @@ class VPBApplication:
         
         # Initial Content
         editor.set_text(f"# {code_type.upper()} Code wird hier angezeigt\n# Klicken Sie 🔄 Refresh um Canvas-Daten zu laden...")
+        # Verdeckte Ansicht wird beim Anzeigen nachgezogen
+        editor.bind("<Map>", lambda e, t=code_type: self._flush_stale_code_view(t), add="+")
 
     
     def _init_controllers(self):
@@ -980,6 +990,40 @@ class VPBApplication:
     # Code Sync Methods (Canvas ↔ JSON/XML)
     # ============================================================================
     
+    def _schedule_code_sync(self):
+        """Plant die Aktualisierung der Code-Ansichten nach einer Modelländerung (debounced)."""
+        if not self.code_sync_service.is_auto_sync_enabled():
+            return
+        if self._code_sync_job is not None:
+            self.root.after_cancel(self._code_sync_job)
+        self._code_sync_job = self.root.after(CODE_SYNC_DEBOUNCE_MS, self._run_code_sync)
+    
+    def _run_code_sync(self):
+        """Aktualisiert sichtbare, schreibgeschützte Code-Ansichten; verdeckte werden vorgemerkt."""
+        self._code_sync_job = None
+        for code_type in ("json", "xml"):
+            editor = getattr(self, f"{code_type}_editor", None)
+            if editor is None or not editor.is_readonly():
+                continue  # laufende Bearbeitung nicht überschreiben
+            if editor.winfo_ismapped():
+                self._code_sync_stale.discard(code_type)
+                self._refresh_code_view(code_type)
+            else:
+                self._code_sync_stale.add(code_type)
+    
+    def _flush_stale_code_view(self, code_type):
+        """Zieht eine beim Anzeigen noch veraltete Code-Ansicht nach."""
+        editor = getattr(self, f"{code_type}_editor", None)
+        if code_type in self._code_sync_stale and editor is not None and editor.is_readonly():
+            self._code_sync_stale.discard(code_type)
+            self._refresh_code_view(code_type)
+    
+    def _refresh_code_view(self, code_type):
+        if code_type == "json":
+            self._refresh_json_from_canvas()
+        else:
+            self._refresh_xml_from_canvas()
+    
     def _refresh_json_from_canvas(self):
         """Aktualisiert JSON-Editor mit Canvas-Daten."""
         try:
@@ -1016,11 +1060,11 @@ class VPBApplication:
             # Konvertierung
             canvas_data = self.code_sync_service.json_to_canvas(json_text)
             if canvas_data:
-                # Canvas neu laden
+                # Nur Änderungen übernehmen statt den Canvas neu zu laden
                 if hasattr(self, 'canvas'):
-                    self.canvas.load_from_dict(canvas_data)
-                    self.canvas.redraw_all()
-                    print("✅ Canvas aktualisiert von JSON")
+                    diff = self.code_sync_service.diff_canvas_data(self.canvas.to_dict(), canvas_data)
+                    if self.canvas.apply_data_diff(diff):
+                        print("✅ Canvas aktualisiert von JSON")
         except Exception as e:
             print(f"❌ JSON Apply Fehler: {e}")
     
@@ -1038,11 +1082,11 @@ class VPBApplication:
             # Konvertierung
             canvas_data = self.code_sync_service.xml_to_canvas(xml_text)
             if canvas_data:
-                # Canvas neu laden
+                # Nur Änderungen übernehmen statt den Canvas neu zu laden
                 if hasattr(self, 'canvas'):
-                    self.canvas.load_from_dict(canvas_data)
-                    self.canvas.redraw_all()
-                    print("✅ Canvas aktualisiert von XML")
+                    diff = self.code_sync_service.diff_canvas_data(self.canvas.to_dict(), canvas_data)
+                    if self.canvas.apply_data_diff(diff):
+                        print("✅ Canvas aktualisiert von XML")
         except Exception as e:
             print(f"❌ XML Apply Fehler: {e}")
     
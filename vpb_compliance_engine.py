@@ -13,12 +13,19 @@ Features:
 
 import json
 import logging
-from typing import Dict, List, Any, Optional, Union, Tuple
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, List, Any, Optional, Union, Tuple, Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 import re
 from enum import Enum
 
+from vpb.models.process_graph import ProcessGraph
+
 logger = logging.getLogger(__name__)
 
 class VBPComplianceLevel(Enum):
@@ -51,6 +58,46 @@ class VBPComplianceResult:
     validation_details: Dict[str, Any]
 
 
+# Schritt-Typen, die eine Bearbeiter-Zuordnung brauchen
+TASK_STEP_TYPES = frozenset({'userTask', 'manualTask'})
+
+# VPB-Elementtypen, die als Prozessschritt einem UDS3-Schritt-Typ entsprechen
+VPB_STEP_TYPES = {'FUNCTION': 'userTask'}
+
+_PARAGRAPH_PATTERN = re.compile(r'§\s*\d+')
+
+
+@lru_cache(maxsize=64)
+def _compiled(pattern: str) -> 're.Pattern':
+    return re.compile(pattern)
+
+
+class ProcessIndex:
+    """Einmaliger Vorab-Durchlauf über ein UDS3-Dokument
+    
+    Hält alle Felder, die die Validatoren brauchen, damit keine Regel das
+    Dokument oder seine Prozessschritte erneut durchsucht.
+    """
+    
+    __slots__ = ('document', 'process_name', 'process_description', 'description_lower',
+                 'attributes', 'steps', 'unassigned_tasks')
+    
+    def __init__(self, uds3_document: Dict[str, Any]):
+        content = uds3_document.get('content') or {}
+        self.document = uds3_document
+        self.process_name = content.get('process_name', '')
+        self.process_description = content.get('process_description', '')
+        self.description_lower = (self.process_description or '').lower()
+        self.attributes = uds3_document.get('verwaltungsattribute') or {}
+        self.steps = content.get('process_steps') or []
+        self.unassigned_tasks = tuple(
+            step.get('step_name', step.get('step_id'))
+            for step in self.steps
+            if step.get('step_type', '') in TASK_STEP_TYPES
+            and not (step.get('verwaltung_specific') or {}).get('zustaendig')
+        )
+
+
 class VBPComplianceEngine:
     """Hauptklasse für VBP-Compliance-Validierung"""
     
@@ -83,10 +130,29 @@ class VBPComplianceEngine:
             'validate_fim_interoperability': self._validate_fim_interoperability
         }
         
+        self.compile_rules()
+        
         logger.info("VBP Compliance Engine initialisiert")
     
-    def validate_uds3_process(self, uds3_document: Dict[str, Any]) -> VBPComplianceResult:
-        """Hauptfunktion: Validiert UDS3-Prozessdokument gegen VBP-Standards"""
+    def compile_rules(self) -> None:
+        """Kompiliert all_rules zum Regelplan (erneut aufrufen, wenn Regeln geändert werden)
+        
+        Der Plan enthält je Kategorie die Regeln mit bereits aufgelöster
+        Validator-Funktion, damit die Validierung pro Dokument keine
+        Nachschlagevorgänge mehr braucht.
+        """
+        self._rule_plan = [
+            (category, rules, [(rule, self.validators.get(rule.validator_function)) for rule in rules])
+            for category, rules in self.all_rules.items()
+        ]
+    
+    def validate_uds3_process(self, uds3_document: Dict[str, Any],
+                              process_graph: Optional[Any] = None) -> VBPComplianceResult:
+        """Hauptfunktion: Validiert UDS3-Prozessdokument gegen VBP-Standards
+        
+        process_graph: optionale ProcessGraph-Analyse (z.B. DocumentModel.get_process_graph());
+        liefert Strukturkennzahlen und Struktur-Warnungen ohne erneute Graph-Berechnung.
+        """
         try:
             violations = []
             warnings = []
@@ -94,15 +160,20 @@ class VBPComplianceEngine:
             category_scores = {}
             validation_details = {}
             
+            # Ein Durchlauf über das Dokument für alle Regeln
+            index = ProcessIndex(uds3_document)
+            
             # Jede Regel-Kategorie durchgehen
-            for category, rules in self.all_rules.items():
+            for category, rules, compiled_rules in self._rule_plan:
                 category_violations = []
                 category_warnings = []
                 category_recommendations = []
                 
-                for rule in rules:
+                for rule, validator_func in compiled_rules:
                     try:
-                        result = self._validate_rule(uds3_document, rule)
+                        if validator_func is None:
+                            continue
+                        result = validator_func(index, rule)
                         
                         if result['status'] == 'violation':
                             violation = {
@@ -159,6 +230,14 @@ class VBPComplianceEngine:
                     'score': category_scores[category]
                 }
             
+            # Struktur-Kennzahlen aus der gemeinsamen Graph-Analyse (fließen nicht in Scores ein)
+            if process_graph is not None:
+                structure_warnings = self._structure_warnings(process_graph)
+                warnings.extend(structure_warnings)
+                validation_details['structure'] = dict(
+                    process_graph.summary(), warnings=len(structure_warnings)
+                )
+            
             # Gesamt-Score und Compliance-Level berechnen
             overall_score = self._calculate_overall_score(category_scores)
             compliance_level = self._determine_compliance_level(overall_score, violations)
@@ -175,15 +254,40 @@ class VBPComplianceEngine:
             
         except Exception as e:
             logger.error(f"VBP Compliance-Validierung fehlgeschlagen: {e}")
-            return VBPComplianceResult(
-                overall_level=VBPComplianceLevel.NICHT_KONFORM,
-                compliance_score=0.0,
-                category_scores={},
-                violations=[{'rule_id': 'system_error', 'message': str(e)}],
-                warnings=[],
-                recommendations=[],
-                validation_details={'error': str(e)}
-            )
+            return _error_result(e)
+    
+    def validate_many(self, documents: Iterable[Tuple[str, Union[Dict[str, Any], str]]],
+                      workers: Optional[int] = None,
+                      chunk_size: int = 50) -> Iterator[Tuple[str, VBPComplianceResult]]:
+        """Validiert ein Prozess-Portfolio im Prozess-Pool, Ergebnisse werden gestreamt
+        
+        Args:
+            documents: (document_id, Dokument) - UDS3-Dokument, VPB-Prozess (metadata/
+                elements) oder JSON-String, z.B. VPBSQLiteDB.iter_process_documents();
+                VPB-Prozesse erhalten zusätzlich die Struktur-Prüfung (process_graph_of)
+            workers: Anzahl Worker-Prozesse (None = CPU-Anzahl, 0/1 = ohne Pool)
+            chunk_size: Dokumente pro Auftrag an einen Worker
+            
+        Yields:
+            (document_id, VBPComplianceResult) in Eingabereihenfolge
+        """
+        chunks = _chunked(documents, chunk_size)
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        if workers <= 1:
+            for chunk in chunks:
+                yield from _validate_documents(self, chunk)
+            return
+        
+        window = 4 * workers
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(type(self), self.all_rules)) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_validate_chunk, chunk))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
     
     def _load_bva_rules(self) -> List[VBPValidationRule]:
         """Lädt BVA-Konventionen-Regeln"""
@@ -295,10 +399,13 @@ class VBPComplianceEngine:
             )
         ]
     
-    def _validate_rule(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_rule(self, uds3_document: Union[Dict[str, Any], 'ProcessIndex'],
+                       rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert einzelne Regel"""
         if rule.validator_function in self.validators:
             validator_func = self.validators[rule.validator_function]
+            if not isinstance(uds3_document, ProcessIndex):
+                uds3_document = ProcessIndex(uds3_document)
             return validator_func(uds3_document, rule)
         else:
             return {
@@ -307,10 +414,9 @@ class VBPComplianceEngine:
             }
     
     # Validator-Funktionen
-    def _validate_naming_convention(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_naming_convention(self, index: 'ProcessIndex', rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert Namenskonventionen"""
-        content = uds3_document.get('content', {})
-        process_name = content.get('process_name', '')
+        process_name = index.process_name
         
         pattern = rule.parameters.get('pattern', r'^[A-Z][a-zA-Z0-9_\s]*$')
         max_length = rule.parameters.get('max_length', 100)
@@ -329,7 +435,7 @@ class VBPComplianceEngine:
                 'details': {'actual_length': len(process_name), 'max_length': max_length}
             }
         
-        if not re.match(pattern, process_name):
+        if not _compiled(pattern).match(process_name):
             return {
                 'status': 'violation',
                 'message': 'Prozessname entspricht nicht BVA-Namenskonvention',
@@ -338,10 +444,9 @@ class VBPComplianceEngine:
         
         return {'status': 'passed', 'message': 'Namenskonvention erfüllt'}
     
-    def _validate_process_documentation(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_process_documentation(self, index: 'ProcessIndex', rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert Prozess-Dokumentation"""
-        content = uds3_document.get('content', {})
-        description = content.get('process_description', '')
+        description = index.process_description
         
         min_length = rule.parameters.get('min_doc_length', 50)
         required_sections = rule.parameters.get('required_sections', [])
@@ -363,7 +468,7 @@ class VBPComplianceEngine:
         # Prüfe erforderliche Abschnitte
         missing_sections = []
         for section in required_sections:
-            if section.lower() not in description.lower():
+            if section.lower() not in index.description_lower:
                 missing_sections.append(section)
         
         if missing_sections:
@@ -376,9 +481,9 @@ class VBPComplianceEngine:
         
         return {'status': 'passed', 'message': 'Dokumentation ausreichend'}
     
-    def _validate_responsibility_assignment(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_responsibility_assignment(self, index: 'ProcessIndex', rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert Zuständigkeitszuweisungen"""
-        verwaltung_attrs = uds3_document.get('verwaltungsattribute', {})
+        verwaltung_attrs = index.attributes
         
         # Prüfe Hauptzuständigkeit
         if not verwaltung_attrs.get('zustaendigkeit'):
@@ -389,30 +494,21 @@ class VBPComplianceEngine:
             }
         
         # Prüfe Bearbeiter-Zuordnung in Prozessschritten
-        content = uds3_document.get('content', {})
-        process_steps = content.get('process_steps', [])
-        
-        unassigned_steps = []
-        for step in process_steps:
-            step_type = step.get('step_type', '')
-            if step_type in ['userTask', 'manualTask']:
-                verwaltung_specific = step.get('verwaltung_specific', {})
-                if not verwaltung_specific.get('zustaendig'):
-                    unassigned_steps.append(step.get('step_name', step.get('step_id')))
+        unassigned_steps = index.unassigned_tasks
         
         if unassigned_steps:
             return {
                 'status': 'warning',
                 'message': 'Nicht alle Benutzer-Tasks haben Zuständigkeitszuweisungen',
                 'recommendation': 'Weise allen User-Tasks explizit Bearbeiter zu',
-                'details': {'unassigned_steps': unassigned_steps}
+                'details': {'unassigned_steps': list(unassigned_steps)}
             }
         
         return {'status': 'passed', 'message': 'Zuständigkeiten vollständig definiert'}
     
-    def _validate_legal_basis(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_legal_basis(self, index: 'ProcessIndex', rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert Rechtsgrundlagen"""
-        verwaltung_attrs = uds3_document.get('verwaltungsattribute', {})
+        verwaltung_attrs = index.attributes
         rechtsgrundlage = verwaltung_attrs.get('rechtsgrundlage', '')
         
         if not rechtsgrundlage:
@@ -425,7 +521,7 @@ class VBPComplianceEngine:
         require_paragraph = rule.parameters.get('require_paragraph', True)
         if require_paragraph:
             # Prüfe ob Paragraph-Angabe vorhanden ist
-            if not re.search(r'§\s*\d+', rechtsgrundlage):
+            if not _PARAGRAPH_PATTERN.search(rechtsgrundlage):
                 return {
                     'status': 'warning',
                     'message': 'Spezifische Paragraphen-Angabe fehlt in Rechtsgrundlage',
@@ -435,9 +531,9 @@ class VBPComplianceEngine:
         
         return {'status': 'passed', 'message': 'Rechtsgrundlage vollständig'}
     
-    def _validate_data_protection(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_data_protection(self, index: 'ProcessIndex', rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert Datenschutz-Compliance"""
-        verwaltung_attrs = uds3_document.get('verwaltungsattribute', {})
+        verwaltung_attrs = index.attributes
         
         require_pia = rule.parameters.get('require_pia', True)
         if require_pia:
@@ -453,9 +549,9 @@ class VBPComplianceEngine:
         
         return {'status': 'passed', 'message': 'Datenschutz-Anforderungen erfüllt'}
     
-    def _validate_security_classification(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_security_classification(self, index: 'ProcessIndex', rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert Sicherheitsklassifikation"""
-        verwaltung_attrs = uds3_document.get('verwaltungsattribute', {})
+        verwaltung_attrs = index.attributes
         
         security_level = verwaltung_attrs.get('sicherheitsstufe') or verwaltung_attrs.get('kritikalitaet')
         if not security_level:
@@ -476,9 +572,9 @@ class VBPComplianceEngine:
         
         return {'status': 'passed', 'message': 'Sicherheitsklassifikation korrekt'}
     
-    def _validate_execution_time(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_execution_time(self, index: 'ProcessIndex', rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert Durchlaufzeit-Definition"""
-        verwaltung_attrs = uds3_document.get('verwaltungsattribute', {})
+        verwaltung_attrs = index.attributes
         
         durchlaufzeit = verwaltung_attrs.get('durchlaufzeit')
         if not durchlaufzeit:
@@ -491,9 +587,9 @@ class VBPComplianceEngine:
         
         return {'status': 'passed', 'message': 'Durchlaufzeit definiert'}
     
-    def _validate_cost_transparency(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_cost_transparency(self, index: 'ProcessIndex', rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert Kostentransparenz"""
-        verwaltung_attrs = uds3_document.get('verwaltungsattribute', {})
+        verwaltung_attrs = index.attributes
         
         kosten = verwaltung_attrs.get('kosten')
         if kosten is None:
@@ -505,9 +601,9 @@ class VBPComplianceEngine:
         
         return {'status': 'passed', 'message': 'Kostentransparenz gegeben'}
     
-    def _validate_automation_level(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_automation_level(self, index: 'ProcessIndex', rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert Automatisierungsgrad"""
-        verwaltung_attrs = uds3_document.get('verwaltungsattribute', {})
+        verwaltung_attrs = index.attributes
         
         auto_level = verwaltung_attrs.get('automatisierungsgrad')
         if auto_level is None:
@@ -519,19 +615,19 @@ class VBPComplianceEngine:
         
         return {'status': 'passed', 'message': 'Automatisierungsgrad dokumentiert'}
     
-    def _validate_stakeholder_definition(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_stakeholder_definition(self, index: 'ProcessIndex', rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert Stakeholder-Definition"""
         # Implementierung für Stakeholder-Validierung
         return {'status': 'passed', 'message': 'Stakeholder-Definition ausreichend'}
     
-    def _validate_interface_definition(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_interface_definition(self, index: 'ProcessIndex', rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert Schnittstellen-Definition"""
         # Implementierung für Interface-Validierung  
         return {'status': 'passed', 'message': 'Schnittstellen korrekt definiert'}
     
-    def _validate_fim_interoperability(self, uds3_document: Dict[str, Any], rule: VBPValidationRule) -> Dict[str, Any]:
+    def _validate_fim_interoperability(self, index: 'ProcessIndex', rule: VBPValidationRule) -> Dict[str, Any]:
         """Validiert FIM-Interoperabilität"""
-        verwaltung_attrs = uds3_document.get('verwaltungsattribute', {})
+        verwaltung_attrs = index.attributes
         
         fim_relevant = verwaltung_attrs.get('fim_relevant', False)
         if fim_relevant:
@@ -545,6 +641,30 @@ class VBPComplianceEngine:
         
         return {'status': 'passed', 'message': 'FIM-Interoperabilität gegeben'}
     
+    def _structure_warnings(self, process_graph: Any) -> List[Dict[str, Any]]:
+        """Leitet Struktur-Warnungen aus einer ProcessGraph-Analyse ab"""
+        summary = process_graph.summary()
+        checks = [
+            (not summary['start_elements'], 'Kein Startelement im Prozessmodell',
+             'Definiere einen eindeutigen Prozessstart'),
+            (not summary['end_elements'], 'Kein Endelement im Prozessmodell',
+             'Definiere mindestens ein Prozessende'),
+            (summary['unreachable'] > 0, f"{summary['unreachable']} Prozessschritte sind vom Start aus nicht erreichbar",
+             'Verbinde oder entferne nicht erreichbare Schritte'),
+            (summary['dead_ends'] > 0, f"{summary['dead_ends']} Prozessschritte führen zu keinem Prozessende",
+             'Ergänze fehlende Pfade zum Prozessende'),
+        ]
+        return [
+            {
+                'rule_id': 'struktur_graph',
+                'rule_name': 'Prozessstruktur',
+                'category': 'struktur',
+                'message': message,
+                'recommendation': recommendation
+            }
+            for failed, message, recommendation in checks if failed
+        ]
+    
     def _calculate_category_score(self, rules: List[VBPValidationRule], violations: List[Dict], warnings: List[Dict]) -> float:
         """Berechnet Score für Regel-Kategorie"""
         if not rules:
@@ -678,6 +798,121 @@ class VBPComplianceReport:
         return action_items
 
 
+def to_compliance_document(document: Union[Dict[str, Any], str],
+                           document_id: Optional[str] = None) -> Dict[str, Any]:
+    """Bringt ein Dokument in die UDS3-Form der Compliance-Engine
+    
+    UDS3-Dokumente (mit 'content') werden unverändert übernommen. VPB-Prozesse
+    (metadata/elements, z.B. process_data aus vpb_processes.db) werden abgebildet:
+    Elemente werden Prozessschritte, zuständige Behörden und Rechtsgrundlagen
+    der Elemente werden übernommen.
+    """
+    if isinstance(document, str):
+        document = json.loads(document)
+    if 'content' in document:
+        return document
+    
+    metadata = document.get('metadata') or {}
+    steps = []
+    legal_bases = []
+    for element in document.get('elements') or []:
+        element_type = element.get('element_type', '')
+        legal_basis = element.get('legal_basis') or ''
+        if legal_basis and legal_basis not in legal_bases:
+            legal_bases.append(legal_basis)
+        steps.append({
+            'step_id': element.get('element_id'),
+            'step_name': element.get('name') or element.get('element_id'),
+            'step_type': VPB_STEP_TYPES.get(element_type, element_type),
+            'verwaltung_specific': {
+                'zustaendig': element.get('responsible_authority') or '',
+                'rechtsgrundlage': legal_basis,
+                'frist_tage': element.get('deadline_days') or 0
+            }
+        })
+    
+    attributes = dict(metadata.get('verwaltungsattribute') or {})
+    if legal_bases:
+        attributes.setdefault('rechtsgrundlage', '; '.join(legal_bases))
+    
+    return {
+        'document_id': document_id or metadata.get('process_id') or document.get('process_id', 'unknown'),
+        'document_type': 'verwaltungsprozess_vpb',
+        'content': {
+            'process_name': metadata.get('name') or metadata.get('process_name') or metadata.get('title', ''),
+            'process_description': metadata.get('description', ''),
+            'process_steps': steps
+        },
+        'verwaltungsattribute': attributes
+    }
+
+
+def process_graph_of(document: Union[Dict[str, Any], str]) -> Optional[ProcessGraph]:
+    """ProcessGraph eines VPB-Prozesses (metadata/elements), wie
+    DocumentModel.get_process_graph() ihn liefert
+    
+    UDS3-Dokumente (mit 'content') haben keine Verbindungen: None.
+    """
+    if isinstance(document, str):
+        document = json.loads(document)
+    if 'content' in document or 'elements' not in document:
+        return None
+    return ProcessGraph.from_dict(document)
+
+
+def _error_result(error: Exception) -> VBPComplianceResult:
+    return VBPComplianceResult(
+        overall_level=VBPComplianceLevel.NICHT_KONFORM,
+        compliance_score=0.0,
+        category_scores={},
+        violations=[{'rule_id': 'system_error', 'message': str(error)}],
+        warnings=[],
+        recommendations=[],
+        validation_details={'error': str(error)}
+    )
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, max(1, size)))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _validate_documents(engine: VBPComplianceEngine, chunk: List[Tuple[str, Any]]
+                        ) -> List[Tuple[str, VBPComplianceResult]]:
+    results = []
+    for document_id, document in chunk:
+        try:
+            if isinstance(document, str):
+                document = json.loads(document)
+            result = engine.validate_uds3_process(to_compliance_document(document, document_id),
+                                                  process_graph_of(document))
+        except Exception as e:
+            logger.error(f"Dokument {document_id} nicht lesbar: {e}")
+            result = _error_result(e)
+        results.append((document_id, result))
+    return results
+
+
+# Engine je Worker-Prozess (validate_many)
+_worker_engine: Optional[VBPComplianceEngine] = None
+
+
+def _init_worker(engine_class: type, all_rules: Dict[str, List[VBPValidationRule]]) -> None:
+    global _worker_engine
+    _worker_engine = engine_class()
+    _worker_engine.all_rules = all_rules
+    _worker_engine.compile_rules()
+
+
+def _validate_chunk(chunk: List[Tuple[str, Any]]) -> List[Tuple[str, VBPComplianceResult]]:
+    """Validiert einen Auftrag (läuft im Worker-Prozess)"""
+    return _validate_documents(_worker_engine, chunk)
+
+
 # Export für Integration
 def get_vbp_compliance_engine():
     """Gibt VBP Compliance Engine zurück"""
@@ -27,9 +27,12 @@ Datum: 22. August 2025
 
 import json
 import logging
+import math
+import string
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
-from dataclasses import dataclass
 
 # VPB Integration
 from vpb_sqlite_db import VPBSQLiteDB
@@ -37,29 +40,178 @@ from uds3_vpb_schema import VPBProcessRecord
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Abschnitt -> Builder-Methode des VPBDataPreparator (berechnet nur aus dem Prozess)
+SECTION_BUILDERS: Dict[str, str] = {
+    "process_overview": "_create_process_overview",
+    "structural_analysis": "_create_structural_analysis",
+    "legal_context": "_create_legal_context",
+    "compliance_points": "_create_compliance_analysis",
+    "authorities_involved": "_create_authorities_analysis",
+    "process_flow": "_create_process_flow_description",
+    "bottlenecks_risks": "_create_bottlenecks_analysis",
+    "optimization_potential": "_create_optimization_analysis",
+    "element_details": "_prepare_element_details",
+    "connection_details": "_prepare_connection_details",
+    "metadata": "_create_metadata_context",
+}
+
+# Prompt-Abschnitte nach Priorität (höchste zuerst); bei Token-Budget wird von hinten gekürzt
+SECTION_PRIORITY: Tuple[str, ...] = (
+    "process_overview",
+    "process_flow",
+    "legal_context",
+    "compliance_points",
+    "authorities_involved",
+    "bottlenecks_risks",
+    "optimization_potential",
+    "structural_analysis",
+    "element_details",
+    "connection_details",
+    "data_quality",
+)
+
+PROMPT_TEMPLATE = """Du bist ein Experte für deutsche Verwaltungsprozesse und hilfst bei der Analyse von VPB-Prozessen (Verwaltungsprozess-Beschreibungssprache).
+
+BENUTZERANFRAGE: {query}
+
+PROZESS-ANALYSE-KONTEXT:
+
+{process_overview}
+
+{structural_analysis}
+
+{legal_context}
+
+{compliance_points}
+
+{authorities_involved}
+
+{process_flow}
+
+{bottlenecks_risks}
+
+{optimization_potential}
+
+ELEMENT-DETAILS:
+{element_details}
+
+VERBINDUNGS-DETAILS:
+{connection_details}
+
+DATENQUALITÄT:
+{data_quality}
+
+Bitte analysiere den Prozess basierend auf der Benutzeranfrage und nutze dabei die bereitgestellten strukturierten Informationen. Gib konkrete, auf den deutschen Verwaltungskontext bezogene Antworten.
+"""
+
+TRUNCATION_MARKER = "[… gekürzt]"
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Grobe Token-Schätzung (ca. 4 Zeichen pro Token)"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def template_sections(template: str) -> List[str]:
+    """Im Prompt-Template referenzierte Platzhalter (ohne Duplikate, in Reihenfolge)"""
+    names: List[str] = []
+    for _, field_name, _, _ in string.Formatter().parse(template):
+        if field_name and field_name not in names:
+            names.append(field_name)
+    return names
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """Kürzt an einer Zeilengrenze und markiert die Kürzung ('' wenn nichts übrig bleibt)"""
+    if len(text) <= max_chars:
+        return text
+    keep = max_chars - len(TRUNCATION_MARKER) - 1
+    if keep <= 0:
+        return ""
+    cut = text.rfind("\n", 0, keep)
+    return text[:cut if cut > 0 else keep].rstrip() + "\n" + TRUNCATION_MARKER
+
+
+class _ProcessSections:
+    """Abschnitte eines Prozessstands, je Abschnitt beim ersten Zugriff berechnet"""
+    
+    def __init__(self, preparator: "VPBDataPreparator", process: VPBProcessRecord, version: Optional[str]):
+        self.process = process
+        self.version = version
+        self._preparator = preparator
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, name: str) -> Any:
+        if name in self._values:
+            return self._values[name]
+        with self._lock:
+            if name not in self._values:
+                builder = getattr(self._preparator, SECTION_BUILDERS[name])
+                self._values[name] = builder(self.process)
+            return self._values[name]
+    
+    def built(self) -> List[str]:
+        return [name for name in SECTION_BUILDERS if name in self._values]
+
+
 class VPBLLMContext:
-    """Aufbereiteter VPB-Kontext für LLM-Analyse"""
-    process_overview: str
-    structural_analysis: str  
-    legal_context: str
-    compliance_points: str
-    authorities_involved: str
-    process_flow: str
-    bottlenecks_risks: str
-    optimization_potential: str
-    element_details: List[Dict[str, Any]]
-    connection_details: List[Dict[str, Any]]
-    metadata: Dict[str, Any]
+    """Aufbereiteter VPB-Kontext für LLM-Analyse
+    
+    Die Abschnitte (process_overview, ..., connection_details, metadata) werden
+    erst beim ersten Zugriff berechnet. Kontexte desselben Prozessstands teilen
+    sich die berechneten Abschnitte; nur metadata (query_context, Zeitstempel)
+    gehört zum einzelnen Kontext.
+    """
+    
+    def __init__(self, sections: _ProcessSections, query_context: str = ""):
+        self._sections = sections
+        self.query_context = query_context
+        self._metadata: Optional[Dict[str, Any]] = None
+    
+    def __getattr__(self, name: str) -> Any:
+        if name in SECTION_BUILDERS:
+            return self._sections.get(name)
+        raise AttributeError(name)
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = dict(
+                self._sections.get("metadata"),
+                query_context=self.query_context,
+                analysis_timestamp=datetime.now().isoformat()
+            )
+        return self._metadata
+    
+    @property
+    def process(self) -> VPBProcessRecord:
+        return self._sections.process
+    
+    def built_sections(self) -> List[str]:
+        """Bereits berechnete Abschnitte des Prozessstands"""
+        return self._sections.built()
+
 
 class VPBDataPreparator:
-    """Bereitet VPB-Prozessdaten für LLM-Analyse auf"""
+    """Bereitet VPB-Prozessdaten für LLM-Analyse auf
+    
+    Aufbereitete Prozesse liegen in einem LRU-Cache (cache_size Einträge),
+    adressiert über (process_id, updated_at): wiederholte Anfragen zum selben
+    Prozessstand laden weder aus SQLite nach noch berechnen sie Abschnitte neu.
+    """
     
-    def __init__(self, db_path: str = "vpb_processes.db"):
+    def __init__(self, db_path: str = "vpb_processes.db", cache_size: int = 32):
         """Initialisiert VPB Data Preparator"""
         self.vpb_db = VPBSQLiteDB(db_path)
         self.element_type_descriptions = self._init_element_descriptions()
         self.connection_type_descriptions = self._init_connection_descriptions()
+        self.cache_size = max(0, cache_size)
+        self.count_tokens = estimate_tokens
+        self._cache: "OrderedDict[str, _ProcessSections]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
         
     def _init_element_descriptions(self) -> Dict[str, str]:
         """Initialisiert Element-Typ-Beschreibungen"""
@@ -94,61 +246,48 @@ class VPBDataPreparator:
         }
     
     def prepare_process_for_llm(self, process_id: str, query_context: str = "") -> VPBLLMContext:
-        """Bereitet VPB-Prozess für LLM-Analyse auf"""
+        """Bereitet VPB-Prozess für LLM-Analyse auf
+        
+        Abschnitte werden lazy berechnet; bei unverändertem updated_at kommt
+        der Prozess samt bereits berechneter Abschnitte aus dem Cache.
+        """
+        return VPBLLMContext(self._process_sections(process_id), query_context)
+    
+    def _process_sections(self, process_id: str) -> _ProcessSections:
+        version = self.vpb_db.get_process_version(process_id)
+        with self._cache_lock:
+            cached = self._cache.get(process_id)
+            if cached is not None and version is not None and cached.version == version:
+                self._cache.move_to_end(process_id)
+                self.cache_stats["hits"] += 1
+                return cached
+            self.cache_stats["misses"] += 1
         
         # Prozess aus Database laden
         process = self.vpb_db.load_process(process_id)
         if not process:
+            self.invalidate(process_id)
             raise ValueError(f"Prozess nicht gefunden: {process_id}")
         
         logger.info(f"Bereite VPB-Prozess für LLM auf: {process.name} ({len(process.elements)} Elemente)")
         
-        # 1. Prozess-Überblick erstellen
-        process_overview = self._create_process_overview(process)
-        
-        # 2. Strukturanalyse
-        structural_analysis = self._create_structural_analysis(process)
-        
-        # 3. Rechtlicher Kontext
-        legal_context = self._create_legal_context(process)
-        
-        # 4. Compliance-Punkte
-        compliance_points = self._create_compliance_analysis(process)
-        
-        # 5. Beteiligte Behörden
-        authorities_involved = self._create_authorities_analysis(process)
-        
-        # 6. Prozessfluss-Beschreibung
-        process_flow = self._create_process_flow_description(process)
-        
-        # 7. Engpässe und Risiken
-        bottlenecks_risks = self._create_bottlenecks_analysis(process)
-        
-        # 8. Optimierungspotential
-        optimization_potential = self._create_optimization_analysis(process)
-        
-        # 9. Detaillierte Element-Aufbereitung
-        element_details = self._prepare_element_details(process)
-        
-        # 10. Detaillierte Verbindungs-Aufbereitung
-        connection_details = self._prepare_connection_details(process)
-        
-        # 11. Metadata zusammenstellen
-        metadata = self._create_metadata_context(process, query_context)
-        
-        return VPBLLMContext(
-            process_overview=process_overview,
-            structural_analysis=structural_analysis,
-            legal_context=legal_context,
-            compliance_points=compliance_points,
-            authorities_involved=authorities_involved,
-            process_flow=process_flow,
-            bottlenecks_risks=bottlenecks_risks,
-            optimization_potential=optimization_potential,
-            element_details=element_details,
-            connection_details=connection_details,
-            metadata=metadata
-        )
+        sections = _ProcessSections(self, process, version)
+        if self.cache_size:
+            with self._cache_lock:
+                self._cache[process_id] = sections
+                self._cache.move_to_end(process_id)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+                    self.cache_stats["evictions"] += 1
+        return sections
+    
+    def invalidate(self, process_id: Optional[str] = None) -> None:
+        """Entfernt einen Prozess (None = alle) aus dem Kontext-Cache"""
+        with self._cache_lock:
+            if process_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(process_id, None)
     
     def _create_process_overview(self, process: VPBProcessRecord) -> str:
         """Erstellt Prozess-Überblick für LLM"""
@@ -628,76 +767,92 @@ class VPBDataPreparator:
         
         return (filled_fields / total_fields) if total_fields > 0 else 0.0
     
-    def format_for_llm_prompt(self, llm_context: VPBLLMContext, query: str) -> str:
-        """Formatiert aufbereiteten Kontext für LLM-Prompt"""
-        
-        prompt = f"""Du bist ein Experte für deutsche Verwaltungsprozesse und hilfst bei der Analyse von VPB-Prozessen (Verwaltungsprozess-Beschreibungssprache).
-
-BENUTZERANFRAGE: {query}
-
-PROZESS-ANALYSE-KONTEXT:
-
-{llm_context.process_overview}
-
-{llm_context.structural_analysis}
-
-{llm_context.legal_context}
-
-{llm_context.compliance_points}
-
-{llm_context.authorities_involved}
-
-{llm_context.process_flow}
-
-{llm_context.bottlenecks_risks}
-
-{llm_context.optimization_potential}
-
-ELEMENT-DETAILS:
-"""
-        
-        # Top 10 wichtigste Elemente hinzufügen
-        sorted_elements = sorted(llm_context.element_details, 
+    def format_for_llm_prompt(self, llm_context: VPBLLMContext, query: str,
+                              max_tokens: Optional[int] = None,
+                              template: str = PROMPT_TEMPLATE) -> str:
+        """Formatiert aufbereiteten Kontext für LLM-Prompt
+        
+        Args:
+            llm_context: Kontext aus prepare_process_for_llm()
+            query: Benutzeranfrage ({query} im Template)
+            max_tokens: Token-Budget des Prompts (geschätzt über count_tokens); bei
+                Überschreitung werden Abschnitte niedrigster Priorität zuerst gekürzt
+            template: Prompt-Template; nur referenzierte Abschnitte werden berechnet
+        """
+        values = {"query": query}
+        for name in template_sections(template):
+            if name != "query":
+                values[name] = self._render_section(llm_context, name)
+        
+        if max_tokens is not None:
+            self._fit_token_budget(template, values, max_tokens)
+        return template.format(**values)
+    
+    def _render_section(self, llm_context: VPBLLMContext, name: str) -> str:
+        """Text eines Prompt-Abschnitts"""
+        if name == "element_details":
+            return self._format_element_details(llm_context.element_details)
+        if name == "connection_details":
+            return self._format_connection_details(llm_context.connection_details)
+        if name == "data_quality":
+            data_quality = llm_context.metadata['data_quality']
+            return (
+                f"- Vollständigkeits-Score: {data_quality['completeness_score']:.2f}\n"
+                f"- Elemente mit Beschreibungen: {data_quality['elements_with_descriptions']}\n"
+                f"- Elemente mit Rechtsgrundlagen: {data_quality['elements_with_legal_basis']}"
+            )
+        if name in SECTION_BUILDERS and name != "metadata":
+            return getattr(llm_context, name)
+        raise ValueError(f"Unbekannter Abschnitt im Prompt-Template: {name}")
+    
+    def _fit_token_budget(self, template: str, values: Dict[str, str], max_tokens: int) -> None:
+        """Kürzt Abschnitte (niedrigste Priorität zuerst), bis der Prompt ins Budget passt"""
+        overflow = self.count_tokens(template.format(**values)) - max_tokens
+        ranked = [name for name in SECTION_PRIORITY if name in values]
+        ranked += [name for name in values if name not in ranked and name != "query"]
+        for name in reversed(ranked):
+            if overflow <= 0:
+                return
+            text = values[name]
+            values[name] = _truncate(text, len(text) - overflow * CHARS_PER_TOKEN)
+            overflow = self.count_tokens(template.format(**values)) - max_tokens
+        if overflow > 0:
+            logger.warning(f"Prompt überschreitet Token-Budget auch ohne Abschnitte um {overflow} Tokens")
+    
+    def _format_element_details(self, element_details: List[Dict[str, Any]]) -> str:
+        """Top 10 wichtigste Elemente für den Prompt"""
+        text = ""
+        sorted_elements = sorted(element_details, 
                                key=lambda x: (x.get('deadline_days', 999), -x.get('automation_potential', 0)))[:10]
         
         for element in sorted_elements:
-            prompt += f"\n{element['name']} ({element['type']}):\n"
-            prompt += f"- Beschreibung: {element['description']}\n"
+            text += f"\n{element['name']} ({element['type']}):\n"
+            text += f"- Beschreibung: {element['description']}\n"
             if element['competent_authority']:
-                prompt += f"- Zuständig: {element['competent_authority']}\n"
+                text += f"- Zuständig: {element['competent_authority']}\n"
             if element['deadline_days']:
-                prompt += f"- Bearbeitungszeit: {element['deadline_days']} Tage\n"
+                text += f"- Bearbeitungszeit: {element['deadline_days']} Tage\n"
             if element['compliance_tags']:
-                prompt += f"- Compliance: {', '.join(element['compliance_tags'])}\n"
-        
-        prompt += f"\n\nVERBINDUNGS-DETAILS:\n"
-        
-        # Wichtigste Verbindungen (Engpässe, kritische)
-        important_connections = [c for c in llm_context.connection_details 
+                text += f"- Compliance: {', '.join(element['compliance_tags'])}\n"
+        return text
+    
+    def _format_connection_details(self, connection_details: List[Dict[str, Any]]) -> str:
+        """Wichtigste Verbindungen (Engpässe, kritische) für den Prompt"""
+        text = ""
+        important_connections = [c for c in connection_details 
                                if c.get('bottleneck_indicator') or c.get('compliance_critical')][:5]
         
         for connection in important_connections:
-            prompt += f"\n{connection['source_element']['name']} → {connection['target_element']['name']}:\n"
+            text += f"\n{connection['source_element']['name']} → {connection['target_element']['name']}:\n"
             if connection['condition']:
-                prompt += f"- Bedingung: {connection['condition']}\n"
+                text += f"- Bedingung: {connection['condition']}\n"
             if connection['average_duration_days']:
-                prompt += f"- Durchlaufzeit: {connection['average_duration_days']} Tage\n"
+                text += f"- Durchlaufzeit: {connection['average_duration_days']} Tage\n"
             if connection['bottleneck_indicator']:
-                prompt += f"- ⚠️ Identifizierter Engpass\n"
+                text += f"- ⚠️ Identifizierter Engpass\n"
             if connection['compliance_critical']:
-                prompt += f"- 📋 Compliance-kritisch\n"
-        
-        prompt += f"""
-
-DATENQUALITÄT:
-- Vollständigkeits-Score: {llm_context.metadata['data_quality']['completeness_score']:.2f}
-- Elemente mit Beschreibungen: {llm_context.metadata['data_quality']['elements_with_descriptions']}
-- Elemente mit Rechtsgrundlagen: {llm_context.metadata['data_quality']['elements_with_legal_basis']}
-
-Bitte analysiere den Prozess basierend auf der Benutzeranfrage und nutze dabei die bereitgestellten strukturierten Informationen. Gib konkrete, auf den deutschen Verwaltungskontext bezogene Antworten.
-"""
-        
-        return prompt
+                text += f"- 📋 Compliance-kritisch\n"
+        return text
 
 # Beispiel-Nutzung und Test-Funktion
 if __name__ == "__main__":
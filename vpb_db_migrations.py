@@ -15,6 +15,8 @@ Aktuelle Migrationen:
 1.1
   - Anlage Tabelle schema_migrations
   - Index auf vpb_processes.updated_at
+1.2
+  - Keyset-Index (updated_at, process_id) für die paginierte Prozessliste
 """
 from __future__ import annotations
 
@@ -38,6 +40,12 @@ MIGRATIONS: List[Tuple[str, List[str]]] = [
             "CREATE INDEX IF NOT EXISTS idx_vpb_processes_updated_at ON vpb_processes(updated_at)",
         ],
     ),
+    (
+        "1.2",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_vpb_processes_keyset ON vpb_processes(updated_at, process_id)",
+        ],
+    ),
 ]
 
 
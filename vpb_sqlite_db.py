@@ -25,28 +25,229 @@ Datum: 22. August 2025
 import sqlite3
 import json
 import logging
+import os
+import fnmatch
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from pathlib import Path
 import uuid
 
 from vpb_db_migrations import apply_pending_migrations
+from core.pagination import clamp_limit, decode_cursor, split_page
 
 from uds3_vpb_schema import VPBProcessRecord, VPBElementData, VPBConnectionData, VPBProcessStatus, VPBAuthorityLevel, VPBLegalContext
 from config import VPB_PROCESSES_DB
 
 logger = logging.getLogger(__name__)
 
+# Pragmas für jede verwaltete Verbindung (WAL: Leser blockieren Schreiber nicht)
+CONNECTION_PRAGMAS: Tuple[str, ...] = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -20000",  # ~20 MB Page-Cache
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Spalten der Detailtabellen (ohne process_id); Reihenfolge = Reihenfolge der Row-Tupel
+ELEMENT_COLUMNS: Tuple[str, ...] = (
+    "element_id", "element_type", "name", "x", "y", "width", "height",
+    "description", "legal_basis", "competent_authority", "deadline_days", "swimlane",
+    "geo_relevance", "admin_level", "compliance_tags", "risk_level",
+    "automation_potential", "citizen_impact",
+)
+CONNECTION_COLUMNS: Tuple[str, ...] = (
+    "connection_id", "source_element_id", "target_element_id",
+    "source_point_x", "source_point_y", "target_point_x", "target_point_y",
+    "connection_type", "condition", "label", "style", "probability",
+    "average_duration_days", "bottleneck_indicator", "compliance_critical",
+)
+PROCESS_COLUMNS: Tuple[str, ...] = (
+    "process_id", "name", "description", "version", "status",
+    "legal_context", "authority_level", "responsible_authority",
+    "involved_authorities", "legal_basis", "created_at", "updated_at",
+    "created_by", "last_modified_by", "complexity_score",
+    "automation_score", "compliance_score", "citizen_satisfaction_score",
+    "geo_scope", "geo_coordinates", "tags", "process_data",
+)
+
+
+# Projektion der Listenansicht (ohne process_data)
+LIST_COLUMNS: Tuple[str, ...] = (
+    "process_id", "name", "description", "status", "authority_level", "legal_context",
+    "updated_at", "complexity_score", "automation_score", "compliance_score", "tags",
+)
+
+
+def _list_filters(status: Optional[str], authority_level: Optional[str],
+                  tags: Optional[Iterable[str]]) -> Tuple[List[str], List[Any]]:
+    """WHERE-Bedingungen der Listenabfragen (Filter werden in SQL ausgewertet)."""
+    conditions: List[str] = []
+    params: List[Any] = []
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+    if authority_level:
+        conditions.append("authority_level = ?")
+        params.append(authority_level)
+    for tag in tags or ():
+        conditions.append("EXISTS (SELECT 1 FROM json_each(vpb_processes.tags) WHERE value = ?)")
+        params.append(tag)
+    return conditions, params
+
+
+def _list_entry(row: sqlite3.Row) -> Dict[str, Any]:
+    entry = {column: row[column] for column in LIST_COLUMNS}
+    entry["tags"] = json.loads(entry["tags"]) if entry["tags"] else []
+    return entry
+
+
+def _upsert_sql(table: str, columns: Tuple[str, ...], conflict: Tuple[str, ...]) -> str:
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in conflict)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT({', '.join(conflict)}) DO UPDATE SET {updates}"
+    )
+
+
+def _insert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+_PROCESS_UPSERT = _upsert_sql("vpb_processes", PROCESS_COLUMNS, ("process_id",))
+_ELEMENT_UPSERT = _upsert_sql("vpb_elements", ("process_id",) + ELEMENT_COLUMNS, ("process_id", "element_id"))
+_CONNECTION_UPSERT = _upsert_sql("vpb_connections", ("process_id",) + CONNECTION_COLUMNS, ("process_id", "connection_id"))
+_ELEMENT_INSERT = _insert_sql("vpb_elements", ("process_id",) + ELEMENT_COLUMNS)
+_CONNECTION_INSERT = _insert_sql("vpb_connections", ("process_id",) + CONNECTION_COLUMNS)
+
+
+def _process_row(process: VPBProcessRecord) -> Tuple[Any, ...]:
+    return (
+        process.process_id, process.name, process.description,
+        process.version, process.status.value, process.legal_context.value,
+        process.authority_level.value, process.responsible_authority,
+        json.dumps(process.involved_authorities), json.dumps(process.legal_basis),
+        process.created_at.isoformat(), process.updated_at.isoformat(),
+        process.created_by, process.last_modified_by, process.complexity_score,
+        process.automation_score, process.compliance_score, process.citizen_satisfaction_score,
+        process.geo_scope, json.dumps(process.geo_coordinates) if process.geo_coordinates else None,
+        json.dumps(process.tags), json.dumps(process.to_dict())
+    )
+
+
+def _element_row(element: VPBElementData) -> Tuple[Any, ...]:
+    return (
+        element.element_id, element.element_type,
+        element.name, element.x, element.y, element.width, element.height,
+        element.description, element.legal_basis, element.competent_authority,
+        element.deadline_days, element.swimlane, element.geo_relevance,
+        element.admin_level, json.dumps(element.compliance_tags),
+        element.risk_level, element.automation_potential, element.citizen_impact
+    )
+
+
+def _connection_row(connection: VPBConnectionData) -> Tuple[Any, ...]:
+    # Normalisierung connection_type (Uppercase Domain-Konsistenz)
+    ctype = (connection.connection_type or "").upper()
+    return (
+        connection.connection_id,
+        connection.source_element_id, connection.target_element_id,
+        connection.source_point[0], connection.source_point[1],
+        connection.target_point[0], connection.target_point[1],
+        ctype, connection.condition, connection.label,
+        connection.style, connection.probability, connection.average_duration_days,
+        connection.bottleneck_indicator, connection.compliance_critical
+    )
+
+
+class _ConnectionManager:
+    """
+    Persistente SQLite-Verbindungen, eine pro Thread.
+
+    sqlite3-Verbindungen dürfen nicht zwischen Threads geteilt werden; jeder
+    Thread erhält beim ersten Zugriff eine eigene Verbindung (mit Pragmas),
+    die bis close() wiederverwendet wird.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    def get(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: Transaktionen werden explizit über transaction() gesteuert
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Schreibtransaktion (BEGIN IMMEDIATE ... COMMIT, Rollback bei Fehler)."""
+        conn = self.get()
+        if conn.in_transaction:
+            # Verschachtelt: äußere Transaktion entscheidet über Commit/Rollback
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Schließt alle Verbindungen (aller Threads)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+
 class VPBSQLiteDB:
-    """SQLite Database für VPB Process Designer"""
+    """SQLite Database für VPB Process Designer
+
+    Hält pro Thread eine persistente Verbindung (WAL-Modus). Speichern
+    schreibt Elemente/Verbindungen per executemany als Diff-Upsert: nur
+    neue/geänderte Zeilen werden geschrieben, entfernte gelöscht.
+    """
     
     def __init__(self, db_path: str = None):
         """Initialisiert VPB SQLite Database"""
         if db_path is None:
             db_path = VPB_PROCESSES_DB
         self.db_path = Path(db_path)
+        self._connections = _ConnectionManager(self.db_path)
         self.init_database()
     
+    def close(self) -> None:
+        """Schließt alle offenen Verbindungen"""
+        self._connections.close()
+    
+    def __enter__(self) -> "VPBSQLiteDB":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
     def init_database(self):
         """Erstellt Database-Schema falls nicht vorhanden"""
         try:
@@ -152,244 +353,257 @@ class VPBSQLiteDB:
             raise
     
     def save_process(self, process: VPBProcessRecord) -> bool:
-        """Speichert VPB-Prozess in SQLite"""
+        """Speichert VPB-Prozess in SQLite (Diff-Upsert in einer Transaktion)"""
         try:
-            process.updated_at = datetime.now()
-            process.update_scores()
-            
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("PRAGMA foreign_keys = ON")
-                
-                # Hauptprozess speichern
-                conn.execute("""
-                    INSERT OR REPLACE INTO vpb_processes (
-                        process_id, name, description, version, status,
-                        legal_context, authority_level, responsible_authority,
-                        involved_authorities, legal_basis, created_at, updated_at,
-                        created_by, last_modified_by, complexity_score,
-                        automation_score, compliance_score, citizen_satisfaction_score,
-                        geo_scope, geo_coordinates, tags, process_data
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    process.process_id, process.name, process.description,
-                    process.version, process.status.value, process.legal_context.value,
-                    process.authority_level.value, process.responsible_authority,
-                    json.dumps(process.involved_authorities), json.dumps(process.legal_basis),
-                    process.created_at.isoformat(), process.updated_at.isoformat(),
-                    process.created_by, process.last_modified_by, process.complexity_score,
-                    process.automation_score, process.compliance_score, process.citizen_satisfaction_score,
-                    process.geo_scope, json.dumps(process.geo_coordinates) if process.geo_coordinates else None,
-                    json.dumps(process.tags), json.dumps(process.to_dict())
-                ))
-                
-                # Alte Elemente und Verbindungen löschen
-                conn.execute("DELETE FROM vpb_elements WHERE process_id = ?", (process.process_id,))
-                conn.execute("DELETE FROM vpb_connections WHERE process_id = ?", (process.process_id,))
-                
-                # Elemente speichern
-                for element in process.elements:
-                    conn.execute("""
-                        INSERT INTO vpb_elements (
-                            process_id, element_id, element_type, name, x, y,
-                            width, height, description, legal_basis, competent_authority,
-                            deadline_days, swimlane, geo_relevance, admin_level,
-                            compliance_tags, risk_level, automation_potential, citizen_impact
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        process.process_id, element.element_id, element.element_type,
-                        element.name, element.x, element.y, element.width, element.height,
-                        element.description, element.legal_basis, element.competent_authority,
-                        element.deadline_days, element.swimlane, element.geo_relevance,
-                        element.admin_level, json.dumps(element.compliance_tags),
-                        element.risk_level, element.automation_potential, element.citizen_impact
-                    ))
-                
-                # Verbindungen speichern  
-                for connection in process.connections:
-                    # Normalisierung connection_type (Uppercase Domain-Konsistenz)
-                    ctype = (connection.connection_type or "").upper()
-                    conn.execute("""
-                        INSERT INTO vpb_connections (
-                            process_id, connection_id, source_element_id, target_element_id,
-                            source_point_x, source_point_y, target_point_x, target_point_y,
-                            connection_type, condition, label, style, probability,
-                            average_duration_days, bottleneck_indicator, compliance_critical
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        process.process_id, connection.connection_id,
-                        connection.source_element_id, connection.target_element_id,
-                        connection.source_point[0], connection.source_point[1],
-                        connection.target_point[0], connection.target_point[1],
-                        ctype, connection.condition, connection.label,
-                        connection.style, connection.probability, connection.average_duration_days,
-                        connection.bottleneck_indicator, connection.compliance_critical
-                    ))
-                
-                conn.commit()
-                logger.info(f"Prozess gespeichert: {process.process_id} - {process.name}")
-                return True
+            with self._connections.transaction() as conn:
+                self._write_process(conn, process)
+            logger.info(f"Prozess gespeichert: {process.process_id} - {process.name}")
+            return True
                 
         except Exception as e:
             logger.error(f"Fehler beim Speichern: {e}")
             return False
     
+    def save_processes(self, processes: Iterable[VPBProcessRecord]) -> int:
+        """Speichert mehrere Prozesse in einer Transaktion (Bulk-Import)
+        
+        Returns:
+            Anzahl gespeicherter Prozesse (0 bei Fehler, dann wird nichts übernommen)
+        """
+        count = 0
+        try:
+            with self._connections.transaction() as conn:
+                for process in processes:
+                    self._write_process(conn, process)
+                    count += 1
+            logger.info(f"{count} Prozesse gespeichert")
+            return count
+        except Exception as e:
+            logger.error(f"Fehler beim Bulk-Speichern: {e}")
+            return 0
+    
+    def _write_process(self, conn: sqlite3.Connection, process: VPBProcessRecord) -> Dict[str, int]:
+        """Schreibt Prozesszeile und Detail-Diffs; gibt Zähler der geänderten Zeilen zurück"""
+        process.updated_at = datetime.now()
+        process.update_scores()
+        
+        # Hauptprozess (Upsert statt INSERT OR REPLACE: REPLACE löscht die Zeile
+        # und würde per ON DELETE CASCADE alle Detailzeilen mitreißen)
+        conn.execute(_PROCESS_UPSERT, _process_row(process))
+        
+        stats = {}
+        stats["elements"] = self._sync_rows(
+            conn, "vpb_elements", "element_id", ELEMENT_COLUMNS, (_ELEMENT_INSERT, _ELEMENT_UPSERT),
+            process.process_id, (_element_row(e) for e in process.elements),
+        )
+        stats["connections"] = self._sync_rows(
+            conn, "vpb_connections", "connection_id", CONNECTION_COLUMNS, (_CONNECTION_INSERT, _CONNECTION_UPSERT),
+            process.process_id, (_connection_row(c) for c in process.connections),
+        )
+        return stats
+    
+    @staticmethod
+    def _sync_rows(conn: sqlite3.Connection, table: str, key: str, columns: Tuple[str, ...],
+                   write_sql: Tuple[str, str], process_id: str, rows: Iterable[Tuple[Any, ...]]) -> int:
+        """Gleicht die Detailzeilen eines Prozesses ab: nur neue/geänderte schreiben, entfernte löschen"""
+        existing = {
+            row[0]: tuple(row)
+            for row in conn.execute(
+                f"SELECT {', '.join(columns)} FROM {table} WHERE process_id = ?", (process_id,)
+            )
+        }
+        changed = []
+        seen = set()
+        for row in rows:
+            seen.add(row[0])
+            if existing.get(row[0]) != row:
+                changed.append((process_id,) + row)
+        removed = [(process_id, rid) for rid in existing if rid not in seen]
+        
+        if removed:
+            conn.executemany(f"DELETE FROM {table} WHERE process_id = ? AND {key} = ?", removed)
+        if changed:
+            # Neuer Prozess: einfaches INSERT, sonst Upsert auf (process_id, id)
+            conn.executemany(write_sql[1] if existing else write_sql[0], changed)
+        return len(changed) + len(removed)
+    
     def load_process(self, process_id: str) -> Optional[VPBProcessRecord]:
         """Lädt VPB-Prozess aus SQLite"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                # Hauptprozess laden
-                cursor = conn.execute("SELECT * FROM vpb_processes WHERE process_id = ?", (process_id,))
-                process_row = cursor.fetchone()
-                
-                if not process_row:
-                    logger.warning(f"Prozess nicht gefunden: {process_id}")
-                    return None
-                
-                # Elemente laden
-                cursor = conn.execute("SELECT * FROM vpb_elements WHERE process_id = ?", (process_id,))
-                element_rows = cursor.fetchall()
-                
-                # Verbindungen laden
-                cursor = conn.execute("SELECT * FROM vpb_connections WHERE process_id = ?", (process_id,))
-                connection_rows = cursor.fetchall()
-                
-                # VPBProcessRecord rekonstruieren
-                process = VPBProcessRecord(
-                    process_id=process_row["process_id"],
-                    name=process_row["name"],
-                    description=process_row["description"] or "",
-                    version=process_row["version"],
-                    status=VPBProcessStatus(process_row["status"]),
-                    legal_context=VPBLegalContext(process_row["legal_context"]),
-                    authority_level=VPBAuthorityLevel(process_row["authority_level"]),
-                    responsible_authority=process_row["responsible_authority"] or "",
-                    involved_authorities=json.loads(process_row["involved_authorities"] or "[]"),
-                    legal_basis=json.loads(process_row["legal_basis"] or "[]"),
-                    created_at=datetime.fromisoformat(process_row["created_at"]),
-                    updated_at=datetime.fromisoformat(process_row["updated_at"]),
-                    created_by=process_row["created_by"],
-                    last_modified_by=process_row["last_modified_by"],
-                    complexity_score=process_row["complexity_score"],
-                    automation_score=process_row["automation_score"],
-                    compliance_score=process_row["compliance_score"],
-                    citizen_satisfaction_score=process_row["citizen_satisfaction_score"],
-                    geo_scope=process_row["geo_scope"],
-                    geo_coordinates=json.loads(process_row["geo_coordinates"]) if process_row["geo_coordinates"] else None,
-                    tags=json.loads(process_row["tags"] or "[]")
+            conn = self._connections.get()
+            # Hauptprozess laden
+            cursor = conn.execute("SELECT * FROM vpb_processes WHERE process_id = ?", (process_id,))
+            process_row = cursor.fetchone()
+            
+            if not process_row:
+                logger.warning(f"Prozess nicht gefunden: {process_id}")
+                return None
+            
+            # Elemente laden
+            cursor = conn.execute("SELECT * FROM vpb_elements WHERE process_id = ?", (process_id,))
+            element_rows = cursor.fetchall()
+            
+            # Verbindungen laden
+            cursor = conn.execute("SELECT * FROM vpb_connections WHERE process_id = ?", (process_id,))
+            connection_rows = cursor.fetchall()
+            
+            # VPBProcessRecord rekonstruieren
+            process = VPBProcessRecord(
+                process_id=process_row["process_id"],
+                name=process_row["name"],
+                description=process_row["description"] or "",
+                version=process_row["version"],
+                status=VPBProcessStatus(process_row["status"]),
+                legal_context=VPBLegalContext(process_row["legal_context"]),
+                authority_level=VPBAuthorityLevel(process_row["authority_level"]),
+                responsible_authority=process_row["responsible_authority"] or "",
+                involved_authorities=json.loads(process_row["involved_authorities"] or "[]"),
+                legal_basis=json.loads(process_row["legal_basis"] or "[]"),
+                created_at=datetime.fromisoformat(process_row["created_at"]),
+                updated_at=datetime.fromisoformat(process_row["updated_at"]),
+                created_by=process_row["created_by"],
+                last_modified_by=process_row["last_modified_by"],
+                complexity_score=process_row["complexity_score"],
+                automation_score=process_row["automation_score"],
+                compliance_score=process_row["compliance_score"],
+                citizen_satisfaction_score=process_row["citizen_satisfaction_score"],
+                geo_scope=process_row["geo_scope"],
+                geo_coordinates=json.loads(process_row["geo_coordinates"]) if process_row["geo_coordinates"] else None,
+                tags=json.loads(process_row["tags"] or "[]")
+            )
+            
+            # Elemente hinzufügen
+            for row in element_rows:
+                element = VPBElementData(
+                    element_id=row["element_id"],
+                    element_type=row["element_type"],
+                    name=row["name"],
+                    x=row["x"],
+                    y=row["y"],
+                    width=row["width"],
+                    height=row["height"],
+                    description=row["description"] or "",
+                    legal_basis=row["legal_basis"] or "",
+                    competent_authority=row["competent_authority"] or "",
+                    deadline_days=row["deadline_days"],
+                    swimlane=row["swimlane"] or "",
+                    geo_relevance=bool(row["geo_relevance"]),
+                    admin_level=row["admin_level"],
+                    compliance_tags=json.loads(row["compliance_tags"] or "[]"),
+                    risk_level=row["risk_level"],
+                    automation_potential=row["automation_potential"],
+                    citizen_impact=row["citizen_impact"]
                 )
-                
-                # Elemente hinzufügen
-                for row in element_rows:
-                    element = VPBElementData(
-                        element_id=row["element_id"],
-                        element_type=row["element_type"],
-                        name=row["name"],
-                        x=row["x"],
-                        y=row["y"],
-                        width=row["width"],
-                        height=row["height"],
-                        description=row["description"] or "",
-                        legal_basis=row["legal_basis"] or "",
-                        competent_authority=row["competent_authority"] or "",
-                        deadline_days=row["deadline_days"],
-                        swimlane=row["swimlane"] or "",
-                        geo_relevance=bool(row["geo_relevance"]),
-                        admin_level=row["admin_level"],
-                        compliance_tags=json.loads(row["compliance_tags"] or "[]"),
-                        risk_level=row["risk_level"],
-                        automation_potential=row["automation_potential"],
-                        citizen_impact=row["citizen_impact"]
-                    )
-                    process.elements.append(element)
-                
-                # Verbindungen hinzufügen
-                for row in connection_rows:
-                    connection = VPBConnectionData(
-                        connection_id=row["connection_id"],
-                        source_element_id=row["source_element_id"],
-                        target_element_id=row["target_element_id"],
-                        source_point=(row["source_point_x"], row["source_point_y"]),
-                        target_point=(row["target_point_x"], row["target_point_y"]),
-                        connection_type=row["connection_type"],
-                        condition=row["condition"] or "",
-                        label=row["label"] or "",
-                        style=row["style"],
-                        probability=row["probability"],
-                        average_duration_days=row["average_duration_days"],
-                        bottleneck_indicator=bool(row["bottleneck_indicator"]),
-                        compliance_critical=bool(row["compliance_critical"])
-                    )
-                    process.connections.append(connection)
-                
-                logger.info(f"Prozess geladen: {process_id} - {process.name}")
-                return process
-                
+                process.elements.append(element)
+            
+            # Verbindungen hinzufügen
+            for row in connection_rows:
+                connection = VPBConnectionData(
+                    connection_id=row["connection_id"],
+                    source_element_id=row["source_element_id"],
+                    target_element_id=row["target_element_id"],
+                    source_point=(row["source_point_x"], row["source_point_y"]),
+                    target_point=(row["target_point_x"], row["target_point_y"]),
+                    connection_type=row["connection_type"],
+                    condition=row["condition"] or "",
+                    label=row["label"] or "",
+                    style=row["style"],
+                    probability=row["probability"],
+                    average_duration_days=row["average_duration_days"],
+                    bottleneck_indicator=bool(row["bottleneck_indicator"]),
+                    compliance_critical=bool(row["compliance_critical"])
+                )
+                process.connections.append(connection)
+            
+            logger.info(f"Prozess geladen: {process_id} - {process.name}")
+            return process
+            
         except Exception as e:
             logger.error(f"Fehler beim Laden: {e}")
             return None
-    
+
+    def get_process_version(self, process_id: str) -> Optional[str]:
+        """Stand eines Prozesses (updated_at) ohne Elemente/Verbindungen zu laden"""
+        try:
+            row = self._connections.get().execute(
+                "SELECT updated_at FROM vpb_processes WHERE process_id = ?", (process_id,)
+            ).fetchone()
+            return row["updated_at"] if row else None
+
+        except Exception as e:
+            logger.error(f"Fehler beim Lesen des Prozess-Stands: {e}")
+            return None
+
     def list_processes(self, status: Optional[str] = None, authority_level: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Listet alle Prozesse auf"""
+        """Listet alle Prozesse auf (ohne process_data)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                query = "SELECT * FROM vpb_processes"
-                params = []
-                
-                conditions = []
-                if status:
-                    conditions.append("status = ?")
-                    params.append(status)
-                if authority_level:
-                    conditions.append("authority_level = ?")
-                    params.append(authority_level)
-                
-                if conditions:
-                    query += " WHERE " + " AND ".join(conditions)
-                
-                query += " ORDER BY updated_at DESC"
-                
-                cursor = conn.execute(query, params)
-                rows = cursor.fetchall()
-                
-                processes = []
-                for row in rows:
-                    processes.append({
-                        "process_id": row["process_id"],
-                        "name": row["name"],
-                        "description": row["description"],
-                        "status": row["status"],
-                        "authority_level": row["authority_level"],
-                        "legal_context": row["legal_context"],
-                        "updated_at": row["updated_at"],
-                        "complexity_score": row["complexity_score"],
-                        "automation_score": row["automation_score"],
-                        "compliance_score": row["compliance_score"]
-                    })
-                
-                return processes
-                
+            conditions, params = _list_filters(status, authority_level, None)
+            query = f"SELECT {', '.join(LIST_COLUMNS)} FROM vpb_processes"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += " ORDER BY updated_at DESC, process_id DESC"
+
+            rows = self._connections.get().execute(query, params).fetchall()
+            return [_list_entry(row) for row in rows]
+            
         except Exception as e:
             logger.error(f"Fehler beim Auflisten: {e}")
             return []
+
+    def list_processes_page(self, limit: Optional[int] = None, cursor: Optional[str] = None,
+                            status: Optional[str] = None, authority_level: Optional[str] = None,
+                            tags: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Eine Seite der Prozessliste (Keyset-Pagination auf (updated_at, process_id)).
+
+        Args:
+            limit: Seitengröße (1..MAX_PAGE_SIZE, Standard DEFAULT_PAGE_SIZE)
+            cursor: next_cursor der vorherigen Seite
+            status / authority_level: Filter (im SQL ausgewertet)
+            tags: Alle angegebenen Tags müssen am Prozess gesetzt sein
+
+        Returns:
+            {"processes": [...], "next_cursor": str | None, "limit": int}
+
+        Raises:
+            InvalidCursorError: Cursor nicht dekodierbar
+        """
+        limit = clamp_limit(limit)
+        conditions, params = _list_filters(status, authority_level, tags)
+        if cursor:
+            updated_at, process_id = decode_cursor(cursor)
+            # Row-Value-Vergleich -> Bereichssuche im Index (updated_at, process_id)
+            conditions.append("(updated_at, process_id) < (?, ?)")
+            params.extend((updated_at, process_id))
+
+        query = f"SELECT {', '.join(LIST_COLUMNS)} FROM vpb_processes"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY updated_at DESC, process_id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        try:
+            rows = self._connections.get().execute(query, params).fetchall()
+        except Exception as e:
+            logger.error(f"Fehler beim Auflisten: {e}")
+            rows = []
+
+        page, next_cursor = split_page(rows, limit, lambda row: (row["updated_at"], row["process_id"]))
+        return {"processes": [_list_entry(row) for row in page], "next_cursor": next_cursor, "limit": limit}
     
     def delete_process(self, process_id: str) -> bool:
         """Löscht Prozess aus SQLite"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("PRAGMA foreign_keys = ON")
+            with self._connections.transaction() as conn:
                 cursor = conn.execute("DELETE FROM vpb_processes WHERE process_id = ?", (process_id,))
-                
-                if cursor.rowcount > 0:
-                    conn.commit()
-                    logger.info(f"Prozess gelöscht: {process_id}")
-                    return True
-                else:
-                    logger.warning(f"Prozess nicht gefunden zum Löschen: {process_id}")
-                    return False
+                deleted = cursor.rowcount > 0
+            
+            if deleted:
+                logger.info(f"Prozess gelöscht: {process_id}")
+                return True
+            else:
+                logger.warning(f"Prozess nicht gefunden zum Löschen: {process_id}")
+                return False
                     
         except Exception as e:
             logger.error(f"Fehler beim Löschen: {e}")
@@ -398,51 +612,219 @@ class VPBSQLiteDB:
     def get_statistics(self) -> Dict[str, Any]:
         """Erstellt Database-Statistiken"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                stats = {}
-                
-                # Prozess-Anzahlen
-                cursor = conn.execute("SELECT COUNT(*) as total FROM vpb_processes")
-                stats["total_processes"] = cursor.fetchone()["total"]
-                
-                # Status-Verteilung
-                cursor = conn.execute("SELECT status, COUNT(*) as count FROM vpb_processes GROUP BY status")
-                stats["by_status"] = {row["status"]: row["count"] for row in cursor.fetchall()}
-                
-                # Behörden-Verteilung
-                cursor = conn.execute("SELECT authority_level, COUNT(*) as count FROM vpb_processes GROUP BY authority_level")
-                stats["by_authority"] = {row["authority_level"]: row["count"] for row in cursor.fetchall()}
-                
-                # Durchschnittliche Scores
-                cursor = conn.execute("""
-                    SELECT 
-                        AVG(complexity_score) as avg_complexity,
-                        AVG(automation_score) as avg_automation,
-                        AVG(compliance_score) as avg_compliance
-                    FROM vpb_processes
-                """)
-                row = cursor.fetchone()
-                stats["average_scores"] = {
-                    "complexity": round(row["avg_complexity"] or 0, 3),
-                    "automation": round(row["avg_automation"] or 0, 3),
-                    "compliance": round(row["avg_compliance"] or 0, 3)
-                }
-                
-                # Element- und Verbindungs-Anzahlen
-                cursor = conn.execute("SELECT COUNT(*) as total FROM vpb_elements")
-                stats["total_elements"] = cursor.fetchone()["total"]
-                
-                cursor = conn.execute("SELECT COUNT(*) as total FROM vpb_connections")
-                stats["total_connections"] = cursor.fetchone()["total"]
-                
-                return stats
-                
+            conn = self._connections.get()
+            stats = {}
+            
+            # Prozess-Anzahlen
+            cursor = conn.execute("SELECT COUNT(*) as total FROM vpb_processes")
+            stats["total_processes"] = cursor.fetchone()["total"]
+            
+            # Status-Verteilung
+            cursor = conn.execute("SELECT status, COUNT(*) as count FROM vpb_processes GROUP BY status")
+            stats["by_status"] = {row["status"]: row["count"] for row in cursor.fetchall()}
+            
+            # Behörden-Verteilung
+            cursor = conn.execute("SELECT authority_level, COUNT(*) as count FROM vpb_processes GROUP BY authority_level")
+            stats["by_authority"] = {row["authority_level"]: row["count"] for row in cursor.fetchall()}
+            
+            # Durchschnittliche Scores
+            cursor = conn.execute("""
+                SELECT 
+                    AVG(complexity_score) as avg_complexity,
+                    AVG(automation_score) as avg_automation,
+                    AVG(compliance_score) as avg_compliance
+                FROM vpb_processes
+            """)
+            row = cursor.fetchone()
+            stats["average_scores"] = {
+                "complexity": round(row["avg_complexity"] or 0, 3),
+                "automation": round(row["avg_automation"] or 0, 3),
+                "compliance": round(row["avg_compliance"] or 0, 3)
+            }
+            
+            # Element- und Verbindungs-Anzahlen
+            cursor = conn.execute("SELECT COUNT(*) as total FROM vpb_elements")
+            stats["total_elements"] = cursor.fetchone()["total"]
+            
+            cursor = conn.execute("SELECT COUNT(*) as total FROM vpb_connections")
+            stats["total_connections"] = cursor.fetchone()["total"]
+            
+            return stats
+            
         except Exception as e:
             logger.error(f"Fehler bei Statistik-Erstellung: {e}")
             return {}
 
+    # ------------------------------------------------------------------
+    # Bulk Import / Export
+    # ------------------------------------------------------------------
+    
+    def import_directory(self, directory: str, pattern: str = "*.vpb.json", workers: Optional[int] = None,
+                         batch_size: int = 200, progress: Optional[Callable[[int, int, float], None]] = None
+                         ) -> Dict[str, Any]:
+        """Importiert alle VPB-JSON-Dateien eines Verzeichnisses
+        
+        Dateien werden gestreamt aufgelistet, in einem Prozess-Pool geparst und
+        migriert und von diesem (einzigen) Schreiber in Batches zu je
+        batch_size Prozessen pro Transaktion gespeichert. Schlägt ein Batch
+        fehl, werden seine Prozesse einzeln wiederholt; nur die Dateien, die
+        dabei scheitern, landen mit ihrem Fehler in errors.
+        
+        Args:
+            directory: Quellverzeichnis (z.B. processes/)
+            pattern: Glob-Muster der Dateien
+            workers: Anzahl Parser-Prozesse (None = CPU-Anzahl, 0/1 = ohne Pool)
+            batch_size: Prozesse pro Schreibtransaktion
+            progress: Callback(importiert, fehlgeschlagen, records_per_second)
+            
+        Returns:
+            Statistik: files, imported, failed, errors [(datei, fehler)], seconds, records_per_second
+        """
+        files = _iter_files(Path(directory), pattern)
+        stats: Dict[str, Any] = {"files": 0, "imported": 0, "failed": 0, "errors": []}
+        batch: List[Tuple[str, VPBProcessRecord]] = []
+        start = time.perf_counter()
+        
+        def flush() -> None:
+            if not batch:
+                return
+            saved = self.save_processes(process for _, process in batch)
+            if saved != len(batch):
+                # Batch verworfen: einzeln wiederholen, um die fehlerhaften Dateien zu finden
+                saved = 0
+                for path, process in batch:
+                    try:
+                        with self._connections.transaction() as conn:
+                            self._write_process(conn, process)
+                        saved += 1
+                    except Exception as e:
+                        stats["failed"] += 1
+                        stats["errors"].append((path, str(e)))
+            stats["imported"] += saved
+            batch.clear()
+            if progress:
+                progress(stats["imported"], stats["failed"], _rate(stats["imported"], start))
+        
+        for path, process, error in _parse_files(files, workers):
+            stats["files"] += 1
+            if process is None:
+                stats["failed"] += 1
+                stats["errors"].append((path, error))
+                continue
+            batch.append((path, process))
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+        
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        stats["records_per_second"] = round(_rate(stats["imported"], start), 1)
+        logger.info(f"Verzeichnis-Import: {stats['imported']} importiert, {stats['failed']} fehlgeschlagen "
+                    f"({stats['records_per_second']} rec/s)")
+        return stats
+    
+    def iter_process_documents(self, fetch_size: int = 200) -> Iterator[Tuple[str, str]]:
+        """Streamt (process_id, JSON-Dokument) aller Prozesse per Cursor
+        
+        Nutzt die JSON-Sicherung aus process_data, ohne VPBProcessRecord-Objekte
+        zu erzeugen. Nur Prozesse ohne Sicherung werden über load_process() geladen.
+        """
+        # Eigene Verbindung: der Cursor bleibt während des Streams offen
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute("SELECT process_id, process_data FROM vpb_processes ORDER BY process_id")
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                for process_id, process_data in rows:
+                    if process_data:
+                        yield process_id, process_data
+                        continue
+                    process = self.load_process(process_id)
+                    if process is not None:
+                        yield process_id, json.dumps(process.to_dict())
+        finally:
+            conn.close()
+    
+    def export_all(self, target_dir: str, progress: Optional[Callable[[int, int, float], None]] = None,
+                   progress_every: int = 100) -> Dict[str, Any]:
+        """Exportiert alle Prozesse als <process_id>_export.vpb.json nach target_dir
+        
+        Returns:
+            Statistik: exported, failed, errors, seconds, records_per_second
+        """
+        target = Path(target_dir)
+        target.mkdir(parents=True, exist_ok=True)
+        stats: Dict[str, Any] = {"exported": 0, "failed": 0, "errors": []}
+        start = time.perf_counter()
+        
+        for process_id, document in self.iter_process_documents():
+            try:
+                data = json.loads(document)
+                with open(target / f"{_safe_filename(process_id)}_export.vpb.json", 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                stats["exported"] += 1
+            except Exception as e:
+                stats["failed"] += 1
+                stats["errors"].append((process_id, str(e)))
+            if progress and (stats["exported"] + stats["failed"]) % progress_every == 0:
+                progress(stats["exported"], stats["failed"], _rate(stats["exported"], start))
+        
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        stats["records_per_second"] = round(_rate(stats["exported"], start), 1)
+        if progress:
+            progress(stats["exported"], stats["failed"], stats["records_per_second"])
+        logger.info(f"Export: {stats['exported']} Prozesse nach {target} ({stats['records_per_second']} rec/s)")
+        return stats
+
+
+def _rate(count: int, start: float) -> float:
+    elapsed = time.perf_counter() - start
+    return count / elapsed if elapsed > 0 else 0.0
+
+
+def _safe_filename(name: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in name) or "process"
+
+
+def _iter_files(directory: Path, pattern: str) -> Iterator[str]:
+    """Listet passende Dateien gestreamt (ohne die ganze Liste aufzubauen)"""
+    for entry in os.scandir(directory):
+        if entry.is_file() and fnmatch.fnmatch(entry.name, pattern):
+            yield entry.path
+
+
+def _parse_vpb_file(path: str) -> Tuple[str, Optional[VPBProcessRecord], Optional[str]]:
+    """Parst und migriert eine VPB-Datei (läuft im Worker-Prozess)"""
+    from uds3_vpb_schema import migrate_legacy_vpb_data
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return path, migrate_legacy_vpb_data(data), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def _parse_files(files: Iterable[str], workers: Optional[int]
+                 ) -> Iterator[Tuple[str, Optional[VPBProcessRecord], Optional[str]]]:
+    """Parst Dateien im Prozess-Pool mit begrenzter Anzahl offener Aufträge"""
+    if workers is not None and workers <= 1:
+        for path in files:
+            yield _parse_vpb_file(path)
+        return
+    
+    workers = workers or os.cpu_count() or 1
+    window = 4 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for path in files:
+            pending.append(pool.submit(_parse_vpb_file, path))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 # CLI für Database-Management
 if __name__ == "__main__":
     import argparse
@@ -454,6 +836,10 @@ if __name__ == "__main__":
     parser.add_argument("--init", action="store_true", help="Database initialisieren")
     parser.add_argument("--import", dest="import_file", help="VPB JSON-Datei importieren")
     parser.add_argument("--export", dest="export_id", help="Prozess als JSON exportieren")
+    parser.add_argument("--import-dir", dest="import_dir", help="Alle *.vpb.json eines Verzeichnisses importieren")
+    parser.add_argument("--export-all", dest="export_dir", help="Alle Prozesse in ein Verzeichnis exportieren")
+    parser.add_argument("--workers", type=int, default=None, help="Parser-Prozesse für --import-dir (Standard: CPU-Anzahl)")
+    parser.add_argument("--batch-size", type=int, default=200, help="Prozesse pro Schreibtransaktion für --import-dir")
     
     args = parser.parse_args()
     
@@ -462,6 +848,9 @@ if __name__ == "__main__":
     
     db = VPBSQLiteDB(args.db)
     
+    def _print_progress(done: int, failed: int, rate: float) -> None:
+        print(f"\r  {done} verarbeitet | {failed} Fehler | {rate:.0f} rec/s", end="", flush=True)
+    
     if args.init:
         print("Database initialisiert")
         
@@ -513,6 +902,23 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"❌ Import-Fehler: {e}")
             
+    elif args.import_dir:
+        result = db.import_directory(args.import_dir, workers=args.workers, batch_size=args.batch_size,
+                                     progress=_print_progress)
+        print()
+        print(f"✅ {result['imported']} von {result['files']} Dateien importiert "
+              f"in {result['seconds']:.1f} s ({result['records_per_second']:.0f} rec/s)")
+        for path, error in result["errors"][:20]:
+            print(f"❌ {path}: {error}")
+        
+    elif args.export_dir:
+        result = db.export_all(args.export_dir, progress=_print_progress)
+        print()
+        print(f"✅ {result['exported']} Prozesse exportiert nach {args.export_dir} "
+              f"in {result['seconds']:.1f} s ({result['records_per_second']:.0f} rec/s)")
+        for process_id, error in result["errors"][:20]:
+            print(f"❌ {process_id}: {error}")
+        
     elif args.export_id:
         process = db.load_process(args.export_id)
         if process: